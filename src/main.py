@@ -1,7 +1,10 @@
 import argparse
+import multiprocessing
 import os
 import traceback
 from models.controllers.configuracion_controller import ConfiguracionController
+from models.controllers.controlar_comentarios import ControlarComentarios
+from models.controllers.controlar_progreso_lectura import ControlarProgresoLectura
 from models.daos.database_dao import DataBaseDAO
 from utilities.configuracion import inicializar_directorios
 from views.apps.factory import crear_app, UI_TKINTER
@@ -42,6 +45,10 @@ def main():
         data_base = DataBaseDAO()
         data_base.crear_base_de_datos()
 
+        # pasamos a la base de datos los comentarios y progresos de versiones anteriores
+        ControlarComentarios().migrar_archivo()
+        ControlarProgresoLectura().migrar_configuracion()
+
         # inicializamos los directorios principales
         inicializar_directorios()
 
@@ -55,4 +62,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # necesario para el pool de procesos de portadas en el ejecutable empaquetado
+    multiprocessing.freeze_support()
     main()
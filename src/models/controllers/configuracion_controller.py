@@ -1,23 +1,32 @@
 from os import mkdir
 from os.path import join, isdir
 import json
-from datetime import datetime
 from utilities.fileINI import FileINI
 from utilities.configuracion import CONFIG_INI
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 class ConfiguracionController:
+    """
+    Acceso a la configuración de la aplicación (settings.ini).
+
+    Todas las instancias comparten el mismo `FileINI` de proceso: el archivo
+    se lee una vez, las lecturas no tocan el disco y las escrituras se
+    guardan agrupadas en segundo plano, así que crear un controlador donde
+    haga falta no cuesta nada.
+    """
+
     def __init__(self):
         self.nombre_biblioteca = "BibliotecaTK"
         self.nombre_portada = "Portadas"
-        self.iniFile = FileINI(pathINI=CONFIG_INI)
+        self.iniFile = FileINI.compartido(CONFIG_INI)
         # ----- Seciones ----
         self.section_ubiaciones = "ubicaciones"
         self.section_estilo = "estilo"
         self.section_toggle = "toggle"
         self.section_ubicaciones = "ubicaciones"
+        self.section_rendimiento = "rendimiento"
         # ----- Keys --------
         self.key_ubicacion_biblioteca = "ubicacion_biblioteca"
         self.key_ubicacion_portadas = "ubicacion_portadas"
@@ -36,6 +45,7 @@ class ConfiguracionController:
         self.key_estado_vista_estante = "estado_vista_estante"
         self.key_progreso_lectura_estante = "progreso_lectura_estante"
         self.key_pestana_activa_principal = "pestana_activa_principal"
+        self.key_hilos_hash = "hilos_hash"
         # ----- Keys Pestañas -----
         self.key_pestana_bienvenida = "pestana_bienvenida"
         self.key_pestana_visualizar = "pestana_visualizar"
@@ -69,6 +79,12 @@ class ConfiguracionController:
                 comment="Es la seccion donde podemos definir que paneles ocultar",
             )
 
+        if not self.iniFile.section_exist(section=self.section_rendimiento):
+            self.iniFile.add_section(
+                section=self.section_rendimiento,
+                comment="Parametros de rendimiento de las tareas en segundo plano",
+            )
+
     def establecer_ubicacion_biblioteca(self, directrio: str) -> bool:
         """
         Esta funcion se encargara de establcer la ubicacion del directorio de la biblioteca
@@ -392,20 +408,11 @@ class ConfiguracionController:
             pass
         return {}
 
-    def guardar_progresos_lectura(self, progresos: Dict[str, Any]) -> bool:
-        if not isinstance(progresos, dict):
-            return False
-        try:
-            value = json.dumps(progresos, ensure_ascii=True)
-            return self.iniFile.add_value(
-                section=self.section_toggle,
-                key=self.key_progreso_lectura_estante,
-                value=value,
-            )
-        except Exception:
-            return False
-
     def obtener_progresos_lectura(self) -> Dict[str, Any]:
+        """
+        Lee los progresos de lectura del archivo de configuración (formato
+        anterior a la tabla `progreso_lectura`; solo se usa para migrarlos).
+        """
         raw = self.iniFile.get_value(
             section=self.section_toggle,
             key=self.key_progreso_lectura_estante,
@@ -448,32 +455,17 @@ class ConfiguracionController:
 
         return progresos_normalizados
 
-    def guardar_progreso_lectura(self, id_documento: int, pagina_actual: int) -> bool:
-        try:
-            id_normalizado = str(int(id_documento))
-            pagina_normalizada = max(0, int(pagina_actual))
-        except (TypeError, ValueError):
-            return False
-
-        progresos = self.obtener_progresos_lectura()
-        progresos[id_normalizado] = {
-            "pagina_actual": pagina_normalizada,
-            "en_lectura": pagina_normalizada > 0,
-            "actualizado_en": datetime.now().isoformat(timespec="seconds"),
-        }
-        return self.guardar_progresos_lectura(progresos=progresos)
-
-    def eliminar_progreso_lectura(self, id_documento: int) -> bool:
-        try:
-            id_normalizado = str(int(id_documento))
-        except (TypeError, ValueError):
-            return False
-
-        progresos = self.obtener_progresos_lectura()
-        if id_normalizado in progresos:
-            progresos.pop(id_normalizado, None)
-            return self.guardar_progresos_lectura(progresos=progresos)
-        return True
+    def eliminar_progresos_lectura(self) -> bool:
+        """
+        Borra los progresos de lectura guardados en el archivo de configuración
+        (formato anterior a la tabla `progreso_lectura`).
+        """
+        return bool(
+            self.iniFile.delete_key(
+                section=self.section_toggle,
+                key=self.key_progreso_lectura_estante,
+            )
+        )
 
     def guardar_pestana_activa_principal(self, nombre_pestana: str) -> bool:
         nombre_normalizado = (nombre_pestana or "").strip().lower()
@@ -485,6 +477,26 @@ class ConfiguracionController:
             value=nombre_normalizado,
         )
 
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Rendimiento
+    # └────────────────────────────────────────────────────────────┘
+
+    def obtener_hilos_hash(self) -> Optional[int]:
+        """
+        Número de hilos para calcular hashes, o None para usar el valor por defecto.
+        """
+        valor = self.iniFile.get_value(section=self.section_rendimiento, key=self.key_hilos_hash)
+        try:
+            hilos = int(valor)
+        except (TypeError, ValueError):
+            return None
+        return hilos if hilos > 0 else None
+
+    def establecer_hilos_hash(self, hilos: int) -> bool:
+        return self.iniFile.add_value(
+            section=self.section_rendimiento, key=self.key_hilos_hash, value=str(int(hilos))
+        )
+
     def obtener_pestana_activa_principal(self) -> str:
         valor = self.iniFile.get_value(
             section=self.section_toggle,
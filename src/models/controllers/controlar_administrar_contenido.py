@@ -505,59 +505,33 @@ class ControlarAdministrarContenido:
     # └────────────────────────────────────────────────────────────┘
 
     def _cargar_capitulos(self, id_documento: int):
-        """Carga los capitulos en el tree view"""
+        """Carga los capitulos y sus secciones en el tree view"""
         # limpiamos el map_items (mapa de items)
         self.map_items.clear()
         # limpiamos el tree
         self.tree_view.delete(*self.tree_view.get_children())
-        # generamos una consulta
+        # una sola consulta trae todo el arbol, con cada padre antes que sus hijos
         consulta = Consulta()
-        lista_capitulos = consulta.capitulos_documento(id_documento=id_documento)
-        if lista_capitulos:
-            for capitulo in lista_capitulos:
-                iid_capitulo = self._insertar_tree_capitulo(capitulo=capitulo)
-                # Solo agregamos al mapa si el iid no es None
-                if iid_capitulo is not None:
-                    self.map_items[iid_capitulo] = capitulo
-                    # cargamos las secciones que tiene el capitulo
-                    self._cargar_secciones(iid_capitulo=iid_capitulo, id_capitulo=capitulo.id)
+        for elemento in consulta.arbol_contenido_documento(id_documento=id_documento):
+            if isinstance(elemento, Capitulo):
+                iid = self._insertar_tree_capitulo(capitulo=elemento)
+            else:
+                iid = self._insertar_tree_seccion(
+                    seccion=elemento, iid_padre=self._iid_padre_seccion(seccion=elemento)
+                )
+            # Solo agregamos al mapa si el iid no es None
+            if iid is not None:
+                self.map_items[iid] = elemento
         # Aplicar formato visual
         self.tree_view.tag_configure("capitulo", font=("", 9, "bold"))
 
-    def _cargar_secciones(self, iid_capitulo: str, id_capitulo: int):
-        """Cargamos las secciones que tiene cada capitulo el tree_view"""
-        # hacemos una consulta para obtener las secciones
-        consulta = Consulta()
-        lista_secciones = consulta.secciones_capitulo(id_capitulo=id_capitulo)
-        if lista_secciones:
-            # si la lista de secciones no esta vacia, la recorremos
-            for seccion in lista_secciones:
-                # cargamos las secciones solamente si no es hijo
-                id_padre = seccion.id_padre
-                if id_padre is None:
-                    iid_seccion = self._insertar_tree_seccion(
-                        seccion=seccion, iid_padre=iid_capitulo
-                    )
-                    # Solo insertamos el iid_seccion en mapa si no es None
-                    if iid_seccion is not None:
-                        self.map_items[iid_seccion] = seccion
-                else:
-                    # aqui hacemos la funcion recursiva
-                    self._recursiva_seccion(
-                        seccion_padre=seccion, iid_seccion=f"sec_{seccion.id_padre}"
-                    )
-
-    def _recursiva_seccion(self, seccion_padre: Seccion, iid_seccion: str) -> str:
-        lista_hijos = seccion_padre.hijos_directos()
-        if lista_hijos:
-            for hijo_seccion in lista_hijos:
-                iid = self._insertar_tree_seccion(seccion=hijo_seccion, iid_padre=iid_seccion)
-                # Solo agregamos al mapa si el iid no es None
-                if iid is not None:
-                    self.map_items[iid] = hijo_seccion
-                    # Solo continuamos la recursión si el item existe en el tree
-                    if not self.tree_view.exists(iid):
-                        self._recursiva_seccion(seccion_padre=hijo_seccion, iid_seccion=iid)
+    def _iid_padre_seccion(self, seccion: Seccion) -> str:
+        """Retorna el iid del padre de una seccion: su seccion padre o, si no, su capitulo"""
+        if seccion.id_padre is not None:
+            iid_padre = f"sec_{seccion.id_padre}"
+            if self.tree_view.exists(iid_padre):
+                return iid_padre
+        return f"cap_{seccion.id_capitulo}"
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Metodos para nsertamos los capitulos y secciones al tree
@@ -1,24 +1,33 @@
-import time
 from threading import Thread
 import math
-from os.path import exists
+import os
+from os.path import isdir, normcase, split
 from ttkbootstrap import Label, Progressbar
-from ttkbootstrap.tableview import Tableview
 from models.entities.consulta import Consulta
 from models.entities.documento import Documento
 from models.entities.favorito import Favorito
 from models.controllers.configuracion_controller import ConfiguracionController
-from utilities.auxiliar import generar_ruta_documento
-from typing import List, Dict, Any
+from utilities.auxiliar import ruta_documento_biblioteca
+from utilities.bus_progreso import BusProgreso
+from views.components.virtual_table_view import VirtualTableView
+from typing import List, Dict, Any, Optional, Set
 
 
 class ControlarAdministrarDocumentos:
-    def __init__(self, lbl_progreso: Label, progress_bar: Progressbar, table_view: Tableview):
+    # filas que se generan y se pasan juntas a la tabla
+    TAMANO_LOTE = 2000
+
+    def __init__(self, lbl_progreso: Label, progress_bar: Progressbar, table_view: VirtualTableView):
         self.lbl_progreso = lbl_progreso
         self.progress_bar = progress_bar
         self.table_view = table_view
         self.encontrados: List[Dict[str, Any]] = []
         self.documentos_seleccionados: List[Documento] = []
+        # biblioteca y archivos de cada subdirectorio, leídos una vez por búsqueda
+        self._ruta_biblioteca: Optional[str] = None
+        self._archivos_subdirectorio: Dict[str, Set[str]] = {}
+        # progreso del hilo de trabajo hacia la interfaz
+        self.bus = BusProgreso(table_view, label=lbl_progreso, progress_bar=progress_bar)
         # icons
         # favorito
         self.icon_favorito = "⭐"
@@ -36,6 +45,18 @@ class ControlarAdministrarDocumentos:
         # existencia
         self.icon_exclamacion = "❗"  # indica que el archivo no existe en la biblioteca
         self.icon_existe = "✳️"  # indica que el archivo existe en la biblioteca
+        # iconos de la columna info, por marca del documento
+        self.icon_map = {
+            'tiene_metadato': self.icon_metadato,
+            'es_favorito': self.icon_favorito,
+            'tiene_capitulos': self.icon_capitulo,
+            'tiene_categoria': self.icon_categoria,
+            'tiene_coleccion': self.icon_coleccion,
+            'tiene_dato_bibliografico': self.icon_bibliografia,
+            'tiene_etiqueta': self.icon_etiqueta,
+            'tiene_grupo': self.icon_grupo,
+            'tiene_palabra_clave': self.icon_palabra_clave,
+        }
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Metodos Principales
@@ -43,6 +64,7 @@ class ControlarAdministrarDocumentos:
 
     def ejecutar_encontrados(self):
         hilo_encontrados = Thread(target=self._procesar_encontrados)
+        self.bus.iniciar()
         hilo_encontrados.start()
 
     def buscar_datos(self, campo: str, buscar: str):
@@ -98,38 +120,32 @@ class ControlarAdministrarDocumentos:
         self.table_view.delete_rows()
 
     def _procesar_encontrados(self):
-        # limpiamos la tabla
-        self._clear_table()
-        # obtenemos el total de encontrados
-        total_encontrados = len(self.encontrados)
-        self.table_view.after(
-            0, lambda: self.progress_bar.config(maximum=total_encontrados, value=0)
-        )
-
-        for i, dato in enumerate(self.encontrados):
-            # Actualizamos el label
-            self.table_view.after(
-                0,
-                lambda nombre=dato['nombre']: self.lbl_progreso.config(
-                    text=f"Procesando: {nombre}"
-                ),
-            )
-
-            # Fila
-            fila = self._generar_fila(dato=dato)
-            if fila:
-                # Insertamos
-                self._insertar_fila(values=fila)
-
-            # Actualizamos el proceso
-            self.table_view.after(0, lambda v=i + 1: self.progress_bar.config(value=v))
-
-        # finalizamos
-        self._finalizar_carga_gui()
+        try:
+            # limpiamos la tabla
+            self.bus.en_ui(self._clear_table)
+            # obtenemos el total de encontrados
+            total_encontrados = len(self.encontrados)
+            self.bus.maximo(total_encontrados)
+            self._preparar_existencia()
+
+            # las filas se generan en este hilo y se pasan a la tabla por lotes
+            for inicio in range(0, total_encontrados, self.TAMANO_LOTE):
+                lote = self.encontrados[inicio:inicio + self.TAMANO_LOTE]
+                filas = [fila for fila in map(self._generar_fila, lote) if fila]
+                if filas:
+                    self._insertar_filas(filas)
+
+                self.bus.texto(f"Procesando: {lote[-1]['nombre']}")
+                self.bus.valor(inicio + len(lote))
+
+            # finalizamos
+            self.bus.en_ui(self._finalizar_carga_gui)
+        finally:
+            self.bus.terminar()
 
     def _generar_fila(self, dato: Dict) -> List:
         """Esta funcion genera una fila, para insertar en la tabla"""
-        if isinstance(dato, Dict):
+        if isinstance(dato, dict):
             activo = "✅" if dato['esta_activo'] else "❎"
             return [
                 dato['id'],
@@ -147,58 +163,52 @@ class ControlarAdministrarDocumentos:
             ]
         return []
 
-    def _insertar_fila(self, values: list):
-        time.sleep(1)
-        self.table_view.after(0, self._insert_en_gui, values)
-
-    def _insert_en_gui(self, values: list):
-        self.table_view.insert_row(values=values)
+    def _insertar_filas(self, filas: List[list]):
+        self.bus.en_ui(lambda: self.table_view.agregar_filas(filas))
 
     def _get_info(self, dato: Dict) -> str:
         info_parts = []
-        if isinstance(dato, Dict):
+        if isinstance(dato, dict):
             # existencia
             if self._existe_documento(dato=dato):
                 info_parts.append(self.icon_existe)
             else:
                 info_parts.append(self.icon_exclamacion)
 
-            icon_map = {
-                'tiene_metadato': self.icon_metadato,
-                'es_favorito': self.icon_favorito,
-                'tiene_capitulos': self.icon_capitulo,
-                'tiene_categoria': self.icon_categoria,
-                'tiene_coleccion': self.icon_coleccion,
-                'tiene_dato_bibliografico': self.icon_bibliografia,
-                'tiene_etiqueta': self.icon_etiqueta,
-                'tiene_grupo': self.icon_grupo,
-                'tiene_palabra_clave': self.icon_palabra_clave,
-            }
-
-            for key, icon in icon_map.items():
+            for key, icon in self.icon_map.items():
                 if int(dato.get(key, 0)) == 1:
                     info_parts.append(icon)
 
         return " ".join(info_parts)
 
+    def _preparar_existencia(self):
+        """Lee la ubicación de la biblioteca una vez para toda la búsqueda."""
+        ruta_biblioteca = ConfiguracionController().obtener_ubicacion_biblioteca()
+        self._ruta_biblioteca = ruta_biblioteca if ruta_biblioteca and isdir(ruta_biblioteca) else None
+        self._archivos_subdirectorio = {}
+
     def _existe_documento(self, dato) -> bool:
-        conf = ConfiguracionController()
-        ruta_biblioteca = conf.obtener_ubicacion_biblioteca()
-        if exists(ruta_biblioteca):
-            if isinstance(dato, Dict):
-                ruta_documento = generar_ruta_documento(
-                    ruta_biblioteca=ruta_biblioteca,
-                    nombre_documento=f"{dato['nombre']}.{dato['extension']}",
-                    id_documento=dato['id'],
-                )
-                if exists(ruta_documento):
-                    return True
-                else:
-                    return False
-            else:
-                return False
-        else:
+        """
+        Comprueba si el archivo del documento está en la biblioteca. Cada
+        subdirectorio (uno por cada mil ids) se lista una sola vez, en lugar
+        de consultar el sistema de archivos por cada documento.
+        """
+        if self._ruta_biblioteca is None or not isinstance(dato, dict):
             return False
+        sub_directorio, archivo = split(
+            ruta_documento_biblioteca(
+                self._ruta_biblioteca, f"{dato['nombre']}.{dato['extension']}", dato['id']
+            )
+        )
+        archivos = self._archivos_subdirectorio.get(sub_directorio)
+        if archivos is None:
+            # normcase: en Windows los nombres no distinguen mayúsculas
+            try:
+                archivos = {normcase(nombre) for nombre in os.listdir(sub_directorio)}
+            except OSError:
+                archivos = set()
+            self._archivos_subdirectorio[sub_directorio] = archivos
+        return normcase(archivo) in archivos
 
     def _formatear_tamano(self, bytes: int) -> str:
         """
@@ -1,34 +1,49 @@
 import json
-from datetime import datetime
-from os.path import join, exists, dirname
-from typing import Any, Dict, Optional
 import os
+from os.path import join, exists
+from typing import Any, Dict, Iterable, Optional, Set
 
+from models.daos.comentario_dao import ComentarioDAO
 from utilities.configuracion import RUTA_DATA
 
 
 class ControlarComentarios:
-    def __init__(self, ruta_archivo: Optional[str] = None):
+    """
+    Comentarios de los documentos, guardados en la tabla `comentario`.
+
+    `ruta_archivo` es el `comentarios.json` de versiones anteriores, que
+    `migrar_archivo` importa una sola vez a la base de datos.
+    """
+
+    def __init__(self, ruta_archivo: Optional[str] = None, ruta_db: Optional[str] = None):
         self.ruta_archivo = ruta_archivo or join(RUTA_DATA, "comentarios.json")
+        self._dao = ComentarioDAO(ruta_db=ruta_db)
 
     def obtener_comentario(self, id_documento: int) -> str:
         id_normalizado = self._normalizar_id(id_documento)
         if id_normalizado is None:
             return ""
 
-        data = self._leer_archivo()
-        comentario = data.get("comentarios", {}).get(id_normalizado)
-        if isinstance(comentario, dict):
-            texto = comentario.get("texto", "")
-            return str(texto) if texto is not None else ""
-        if isinstance(comentario, str):
-            return comentario
-        return ""
+        filas = self._dao.instanciar(params=(id_normalizado,))
+        return str(filas[0]["texto"]) if filas else ""
 
     def obtener_comentarios(self) -> Dict[str, Any]:
-        data = self._leer_archivo()
-        comentarios = data.get("comentarios", {})
-        return comentarios if isinstance(comentarios, dict) else {}
+        return {
+            str(fila["id_documento"]): {
+                "texto": fila["texto"],
+                "actualizado_en": fila["actualizado_en"],
+            }
+            for fila in self._dao.obtener_todos()
+        }
+
+    def ids_con_comentario(self, ids_documentos: Iterable[int]) -> Set[str]:
+        """
+        Retorna cuáles de los documentos dados tienen comentario, como IDs en texto.
+        """
+        ids = [i for i in map(self._normalizar_id, ids_documentos) if i is not None]
+        if not ids:
+            return set()
+        return {str(id_documento) for id_documento in self._dao.ids_con_comentario(ids)}
 
     def guardar_comentario(self, id_documento: int, texto: str) -> bool:
         id_normalizado = self._normalizar_id(id_documento)
@@ -36,52 +51,57 @@ class ControlarComentarios:
             return False
 
         texto_normalizado = (texto or "").strip()
-        data = self._leer_archivo()
-        comentarios = data.get("comentarios", {})
-        if not isinstance(comentarios, dict):
-            comentarios = {}
-
         if texto_normalizado:
-            comentarios[id_normalizado] = {
-                "texto": texto_normalizado,
-                "actualizado_en": datetime.now().isoformat(timespec="seconds"),
-            }
-        else:
-            comentarios.pop(id_normalizado, None)
-
-        data["comentarios"] = comentarios
-        return self._guardar_archivo(data)
-
-    def _leer_archivo(self) -> Dict[str, Any]:
+            return self._dao.guardar(id_normalizado, texto_normalizado)
+        # borrar un comentario que no existe no es un error
+        return self._dao.eliminar(params=(id_normalizado,)) or not self._dao.existe(
+            params=(id_normalizado,)
+        )
+
+    def migrar_archivo(self) -> int:
+        """
+        Importa los comentarios de `ruta_archivo` a la base de datos y lo
+        renombra a `.migrado` para no volver a importarlo.
+
+        Returns:
+            int: Número de comentarios importados.
+        """
         if not exists(self.ruta_archivo):
-            return {"comentarios": {}}
+            return 0
+
+        filas = []
+        for id_documento, comentario in self._leer_archivo().items():
+            id_normalizado = self._normalizar_id(id_documento)
+            if id_normalizado is None:
+                continue
+            if isinstance(comentario, dict):
+                texto, actualizado_en = comentario.get("texto"), comentario.get("actualizado_en")
+            else:
+                texto, actualizado_en = comentario, None
+            if isinstance(texto, str):
+                filas.append((id_normalizado, texto.strip(), actualizado_en or None))
+
+        importados = self._dao.insertar_lote(filas)
+        if importados is None:
+            return 0
+        try:
+            os.replace(self.ruta_archivo, f"{self.ruta_archivo}.migrado")
+        except OSError:
+            pass
+        return importados
 
+    def _leer_archivo(self) -> Dict[str, Any]:
         try:
             with open(self.ruta_archivo, "r", encoding="utf-8") as file:
                 data = json.load(file)
         except Exception:
-            return {"comentarios": {}}
-
-        if not isinstance(data, dict):
-            return {"comentarios": {}}
-
-        comentarios = data.get("comentarios", {})
-        if not isinstance(comentarios, dict):
-            comentarios = {}
-
-        return {"comentarios": comentarios}
+            return {}
 
-    def _guardar_archivo(self, data: Dict[str, Any]) -> bool:
-        try:
-            os.makedirs(dirname(self.ruta_archivo), exist_ok=True)
-            with open(self.ruta_archivo, "w", encoding="utf-8") as file:
-                json.dump(data, file, ensure_ascii=False, indent=2)
-            return True
-        except Exception:
-            return False
+        comentarios = data.get("comentarios", {}) if isinstance(data, dict) else {}
+        return comentarios if isinstance(comentarios, dict) else {}
 
-    def _normalizar_id(self, id_documento: int) -> Optional[str]:
+    def _normalizar_id(self, id_documento: int) -> Optional[int]:
         try:
-            return str(int(id_documento))
+            return int(id_documento)
         except (TypeError, ValueError):
             return None
@@ -1,4 +1,3 @@
-from ttkbootstrap.tableview import Tableview
 from ttkbootstrap import Button, IntVar, StringVar
 from typing import Dict, Any, Optional
 from tkinter.messagebox import showerror, showwarning, showinfo, askyesno
@@ -19,6 +18,7 @@ from utilities.auxiliar import (
     eliminar_archivo,
 )
 from views.components.resizable_input_dialog import ask_resizable_string
+from views.components.virtual_table_view import VirtualTableView
 from views.components.resizable_text_dialog import ask_resizable_text
 from views.dialogs.dialog_visualizar_metadatos import DialogVisualizarMetadatos
 
@@ -26,12 +26,12 @@ from views.dialogs.dialog_visualizar_metadatos import DialogVisualizarMetadatos
 class ControlarDocumentoSeleccionado:
     def __init__(
         self,
-        table_view: Tableview,
+        table_view: VirtualTableView,
         map_vars: Dict[str, Any] = {},
         map_widgets: Dict[str, Any] = {},
         master=None,
     ):
-        self.table_view: Tableview = table_view
+        self.table_view: VirtualTableView = table_view
         self.map_vars = map_vars
         self.map_widgets = map_widgets
         self.master = master
@@ -127,13 +127,15 @@ class ControlarDocumentoSeleccionado:
         item_id = self.selected_item[0]
 
         # Obtener los valores actuales de la fila
-        values = list(self.table_view.view.item(item_id)['values'])
+        values = self.table_view.modelo.fila(item_id)
+        if values is None:
+            return
 
         # Actualizar solo el valor del nombre (índice 3 según _set_documento)
         values[3] = self.documento.nombre
 
-        # Actualizar la fila en el treeview
-        self.table_view.view.item(item_id, values=values)
+        # Actualizar la fila en la tabla (y en sus datos, no solo en el treeview)
+        self.table_view.actualizar_fila(item_id, values)
 
         # Mantener la selección
         self.table_view.view.selection_set(item_id)
@@ -629,7 +631,7 @@ class ControlarDocumentoSeleccionado:
                 # Remover el item de la tabla
                 if self.selected_item:
                     item_id = self.selected_item[0]
-                    self.table_view.view.delete(item_id)
+                    self.table_view.delete_rows(iids=[item_id])
 
                 # Limpiar selección
                 self.documento = None
@@ -720,7 +722,7 @@ class ControlarDocumentoSeleccionado:
             # Remover el item de la tabla
             if self.selected_item:
                 item_id = self.selected_item[0]
-                self.table_view.view.delete(item_id)
+                self.table_view.delete_rows(iids=[item_id])
 
             # Limpiar selección
             self.documento = None
@@ -788,7 +790,7 @@ class ControlarDocumentoSeleccionado:
             # Remover el item de la tabla
             if self.selected_item:
                 item_id = self.selected_item[0]
-                self.table_view.view.delete(item_id)
+                self.table_view.delete_rows(iids=[item_id])
 
             # Limpiar selección
             self.documento = None
@@ -1,30 +1,43 @@
 import threading
-import time
 import logging
-from os.path import join, exists
-from pathlib import Path
+from dataclasses import dataclass
+from os.path import exists
 from ttkbootstrap import Label, Progressbar
 from ttkbootstrap.tableview import Tableview
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from models.entities.documento import Documento
-from models.entities.metadato import Metadato
+from models.daos.metadato_dao import MetadatoDAO
+from models.dtos.trabajo_importacion_dto import TrabajoImportacionDTO
 from utilities.auxiliar import (
-    obtener_datos_documento,
     hash_sha256,
     generar_ruta_documento,
-    copiar_archivo,
-    mover_archivo,
-    obtener_metadatos,
-    crear_directorio_id_documento,
-    pdf_miniatura,
-    pdf_normal,
 )
 from models.controllers.configuracion_controller import ConfiguracionController
+from utilities.bus_progreso import BusProgreso
+from utilities.extraccion_texto import obtener_extractor_texto
+from utilities.operaciones_archivo import (
+    COPIAR,
+    MOVER,
+    OperacionArchivo,
+    obtener_ejecutor_archivos,
+)
+from utilities.pipeline import EstadisticasEtapa, EtapaPipeline, Pipeline
+from utilities.sesion_exiftool import SesionExifTool, obtener_sesion_exiftool
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _ElementoImportacion:
+    """Estado de un archivo mientras recorre las etapas de la importación."""
+
+    item: str
+    trabajo: Optional[TrabajoImportacionDTO]
+    documento: Optional[Documento] = None
+    id_documento: Optional[int] = None
+
+
 class ControlarImporetacionDocumento:
     """Controlador para gestionar la importación de documentos a la biblioteca.
 
@@ -33,16 +46,38 @@ class ControlarImporetacionDocumento:
     - Inserción en la base de datos
     - Generación de metadatos
     - Copia o movimiento de archivos
-    - Generación de portadas para PDFs
     - Actualización de progreso en la GUI
+
+    Cada paso es una etapa de un `Pipeline` con sus propios hilos y colas
+    acotadas, de modo que los archivos avanzan en paralelo y el ritmo lo
+    marca la E/S de la etapa más lenta. Las portadas ya no se generan aquí:
+    las crea la caché de portadas la primera vez que el estante las pide. El
+    texto de las páginas lo extrae después, en segundo plano, el extractor
+    de texto.
     """
 
+    # Hilos por etapa. La inserción en la base de datos usa un único hilo
+    # porque SQLite solo admite un escritor a la vez, y los metadatos otro
+    # porque todos pasan por el mismo proceso exiftool.
+    HILOS_POR_ETAPA: Dict[str, int] = {
+        "hash": 2,
+        "bd": 1,
+        "metadatos": 1,
+        "archivo": 2,
+    }
+    TAMANO_COLA: int = 16
+    # Archivos por orden a exiftool
+    TAMANO_LOTE_METADATOS: int = 16
+
     def __init__(
         self,
         label_progress: Label,
         progress_bar: Progressbar,
         table_view: Tableview,
         tipo_importacion: str = "copiar",
+        trabajos: Optional[Dict[str, TrabajoImportacionDTO]] = None,
+        hilos_por_etapa: Optional[Dict[str, int]] = None,
+        sesion_exiftool: Optional[SesionExifTool] = None,
     ) -> None:
         """Inicializa el controlador de importación.
 
@@ -51,20 +86,29 @@ class ControlarImporetacionDocumento:
             progress_bar: Widget Progressbar para la barra de progreso
             table_view: Widget Tableview que contiene los documentos a importar
             tipo_importacion: Tipo de operación ('copiar' o 'mover'). Por defecto 'copiar'
+            trabajos: Trabajos de importación registrados en la selección, por ruta
+            hilos_por_etapa: Hilos de cada etapa; completa `HILOS_POR_ETAPA`
+            sesion_exiftool: Sesión de exiftool; por defecto la del proceso
         """
         self.label_progress: Label = label_progress
         self.progress_bar: Progressbar = progress_bar
         self.table_view: Tableview = table_view
-        self.dict_data: Dict[str, tuple] = {}
+        self.dict_data: Dict[str, TrabajoImportacionDTO] = {}
+        self.trabajos: Dict[str, TrabajoImportacionDTO] = trabajos if trabajos is not None else {}
         self.tipo_importacion: str = tipo_importacion
         self.ruta_biblioteca: str = ""
-        self.ruta_portadas: str = ""
+        self.hilos_por_etapa: Dict[str, int] = {**self.HILOS_POR_ETAPA, **(hilos_por_etapa or {})}
+        self.pipeline: Optional[Pipeline] = None
+        self.sesion_exiftool: SesionExifTool = sesion_exiftool or obtener_sesion_exiftool()
+        # progreso de los hilos de las etapas hacia la interfaz
+        self.bus: BusProgreso = BusProgreso(
+            table_view, label=label_progress, progress_bar=progress_bar, table_view=table_view
+        )
 
         try:
             configuracion = ConfiguracionController()
             if exists(configuracion.obtener_ubicacion_biblioteca()):
                 self.ruta_biblioteca = configuracion.obtener_ubicacion_biblioteca()
-                self.ruta_portadas = configuracion.obtener_ubicacion_portadas()
                 logger.info(f"Rutas configuradas - Biblioteca: {self.ruta_biblioteca}")
         except Exception as e:
             logger.error(f"Error al obtener configuración: {e}")
@@ -72,7 +116,10 @@ class ControlarImporetacionDocumento:
     def importar(self) -> None:
         """Inicia el hilo de trabajo para importar documentos de forma asíncrona."""
         try:
+            # se crea antes de arrancar el hilo para que `cancelar` tenga efecto desde ya
+            self.pipeline = self._crear_pipeline()
             hilo_trabajo = threading.Thread(target=self._procesar_importacion, daemon=True)
+            self.bus.iniciar()
             hilo_trabajo.start()
             logger.info("Iniciando proceso de importación en hilo de trabajo")
         except Exception as e:
@@ -80,10 +127,11 @@ class ControlarImporetacionDocumento:
             self.table_view.after(0, lambda: self.label_progress.config(text=f"Error: {e}"))
 
     def _load_data(self) -> None:
-        """Carga los datos de la tabla en un diccionario.
+        """Carga los trabajos de importación de la tabla en un diccionario.
 
-        Extrae todos los items de la Tableview y los almacena en dict_data
-        para procesarlos posteriormente.
+        Asocia cada item de la Tableview con el `TrabajoImportacionDTO`
+        registrado para su ruta y lo almacena en dict_data para procesarlo
+        posteriormente.
         """
         try:
             items = self.table_view.view.get_children()
@@ -91,7 +139,9 @@ class ControlarImporetacionDocumento:
                 for item in items:
                     values = self.table_view.view.item(item, 'values')
                     if values:
-                        self.dict_data[item] = values
+                        trabajo = self._obtener_trabajo(ruta_documento=values[6])
+                        if trabajo:
+                            self.dict_data[item] = trabajo
             logger.info(f"Datos cargados: {len(self.dict_data)} documentos")
         except Exception as e:
             logger.error(f"Error al cargar datos de la tabla: {e}")
@@ -100,96 +150,136 @@ class ControlarImporetacionDocumento:
         """Procesa la importación de todos los documentos en el hilo de trabajo.
 
         Este método es ejecutado en un hilo separado para no bloquear la GUI.
-        Realiza:
-        - Validación de documentos
+        Encadena las etapas:
+        - Validación del hash (solo se recalcula si el archivo cambió)
         - Inserción en base de datos
         - Gestión de metadatos
         - Copia/movimiento de archivos
-        - Generación de portadas
         """
+        try:
+            self._importar_documentos()
+        finally:
+            self.bus.terminar()
+
+    def _importar_documentos(self) -> None:
         # cargamos los datos
         self._load_data()
 
         # Configuramos el proceso inicial
         total_archivos = len(self.dict_data.keys())
-        self.table_view.after(0, lambda: self.progress_bar.config(maximum=total_archivos, value=0))
+        self.bus.maximo(total_archivos)
 
-        # recorremos los datos
         if self.dict_data:
-
-            for i, item in enumerate(self.dict_data.keys()):
-                fila = self.dict_data[item]
-                ruta_documento = fila[6]
-                documento = self._generar_documento(ruta_documento=ruta_documento)
-                # verificamos que se una instancia del documento
-                if isinstance(documento, Documento):
-                    # verificamos que no exista en la base de datos
-                    if not documento.existe():
-                        # si no existe cargamos el documento a la base de datos
-                        id_documento = documento.insertar()
-                        nombre_con_extension = f"{documento.nombre}.{documento.extension}"
-                        # insertamos los metadatos de los documentos
-                        self._inserta_metadatos(
-                            id_documento=id_documento, ruta_documento=ruta_documento
-                        )
-                        # Copiamos o movemos los archivos de acuerdo a la opcion del usuario
-                        if self.tipo_importacion == "copiar":
-                            # copiamos los archivos
-                            ruta_destino = generar_ruta_documento(
-                                self.ruta_biblioteca,
-                                nombre_documento=nombre_con_extension,
-                                id_documento=id_documento,
-                            )
-                            # copiamos
-                            self._copiar_documento(
-                                ruta_origen=ruta_documento, ruta_destino=ruta_destino
-                            )
-                            # generamos la portad
-                            self._generar_portada(
-                                pdf_path=ruta_documento,
-                                id_documento=id_documento,
-                                extension=documento.extension,
-                            )
-                        elif self.tipo_importacion == "mover":
-                            # movemos lo archivos
-                            ruta_destino = generar_ruta_documento(
-                                self.ruta_biblioteca,
-                                nombre_documento=nombre_con_extension,
-                                id_documento=id_documento,
-                            )
-                            # antes de mover generamos la portada
-                            self._generar_portada(
-                                pdf_path=ruta_documento,
-                                id_documento=id_documento,
-                                extension=documento.extension,
-                            )
-                            # movemos
-                            self._mover_documento(
-                                ruta_origen=ruta_documento, ruta_destino=ruta_destino
-                            )
-
-                        # mostramos el proceso en el label
-                        self.table_view.after(
-                            0,
-                            lambda r=ruta_documento: self.label_progress.config(
-                                text=f"Importando el archivo: {r}"
-                            ),
-                        )
-
-                        # sacamos los archivos importados de la tabla, para evitar dobles importaciones
-                        self.table_view.after(0, lambda it=item: self.table_view.view.delete(item))
-
-                # 2. Actualizar el progreso (DELEGADO a la GUI)
-                self.table_view.after(0, lambda v=i + 1: self.progress_bar.config(value=v))
+            if self.pipeline is None:
+                self.pipeline = self._crear_pipeline()
+            elementos = (
+                _ElementoImportacion(item=item, trabajo=trabajo)
+                for item, trabajo in self.dict_data.items()
+            )
+            self.pipeline.ejecutar(
+                elementos,
+                al_completar=self._al_completar_elemento,
+                al_progresar=self._notificar_progreso,
+            )
 
             # mostramos la importacion de documentos
-            self.table_view.view.after(0, self._finalizar_carga_gui)
+            self.bus.en_ui(self._finalizar_carga_gui)
+            # el texto de las páginas de los documentos nuevos se indexa en segundo plano
+            obtener_extractor_texto().iniciar()
+
+    def cancelar(self) -> None:
+        """Detiene la importación en curso tras los archivos ya empezados."""
+        if self.pipeline is not None:
+            self.pipeline.cancelar()
+
+    def _crear_pipeline(self) -> Pipeline:
+        etapas = [
+            ("hash", self._etapa_hash),
+            ("bd", self._etapa_bd),
+            ("metadatos", self._etapa_metadatos),
+            ("archivo", self._etapa_archivo),
+        ]
+        return Pipeline(
+            [
+                EtapaPipeline(
+                    nombre,
+                    funcion,
+                    num_hilos=self.hilos_por_etapa.get(nombre, 1),
+                    tamano_cola=self.TAMANO_COLA,
+                    tamano_lote=self.TAMANO_LOTE_METADATOS if nombre == "metadatos" else 1,
+                )
+                for nombre, funcion in etapas
+            ]
+        )
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Etapas de la importación
+    # └────────────────────────────────────────────────────────────┘
 
-    def _inserta_metadatos(self, id_documento: int, ruta_documento):
-        datos = obtener_metadatos(ruta_origen=ruta_documento)
-        for clave, valor in datos.items():
-            meta_dato = Metadato(id_documento=id_documento, clave=clave, valor=valor)
-            meta_dato.insertar()
+    def _etapa_hash(self, elemento: _ElementoImportacion) -> Optional[_ElementoImportacion]:
+        trabajo = elemento.trabajo
+        # el hash calculado en la selección es válido si el archivo no cambió
+        if not trabajo.esta_vigente():
+            trabajo = self._obtener_trabajo(ruta_documento=trabajo.ruta, recalcular=True)
+        if trabajo is None or trabajo.existe_en_biblioteca:
+            return None
+        elemento.trabajo = trabajo
+        elemento.documento = self._generar_documento(trabajo=trabajo)
+        return elemento
+
+    def _etapa_bd(self, elemento: _ElementoImportacion) -> Optional[_ElementoImportacion]:
+        documento = elemento.documento
+        # verificamos que no exista en la base de datos
+        if documento.existe():
+            return None
+        elemento.id_documento = documento.insertar()
+        return elemento if elemento.id_documento else None
+
+    def _etapa_metadatos(
+        self, elementos: List[_ElementoImportacion]
+    ) -> List[_ElementoImportacion]:
+        # un lote de archivos en una sola orden a exiftool y una sola transacción
+        try:
+            self._inserta_metadatos_lote(elementos)
+        except Exception as e:
+            # los metadatos son opcionales: los documentos ya están en la base
+            # de datos y sus archivos tienen que llegar a la biblioteca igualmente
+            logger.error(f"Error al insertar metadatos de {len(elementos)} documentos: {e}")
+        return elementos
+
+    def _etapa_archivo(self, elemento: _ElementoImportacion) -> _ElementoImportacion:
+        # Copiamos o movemos los archivos de acuerdo a la opcion del usuario
+        ruta_destino = generar_ruta_documento(
+            self.ruta_biblioteca,
+            nombre_documento=elemento.trabajo.nombre_con_extension,
+            id_documento=elemento.id_documento,
+        )
+        if self.tipo_importacion == "copiar":
+            self._copiar_documento(ruta_origen=elemento.trabajo.ruta, ruta_destino=ruta_destino)
+        elif self.tipo_importacion == "mover":
+            self._mover_documento(ruta_origen=elemento.trabajo.ruta, ruta_destino=ruta_destino)
+        return elemento
+
+    def _al_completar_elemento(self, elemento: _ElementoImportacion) -> None:
+        """Saca de la tabla el archivo importado, para evitar dobles importaciones."""
+        self.bus.eliminar_fila(elemento.item)
+
+    def _notificar_progreso(self, estadisticas: List[EstadisticasEtapa]) -> None:
+        """Publica el rendimiento y la cola de cada etapa en el bus de progreso."""
+        texto = " | ".join(
+            f"{e.nombre}: {e.procesados} ({e.por_segundo:.1f}/s, cola {e.en_cola})"
+            for e in estadisticas
+        )
+        # un archivo termina al superar la última etapa o al ser descartado en cualquiera
+        terminados = estadisticas[-1].procesados + sum(e.descartados for e in estadisticas)
+        self.bus.texto(texto)
+        self.bus.valor(terminados)
+
+    def _inserta_metadatos_lote(self, elementos: List[_ElementoImportacion]):
+        datos = self.sesion_exiftool.obtener_metadatos([e.trabajo.ruta for e in elementos])
+        MetadatoDAO().insertar_metadatos_documentos(
+            {e.id_documento: datos.get(e.trabajo.ruta, {}) for e in elementos}
+        )
 
     def _finalizar_carga_gui(self):
         """Método seguro para la GUI: ajusta la tabla y actualiza el mensaje final."""
@@ -198,34 +288,39 @@ class ControlarImporetacionDocumento:
 
     def _copiar_documento(self, ruta_origen, ruta_destino):
         """Copiamos los archivos importados a la biblioteca"""
-        time.sleep(1)
-        copiar_archivo(ruta_origen=ruta_origen, ruta_destino=ruta_destino)
+        # sin cancelación: el documento ya está registrado en la base de datos
+        obtener_ejecutor_archivos().ejecutar([OperacionArchivo(COPIAR, ruta_origen, ruta_destino)])
 
     def _mover_documento(self, ruta_origen, ruta_destino):
-        """Copiamos los archivos importados a la biblioteca"""
-        time.sleep(1)
-        mover_archivo(ruta_origen=ruta_origen, ruta_destino=ruta_destino)
+        """Movemos los archivos importados a la biblioteca"""
+        obtener_ejecutor_archivos().ejecutar([OperacionArchivo(MOVER, ruta_origen, ruta_destino)])
 
-    def _generar_documento(self, ruta_documento: str) -> Documento:
+    def _obtener_trabajo(
+        self, ruta_documento: str, recalcular: bool = False
+    ) -> Optional[TrabajoImportacionDTO]:
+        """Retorna el trabajo registrado para una ruta.
+
+        Solo se vuelve a calcular el hash si la ruta no tiene trabajo o si
+        el archivo cambió desde la selección (`recalcular`).
+        """
+        trabajo = self.trabajos.get(ruta_documento)
+        if trabajo is None or recalcular:
+            hash_archivo = hash_sha256(archivo=ruta_documento)
+            if not hash_archivo:
+                return None
+            trabajo = TrabajoImportacionDTO.desde_ruta(ruta=ruta_documento, hash=hash_archivo)
+            if trabajo:
+                self.trabajos[ruta_documento] = trabajo
+        return trabajo
+
+    def _generar_documento(self, trabajo: Optional[TrabajoImportacionDTO]) -> Documento:
         documento = None
-        if exists(ruta_documento):
-            datos = obtener_datos_documento(ruta_origen=ruta_documento)
+        if trabajo is not None:
             documento = Documento(
-                nombre=datos['nombre_sin_extension'],
-                extension=datos['extension'],
-                tamano=datos['tamano_bytes'],
-                hash=hash_sha256(archivo=ruta_documento),
+                nombre=trabajo.nombre,
+                extension=trabajo.extension,
+                tamano=trabajo.tamano,
+                hash=trabajo.hash,
                 esta_activo=True,
             )
         return documento
-
-    def _generar_portada(self, pdf_path: str, id_documento: int, extension: str):
-        if extension.lower() == "pdf":
-            if exists(self.ruta_portadas):
-                dir_portada = crear_directorio_id_documento(
-                    ruta_destino=self.ruta_portadas, id_documento=id_documento
-                )
-                output_path_normal = join(dir_portada, f"{str(id_documento)}_normal.png")
-                output_path_miniatura = join(dir_portada, f"{str(id_documento)}_miniatura.png")
-                pdf_miniatura(pdf_path=pdf_path, output_path=output_path_miniatura)
-                pdf_normal(pdf_path=pdf_path, output_path=output_path_normal)
@@ -1,23 +1,25 @@
-import time
-from threading import Thread
+from threading import Event, Thread
 from os.path import exists, join
-from ttkbootstrap.tableview import Tableview, TableRow
 from ttkbootstrap import Label, Progressbar
 from models.entities.documento import Documento
 from typing import List, Dict
 from tkinter.messagebox import showwarning, askyesno
-from utilities.auxiliar import (
-    generar_ruta_documento,
-    copiar_archivo,
-    mover_archivo,
-    eliminar_archivo,
+from utilities.auxiliar import generar_ruta_documento
+from utilities.bus_progreso import BusProgreso
+from utilities.operaciones_archivo import (
+    COPIAR,
+    ELIMINAR,
+    MOVER,
+    OperacionArchivo,
+    obtener_ejecutor_archivos,
 )
 from models.controllers.configuracion_controller import ConfiguracionController
+from views.components.virtual_table_view import FilaTabla, VirtualTableView
 
 
 class ControlarOperacionesDocumentos:
     def __init__(
-        self, master, table_view: Tableview, lbl_progreso: Label, progress_bar: Progressbar
+        self, master, table_view: VirtualTableView, lbl_progreso: Label, progress_bar: Progressbar
     ):
         self.master = master
         self.table_view = table_view
@@ -37,7 +39,16 @@ class ControlarOperacionesDocumentos:
         # obtenemos los documentos seleccionados
         self.documentos_seleccionados: List[Documento] = []
         # mapa de documento fila
-        self.map_id_fila: Dict[str, TableRow] = {}
+        self.map_id_fila: Dict[int, FilaTabla] = {}
+        # cancela las operaciones de archivo en curso
+        self._cancelado = Event()
+        # progreso de los hilos de trabajo hacia la interfaz
+        self.bus = BusProgreso(
+            table_view,
+            label=lbl_progreso,
+            progress_bar=progress_bar,
+            eliminar_filas=self._eliminar_filas_tabla,
+        )
 
         # cargamos los documetos seleccionados
         self._cargar_documentos_seleccionados()
@@ -71,33 +82,49 @@ class ControlarOperacionesDocumentos:
     def ejecutar_copia_seleccionados(self):
         if not self._confirmar_operacion("copiar", self.path_copy):
             return
-        hijo_copia = Thread(target=self._copiar_seleccionados)
+        hijo_copia = Thread(target=self._en_hilo, args=(self._copiar_seleccionados,))
+        self.bus.iniciar()
         hijo_copia.start()
 
     def ejecutar_mover_seleccionados(self):
         if not self._confirmar_operacion("mover", self.path_move):
             return
-        hijo_mover = Thread(target=self._mover_seleccionados)
+        hijo_mover = Thread(target=self._en_hilo, args=(self._mover_seleccionados,))
+        self.bus.iniciar()
         hijo_mover.start()
 
     def ejecutar_eliminar_seleccionados(self):
         if not self._confirmar_operacion("eliminar"):
             return
-        hijo_eliminar = Thread(target=self._eliminar_seleccionados)
+        hijo_eliminar = Thread(target=self._en_hilo, args=(self._eliminar_seleccionados,))
+        self.bus.iniciar()
         hijo_eliminar.start()
 
     def ejecutar_eliminar_filas_seleccionados(self):
         if not self._confirmar_operacion("eliminar filas"):
             return
-        hijo_eliminar_filas = Thread(target=self._eliminar_filas_seleccionados)
+        hijo_eliminar_filas = Thread(target=self._en_hilo, args=(self._eliminar_filas_seleccionados,))
+        self.bus.iniciar()
         hijo_eliminar_filas.start()
 
     def ejecutar_eliminar_registros(self):
         if not self._confirmar_operacion("eliminar registros"):
             return
-        hijo_registros = Thread(target=self._eliminar_registros)
+        hijo_registros = Thread(target=self._en_hilo, args=(self._eliminar_registros,))
+        self.bus.iniciar()
         hijo_registros.start()
 
+    def _en_hilo(self, funcion):
+        """Ejecuta la operacion del hilo de trabajo y cierra el bus de progreso"""
+        try:
+            funcion()
+        finally:
+            self.bus.terminar()
+
+    def cancelar(self):
+        """Cancela la copia, el movimiento o la eliminación en curso."""
+        self._cancelado.set()
+
     def _confirmar_operacion(self, operacion: str, ruta_destino: str = None) -> bool:
         if not self.documentos_seleccionados:
             showwarning(
@@ -120,287 +147,168 @@ class ControlarOperacionesDocumentos:
 
     def _copiar_seleccionados(self):
         """Copiamos los archivos seleccionados"""
-
-        # verificamos que se hayan selecciados los documentos
-        if not self.documentos_seleccionados:
-            showwarning(
-                title="Advertencia",
-                message="Seleccione los documentos a copiar",
-                parent=self.master,
-            )
-            return
-
-        total_seleccinados = len(self.documentos_seleccionados)
-        # configuramos el progress, con el maximo de elementos encontrados
-        self.table_view.after(
-            0, lambda: self.prosgress_bar.config(maximum=total_seleccinados, value=0)
-        )
-        for i, documento in enumerate(self.documentos_seleccionados):
-            # actualizamos o mostramos el proceso en el label
-            self.table_view.after(
-                0,
-                lambda nombre=documento.nombre: self.lbl_progreso.config(
-                    text=f"Copiando >> {nombre} a >> {self.path_copy}"
-                ),
-            )
-
-            # Copiamos ....
-            self._copiar(documento=documento)
-
-            # Actualizamos el progreso
-            self.table_view.after(0, lambda v=i + 1: self.prosgress_bar.config(value=v))
-
-        # finalizamos
-        self._finalizar_carga_gui()
+        self._ejecutar_operacion_archivo(tipo=COPIAR, ruta_destino=self.path_copy)
 
     def _eliminar_filas_seleccionados(self):
         """Eliminamos filas de los archivos seleccionados"""
 
         # verificamos que se hayan selecciados los documentos
         if not self.documentos_seleccionados:
-            showwarning(
-                title="Advertencia",
-                message="Seleccione los documentos a copiar",
-                parent=self.master,
+            self.bus.en_ui(
+                lambda: showwarning(
+                    title="Advertencia",
+                    message="Seleccione los documentos a procesar",
+                    parent=self.master,
+                )
             )
             return
 
         total_seleccinados = len(self.documentos_seleccionados)
         # configuramos el progress, con el maximo de elementos encontrados
-        self.table_view.after(
-            0, lambda: self.prosgress_bar.config(maximum=total_seleccinados, value=0)
-        )
+        self.bus.maximo(total_seleccinados)
         for i, documento in enumerate(self.documentos_seleccionados):
             # actualizamos o mostramos el proceso en el label
-            self.table_view.after(
-                0,
-                lambda nombre=documento.nombre: self.lbl_progreso.config(
-                    text=f"Eliminando filas >> {nombre}"
-                ),
-            )
+            self.bus.texto(f"Eliminando filas >> {documento.nombre}")
 
             # Elimnamos ....
             self._eliminar_filas(documento=documento)
 
             # Actualizamos el progreso
-            self.table_view.after(0, lambda v=i + 1: self.prosgress_bar.config(value=v))
+            self.bus.valor(i + 1)
 
         # finalizamos
-        self._finalizar_carga_gui()
+        self.bus.en_ui(self._finalizar_carga_gui)
 
     def _eliminar_seleccionados(self):
         """Eliminamos los archivos seleccionados"""
-
-        # verificamos que se hayan selecciados los documentos
-        if not self.documentos_seleccionados:
-            showwarning(
-                title="Advertencia",
-                message="Seleccione los documentos a copiar",
-                parent=self.master,
-            )
-            return
-
-        total_seleccinados = len(self.documentos_seleccionados)
-        # configuramos el progress, con el maximo de elementos encontrados
-        self.table_view.after(
-            0, lambda: self.prosgress_bar.config(maximum=total_seleccinados, value=0)
-        )
-        for i, documento in enumerate(self.documentos_seleccionados):
-            # actualizamos o mostramos el proceso en el label
-            self.table_view.after(
-                0,
-                lambda nombre=documento.nombre: self.lbl_progreso.config(
-                    text=f"Eliminando >> {nombre}"
-                ),
-            )
-
-            # Elimnamos ....
-            self._eliminar(documento=documento)
-
-            # Actualizamos el progreso
-            self.table_view.after(0, lambda v=i + 1: self.prosgress_bar.config(value=v))
-
-        # finalizamos
-        self._finalizar_carga_gui()
+        self._ejecutar_operacion_archivo(tipo=ELIMINAR, ruta_destino=None)
 
     def _eliminar_registros(self):
         """Eliminamos los archivos seleccionados"""
 
         # verificamos que se hayan selecciados los documentos
         if not self.documentos_seleccionados:
-            showwarning(
-                title="Advertencia",
-                message="Seleccione los documentos a copiar",
-                parent=self.master,
+            self.bus.en_ui(
+                lambda: showwarning(
+                    title="Advertencia",
+                    message="Seleccione los documentos a procesar",
+                    parent=self.master,
+                )
             )
             return
 
         total_seleccinados = len(self.documentos_seleccionados)
         # configuramos el progress, con el maximo de elementos encontrados
-        self.table_view.after(
-            0, lambda: self.prosgress_bar.config(maximum=total_seleccinados, value=0)
-        )
+        self.bus.maximo(total_seleccinados)
         for i, documento in enumerate(self.documentos_seleccionados):
             # actualizamos o mostramos el proceso en el label
-            self.table_view.after(
-                0,
-                lambda nombre=documento.nombre: self.lbl_progreso.config(
-                    text=f"Eliminando >> {nombre}"
-                ),
-            )
+            self.bus.texto(f"Eliminando >> {documento.nombre}")
 
             # Elimnamos ....
             self._eliminar_registro(documento=documento)
 
             # Actualizamos el progreso
-            self.table_view.after(0, lambda v=i + 1: self.prosgress_bar.config(value=v))
+            self.bus.valor(i + 1)
 
         # finalizamos
-        self._finalizar_carga_gui()
+        self.bus.en_ui(self._finalizar_carga_gui)
 
     def _mover_seleccionados(self):
         """Movemos los archivos seleccionados"""
-
+        self._ejecutar_operacion_archivo(tipo=MOVER, ruta_destino=self.path_move)
+
+    def _ejecutar_operacion_archivo(self, tipo: str, ruta_destino: str = None):
+        """
+        Copia, mueve o elimina los archivos de los documentos seleccionados en
+        paralelo con el ejecutor de operaciones de archivo. Al mover o eliminar
+        un archivo se elimina también su registro y su fila.
+        """
         # verificamos que se hayan selecciados los documentos
         if not self.documentos_seleccionados:
-            showwarning(
-                title="Advertencia",
-                message="Seleccione los documentos a mover",
-                parent=self.master,
+            self.bus.en_ui(
+                lambda: showwarning(
+                    title="Advertencia",
+                    message="Seleccione los documentos a procesar",
+                    parent=self.master,
+                )
             )
             return
 
-        total_seleccinados = len(self.documentos_seleccionados)
-        # configuramos el progress, con el maximo de elementos encontrados
-        self.table_view.after(
-            0, lambda: self.prosgress_bar.config(maximum=total_seleccinados, value=0)
-        )
-        for i, documento in enumerate(self.documentos_seleccionados):
-            # actualizamos o mostramos el proceso en el label
-            self.table_view.after(
-                0,
-                lambda nombre=documento.nombre: self.lbl_progreso.config(
-                    text=f"Moviendo >> {nombre} a >> {self.path_move}"
-                ),
-            )
-
-            # Copiamos ....
-            self._mover(documento=documento)
-
-            # Actualizamos el progreso
-            self.table_view.after(0, lambda v=i + 1: self.prosgress_bar.config(value=v))
-
-        # finalizamos
-        self._finalizar_carga_gui()
-
-    def _copiar(self, documento: Documento):
-        time.sleep(1)
-
-        if not exists(self.path_biblioteca):
-            showwarning(
-                title="Advertencia",
-                message=f"No existe o no se ha configurado la ubicacion de la bibllioteca: {self.path_biblioteca}",
-                parent=self.master,
+        if not self.path_biblioteca or not exists(self.path_biblioteca):
+            self.bus.en_ui(
+                lambda: showwarning(
+                    title="Advertencia",
+                    message=f"No existe o no se ha configurado la ubicacion de la bibllioteca: {self.path_biblioteca}",
+                    parent=self.master,
+                )
             )
             return
 
-        ruta_documento = generar_ruta_documento(
-            ruta_biblioteca=self.path_biblioteca,
-            id_documento=documento.id,
-            nombre_documento=f"{documento.nombre}.{documento.extension}",
-        )
-
-        if not exists(ruta_documento):
-            showwarning(
-                title="Advertencia",
-                message=f"No existe el documento en la ubicacion seleccionada: {ruta_documento}",
-                parent=self.master,
+        operaciones = []
+        for documento in self.documentos_seleccionados:
+            nombre_documento = f"{documento.nombre}.{documento.extension}"
+            operaciones.append(
+                OperacionArchivo(
+                    tipo=tipo,
+                    origen=generar_ruta_documento(
+                        ruta_biblioteca=self.path_biblioteca,
+                        id_documento=documento.id,
+                        nombre_documento=nombre_documento,
+                    ),
+                    destino=join(ruta_destino, nombre_documento) if ruta_destino else None,
+                    dato=documento,
+                )
             )
-            return
 
-        ruta_destino = join(self.path_copy, f"{documento.nombre}.{documento.extension}")
-
-        copiar_archivo(ruta_origen=ruta_documento, ruta_destino=ruta_destino)
-
-    def _mover(self, documento: Documento):
-        time.sleep(1)
+        total_seleccinados = len(operaciones)
+        textos = {COPIAR: "Copiando", MOVER: "Moviendo", ELIMINAR: "Eliminando"}
+        # configuramos el progress, con el maximo de elementos encontrados
+        self.bus.maximo(total_seleccinados)
 
-        if not exists(self.path_biblioteca):
-            showwarning(
-                title="Advertencia",
-                message=f"No existe o no se ha configurado la ubicacion de la bibllioteca: {self.path_biblioteca}",
-                parent=self.master,
-            )
-            return
+        def al_terminar(operacion: OperacionArchivo, terminadas: int):
+            documento: Documento = operacion.dato
+            # actualizamos o mostramos el proceso en el label
+            self.bus.texto(f"{textos[tipo]} >> {documento.nombre}")
+            # si el archivo salio de la biblioteca, eliminamos el registro y la fila
+            if operacion.ok and tipo != COPIAR and documento.eliminar():
+                self.bus.eliminar_fila(documento.id)
+            # Actualizamos el progreso
+            self.bus.valor(terminadas)
 
-        ruta_documento = generar_ruta_documento(
-            ruta_biblioteca=self.path_biblioteca,
-            id_documento=documento.id,
-            nombre_documento=f"{documento.nombre}.{documento.extension}",
+        resultado = obtener_ejecutor_archivos().ejecutar(
+            operaciones, cancelado=self._cancelado, al_terminar=al_terminar
         )
 
-        if not exists(ruta_documento):
-            showwarning(
-                title="Advertencia",
-                message=f"No existe el documento en la ubicacion seleccionada: {ruta_documento}",
-                parent=self.master,
-            )
-            return
-
-        ruta_destino = join(self.path_move, f"{documento.nombre}.{documento.extension}")
-
-        if mover_archivo(ruta_origen=ruta_documento, ruta_destino=ruta_destino):
-            # si la operacion fue en exito, eliminamos el registros de la base datos
-            if documento.eliminar():
-                # aqui eliminamos la fila de la tabla
-                self.table_view.after(
-                    0, lambda doc_id=documento.id: self._eliminar_fila_tabla(doc_id)
+        no_encontrados = [o.origen for o in resultado if o.error and not exists(o.origen)]
+        if no_encontrados:
+            self.bus.en_ui(
+                lambda: showwarning(
+                    title="Advertencia",
+                    message="No existen en la biblioteca los documentos:\n" + "\n".join(no_encontrados),
+                    parent=self.master,
                 )
-
-    def _eliminar(self, documento: Documento):
-        time.sleep(1)
-
-        if not exists(self.path_biblioteca):
-            showwarning(
-                title="Advertencia",
-                message=f"No existe o no se ha configurado la ubicacion de la bibllioteca: {self.path_biblioteca}",
-                parent=self.master,
             )
-            return
-
-        ruta_documento = generar_ruta_documento(
-            ruta_biblioteca=self.path_biblioteca,
-            id_documento=documento.id,
-            nombre_documento=f"{documento.nombre}.{documento.extension}",
-        )
 
-        if eliminar_archivo(ruta_destino=ruta_documento):
-            # si la operacion fue un exito, eliminamos el registro de la base de datos
-            if documento.eliminar():
-                # aqui eliminamos la fila de la tabla
-                self.table_view.after(
-                    0, lambda doc_id=documento.id: self._eliminar_fila_tabla(doc_id)
-                )
+        # finalizamos
+        self.bus.en_ui(self._finalizar_carga_gui)
 
     def _eliminar_registro(self, documento: Documento):
-        time.sleep(1)
-
         if documento.eliminar():
             # aqui eliminamos la fila de la tabla
-            self.table_view.after(0, lambda doc_id=documento.id: self._eliminar_fila_tabla(doc_id))
+            self.bus.eliminar_fila(documento.id)
 
     def _eliminar_filas(self, documento: Documento):
-        time.sleep(1)
-        self.table_view.after(0, lambda doc_id=documento.id: self._eliminar_fila_tabla(doc_id))
+        self.bus.eliminar_fila(documento.id)
 
     def _finalizar_carga_gui(self):
         self.table_view.autofit_columns()
         self.lbl_progreso.config(text="Proceso completado con exito!!!.")
 
-    def _eliminar_fila_tabla(self, id_documento: int):
-        fila: TableRow = self.map_id_fila.get(id_documento, None)
-        if fila is not None:
-            iid = fila.iid
-            self.table_view.delete_row(iid=iid)
-            # Limpiamos el mapeo
-            del self.map_id_fila[id_documento]
+    def _eliminar_filas_tabla(self, ids_documentos: List[int]):
+        iids = []
+        for id_documento in ids_documentos:
+            fila: FilaTabla = self.map_id_fila.pop(id_documento, None)
+            if fila is not None:
+                iids.append(fila.iid)
+        if iids:
+            self.table_view.delete_rows(iids=iids)
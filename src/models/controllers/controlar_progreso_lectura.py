@@ -0,0 +1,82 @@
+from typing import Any, Dict, Iterable, Optional
+
+from models.controllers.configuracion_controller import ConfiguracionController
+from models.daos.progreso_lectura_dao import ProgresoLecturaDAO
+
+
+class ControlarProgresoLectura:
+    """
+    Progreso de lectura de los documentos, guardado en la tabla `progreso_lectura`.
+
+    Los progresos de versiones anteriores, guardados como JSON en el archivo
+    de configuración, se importan una sola vez con `migrar_configuracion`.
+    """
+
+    def __init__(self, ruta_db: Optional[str] = None):
+        self._dao = ProgresoLecturaDAO(ruta_db=ruta_db)
+
+    def obtener_progresos(self, ids_documentos: Iterable[int]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna el progreso de los documentos dados que lo tienen, por su ID
+        en texto: {"pagina_actual", "en_lectura", "actualizado_en"}.
+        """
+        ids = [i for i in map(self._normalizar_id, ids_documentos) if i is not None]
+        if not ids:
+            return {}
+        return {
+            str(id_documento): {
+                "pagina_actual": fila["pagina_actual"],
+                "en_lectura": bool(fila["en_lectura"]),
+                "actualizado_en": fila["actualizado_en"] or "",
+            }
+            for id_documento, fila in self._dao.obtener_por_documentos(ids).items()
+        }
+
+    def guardar_progreso(self, id_documento: int, pagina_actual: int) -> bool:
+        id_normalizado = self._normalizar_id(id_documento)
+        try:
+            pagina_normalizada = max(0, int(pagina_actual))
+        except (TypeError, ValueError):
+            return False
+        if id_normalizado is None:
+            return False
+        return self._dao.guardar(id_normalizado, pagina_normalizada, pagina_normalizada > 0)
+
+    def eliminar_progreso(self, id_documento: int) -> bool:
+        id_normalizado = self._normalizar_id(id_documento)
+        if id_normalizado is None:
+            return False
+        return self._dao.eliminar(params=(id_normalizado,))
+
+    def migrar_configuracion(self, config: Optional[ConfiguracionController] = None) -> int:
+        """
+        Importa los progresos guardados en el archivo de configuración a la
+        base de datos y los borra de él.
+
+        Returns:
+            int: Número de progresos importados.
+        """
+        config = config or ConfiguracionController()
+        progresos = config.obtener_progresos_lectura()
+        if not progresos:
+            return 0
+
+        importados = self._dao.insertar_lote(
+            (
+                int(id_documento),
+                datos["pagina_actual"],
+                datos["en_lectura"],
+                datos["actualizado_en"] or None,
+            )
+            for id_documento, datos in progresos.items()
+        )
+        if importados is None:
+            return 0
+        config.eliminar_progresos_lectura()
+        return importados
+
+    def _normalizar_id(self, id_documento: int) -> Optional[int]:
+        try:
+            return int(id_documento)
+        except (TypeError, ValueError):
+            return None
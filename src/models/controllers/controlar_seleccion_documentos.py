@@ -1,12 +1,14 @@
 import threading
-import time
 import datetime
 import logging
-from pathlib import Path
 from os.path import isfile
-from typing import List
-from utilities.auxiliar import hash_sha256, obtener_datos_documento
+from typing import Dict, List, Optional
+from utilities.auxiliar import hash_sha256
+from utilities.bus_progreso import BusProgreso
+from utilities.hashing import EstadisticasHash, MotorHash, ResultadoHash, obtener_cache_hash
 from models.entities.documento import Documento
+from models.dtos.trabajo_importacion_dto import TrabajoImportacionDTO
+from models.controllers.configuracion_controller import ConfiguracionController
 from ttkbootstrap import Label, Progressbar
 from ttkbootstrap.tableview import Tableview
 
@@ -18,7 +20,9 @@ class ControlarSeleccionDocumentos:
     """Controlador para gestionar la selección y carga de documentos en la tabla.
 
     Esta clase procesa archivos seleccionados y los carga en la interfaz,
-    generando metadatos como hash, tamaño, fechas, etc.
+    generando metadatos como hash, tamaño, fechas, etc. Por cada archivo
+    registra un `TrabajoImportacionDTO` en `trabajos` (clave: ruta), que es lo
+    que consumen después la importación y las operaciones en masa.
     """
 
     def __init__(
@@ -27,6 +31,7 @@ class ControlarSeleccionDocumentos:
         progress_bar: Progressbar,
         table_view: Tableview,
         lista_archivos: List[str],
+        trabajos: Optional[Dict[str, TrabajoImportacionDTO]] = None,
     ) -> None:
         """Inicializa el controlador de selección.
 
@@ -35,12 +40,29 @@ class ControlarSeleccionDocumentos:
             progress_bar: Widget Progressbar para la barra de progreso
             table_view: Widget Tableview donde se mostrarán los archivos
             lista_archivos: Lista de rutas de archivos a procesar
+            trabajos: Registro compartido de trabajos de importación por ruta
         """
         self.label_progreso: Label = label_progreso
         self.progress_bar: Progressbar = progress_bar
         self.table_view: Tableview = table_view
         self.lista_archivos: List[str] = lista_archivos
+        self.trabajos: Dict[str, TrabajoImportacionDTO] = trabajos if trabajos is not None else {}
         self.formato: str = "%Y-%m-%d %H:%M:%S"
+        self.motor_hash: MotorHash = MotorHash(
+            num_hilos=self._obtener_hilos_hash(), cache=obtener_cache_hash()
+        )
+        # progreso del hilo de trabajo hacia la interfaz
+        self.bus = BusProgreso(table_view, label=label_progreso, progress_bar=progress_bar)
+        # filas generadas que la interfaz todavía no ha insertado
+        self._filas_pendientes: List[list] = []
+        self._lock_filas = threading.Lock()
+
+    def _obtener_hilos_hash(self) -> Optional[int]:
+        try:
+            return ConfiguracionController().obtener_hilos_hash()
+        except Exception as e:
+            logger.error(f"Error al obtener configuración: {e}")
+            return None
 
     def cargar_archivos_seleccionados(self) -> None:
         """Inicia un hilo de trabajo para cargar los archivos seleccionados.
@@ -53,6 +75,7 @@ class ControlarSeleccionDocumentos:
                 hilo_trabajo = threading.Thread(
                     target=self._procesar_y_cargar_archivos, daemon=True
                 )
+                self.bus.iniciar()
                 hilo_trabajo.start()
             except Exception as e:
                 logger.error(f"Error al iniciar carga de archivos: {e}")
@@ -61,104 +84,127 @@ class ControlarSeleccionDocumentos:
     def _procesar_y_cargar_archivos(self) -> None:
         """Procesa y carga todos los archivos en el hilo de trabajo.
 
-        Genera filas con metadatos para cada archivo y las inserta
-        en la tabla de forma segura para la GUI.
+        Los hashes se calculan en paralelo con `MotorHash`; cada fila se genera
+        a medida que termina su archivo y la interfaz inserta de una vez las
+        filas que se acumulan entre dos vaciados del bus de progreso.
         """
-
-        # 1. Configurar el progreso inicial
-        total_archivos = len(self.lista_archivos)
-        self.table_view.after(0, lambda: self.progress_bar.config(maximum=total_archivos, value=0))
-
-        for i, ruta_archivo in enumerate(self.lista_archivos):
-            try:
-                # Actualizar la etiqueta (DELEGADO a la GUI)
-                self.table_view.after(
-                    0, lambda r=ruta_archivo: self.label_progreso.config(text=f"Procesando: {r}")
-                )
-
-                fila = self._generar_fila(ruta_archivo=ruta_archivo)
-
-                if fila:
-                    # Insertar la fila en el hilo de trabajo
-                    self.insertar_fila(values=fila)
-
-                # Actualizar el progreso (DELEGADO a la GUI)
-                self.table_view.after(0, lambda v=i + 1: self.progress_bar.config(value=v))
-            except Exception as e:
-                logger.error(f"Error procesando archivo {ruta_archivo}: {e}")
-
-        # Finalizar (DELEGADO a la GUI)
-        self.table_view.after(0, self._finalizar_carga_gui)
+        try:
+            # 1. Configurar el progreso inicial
+            rutas = [ruta for ruta in self.lista_archivos if isfile(ruta)]
+            self.bus.maximo(len(rutas))
+
+            for resultado in self.motor_hash.hashear(rutas, al_completar=self._notificar_progreso):
+                try:
+                    trabajo = self._generar_trabajo(
+                        ruta_archivo=resultado.ruta, hash_archivo=resultado.hash
+                    )
+
+                    if trabajo:
+                        self.trabajos[trabajo.ruta] = trabajo
+                        self.insertar_fila(values=self._generar_fila(trabajo))
+                except Exception as e:
+                    logger.error(f"Error procesando archivo {resultado.ruta}: {e}")
+
+            # Finalizar (DELEGADO a la GUI)
+            self.bus.en_ui(self._finalizar_carga_gui)
+        finally:
+            self.bus.terminar()
+
+    def _notificar_progreso(self, resultado: ResultadoHash, estadisticas: EstadisticasHash):
+        """Publica el rendimiento del archivo y del lote en el bus de progreso."""
+        self.bus.texto(
+            f"Procesando: {resultado.ruta} ({resultado.mb_por_segundo:.1f} MB/s) "
+            f"- Total: {estadisticas.archivos_procesados}/{estadisticas.total_archivos} "
+            f"a {estadisticas.mb_por_segundo:.1f} MB/s"
+        )
+        self.bus.valor(estadisticas.archivos_procesados)
 
     def insertar_fila(self, values: List) -> None:
-        """Inserta una fila en la tabla de forma segura para la GUI.
+        """Encola una fila para insertarla en la tabla desde el hilo de la GUI.
 
         Args:
             values: Lista de valores para la fila
         """
-        try:
-            time.sleep(1.5)  # Simular operación I/O
-            # Usamos 'after' para ejecutar en el hilo principal de Tkinter
-            self.table_view.after(0, self._insertar_en_gui, values)
-        except Exception as e:
-            logger.error(f"Error al insertar fila: {e}")
-
-    def _insertar_en_gui(self, values: list):
-        """Método seguro para la GUI: inserta la fila en la Tableview."""
-        self.table_view.insert_row(values=values)
+        with self._lock_filas:
+            self._filas_pendientes.append(values)
+            primera = len(self._filas_pendientes) == 1
+        if primera:
+            self.bus.en_ui(self._insertar_en_gui)
+
+    def _insertar_en_gui(self):
+        """Método seguro para la GUI: inserta las filas pendientes con una sola recarga."""
+        with self._lock_filas:
+            filas, self._filas_pendientes = self._filas_pendientes, []
+        for values in filas:
+            self.table_view.insert_row(values=values, reload=False)
+        if filas:
+            self.table_view.load_table_data()
 
     def _finalizar_carga_gui(self):
         """Método seguro para la GUI: ajusta la tabla y actualiza el mensaje final."""
         self.table_view.autofit_columns()
         self.label_progreso.config(text="Carga de archivos completada.")
 
-    def _generar_fila(self, ruta_archivo: str) -> list:
+    def _generar_trabajo(
+        self, ruta_archivo: str, hash_archivo: Optional[str] = None
+    ) -> Optional[TrabajoImportacionDTO]:
         """
-        Genera una lista de valores para una fila de la tabla a partir de una ruta de archivo.
+        Crea el trabajo de importación de un archivo con un único `stat`.
 
         Args:
             ruta_archivo (str): La ruta completa al archivo a procesar.
+            hash_archivo (Optional[str]): Hash ya calculado; si es None se calcula aquí.
 
         Returns:
-            list: Una lista con los datos del archivo para ser insertada en la tabla,
-                  o una lista vacía si el archivo no es válido o no se puede procesar.
+            Optional[TrabajoImportacionDTO]: El trabajo, o None si el archivo no
+            es válido o no se puede procesar.
         """
         if not isfile(ruta_archivo):
-            return []
+            return None
 
-        # 1. Obtener datos básicos y hash del archivo.
-        hash_archivo = hash_sha256(archivo=ruta_archivo)
-        datos_documento = obtener_datos_documento(ruta_origen=ruta_archivo)
+        if hash_archivo is None:
+            hash_archivo = hash_sha256(archivo=ruta_archivo)
+        if not hash_archivo:
+            return None
 
-        if not hash_archivo or not datos_documento:
-            return []
+        trabajo = TrabajoImportacionDTO.desde_ruta(ruta=ruta_archivo, hash=hash_archivo)
+        if trabajo is None:
+            return None
 
-        # 2. Verificar si el documento ya existe en la base de datos.
+        # Verificar si el documento ya existe en la base de datos.
         documento = Documento(
-            nombre=datos_documento['nombre_sin_extension'],
-            extension=datos_documento['extension'],
-            hash=hash_archivo,
-            tamano=datos_documento['tamano_bytes'],
+            nombre=trabajo.nombre,
+            extension=trabajo.extension,
+            hash=trabajo.hash,
+            tamano=trabajo.tamano,
         )
-        estado_existencia = "🔴 Ya Existe" if documento.existe() else "🟢 No Existe"
+        trabajo.existe_en_biblioteca = documento.existe()
+        return trabajo
 
-        # 3. Obtener metadatos de fecha y construir la fila.
-        info_archivo = Path(ruta_archivo).stat()
-        fecha_creacion = datetime.datetime.fromtimestamp(info_archivo.st_ctime).strftime(
-            self.formato
-        )
-        fecha_modificacion = datetime.datetime.fromtimestamp(info_archivo.st_mtime).strftime(
+    def _generar_fila(self, trabajo: TrabajoImportacionDTO) -> list:
+        """
+        Genera la lista de valores de la fila de la tabla para un trabajo.
+
+        Args:
+            trabajo (TrabajoImportacionDTO): El archivo seleccionado.
+
+        Returns:
+            list: Los datos del archivo para ser insertados en la tabla.
+        """
+        estado_existencia = "🔴 Ya Existe" if trabajo.existe_en_biblioteca else "🟢 No Existe"
+        fecha_creacion = datetime.datetime.fromtimestamp(trabajo.ctime).strftime(self.formato)
+        fecha_modificacion = datetime.datetime.fromtimestamp(trabajo.mtime).strftime(
             self.formato
         )
 
         return [
-            f"📗 {datos_documento['nombre_con_extension']}",
-            self._formatear_tamano(int(datos_documento['tamano_bytes'])),
+            f"📗 {trabajo.nombre_con_extension}",
+            self._formatear_tamano(trabajo.tamano),
             fecha_creacion,
             fecha_modificacion,
             estado_existencia,
-            hash_archivo,
-            ruta_archivo,
+            trabajo.hash,
+            trabajo.ruta,
         ]
 
     def _formatear_tamano(self, bytes: int) -> str:
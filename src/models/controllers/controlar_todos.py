@@ -1,11 +1,19 @@
 import threading
-import time
 import logging
 from os.path import join
 from ttkbootstrap import Label, Progressbar
 from ttkbootstrap.tableview import Tableview
-from typing import Dict
-from utilities.auxiliar import copiar_archivo, mover_archivo, eliminar_archivo, papelera_archivo
+from typing import Dict, Optional, Tuple
+from models.dtos.trabajo_importacion_dto import TrabajoImportacionDTO
+from utilities.bus_progreso import BusProgreso
+from utilities.operaciones_archivo import (
+    COPIAR,
+    ELIMINAR,
+    MOVER,
+    PAPELERA,
+    OperacionArchivo,
+    obtener_ejecutor_archivos,
+)
 from pathlib import Path
 
 # Configurar logging
@@ -17,15 +25,25 @@ class ControlarTodos:
 
     Gestiona operaciones de copia, movimiento, eliminación y envío a papelera
     para todos los archivos cargados en la tabla de una manera segura y asíncrona.
-    Las operaciones se ejecutan en hilos separados para no bloquear la interfaz.
+    Las operaciones se ejecutan en hilos separados para no bloquear la interfaz,
+    repartidas en paralelo por el ejecutor de operaciones de archivo.
     """
 
+    # Textos por operación: (en curso, finalizado, error)
+    TEXTOS: Dict[str, Tuple[str, str, str]] = {
+        COPIAR: ("📋 Copiando", "✅ Copia completada exitosamente", "❌ Error en la copia"),
+        MOVER: ("➡️ Moviendo", "✅ Movimiento completado exitosamente", "❌ Error en el movimiento"),
+        ELIMINAR: ("🗑️ Eliminando", "✅ Eliminación completada", "❌ Error en la eliminación"),
+        PAPELERA: ("♻️ Papelera", "✅ Envío a papelera completado", "❌ Error en papelera"),
+    }
+
     def __init__(
         self,
         label_progreso: Label,
         progress_bar: Progressbar,
         table_view: Tableview,
         ruta_destino: str,
+        trabajos: Optional[Dict[str, TrabajoImportacionDTO]] = None,
     ) -> None:
         """Inicializa el controlador de operaciones en masa.
 
@@ -34,13 +52,20 @@ class ControlarTodos:
             progress_bar: Widget Progressbar para la visualización del progreso
             table_view: Widget Tableview que contiene los documentos
             ruta_destino: Ruta de destino para operaciones de copia/movimiento
+            trabajos: Trabajos de importación registrados en la selección, por ruta
         """
         self.label_progreso: Label = label_progreso
         self.progress_bar: Progressbar = progress_bar
         self.table_view: Tableview = table_view
-        self.dict_data: Dict[str, tuple] = {}
+        self.dict_data: Dict[str, TrabajoImportacionDTO] = {}
+        self.trabajos: Dict[str, TrabajoImportacionDTO] = trabajos if trabajos is not None else {}
         self.ruta_destino: str = ruta_destino
-        logger.info("ControlarTodos inicializado")
+        self._cancelado: threading.Event = threading.Event()
+        # progreso de los hilos de trabajo hacia la interfaz
+        self.bus: BusProgreso = BusProgreso(
+            table_view, label=label_progreso, progress_bar=progress_bar, table_view=table_view
+        )
+        logger.info(f"{type(self).__name__} inicializado")
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Funciones Públicas
@@ -52,11 +77,7 @@ class ControlarTodos:
         Crea un hilo demonio para procesar la copia de archivos sin bloquear
         la interfaz de usuario. Actualiza la barra de progreso durante la operación.
         """
-        hilo_trabajo: threading.Thread = threading.Thread(
-            target=self._procesar_y_copiar_todos, daemon=True
-        )
-        hilo_trabajo.start()
-        logger.debug("Hilo de copia iniciado")
+        self._iniciar(COPIAR)
 
     def mover_todos(self) -> None:
         """Inicia el proceso asíncrono de movimiento de todos los archivos.
@@ -64,11 +85,7 @@ class ControlarTodos:
         Crea un hilo demonio para procesar el movimiento de archivos sin bloquear
         la interfaz de usuario. Los archivos se mueven a ruta_destino.
         """
-        hilo_trabajo: threading.Thread = threading.Thread(
-            target=self._procesar_y_mover_todos, daemon=True
-        )
-        hilo_trabajo.start()
-        logger.debug("Hilo de movimiento iniciado")
+        self._iniciar(MOVER)
 
     def eliminar_todos(self) -> None:
         """Inicia el proceso asíncrono de eliminación de todos los archivos.
@@ -76,11 +93,7 @@ class ControlarTodos:
         Crea un hilo demonio para procesar la eliminación de archivos sin bloquear
         la interfaz de usuario. Los archivos se eliminarán permanentemente.
         """
-        hilo_trabajo: threading.Thread = threading.Thread(
-            target=self._procesar_y_eliminar_todos, daemon=True
-        )
-        hilo_trabajo.start()
-        logger.debug("Hilo de eliminación iniciado")
+        self._iniciar(ELIMINAR)
 
     def papelera_todos(self) -> None:
         """Inicia el proceso asíncrono de envío a papelera de todos los archivos.
@@ -88,21 +101,38 @@ class ControlarTodos:
         Crea un hilo demonio para procesar el envío a papelera sin bloquear
         la interfaz de usuario. Los archivos se pueden recuperar desde papelera.
         """
-        hilo_trabajo: threading.Thread = threading.Thread(
-            target=self._procesar_y_papelera_todos, daemon=True
-        )
-        hilo_trabajo.start()
-        logger.debug("Hilo de papelera iniciado")
+        self._iniciar(PAPELERA)
+
+    def cancelar(self) -> None:
+        """Cancela la operación en curso.
+
+        Las copias en curso se detienen sin dejar archivos a medias y los
+        archivos aún no procesados se quedan en la tabla.
+        """
+        self._cancelado.set()
+        logger.debug("Cancelación solicitada")
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Funciones Privadas - Carga de Datos
     # └────────────────────────────────────────────────────────────┘
 
+    def _incluir(self, trabajo: TrabajoImportacionDTO) -> bool:
+        """Indica si el trabajo de una fila entra en la operación en masa.
+
+        Args:
+            trabajo: Trabajo de importación registrado para la fila
+
+        Returns:
+            True para todos los archivos de la tabla
+        """
+        return True
+
     def _load_data(self) -> None:
         """Carga los datos de la tabla en el diccionario interno.
 
-        Itera sobre todos los elementos visibles en la tabla y almacena
-        sus valores en dict_data para procesamiento posterior.
+        Itera sobre todos los elementos visibles en la tabla y almacena en
+        dict_data el `TrabajoImportacionDTO` registrado para la ruta de cada uno
+        que acepte `_incluir`.
         """
         try:
             items = self.table_view.view.get_children()
@@ -112,324 +142,121 @@ class ControlarTodos:
                 for item in items:
                     values = self.table_view.view.item(item, 'values')
                     if values:
-                        self.dict_data[item] = values
+                        trabajo = self.trabajos.get(values[6])
+                        if trabajo is None:
+                            logger.warning(f"Sin trabajo de importación para: {values[6]}")
+                            continue
+                        if self._incluir(trabajo):
+                            self.dict_data[item] = trabajo
                 logger.debug(f"Datos cargados: {len(self.dict_data)} elementos")
             else:
                 logger.warning("No hay elementos en la tabla")
 
         except Exception as e:
             logger.error(f"Error al cargar datos de tabla: {e}")
-            self.label_progreso.config(text="❌ Error al cargar datos")
+            self.bus.texto("❌ Error al cargar datos")
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Funciones Privadas - Procesamiento en Hilo
     # └────────────────────────────────────────────────────────────┘
 
-    def _procesar_y_copiar_todos(self) -> None:
-        """Procesa la copia de todos los archivos en un hilo separado.
-
-        Itera sobre todos los archivos cargados, copia cada uno a la ruta
-        de destino especificada, actualiza la UI con el progreso actual.
-        Maneja errores de forma robusta continuando con el siguiente archivo.
-        """
-        try:
-            # Cargamos los datos
-            self._load_data()
-
-            if not self.dict_data:
-                logger.warning("No hay archivos para copiar")
-                self.label_progreso.config(text="❌ No hay archivos seleccionados")
-                return
-
-            total_datos = len(self.dict_data)
-            logger.info(f"Iniciando copia de {total_datos} archivos")
-
-            # Configuramos el proceso inicial
-            self.table_view.after(0, lambda: self.progress_bar.config(maximum=total_datos, value=0))
-
-            # Recorremos los datos y procesamos cada uno
-            for i, item in enumerate(self.dict_data.keys()):
-                try:
-                    fila = self.dict_data[item]
-                    nombre_archivo = fila[6] if len(fila) > 6 else str(item)
-
-                    self.table_view.after(
-                        0,
-                        lambda r=nombre_archivo: self.label_progreso.config(
-                            text=f"📋 Copiando: {r}"
-                        ),
-                    )
-
-                    # Realizamos la copia
-                    self._copiar(ruta_origen=nombre_archivo)
-
-                    # Actualizamos la barra de progreso
-                    self.table_view.after(0, lambda v=i + 1: self.progress_bar.config(value=v))
-
-                    logger.debug(f"✓ Copiado: {nombre_archivo}")
-
-                except Exception as e:
-                    logger.error(f"Error copiando archivo {item}: {e}")
-                    continue
-
-            # Finalizamos el proceso
-            self._proceso_finalizado(tipo_proceso="✅ Copia completada exitosamente")
-            logger.info("Proceso de copia finalizado")
-
-        except Exception as e:
-            logger.error(f"Error en proceso de copia masiva: {e}")
-            self.label_progreso.config(text="❌ Error en la copia")
-            self.progress_bar.config(value=0)
-
-    def _procesar_y_mover_todos(self) -> None:
-        """Procesa el movimiento de todos los archivos en un hilo separado.
-
-        Itera sobre todos los archivos cargados, mueve cada uno a la ruta
-        de destino especificada, actualiza la UI y elimina las filas de la tabla.
-        """
-        try:
-            # Cargamos los datos
-            self._load_data()
-
-            if not self.dict_data:
-                logger.warning("No hay archivos para mover")
-                self.label_progreso.config(text="❌ No hay archivos seleccionados")
-                return
-
-            total_datos = len(self.dict_data)
-            logger.info(f"Iniciando movimiento de {total_datos} archivos")
-
-            # Configuramos el proceso inicial
-            self.table_view.after(0, lambda: self.progress_bar.config(maximum=total_datos, value=0))
-
-            # Recorremos los datos y procesamos cada uno
-            for i, item in enumerate(self.dict_data.keys()):
-                try:
-                    fila = self.dict_data[item]
-                    nombre_archivo = fila[6] if len(fila) > 6 else str(item)
-
-                    self.table_view.after(
-                        0,
-                        lambda r=nombre_archivo: self.label_progreso.config(
-                            text=f"➡️ Moviendo: {r}"
-                        ),
-                    )
-
-                    # Realizamos el movimiento
-                    self._mover(ruta_origen=nombre_archivo)
-
-                    # Actualizamos la barra de progreso
-                    self.table_view.after(0, lambda v=i + 1: self.progress_bar.config(value=v))
-
-                    # Eliminamos la fila del archivo
-                    self.table_view.after(0, lambda it=item: self.table_view.view.delete(it))
+    def _iniciar(self, tipo: str) -> None:
+        """Lanza `_procesar` para la operación en un hilo demonio.
 
-                    logger.debug(f"✓ Movido: {nombre_archivo}")
-
-                except Exception as e:
-                    logger.error(f"Error moviendo archivo {item}: {e}")
-                    continue
-
-            # Finalizamos el proceso
-            self._proceso_finalizado(tipo_proceso="✅ Movimiento completado exitosamente")
-            logger.info("Proceso de movimiento finalizado")
-
-        except Exception as e:
-            logger.error(f"Error en proceso de movimiento masivo: {e}")
-            self.label_progreso.config(text="❌ Error en el movimiento")
-            self.progress_bar.config(value=0)
-
-    def _procesar_y_eliminar_todos(self) -> None:
-        """Procesa la eliminación de todos los archivos en un hilo separado.
-
-        Itera sobre todos los archivos cargados, elimina cada uno permanentemente,
-        actualiza la UI y elimina las filas de la tabla.
+        Args:
+            tipo: Operación a realizar (copiar, mover, papelera o eliminar)
         """
-        try:
-            # Cargamos los datos
-            self._load_data()
-
-            if not self.dict_data:
-                logger.warning("No hay archivos para eliminar")
-                self.label_progreso.config(text="❌ No hay archivos seleccionados")
-                return
-
-            total_datos = len(self.dict_data)
-            logger.info(f"Iniciando eliminación de {total_datos} archivos")
-
-            # Configuramos el proceso inicial
-            self.table_view.after(0, lambda: self.progress_bar.config(maximum=total_datos, value=0))
-
-            # Recorremos los datos y procesamos cada uno
-            for i, item in enumerate(self.dict_data.keys()):
-                try:
-                    fila = self.dict_data[item]
-                    nombre_archivo = fila[6] if len(fila) > 6 else str(item)
-
-                    self.table_view.after(
-                        0,
-                        lambda r=nombre_archivo: self.label_progreso.config(
-                            text=f"🗑️ Eliminando: {r}"
-                        ),
-                    )
-
-                    # Realizamos la eliminación
-                    self._eliminar(ruta_origen=nombre_archivo)
-
-                    # Actualizamos la barra de progreso
-                    self.table_view.after(0, lambda v=i + 1: self.progress_bar.config(value=v))
-
-                    # Eliminamos la fila del archivo
-                    self.table_view.after(0, lambda it=item: self.table_view.view.delete(it))
-
-                    logger.debug(f"✓ Eliminado: {nombre_archivo}")
-
-                except Exception as e:
-                    logger.error(f"Error eliminando archivo {item}: {e}")
-                    continue
-
-            # Finalizamos el proceso
-            self._proceso_finalizado(tipo_proceso="✅ Eliminación completada")
-            logger.info("Proceso de eliminación finalizado")
+        hilo_trabajo: threading.Thread = threading.Thread(
+            target=self._procesar, args=(tipo,), daemon=True
+        )
+        self.bus.iniciar()
+        hilo_trabajo.start()
+        logger.debug(f"Hilo de {tipo} iniciado en {type(self).__name__}")
 
-        except Exception as e:
-            logger.error(f"Error en proceso de eliminación masiva: {e}")
-            self.label_progreso.config(text="❌ Error en la eliminación")
-            self.progress_bar.config(value=0)
+    def _procesar(self, tipo: str) -> None:
+        """Procesa una operación sobre los archivos cargados en un hilo separado.
 
-    def _procesar_y_papelera_todos(self) -> None:
-        """Procesa el envío a papelera de todos los archivos en un hilo separado.
+        Encola una operación por archivo en el ejecutor de operaciones de
+        archivo compartido, que las reparte entre sus hilos, y publica el
+        avance en el bus de progreso. Un archivo que falla no detiene al resto.
 
-        Itera sobre todos los archivos cargados, envía cada uno a papelera,
-        actualiza la UI y elimina las filas de la tabla.
+        Args:
+            tipo: Operación a realizar (copiar, mover, papelera o eliminar)
         """
+        en_curso, finalizado, error = self.TEXTOS[tipo]
         try:
             # Cargamos los datos
             self._load_data()
 
             if not self.dict_data:
-                logger.warning("No hay archivos para enviar a papelera")
-                self.label_progreso.config(text="❌ No hay archivos seleccionados")
+                logger.warning(f"No hay archivos para {tipo}")
+                self.bus.texto("❌ No hay archivos seleccionados")
                 return
 
-            total_datos = len(self.dict_data)
-            logger.info(f"Iniciando envío a papelera de {total_datos} archivos")
+            operaciones = [
+                OperacionArchivo(
+                    tipo=tipo,
+                    origen=trabajo.ruta,
+                    destino=self._ruta_destino(trabajo.ruta) if tipo in (COPIAR, MOVER) else None,
+                    dato=item,
+                )
+                for item, trabajo in self.dict_data.items()
+            ]
+            total_datos = len(operaciones)
+            logger.info(f"Iniciando {tipo} de {total_datos} archivos")
 
             # Configuramos el proceso inicial
-            self.table_view.after(0, lambda: self.progress_bar.config(maximum=total_datos, value=0))
-
-            # Recorremos los datos y procesamos cada uno
-            for i, item in enumerate(self.dict_data.keys()):
-                try:
-                    fila = self.dict_data[item]
-                    nombre_archivo = fila[6] if len(fila) > 6 else str(item)
-
-                    self.table_view.after(
-                        0,
-                        lambda r=nombre_archivo: self.label_progreso.config(
-                            text=f"♻️ Papelera: {r}"
-                        ),
-                    )
-
-                    # Realizamos envío a papelera
-                    self._papelera(ruta_origen=nombre_archivo)
+            self.bus.maximo(total_datos)
+            self.bus.texto(f"{en_curso} {total_datos} archivos...")
 
-                    # Actualizamos la barra de progreso
-                    self.table_view.after(0, lambda v=i + 1: self.progress_bar.config(value=v))
-
-                    # Eliminamos la fila del archivo
-                    self.table_view.after(0, lambda it=item: self.table_view.view.delete(it))
-
-                    logger.debug(f"✓ Enviado a papelera: {nombre_archivo}")
-
-                except Exception as e:
-                    logger.error(f"Error enviando a papelera {item}: {e}")
-                    continue
+            resultado = obtener_ejecutor_archivos().ejecutar(
+                operaciones,
+                cancelado=self._cancelado,
+                al_terminar=self._al_terminar_operacion,
+            )
 
             # Finalizamos el proceso
-            self._proceso_finalizado(tipo_proceso="✅ Envío a papelera completado")
-            logger.info("Proceso de papelera finalizado")
-
-        except Exception as e:
-            logger.error(f"Error en proceso de papelera masiva: {e}")
-            self.label_progreso.config(text="❌ Error en papelera")
-            self.progress_bar.config(value=0)
-
-    # ┌────────────────────────────────────────────────────────────┐
-    # │ Funciones Privadas - Operaciones de Archivo
-    # └────────────────────────────────────────────────────────────┘
-
-    def _papelera(self, ruta_origen: str) -> None:
-        """Envía un archivo a la papelera del sistema.
-
-        Args:
-            ruta_origen: Ruta completa del archivo a enviar a papelera
+            fallidos = sum(1 for operacion in resultado if operacion.error)
+            if self._cancelado.is_set():
+                finalizado = "⛔ Operación cancelada"
+            elif fallidos:
+                finalizado = f"{finalizado} ({fallidos} con errores)"
+            self.bus.en_ui(lambda: self._proceso_finalizado(tipo_proceso=finalizado))
+            logger.info(f"Proceso de {tipo} finalizado")
 
-        Raises:
-            Exception: Si ocurre un error durante la operación de papelera
-        """
-        try:
-            time.sleep(2)
-            papelera_archivo(ruta_origen=ruta_origen)
-            logger.debug(f"Archivo enviado a papelera: {ruta_origen}")
         except Exception as e:
-            logger.error(f"Error al enviar a papelera {ruta_origen}: {e}")
-            raise
+            logger.error(f"Error en proceso de {tipo} masivo: {e}")
+            self.bus.texto(error)
+            self.bus.valor(0)
+        finally:
+            self.bus.terminar()
 
-    def _eliminar(self, ruta_origen: str) -> None:
-        """Elimina un archivo permanentemente.
+    def _al_terminar_operacion(self, operacion: OperacionArchivo, terminadas: int) -> None:
+        """Muestra el avance y, si el archivo salió de su ubicación, quita su fila.
 
         Args:
-            ruta_origen: Ruta completa del archivo a eliminar
-
-        Raises:
-            Exception: Si ocurre un error durante la eliminación
+            operacion: Operación terminada (bien, mal o cancelada)
+            terminadas: Número de operaciones terminadas hasta ahora
         """
-        try:
-            time.sleep(2)
-            eliminar_archivo(ruta_destino=ruta_origen)
-            logger.debug(f"Archivo eliminado: {ruta_origen}")
-        except Exception as e:
-            logger.error(f"Error al eliminar {ruta_origen}: {e}")
-            raise
-
-    def _copiar(self, ruta_origen: str) -> None:
-        """Copia un archivo a la ruta de destino especificada.
+        en_curso = self.TEXTOS[operacion.tipo][0]
+        self.bus.texto(f"{en_curso}: {operacion.origen}")
+        self.bus.valor(terminadas)
+        if operacion.ok:
+            logger.debug(f"✓ {operacion.tipo}: {operacion.origen}")
+            if operacion.tipo != COPIAR:
+                # Eliminamos la fila del archivo
+                self.bus.eliminar_fila(operacion.dato)
+
+    def _ruta_destino(self, ruta_origen: str) -> str:
+        """Ruta de destino de un archivo al copiarlo o moverlo.
 
         Args:
-            ruta_origen: Ruta completa del archivo a copiar
+            ruta_origen: Ruta completa del archivo
 
-        Raises:
-            Exception: Si ocurre un error durante la copia
+        Returns:
+            La ruta en ruta_destino con el mismo nombre de archivo
         """
-        try:
-            time.sleep(2)
-            nombre_archivo = Path(ruta_origen).name
-            ruta_dest = join(self.ruta_destino, nombre_archivo)
-            copiar_archivo(ruta_origen=ruta_origen, ruta_destino=ruta_dest)
-            logger.debug(f"Archivo copiado: {ruta_origen} → {ruta_dest}")
-        except Exception as e:
-            logger.error(f"Error al copiar {ruta_origen}: {e}")
-            raise
-
-    def _mover(self, ruta_origen: str) -> None:
-        """Mueve un archivo a la ruta de destino especificada.
-
-        Args:
-            ruta_origen: Ruta completa del archivo a mover
-
-        Raises:
-            Exception: Si ocurre un error durante el movimiento
-        """
-        try:
-            time.sleep(2)
-            nombre_archivo = Path(ruta_origen).name
-            ruta_dest = join(self.ruta_destino, nombre_archivo)
-            mover_archivo(ruta_origen=ruta_origen, ruta_destino=ruta_dest)
-            logger.debug(f"Archivo movido: {ruta_origen} → {ruta_dest}")
-        except Exception as e:
-            logger.error(f"Error al mover {ruta_origen}: {e}")
-            raise
+        return join(self.ruta_destino, Path(ruta_origen).name)
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Funciones Privadas - Finalización
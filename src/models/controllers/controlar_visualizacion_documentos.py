@@ -1,6 +1,6 @@
 from ttkbootstrap.tableview import Tableview
 from ttkbootstrap import Treeview, Button, Entry, Combobox, StringVar
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Set, Tuple
 from os.path import join, exists
 from tkinter.messagebox import showerror, showwarning
 from tkinter import Menu
@@ -23,6 +23,23 @@ from utilities.auxiliar import (
 )
 
 
+# Por árbol de organización: (prefijo del iid, mapa de documentos por
+# organización, método de `Consulta` que lee los documentos de una)
+ARBOLES_ORGANIZACION: Dict[str, Tuple[str, str, str]] = {
+    "Colecciones": ("col", "map_documentos_por_coleccion", "get_documentos_por_coleccion"),
+    "Grupos": ("gpo", "map_documentos_por_grupo", "get_documentos_por_grupo"),
+    "Categorías": ("cat", "map_documentos_por_categoria", "get_documentos_por_categoria"),
+    "Etiquetas": ("eti", "map_documentos_por_etiqueta", "get_documentos_por_etiqueta"),
+    "Palabras Clave": (
+        "pc",
+        "map_documentos_por_palabra_clave",
+        "get_documentos_por_palabra_clave",
+    ),
+}
+# Hijo provisional de las organizaciones con documentos aún sin cargar
+SUFIJO_NODO_PENDIENTE = "_pendiente"
+
+
 class ControlarVisualizacionDocumentos:
     """
     Controlador para la lógica de la vista principal de documentos.
@@ -70,6 +87,9 @@ class ControlarVisualizacionDocumentos:
         self.map_palabras_clave: Dict[int, PalabraClave] = {}
         self.map_documentos_por_palabra_clave: Dict[int, List[Dict[str, Any]]] = {}
         self.map_documentos: Dict[int, Dict[str, Any]] = {}
+        # Documentos mostrados en la tabla, que siguen en `map_documentos`
+        # aunque se colapse su organización
+        self.ids_documentos_tabla: Set[int] = set()
         self.tree_contextual_nombre: str = ""
 
         # --- Inicialización ---
@@ -123,6 +143,17 @@ class ControlarVisualizacionDocumentos:
             tree_palabras_clave.bind("<Double-1>", self.on_doble_clic_tree_palabra_clave)
             tree_palabras_clave.bind("<Button-3>", lambda event: self._on_click_derecho_tree(event, "Palabras Clave"))
 
+        # Documentos de cada organización: se cargan al expandir y se liberan al colapsar
+        for nombre_tree in ARBOLES_ORGANIZACION:
+            tree = self.map_treeviews.get(nombre_tree)
+            if tree:
+                tree.bind(
+                    "<<TreeviewOpen>>", lambda event, n=nombre_tree: self._on_expandir_organizacion(n)
+                )
+                tree.bind(
+                    "<<TreeviewClose>>", lambda event, n=nombre_tree: self._on_colapsar_organizacion(n)
+                )
+
         # Vincular evento de doble clic en la tabla de documentos
         self.table_view.view.bind("<Double-1>", self.on_doble_clic_tabla_documentos)
         self.table_view.view.bind("<Button-3>", self._on_click_derecho_tabla)
@@ -232,6 +263,8 @@ class ControlarVisualizacionDocumentos:
     def recargar_datos(self):
         """Vuelve a cargar todos los datos de los treeviews."""
         self._cargar_datos_iniciales()
+        # Las organizaciones vuelven a estar sin cargar
+        self._liberar_documentos(list(self.map_documentos))
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Lógica de Carga de Datos (Pestaña Colecciones)
@@ -247,35 +280,21 @@ class ControlarVisualizacionDocumentos:
         for item in tree_colecciones.get_children():
             tree_colecciones.delete(item)
 
-        # Obtener datos
+        # Obtener datos: las colecciones y cuántos documentos tiene cada una
         self.colecciones = self.consulta.get_colecciones()
         self.map_colecciones = {col.id: col for col in self.colecciones}
-
-        # Poblar Treeview con colecciones y sus documentos
-        if self.colecciones:
-            for coleccion in self.colecciones:
-                # Obtener documentos para esta colección
-                documentos = self.consulta.get_documentos_por_coleccion(coleccion.id)
-                self.map_documentos_por_coleccion[coleccion.id] = documentos
-
-                # Insertar la colección como nodo padre
-                iid_coleccion = f"col_{coleccion.id}"
-                tree_colecciones.insert(
-                    "",
-                    "end",
-                    iid=iid_coleccion,
-                    text=f" {self.icon_coleccion} {coleccion.nombre} ({len(documentos)})",
-                )
-
-                # Insertar los documentos como hijos
-                for doc in documentos:
-                    # El iid debe ser único en todo el Treeview
-                    iid_documento = f"{iid_coleccion}_doc_{doc['id']}"
-                    tree_colecciones.insert(
-                        iid_coleccion, "end", iid=iid_documento, text=f"  📄 {doc['nombre']}"
-                    )
-                    # Guardar el documento en el mapa global para acceso rápido
-                    self.map_documentos[doc['id']] = doc
+        self.map_documentos_por_coleccion = {}
+        conteos = self.consulta.get_conteo_documentos_por_organizacion("coleccion")
+
+        # Poblar Treeview solo con las colecciones; los documentos se cargan al expandir
+        for coleccion in self.colecciones:
+            self._insertar_nodo_organizacion(
+                tree_colecciones,
+                "",
+                f"col_{coleccion.id}",
+                f" {self.icon_coleccion} {coleccion.nombre}",
+                conteos.get(coleccion.id, 0),
+            )
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Lógica de Carga de Datos (Pestaña Grupos)
@@ -294,37 +313,24 @@ class ControlarVisualizacionDocumentos:
         # Obtener datos
         self.grupos = self.consulta.get_grupos()
         self.map_grupos = {g.id: g for g in self.grupos}
-
-        # Poblar Treeview con grupos y sus documentos
-        if self.grupos:
-            for grupo in self.grupos:
-                # Obtener documentos para este grupo
-                documentos = self.consulta.get_documentos_por_grupo(grupo.id)
-                self.map_documentos_por_grupo[grupo.id] = documentos
-
-                # Insertar el grupo como nodo padre
-                iid_grupo = f"gpo_{grupo.id}"
-                tree_grupos.insert(
-                    "",
-                    "end",
-                    iid=iid_grupo,
-                    text=f" {self.icon_grupo} {grupo.nombre} ({len(documentos)})",
-                )
-
-                # Insertar los documentos como hijos
-                for doc in documentos:
-                    iid_documento = f"{iid_grupo}_doc_{doc['id']}"
-                    tree_grupos.insert(
-                        iid_grupo, "end", iid=iid_documento, text=f"  📄 {doc['nombre']}"
-                    )
-                    self.map_documentos[doc['id']] = doc
+        self.map_documentos_por_grupo = {}
+        conteos = self.consulta.get_conteo_documentos_por_organizacion("grupo")
+
+        for grupo in self.grupos:
+            self._insertar_nodo_organizacion(
+                tree_grupos,
+                "",
+                f"gpo_{grupo.id}",
+                f" {self.icon_grupo} {grupo.nombre}",
+                conteos.get(grupo.id, 0),
+            )
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Lógica de Carga de Datos (Pestaña Categorías)
     # └────────────────────────────────────────────────────────────┘
 
     def _cargar_categorias(self):
-        """Carga las categorías y sus documentos de forma jerárquica."""
+        """Carga las categorías de forma jerárquica; sus documentos, al expandirlas."""
         tree_categorias = self.map_treeviews.get("Categorías")
         if not tree_categorias:
             return
@@ -334,6 +340,8 @@ class ControlarVisualizacionDocumentos:
 
         self.categorias = self.consulta.get_categorias()
         self.map_categorias = {cat.id: cat for cat in self.categorias}
+        self.map_documentos_por_categoria = {}
+        conteos = self.consulta.get_conteo_documentos_por_organizacion("categoria")
 
         # Organizar categorías en un diccionario de hijos por padre
         nodos_hijos = {}
@@ -347,29 +355,15 @@ class ControlarVisualizacionDocumentos:
         def anadir_nodos(parent_id, parent_iid):
             if parent_id in nodos_hijos:
                 for cat in sorted(nodos_hijos[parent_id], key=lambda x: x.nombre):
-                    documentos = self.consulta.get_documentos_por_categoria(cat.id)
-                    self.map_documentos_por_categoria[cat.id] = documentos
-
                     iid_categoria = f"cat_{cat.id}"
-                    tree_categorias.insert(
+                    self._insertar_nodo_organizacion(
+                        tree_categorias,
                         parent_iid,
-                        "end",
-                        iid=iid_categoria,
-                        text=f" {self.icon_categoria} {cat.nombre} ({len(documentos)})",
-                        open=False,  # Iniciar cerradas
+                        iid_categoria,
+                        f" {self.icon_categoria} {cat.nombre}",
+                        conteos.get(cat.id, 0),
                     )
 
-                    # Insertar documentos como hijos de la categoría
-                    for doc in documentos:
-                        iid_documento = f"{iid_categoria}_doc_{doc['id']}"
-                        tree_categorias.insert(
-                            iid_categoria,
-                            "end",
-                            iid=iid_documento,
-                            text=f"  📄 {doc['nombre']}",
-                        )
-                        self.map_documentos[doc['id']] = doc
-
                     # Llamada recursiva para las subcategorías
                     anadir_nodos(cat.id, iid_categoria)
 
@@ -393,30 +387,17 @@ class ControlarVisualizacionDocumentos:
         # Obtener datos
         self.etiquetas = self.consulta.get_etiquetas()
         self.map_etiquetas = {e.id: e for e in self.etiquetas}
-
-        # Poblar Treeview con etiquetas y sus documentos
-        if self.etiquetas:
-            for etiqueta in self.etiquetas:
-                # Obtener documentos para esta etiqueta
-                documentos = self.consulta.get_documentos_por_etiqueta(etiqueta.id)
-                self.map_documentos_por_etiqueta[etiqueta.id] = documentos
-
-                # Insertar la etiqueta como nodo padre
-                iid_etiqueta = f"eti_{etiqueta.id}"
-                tree_etiquetas.insert(
-                    "",
-                    "end",
-                    iid=iid_etiqueta,
-                    text=f" {self.icon_etiqueta} {etiqueta.nombre} ({len(documentos)})",
-                )
-
-                # Insertar los documentos como hijos
-                for doc in documentos:
-                    iid_documento = f"{iid_etiqueta}_doc_{doc['id']}"
-                    tree_etiquetas.insert(
-                        iid_etiqueta, "end", iid=iid_documento, text=f"  📄 {doc['nombre']}"
-                    )
-                    self.map_documentos[doc['id']] = doc
+        self.map_documentos_por_etiqueta = {}
+        conteos = self.consulta.get_conteo_documentos_por_organizacion("etiqueta")
+
+        for etiqueta in self.etiquetas:
+            self._insertar_nodo_organizacion(
+                tree_etiquetas,
+                "",
+                f"eti_{etiqueta.id}",
+                f" {self.icon_etiqueta} {etiqueta.nombre}",
+                conteos.get(etiqueta.id, 0),
+            )
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Lógica de Carga de Datos (Pestaña Palabras Clave)
@@ -435,30 +416,109 @@ class ControlarVisualizacionDocumentos:
         # Obtener datos
         self.palabras_clave = self.consulta.get_palabras_clave()
         self.map_palabras_clave = {pc.id: pc for pc in self.palabras_clave}
+        self.map_documentos_por_palabra_clave = {}
+        conteos = self.consulta.get_conteo_documentos_por_organizacion("palabra_clave")
+
+        for pc in self.palabras_clave:
+            self._insertar_nodo_organizacion(
+                tree_palabras_clave,
+                "",
+                f"pc_{pc.id}",
+                f" {self.icon_palabra_clave} {pc.palabra}",
+                conteos.get(pc.id, 0),
+            )
 
-        # Poblar Treeview con palabras clave y sus documentos
-        if self.palabras_clave:
-            for pc in self.palabras_clave:
-                # Obtener documentos para esta palabra clave
-                documentos = self.consulta.get_documentos_por_palabra_clave(pc.id)
-                self.map_documentos_por_palabra_clave[pc.id] = documentos
-
-                # Insertar la palabra clave como nodo padre
-                iid_pc = f"pc_{pc.id}"
-                tree_palabras_clave.insert(
-                    "",
-                    "end",
-                    iid=iid_pc,
-                    text=f" {self.icon_palabra_clave} {pc.palabra} ({len(documentos)})",
-                )
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Carga perezosa de los documentos de cada organización
+    # └────────────────────────────────────────────────────────────┘
 
-                # Insertar los documentos como hijos
-                for doc in documentos:
-                    iid_documento = f"{iid_pc}_doc_{doc['id']}"
-                    tree_palabras_clave.insert(
-                        iid_pc, "end", iid=iid_documento, text=f"  📄 {doc['nombre']}"
-                    )
-                    self.map_documentos[doc['id']] = doc
+    def _insertar_nodo_organizacion(
+        self, tree: Treeview, parent_iid: str, iid: str, texto: str, total: int
+    ):
+        """
+        Inserta el nodo de una organización con su número de documentos. Si
+        tiene documentos, se le añade un hijo provisional para que se pueda
+        expandir; los documentos se insertan en `_on_expandir_organizacion`.
+        """
+        tree.insert(parent_iid, "end", iid=iid, text=f"{texto} ({total})", open=False)
+        if total:
+            tree.insert(iid, "end", iid=f"{iid}{SUFIJO_NODO_PENDIENTE}", text="  …")
+
+    def _documentos_de_organizacion(self, nombre_tree: str, id_organizacion: int):
+        """
+        Devuelve los documentos de una organización, consultándolos solo si
+        no se habían cargado ya.
+        """
+        _, atributo_mapa, getter = ARBOLES_ORGANIZACION[nombre_tree]
+        mapa = getattr(self, atributo_mapa)
+        if id_organizacion not in mapa:
+            documentos = getattr(self.consulta, getter)(id_organizacion)
+            mapa[id_organizacion] = documentos
+            for doc in documentos:
+                self.map_documentos[doc['id']] = doc
+        return mapa[id_organizacion]
+
+    def _nodo_organizacion_enfocado(self, nombre_tree: str):
+        """Retorna (tree, iid, id) de la organización enfocada, o None."""
+        tree = self.map_treeviews.get(nombre_tree)
+        if not tree:
+            return None
+        iid = tree.focus()
+        prefijo = ARBOLES_ORGANIZACION[nombre_tree][0]
+        if not iid or not iid.startswith(f"{prefijo}_") or "_doc_" in iid:
+            return None
+        try:
+            return tree, iid, int(iid.split("_")[1])
+        except ValueError:
+            return None
+
+    def _on_expandir_organizacion(self, nombre_tree: str):
+        """
+        Al expandir una organización sustituye su hijo provisional por sus
+        documentos, delante de las subcategorías si las hay.
+        """
+        nodo = self._nodo_organizacion_enfocado(nombre_tree)
+        if nodo is None:
+            return
+        tree, iid, id_organizacion = nodo
+        pendiente = f"{iid}{SUFIJO_NODO_PENDIENTE}"
+        if not tree.exists(pendiente):
+            return
+        tree.delete(pendiente)
+        for posicion, doc in enumerate(self._documentos_de_organizacion(nombre_tree, id_organizacion)):
+            tree.insert(iid, posicion, iid=f"{iid}_doc_{doc['id']}", text=f"  📄 {doc['nombre']}")
+
+    def _on_colapsar_organizacion(self, nombre_tree: str):
+        """
+        Al colapsar una organización libera los nodos y los datos de sus
+        documentos y vuelve a dejar el hijo provisional.
+        """
+        nodo = self._nodo_organizacion_enfocado(nombre_tree)
+        if nodo is None:
+            return
+        tree, iid, id_organizacion = nodo
+        hijos_documento = [hijo for hijo in tree.get_children(iid) if "_doc_" in hijo]
+        if not hijos_documento:
+            return
+        tree.delete(*hijos_documento)
+        tree.insert(iid, 0, iid=f"{iid}{SUFIJO_NODO_PENDIENTE}", text="  …")
+        documentos = getattr(self, ARBOLES_ORGANIZACION[nombre_tree][1]).pop(id_organizacion, None)
+        if documentos:
+            self._liberar_documentos([doc['id'] for doc in documentos])
+
+    def _liberar_documentos(self, ids_documentos: List[int]):
+        """
+        Quita de `map_documentos` los documentos indicados que ya no estén
+        en la tabla ni en ninguna organización cargada.
+        """
+        candidatos = set(ids_documentos) - self.ids_documentos_tabla
+        for _, atributo_mapa, _ in ARBOLES_ORGANIZACION.values():
+            if not candidatos:
+                return
+            for documentos in getattr(self, atributo_mapa).values():
+                candidatos.difference_update(doc['id'] for doc in documentos)
+        for id_documento in candidatos:
+            self.map_documentos.pop(id_documento, None)
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Métodos Auxiliares
@@ -467,6 +527,9 @@ class ControlarVisualizacionDocumentos:
     def _poblar_tabla(self, lista_documentos: List[Dict[str, Any]]):
         """Limpia y puebla la tabla con una lista de documentos."""
         self.table_view.delete_rows()
+        ids_anteriores = self.ids_documentos_tabla
+        self.ids_documentos_tabla = {doc['id'] for doc in lista_documentos}
+        self._liberar_documentos(list(ids_anteriores))
         if not lista_documentos:
             return
 
@@ -528,7 +591,7 @@ class ControlarVisualizacionDocumentos:
 
         if tipo == "col":
             # Se hizo doble clic en una colección
-            documentos = self.map_documentos_por_coleccion.get(id_item, [])
+            documentos = self._documentos_de_organizacion("Colecciones", id_item)
             self._poblar_tabla(documentos)
         elif tipo == "doc":
             # El ID del documento es la última parte del iid
@@ -556,7 +619,7 @@ class ControlarVisualizacionDocumentos:
 
         if tipo == "gpo":
             # Se hizo doble clic en un grupo
-            documentos = self.map_documentos_por_grupo.get(id_item, [])
+            documentos = self._documentos_de_organizacion("Grupos", id_item)
             self._poblar_tabla(documentos)
         elif tipo == "doc":
             # Se hizo doble clic en un documento
@@ -584,7 +647,7 @@ class ControlarVisualizacionDocumentos:
 
         if tipo == "cat":
             # Se hizo doble clic en una categoría
-            documentos = self.map_documentos_por_categoria.get(id_item, [])
+            documentos = self._documentos_de_organizacion("Categorías", id_item)
             self._poblar_tabla(documentos)
         elif tipo == "doc":
             # Se hizo doble clic en un documento
@@ -612,7 +675,7 @@ class ControlarVisualizacionDocumentos:
 
         if tipo == "eti":
             # Se hizo doble clic en una etiqueta
-            documentos = self.map_documentos_por_etiqueta.get(id_item, [])
+            documentos = self._documentos_de_organizacion("Etiquetas", id_item)
             self._poblar_tabla(documentos)
         elif tipo == "doc":
             # Se hizo doble clic en un documento
@@ -640,7 +703,7 @@ class ControlarVisualizacionDocumentos:
 
         if tipo == "pc":
             # Se hizo doble clic en una palabra clave
-            documentos = self.map_documentos_por_palabra_clave.get(id_item, [])
+            documentos = self._documentos_de_organizacion("Palabras Clave", id_item)
             self._poblar_tabla(documentos)
         elif tipo == "doc":
             # Se hizo doble clic en un documento
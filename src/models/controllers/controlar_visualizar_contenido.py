@@ -76,15 +76,26 @@ class ControlarVisualizarContenido:
             showwarning("Búsqueda vacía", "Por favor, ingrese un término para buscar.")
             return
 
-        resultados = Consulta().buscar_en_contenido(termino=termino)
-        self._poblar_treeview(resultados)
+        self._poblar_treeview(self._buscar(termino))
+
+    def _buscar(self, termino: str) -> List[Dict[str, Any]]:
+        """
+        Une los capítulos y secciones con las páginas cuyo texto contiene el
+        término; de las páginas se muestra el fragmento que coincide.
+        """
+        consulta = Consulta()
+        resultados = consulta.buscar_en_contenido(termino=termino)
+        for pagina in consulta.buscar_en_texto_paginas(termino=termino):
+            pagina["tipo"] = "Página"
+            pagina["titulo_item"] = pagina.pop("fragmento")
+            resultados.append(pagina)
+        return resultados
 
     def recargar_resultados(self):
         """Recarga sin advertencias; limpia si no hay término activo."""
         termino = self.ent_buscar.get().strip()
         if termino:
-            resultados = Consulta().buscar_en_contenido(termino=termino)
-            self._poblar_treeview(resultados)
+            self._poblar_treeview(self._buscar(termino))
             return
 
         for item in self.tree_view.get_children():
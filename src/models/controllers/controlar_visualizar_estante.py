@@ -1,7 +1,7 @@
 import os
 import math
 import threading
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from ttkbootstrap import Frame, StringVar, Entry, Combobox, Button, Label, Separator
 from ttkbootstrap.scrolled import ScrolledFrame
 from tkinter.messagebox import showerror, showinfo, showwarning, askyesno
@@ -12,17 +12,21 @@ from PIL import Image, ImageTk
 from models.entities.consulta import Consulta
 from models.entities.favorito import Favorito
 from models.entities.documento import Documento
+from models.daos.documento_dao import DocumentoDAO
 from models.controllers.configuracion_controller import ConfiguracionController
 from models.controllers.controlar_comentarios import ControlarComentarios
+from models.controllers.controlar_progreso_lectura import ControlarProgresoLectura
 from models.controllers.controlar_menu_contextual_documento import (
     ControlarMenuContextualDocumento,
 )
 from utilities.auxiliar import (
-    crear_directorio_id_documento,
     abrir_archivo,
+    directorio_id_documento,
     generar_ruta_documento,
     copiar_archivo,
+    ruta_documento_biblioteca,
 )
+from utilities.cache_portadas import SolicitudPortada, obtener_cache_portadas
 from utilities.configuracion import DIRECTORIO_TEMPORAL
 from views.components.resizable_input_dialog import ask_resizable_string
 from views.components.resizable_text_dialog import ask_resizable_text
@@ -32,8 +36,13 @@ from ttkbootstrap.constants import *
 ANCHO_PORTADA = 100
 ANCHO_PORTADA_LISTA = 56
 ALTO_PORTADA_LISTA = 84
+
+# El relleno de la caché de portadas se lanza una sola vez por proceso
+_relleno_portadas_iniciado = threading.Event()
 PORTADAS_POR_REPISA = 8
 DOCUMENTOS_POR_PAGINA = 40  # Número de documentos por página
+RETARDO_BUSQUEDA_MS = 200  # Espera tras la última tecla antes de buscar
+MIN_CARACTERES_PREFIJO = 2  # Una sola letra coincide con casi todo el índice
 
 
 class ControlarVisualizarEstante:
@@ -106,14 +115,19 @@ class ControlarVisualizarEstante:
         # Variables de paginación
         self.pagina_actual = 1
         self.total_documentos = 0
+        # (nombre, id) del último documento de cada página ya mostrada: la
+        # página siguiente se pide por clave, sin OFFSET
+        self._claves_paginas: Dict[int, Tuple[str, int]] = {}
+        # Página siguiente leída en segundo plano: (página, documentos)
+        self._pagina_precargada: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+        # Cambia con cada búsqueda para descartar precargas de búsquedas anteriores
+        self._generacion_paginacion = 0
         self.campo_busqueda_actual = ""
         self.termino_busqueda_actual = ""
         self.modo_visualizacion_actual = "cuadricula"
         self.tipo_organizacion_actual: Optional[str] = None
         self.id_organizacion_actual: Optional[int] = None
         self.nombre_organizacion_actual: str = ""
-        self.documentos_organizacion: List[Dict[str, Any]] = []
-        self.documentos_filtrados_organizacion: List[Dict[str, Any]] = []
         self.tipo_organizacion_seleccionado: Optional[str] = None
         self.map_organizaciones: Dict[str, int] = {}
         self._map_organizacion_getters: Dict[str, Callable[[], List[Any]]] = {
@@ -123,21 +137,16 @@ class ControlarVisualizarEstante:
             "etiqueta": self.consulta.get_etiquetas,
             "palabra_clave": self.consulta.get_palabras_clave,
         }
-        self._map_documentos_getters: Dict[str, Callable[[int], List[Dict[str, Any]]]] = {
-            "coleccion": self.consulta.get_documentos_por_coleccion,
-            "grupo": self.consulta.get_documentos_por_grupo,
-            "categoria": self.consulta.get_documentos_por_categoria,
-            "etiqueta": self.consulta.get_documentos_por_etiqueta,
-            "palabra_clave": self.consulta.get_documentos_por_palabra_clave,
-        }
 
         # Almacenamiento de referencias de imágenes para evitar que el recolector de basura las elimine
         self._referencias_imagenes = []
         self.documento_seleccionado_contextual = None
-        self.progresos_lectura = self.config.obtener_progresos_lectura()
-        self._depurar_progresos_lectura_huerfanos()
+        # progresos y comentarios de los documentos de la página mostrada
+        self.progreso_lectura = ControlarProgresoLectura()
+        self.progresos_lectura: Dict[str, Dict[str, Any]] = {}
         self.comentarios = ControlarComentarios()
         self._comentarios_ids = set()
+        self._busqueda_programada: Optional[str] = None
         self.menu_ops = ControlarMenuContextualDocumento(
             master=self.master,
             get_documento_data=self._get_documento_contextual,
@@ -216,6 +225,7 @@ class ControlarVisualizarEstante:
         """Vincula los eventos de los widgets a los métodos del controlador."""
         self.btn_buscar.config(command=self.on_buscar)
         self.ent_buscar.bind("<Return>", self.on_buscar)
+        self.ent_buscar.bind("<KeyRelease>", self._on_escribir_busqueda)
         if self.cbx_modo_visualizacion:
             self.cbx_modo_visualizacion.bind(
                 "<<ComboboxSelected>>", self.on_cambiar_modo_visualizacion
@@ -237,12 +247,40 @@ class ControlarVisualizarEstante:
         self.campo_busqueda_actual = "todo"
         self.termino_busqueda_actual = ""
         self.pagina_actual = 1
+        self._reiniciar_paginacion()
         self._guardar_estado_busqueda_estante(campo_db="todo", termino_busqueda="")
         self.total_documentos = self.consulta.contar_resultados_busqueda(campo="todo", termino="")
         self._mostrar_pagina_actual()
 
+    def _on_escribir_busqueda(self, event=None):
+        """
+        Búsqueda mientras se escribe: se lanza cuando el usuario deja de
+        teclear durante `RETARDO_BUSQUEDA_MS` y el término ha cambiado.
+        Mientras la última palabra tenga menos de `MIN_CARACTERES_PREFIJO`
+        letras solo se busca al pulsar Enter.
+        """
+        if event is not None and event.keysym in ("Return", "KP_Enter"):
+            return
+        if self._busqueda_programada is not None:
+            self.master.after_cancel(self._busqueda_programada)
+        self._busqueda_programada = self.master.after(
+            RETARDO_BUSQUEDA_MS, self._ejecutar_busqueda_programada
+        )
+
+    def _ejecutar_busqueda_programada(self):
+        self._busqueda_programada = None
+        termino = self.var_buscar.get().strip()
+        if termino == self.termino_busqueda_actual:
+            return
+        if termino and len(termino.split()[-1]) < MIN_CARACTERES_PREFIJO:
+            return
+        self.on_buscar()
+
     def on_buscar(self, event=None):
         """Maneja el evento de búsqueda."""
+        if self._busqueda_programada is not None:
+            self.master.after_cancel(self._busqueda_programada)
+            self._busqueda_programada = None
         termino_busqueda = self.var_buscar.get().strip()
         campo_seleccionado = self.cbx_campos.get()
         campo_db = self.MAPA_CAMPO_UI_A_DB.get(campo_seleccionado, "todo")
@@ -263,18 +301,8 @@ class ControlarVisualizarEstante:
         self.campo_busqueda_actual = campo_db
         self.termino_busqueda_actual = termino_busqueda
         self.pagina_actual = 1
-        if self._tiene_filtro_organizacion():
-            self._actualizar_documentos_filtrados_organizacion()
-            self._guardar_estado_busqueda_estante(
-                campo_db=campo_db,
-                termino_busqueda=termino_busqueda,
-            )
-            self._mostrar_pagina_actual()
-            return
-
-        self.total_documentos = self.consulta.contar_resultados_busqueda(
-            campo=campo_db, termino=termino_busqueda
-        )
+        self._reiniciar_paginacion()
+        self._actualizar_total_documentos()
         self._guardar_estado_busqueda_estante(
             campo_db=campo_db,
             termino_busqueda=termino_busqueda,
@@ -374,7 +402,9 @@ class ControlarVisualizarEstante:
         Renderiza los documentos en el ScrolledFrame según el modo de visualización.
         """
         self._limpiar_estante_visual()
-        self._comentarios_ids = set(self.comentarios.obtener_comentarios().keys())
+        ids_documentos = [doc["id"] for doc in lista_documentos or []]
+        self.progresos_lectura = self.progreso_lectura.obtener_progresos(ids_documentos)
+        self._comentarios_ids = self.comentarios.ids_con_comentario(ids_documentos)
 
         if not lista_documentos:
             Label(self.scroll_frame, text="No se encontraron documentos.", bootstyle="secondary").pack(
@@ -394,6 +424,7 @@ class ControlarVisualizarEstante:
 
     def _mostrar_documentos_cuadricula(self, lista_documentos):
         ruta_portadas = self.config.obtener_ubicacion_portadas()
+        ruta_biblioteca = self.config.obtener_ubicacion_biblioteca()
 
         # Contenedor principal dentro del ScrolledFrame
         main_container = Frame(self.scroll_frame)
@@ -434,17 +465,17 @@ class ControlarVisualizarEstante:
             )
             ToolTip(frame_portada, text=tooltip_text, bootstyle=(INFO, INVERSE))
 
-            ruta_portada_miniatura = os.path.join(
-                crear_directorio_id_documento(ruta_portadas, id_documento),
-                f"{id_documento}_miniatura.png",
-            )
-
             # Placeholder inicial mientras carga
             lbl_imagen = Label(frame_portada, text="⌛", font=("Helvetica", 16))
 
             # Añadir a la lista de tareas para el hilo
             tareas_carga.append(
-                (ruta_portada_miniatura, lbl_imagen, ANCHO_PORTADA, int(ANCHO_PORTADA * 1.5))
+                (
+                    _solicitud_portada_documento(doc, ruta_biblioteca, ruta_portadas),
+                    lbl_imagen,
+                    ANCHO_PORTADA,
+                    int(ANCHO_PORTADA * 1.5),
+                )
             )
 
             lbl_imagen.pack(pady=(0, 5))
@@ -495,6 +526,7 @@ class ControlarVisualizarEstante:
 
     def _mostrar_documentos_lista(self, lista_documentos):
         ruta_portadas = self.config.obtener_ubicacion_portadas()
+        ruta_biblioteca = self.config.obtener_ubicacion_biblioteca()
 
         main_container = Frame(self.scroll_frame)
         main_container.pack(fill=BOTH, expand=True, padx=10, pady=10)
@@ -560,13 +592,9 @@ class ControlarVisualizarEstante:
             )
             ToolTip(fila, text=tooltip_text, bootstyle=(INFO, INVERSE))
 
-            ruta_portada_miniatura = os.path.join(
-                crear_directorio_id_documento(ruta_portadas, id_documento),
-                f"{id_documento}_miniatura.png",
-            )
             tareas_carga.append(
                 (
-                    ruta_portada_miniatura,
+                    _solicitud_portada_documento(doc, ruta_biblioteca, ruta_portadas),
                     lbl_imagen,
                     ANCHO_PORTADA_LISTA,
                     ALTO_PORTADA_LISTA,
@@ -590,27 +618,106 @@ class ControlarVisualizarEstante:
 
     def _mostrar_pagina_actual(self):
         """Muestra la página actual de documentos."""
-        if self._tiene_filtro_organizacion():
-            offset = (self.pagina_actual - 1) * DOCUMENTOS_POR_PAGINA
-            documentos_pagina = self.documentos_filtrados_organizacion[
-                offset : offset + DOCUMENTOS_POR_PAGINA
-            ]
-            self._mostrar_documentos_en_estante(documentos_pagina)
-            self._actualizar_controles_paginacion()
-            return
-
         if not self.campo_busqueda_actual:
             self._cargar_estante()
             return
-        offset = (self.pagina_actual - 1) * DOCUMENTOS_POR_PAGINA
-        documentos_pagina = self.consulta.buscar_en_estante(
+        documentos_pagina = self._tomar_pagina_precargada(self.pagina_actual)
+        if documentos_pagina is None:
+            documentos_pagina = self._consultar_pagina(self.pagina_actual)
+        if documentos_pagina:
+            ultimo = documentos_pagina[-1]
+            self._claves_paginas[self.pagina_actual] = (ultimo["nombre"], ultimo["id"])
+        self._mostrar_documentos_en_estante(documentos_pagina)
+        self._actualizar_controles_paginacion()
+        self._precargar_pagina(self.pagina_actual + 1)
+
+    def _consultar_pagina(self, pagina: int) -> List[Dict[str, Any]]:
+        """
+        Lee una página de la búsqueda actual (y de la organización
+        seleccionada), por clave a partir del último documento de la página
+        anterior cuando se conoce.
+        """
+        return self.consulta.buscar_en_estante(
             campo=self.campo_busqueda_actual,
             termino=self.termino_busqueda_actual,
             limit=DOCUMENTOS_POR_PAGINA,
-            offset=offset,
+            offset=(pagina - 1) * DOCUMENTOS_POR_PAGINA,
+            despues_de=self._claves_paginas.get(pagina - 1),
+            tipo_organizacion=self.tipo_organizacion_actual,
+            id_organizacion=self.id_organizacion_actual,
+        )
+
+    def _actualizar_total_documentos(self):
+        """Cuenta los documentos de la búsqueda y la organización actuales."""
+        self.total_documentos = self.consulta.contar_resultados_busqueda(
+            campo=self.campo_busqueda_actual or "todo",
+            termino=self.termino_busqueda_actual,
+            tipo_organizacion=self.tipo_organizacion_actual,
+            id_organizacion=self.id_organizacion_actual,
         )
-        self._mostrar_documentos_en_estante(documentos_pagina)
-        self._actualizar_controles_paginacion()
+
+    def _reiniciar_paginacion(self):
+        """Olvida las claves de página y la precarga de la búsqueda anterior."""
+        self._claves_paginas = {}
+        self._pagina_precargada = None
+        self._generacion_paginacion += 1
+
+    def _tomar_pagina_precargada(self, pagina: int) -> Optional[List[Dict[str, Any]]]:
+        precargada = self._pagina_precargada
+        if precargada is None or precargada[0] != pagina:
+            return None
+        self._pagina_precargada = None
+        return precargada[1]
+
+    def _precargar_pagina(self, pagina: int):
+        """
+        Lee en segundo plano la página siguiente y encarga sus portadas, para
+        que pasar de página no tenga que esperar a la base de datos.
+        """
+        total_paginas = (self.total_documentos + DOCUMENTOS_POR_PAGINA - 1) // DOCUMENTOS_POR_PAGINA
+        if pagina > total_paginas:
+            return
+        generacion = self._generacion_paginacion
+        despues_de = self._claves_paginas.get(pagina - 1)
+        campo, termino = self.campo_busqueda_actual, self.termino_busqueda_actual
+        tipo_organizacion, id_organizacion = (
+            self.tipo_organizacion_actual,
+            self.id_organizacion_actual,
+        )
+        ruta_biblioteca = self.config.obtener_ubicacion_biblioteca()
+        ruta_portadas = self.config.obtener_ubicacion_portadas()
+        if self.modo_visualizacion_actual == "lista":
+            tamano = (ANCHO_PORTADA_LISTA, ALTO_PORTADA_LISTA)
+        else:
+            tamano = (ANCHO_PORTADA, int(ANCHO_PORTADA * 1.5))
+
+        def trabajar():
+            try:
+                documentos = self.consulta.buscar_en_estante(
+                    campo=campo,
+                    termino=termino,
+                    limit=DOCUMENTOS_POR_PAGINA,
+                    offset=(pagina - 1) * DOCUMENTOS_POR_PAGINA,
+                    despues_de=despues_de,
+                    tipo_organizacion=tipo_organizacion,
+                    id_organizacion=id_organizacion,
+                )
+            except Exception as e:
+                print(f"Error al precargar la página {pagina}: {e}")
+                return
+            self.master.after(0, self._guardar_pagina_precargada, generacion, pagina, documentos)
+            cache = obtener_cache_portadas()
+            if cache is not None:
+                for doc in documentos:
+                    cache.solicitar(
+                        _solicitud_portada_documento(doc, ruta_biblioteca, ruta_portadas), tamano
+                    )
+
+        threading.Thread(target=trabajar, name="precarga-estante", daemon=True).start()
+
+    def _guardar_pagina_precargada(self, generacion: int, pagina: int, documentos):
+        if generacion == self._generacion_paginacion:
+            self._pagina_precargada = (pagina, documentos)
 
     def _actualizar_controles_paginacion(self):
         """Actualiza los controles de paginación."""
@@ -643,11 +750,15 @@ class ControlarVisualizarEstante:
         Refresca el estado visual del estante.
         Si hay una búsqueda activa, recarga la página actual.
         """
-        self.progresos_lectura = self.config.obtener_progresos_lectura()
         if self._tiene_filtro_organizacion():
             self._recargar_filtro_organizacion()
             return
         if self.termino_busqueda_actual:
+            # los datos pudieron cambiar: se descarta la precarga, y el total
+            # se vuelve a contar solo si hubo escrituras
+            self._pagina_precargada = None
+            self._generacion_paginacion += 1
+            self._actualizar_total_documentos()
             self._mostrar_pagina_actual()
             return
 
@@ -663,8 +774,6 @@ class ControlarVisualizarEstante:
         self.tipo_organizacion_actual = None
         self.id_organizacion_actual = None
         self.nombre_organizacion_actual = ""
-        self.documentos_organizacion = []
-        self.documentos_filtrados_organizacion = []
         if limpiar_ui:
             self.tipo_organizacion_seleccionado = None
             self.map_organizaciones = {}
@@ -784,16 +893,15 @@ class ControlarVisualizarEstante:
         self.termino_busqueda_actual = ""
 
     def _aplicar_filtro_organizacion(self, tipo_key: str, id_org: int, nombre_ui: str = ""):
-        if tipo_key not in self._map_documentos_getters:
+        if tipo_key not in self._map_organizacion_getters:
             return
-        self.progresos_lectura = self.config.obtener_progresos_lectura()
-        documentos = self._map_documentos_getters[tipo_key](id_org)
-        self.documentos_organizacion = documentos or []
         self.pagina_actual = 1
+        self._reiniciar_paginacion()
         self.tipo_organizacion_actual = tipo_key
         self.id_organizacion_actual = id_org
         self.nombre_organizacion_actual = nombre_ui or ""
-        self._actualizar_documentos_filtrados_organizacion()
+        self.campo_busqueda_actual = self.campo_busqueda_actual or "todo"
+        self._actualizar_total_documentos()
         self._guardar_estado_busqueda_estante(
             campo_db=self.campo_busqueda_actual or "todo",
             termino_busqueda=self.termino_busqueda_actual,
@@ -836,44 +944,52 @@ class ControlarVisualizarEstante:
             return nombre_ui
         return ""
 
-    def _actualizar_documentos_filtrados_organizacion(self):
-        if not self._tiene_filtro_organizacion():
-            self.documentos_filtrados_organizacion = []
-            self.total_documentos = 0
-            return
-
-        ids_organizacion = {
-            doc.get("id")
-            for doc in self.documentos_organizacion
-            if doc.get("id") is not None
-        }
-        if not ids_organizacion:
-            self.documentos_filtrados_organizacion = []
-            self.total_documentos = 0
+    def _iniciar_relleno_portadas(self, cache) -> None:
+        """
+        Lanza, una vez por proceso, la generación en segundo plano de las
+        portadas de cuadrícula que faltan en la caché.
+        """
+        if _relleno_portadas_iniciado.is_set():
             return
+        _relleno_portadas_iniciado.set()
+        ruta_biblioteca = self.config.obtener_ubicacion_biblioteca()
+        ruta_portadas = self.config.obtener_ubicacion_portadas()
 
-        if self.termino_busqueda_actual:
-            campo_db = self.campo_busqueda_actual or "todo"
-            termino = self.termino_busqueda_actual
-        else:
-            campo_db = "todo"
-            termino = ""
+        def obtener_solicitudes():
+            documentos = DocumentoDAO().instanciar(
+                sql="SELECT id, nombre, extension, hash FROM documento "
+                "WHERE esta_activo = 1 ORDER BY nombre"
+            )
+            for doc in documentos:
+                yield _solicitud_portada_documento(doc, ruta_biblioteca, ruta_portadas)
 
-        resultados = self.consulta.buscar_en_estante(
-            campo=campo_db,
-            termino=termino,
-            limit=None,
-            offset=0,
-        )
-        self.documentos_filtrados_organizacion = [
-            doc for doc in resultados if doc.get("id") in ids_organizacion
-        ]
-        self.total_documentos = len(self.documentos_filtrados_organizacion)
+        cache.iniciar_relleno(obtener_solicitudes, (ANCHO_PORTADA, int(ANCHO_PORTADA * 1.5)))
 
     def _procesar_carga_imagenes(self, tareas):
-        """Procesa la carga de imágenes en un hilo separado."""
-        for ruta, label, ancho, alto in tareas:
-            if os.path.exists(ruta):
+        """
+        Procesa la carga de imágenes en un hilo separado.
+
+        Las portadas salen de la caché de portadas; las que faltan se
+        encargan todas a la vez al pool de procesos y se muestran en orden
+        a medida que están listas.
+        """
+        cache = obtener_cache_portadas()
+        if cache is None:
+            for _, label, _, _ in tareas:
+                self.master.after(0, self._configurar_label_sin_portada, label)
+            return
+
+        pendientes = [
+            (cache.solicitar(solicitud, (ancho, alto)), label, ancho, alto)
+            for solicitud, label, ancho, alto in tareas
+        ]
+        for futuro, label, ancho, alto in pendientes:
+            try:
+                ruta = futuro.result()
+            except Exception as e:
+                print(f"Error al generar la portada: {e}")
+                ruta = None
+            if ruta and os.path.exists(ruta):
                 try:
                     img = Image.open(ruta)
                     img.thumbnail((ancho, alto))
@@ -885,6 +1001,8 @@ class ControlarVisualizarEstante:
             else:
                 self.master.after(0, self._configurar_label_sin_portada, label)
 
+        self._iniciar_relleno_portadas(cache)
+
     def _actualizar_imagen_label(self, label, pil_image):
         """Actualiza el label con la imagen cargada (en el hilo principal)."""
         try:
@@ -1038,28 +1156,6 @@ class ControlarVisualizarEstante:
             return f"{porcentaje}% {barra} ({info['pagina_mostrada']}/{info['total_paginas']})"
         return f"Pág. {info['pagina_actual']}"
 
-    def _depurar_progresos_lectura_huerfanos(self):
-        if not self.progresos_lectura:
-            return
-
-        try:
-            ids_validos = {
-                str(doc["id"])
-                for doc in Consulta().get_todos_documentos()
-                if doc.get("id") is not None
-            }
-        except Exception:
-            return
-
-        progreso_filtrado = {
-            id_documento: datos
-            for id_documento, datos in self.progresos_lectura.items()
-            if id_documento in ids_validos
-        }
-        if len(progreso_filtrado) != len(self.progresos_lectura):
-            if self.config.guardar_progresos_lectura(progresos=progreso_filtrado):
-                self.progresos_lectura = progreso_filtrado
-
     # --- Métodos para el menú contextual ---
 
     def _mostrar_menu_contextual(self, event, documento):
@@ -1227,14 +1323,13 @@ class ControlarVisualizarEstante:
             )
             return
 
-        if not self.config.guardar_progreso_lectura(
+        if not self.progreso_lectura.guardar_progreso(
             id_documento=id_documento,
             pagina_actual=pagina_actual,
         ):
             showerror("Error", "No se pudo guardar el progreso de lectura.", parent=self.master)
             return
 
-        self.progresos_lectura = self.config.obtener_progresos_lectura()
         self.recargar_estante()
 
         if total_paginas > 0:
@@ -1274,11 +1369,10 @@ class ControlarVisualizarEstante:
             )
             return
 
-        if not self.config.eliminar_progreso_lectura(id_documento=id_documento):
+        if not self.progreso_lectura.eliminar_progreso(id_documento=id_documento):
             showerror("Error", "No se pudo eliminar el progreso de lectura.", parent=self.master)
             return
 
-        self.progresos_lectura.pop(str(id_documento), None)
         self.recargar_estante()
         showinfo("Progreso de lectura", "Se eliminó el progreso de lectura.", parent=self.master)
 
@@ -1340,3 +1434,30 @@ class ControlarVisualizarEstante:
             return f"{int(valor)} B"
         else:
             return f"{valor:.2f} {unidades[indice]}"
+
+
+def _solicitud_portada_documento(
+    doc: Dict[str, Any], ruta_biblioteca: str, ruta_portadas: str
+) -> SolicitudPortada:
+    """
+    Construye la solicitud de portada de un documento a partir de su fila.
+
+    La miniatura generada en la importación por versiones anteriores, si
+    existe, se reutiliza como origen para no volver a renderizar el documento.
+    """
+    id_documento = doc["id"]
+    ruta_documento = ""
+    if ruta_biblioteca and os.path.isdir(ruta_biblioteca):
+        ruta_documento = ruta_documento_biblioteca(
+            ruta_biblioteca, f"{doc['nombre']}.{doc['extension']}", id_documento
+        )
+    ruta_portada_existente = None
+    if ruta_portadas and os.path.isdir(ruta_portadas):
+        ruta_portada_existente = os.path.join(
+            directorio_id_documento(ruta_portadas, id_documento), f"{id_documento}_miniatura.png"
+        )
+    return SolicitudPortada(
+        hash=doc.get("hash") or f"id-{id_documento}",
+        ruta_documento=ruta_documento,
+        ruta_portada_existente=ruta_portada_existente,
+    )
@@ -47,13 +47,11 @@ class BibliografiaDAO(DAO):
         )
         """
         try:
-            con = self._conectar()
-            cursor = con.cursor()
-            cursor.execute(sql)
-            con.commit()
+            with self._get_connection() as con:
+                cursor = con.cursor()
+                cursor.execute(sql)
         except sqlite3.Error as ex:
             print(f"Error al crear las tablas de bibliografía: {ex}")
-            self._conectar().rollback()
             raise
 
     def insertar(self, params: tuple = ()) -> Optional[int]:
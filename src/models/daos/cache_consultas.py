@@ -0,0 +1,211 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+# Tablas de asociación documento <-> organización
+_ASOCIACIONES: Dict[str, str] = {
+    "coleccion": "documento_coleccion",
+    "grupo": "documento_grupo",
+    "categoria": "documento_categoria",
+    "etiqueta": "documento_etiqueta",
+    "palabra_clave": "documento_palabra_clave",
+}
+# Tablas hijas de documento cuyos cambios recalcula un disparador en documento_flags
+_TABLAS_CON_FLAG = ("bibliografia", "metadato", "capitulo", "favorito", *_ASOCIACIONES.values())
+# Tablas hijas de documento cuyos cambios reescribe un disparador en documento_fts
+_TABLAS_CON_FTS = ("bibliografia", *_ASOCIACIONES.values())
+
+# Tablas que cambian además de la escrita, por borrados en cascada y disparadores
+ESCRITURAS_DERIVADAS: Dict[str, Tuple[str, ...]] = {
+    "documento": (
+        *_TABLAS_CON_FLAG,
+        "seccion",
+        "documento_flags",
+        "documento_fts",
+        "progreso_lectura",
+        "comentario",
+    ),
+    "capitulo": ("seccion", "documento_flags"),
+    "metadato": ("documento", "documento_flags"),
+    **{
+        tabla: ("documento_flags", "documento_fts") if tabla in _TABLAS_CON_FTS else ("documento_flags",)
+        for tabla in _TABLAS_CON_FLAG
+        if tabla not in ("capitulo", "metadato")
+    },
+    **{
+        tabla: (asociacion, "documento_flags", "documento_fts")
+        for tabla, asociacion in _ASOCIACIONES.items()
+    },
+}
+
+_PATRON_TABLA_ESCRITA = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)"
+    r"\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+
+def tabla_escrita(sql: str) -> Optional[str]:
+    """
+    Retorna la tabla que modifica una sentencia INSERT, REPLACE, UPDATE o
+    DELETE, o None si no se reconoce.
+    """
+    coincidencia = _PATRON_TABLA_ESCRITA.match(sql)
+    return coincidencia.group(1).lower() if coincidencia else None
+
+
+class CacheConsultas:
+    """
+    Caché de proceso para resultados de consultas que cambian poco (listas de
+    organizaciones, totales...), acotada (LRU) a `MAX_ENTRADAS`.
+
+    Cada resultado se guarda junto con la versión de las tablas de las que
+    depende. Las escrituras de los DAO anotan qué tablas tocan y, al terminar
+    la transacción más externa, suben su contador de versión (y el de las
+    tablas que cambian por cascada o disparadores); el resultado guardado
+    deja de valer en cuanto cambia alguna de sus versiones. Una escritura
+    cuyas tablas no se conocen sube la generación de toda la base de datos.
+    """
+
+    MAX_ENTRADAS = 256
+    habilitada = True
+
+    _lock = threading.Lock()
+    _local = threading.local()
+    # (ruta, tabla) -> versión; ruta -> generación
+    _versiones: Dict[Tuple[str, str], int] = {}
+    _generaciones: Dict[str, int] = {}
+    # (ruta, clave) -> (versión de las tablas, valor)
+    _entradas: "OrderedDict[Tuple[str, Hashable], Tuple[Tuple[int, ...], Any]]" = OrderedDict()
+    _aciertos = 0
+    _fallos = 0
+
+    @classmethod
+    def obtener(
+        cls,
+        ruta_db: str,
+        clave: Hashable,
+        tablas: Iterable[str],
+        calcular: Callable[[], Any],
+    ) -> Any:
+        """
+        Retorna el resultado guardado para `clave` si ninguna de `tablas` se
+        escribió desde que se guardó; si no, lo calcula y lo guarda.
+
+        Args:
+            ruta_db (str): Base de datos de la consulta.
+            clave (Hashable): Método y argumentos de la consulta.
+            tablas (Iterable[str]): Tablas que lee la consulta.
+            calcular (Callable[[], Any]): Ejecuta la consulta.
+        """
+        if not cls.habilitada:
+            return calcular()
+        clave = (ruta_db, clave)
+        # la versión se lee antes de consultar: si una escritura se confirma
+        # mientras tanto, el resultado se guarda con la versión anterior
+        version = cls._version(ruta_db, tablas)
+        with cls._lock:
+            guardado = cls._entradas.get(clave)
+            if guardado is not None and guardado[0] == version:
+                cls._entradas.move_to_end(clave)
+                cls._aciertos += 1
+                return guardado[1]
+            cls._fallos += 1
+
+        valor = calcular()
+        with cls._lock:
+            cls._entradas[clave] = (version, valor)
+            cls._entradas.move_to_end(clave)
+            while len(cls._entradas) > cls.MAX_ENTRADAS:
+                cls._entradas.popitem(last=False)
+        return valor
+
+    @classmethod
+    def _version(cls, ruta_db: str, tablas: Iterable[str]) -> Tuple[int, ...]:
+        return (
+            cls._generaciones.get(ruta_db, 0),
+            *(cls._versiones.get((ruta_db, tabla), 0) for tabla in tablas),
+        )
+
+    # --- Escrituras ---
+
+    @classmethod
+    def _pendientes(cls) -> Dict[str, Optional[Set[str]]]:
+        pendientes = getattr(cls._local, "pendientes", None)
+        if pendientes is None:
+            pendientes = cls._local.pendientes = {}
+        return pendientes
+
+    @classmethod
+    def registrar_escritura(cls, ruta_db: str, tablas: Iterable[Optional[str]]):
+        """
+        Anota en el thread actual las tablas que escribe la transacción en
+        curso. Una tabla None (desconocida) invalida toda la base de datos.
+        """
+        pendientes = cls._pendientes()
+        tablas = set(tablas)
+        if None in tablas:
+            pendientes[ruta_db] = None
+        elif ruta_db not in pendientes:
+            pendientes[ruta_db] = tablas
+        elif pendientes[ruta_db] is not None:
+            pendientes[ruta_db] |= tablas
+
+    @classmethod
+    def confirmar_escrituras(cls, ruta_db: str, hubo_cambios: bool = False):
+        """
+        Sube las versiones de las tablas anotadas al terminar la transacción
+        más externa. Con `hubo_cambios` y sin tablas anotadas (una escritura
+        que no pasa por los métodos de `DAO`) se invalida toda la base de datos.
+        """
+        pendientes = cls._pendientes()
+        if ruta_db not in pendientes:
+            if hubo_cambios:
+                cls.invalidar(ruta_db)
+            return
+        cls.invalidar(ruta_db, pendientes.pop(ruta_db))
+
+    @classmethod
+    def invalidar(cls, ruta_db: str, tablas: Optional[Iterable[str]] = None):
+        """
+        Sube la versión de `tablas` (y de las que cambian con ellas) o, sin
+        tablas, la generación de toda la base de datos.
+        """
+        with cls._lock:
+            if tablas is None:
+                cls._generaciones[ruta_db] = cls._generaciones.get(ruta_db, 0) + 1
+                return
+            afectadas = set(tablas)
+            for tabla in list(afectadas):
+                afectadas.update(ESCRITURAS_DERIVADAS.get(tabla, ()))
+            for tabla in afectadas:
+                clave = (ruta_db, tabla)
+                cls._versiones[clave] = cls._versiones.get(clave, 0) + 1
+
+    # --- Estado ---
+
+    @classmethod
+    def estadisticas(cls) -> Dict[str, float]:
+        """
+        Returns:
+            Dict[str, float]: Aciertos, fallos, proporción de aciertos y entradas guardadas.
+        """
+        with cls._lock:
+            consultas = cls._aciertos + cls._fallos
+            return {
+                "aciertos": cls._aciertos,
+                "fallos": cls._fallos,
+                "proporcion_aciertos": cls._aciertos / consultas if consultas else 0.0,
+                "entradas": len(cls._entradas),
+            }
+
+    @classmethod
+    def resetear(cls):
+        """
+        Vacía la caché y sus estadísticas (útil principalmente para tests).
+        """
+        with cls._lock:
+            cls._entradas = OrderedDict()
+            cls._aciertos = 0
+            cls._fallos = 0
@@ -0,0 +1,157 @@
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from os.path import join
+from models.daos.dao import DAO
+from utilities.configuracion import RUTA_DATA
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Base de datos auxiliar, separada de la biblioteca, para la caché de hashes
+RUTA_CACHE_HASH = join(RUTA_DATA, "hash_cache.sqlite3")
+
+
+class CacheHashDAO(DAO):
+    """
+    DAO para la tabla `cache_hash`, que asocia la firma de un archivo
+    (ruta, tamaño, mtime_ns, inodo) con su hash SHA-256.
+
+    Una fila solo es válida mientras la firma del archivo no cambie; si el
+    archivo se modifica, la búsqueda falla y la siguiente escritura la
+    reemplaza. Las filas menos usadas se desalojan al superar un máximo.
+    """
+
+    def __init__(self, ruta_db: Optional[str] = None):
+        """
+        Inicializa el DAO de la caché de hashes.
+
+        Args:
+            ruta_db (Optional[str]): Ruta opcional al archivo de la base de datos.
+                                     Por defecto `RUTA_CACHE_HASH`.
+        """
+        super().__init__(ruta_db or RUTA_CACHE_HASH)
+
+    def crear_tabla(self):
+        """
+        Crea la tabla `cache_hash` y su índice LRU si no existen.
+        """
+        sql = """
+        CREATE TABLE IF NOT EXISTS cache_hash(
+            ruta TEXT PRIMARY KEY,
+            tamano INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            inodo INTEGER NOT NULL,
+            hash TEXT NOT NULL,
+            usado_en REAL NOT NULL
+        )
+        """
+        try:
+            with self._get_connection() as con:
+                cursor = con.cursor()
+                cursor.execute(sql)
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_cache_hash_usado_en ON cache_hash(usado_en)"
+                )
+        except sqlite3.Error as ex:
+            print(f"Error al crear la tabla cache_hash: {ex}")
+            raise
+
+    def insertar(self, sql: str = None, params: tuple = ()) -> Optional[int]:
+        """
+        Inserta o reemplaza una entrada de la caché.
+
+        Parámetros por defecto: (ruta, tamano, mtime_ns, inodo, hash, usado_en)
+        """
+        if sql is None:
+            sql = """
+            INSERT OR REPLACE INTO cache_hash (ruta, tamano, mtime_ns, inodo, hash, usado_en)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """
+        return self._ejecutar_insertar(sql, params)
+
+    def eliminar(self, sql: str = None, params: tuple = ()) -> bool:
+        """
+        Elimina una entrada de la caché. Por defecto, por `ruta`.
+        """
+        if sql is None:
+            sql = "DELETE FROM cache_hash WHERE ruta = ?"
+        return self._ejecutar_actualizacion(sql, params)
+
+    def instanciar(self, sql: str = None, params: tuple = ()) -> List[Dict[str, Any]]:
+        """
+        Consulta entradas de la caché. Por defecto, por `ruta`.
+        """
+        if sql is None:
+            sql = "SELECT * FROM cache_hash WHERE ruta = ?"
+        return self._ejecutar_consulta(sql, params)
+
+    def existe(self, sql: str = None, params: tuple = ()) -> bool:
+        """
+        Verifica si hay una entrada para una ruta.
+        """
+        if sql is None:
+            sql = "SELECT 1 FROM cache_hash WHERE ruta = ?"
+        return len(self._ejecutar_consulta(sql, params)) > 0
+
+    def obtener_hash(self, ruta: str, tamano: int, mtime_ns: int, inodo: int) -> Optional[str]:
+        """
+        Retorna el hash guardado si la firma del archivo no ha cambiado.
+        """
+        sql = """
+        SELECT hash FROM cache_hash
+        WHERE ruta = ? AND tamano = ? AND mtime_ns = ? AND inodo = ?
+        """
+        filas = self._ejecutar_consulta(sql, (ruta, tamano, mtime_ns, inodo))
+        return filas[0]["hash"] if filas else None
+
+    def guardar_lote(self, entradas: Iterable[Tuple[str, int, int, int, str, float]]) -> bool:
+        """
+        Inserta o reemplaza varias entradas en una sola transacción.
+
+        Args:
+            entradas: Tuplas (ruta, tamano, mtime_ns, inodo, hash, usado_en).
+        """
+        sql = """
+        INSERT OR REPLACE INTO cache_hash (ruta, tamano, mtime_ns, inodo, hash, usado_en)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura("cache_hash")
+                con.executemany(sql, list(entradas))
+            return True
+        except sqlite3.Error as ex:
+            logger.error("Error al guardar la caché de hashes: %s", ex)
+            return False
+
+    def marcar_usados(self, rutas: Iterable[str], usado_en: float) -> bool:
+        """
+        Actualiza la marca de uso (LRU) de varias rutas en una sola transacción.
+        """
+        sql = "UPDATE cache_hash SET usado_en = ? WHERE ruta = ?"
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura("cache_hash")
+                con.executemany(sql, [(usado_en, ruta) for ruta in rutas])
+            return True
+        except sqlite3.Error as ex:
+            logger.error("Error al actualizar la caché de hashes: %s", ex)
+            return False
+
+    def desalojar(self, max_entradas: int) -> bool:
+        """
+        Elimina las entradas usadas hace más tiempo hasta dejar `max_entradas`.
+        """
+        sql = """
+        DELETE FROM cache_hash WHERE ruta IN (
+            SELECT ruta FROM cache_hash ORDER BY usado_en DESC LIMIT -1 OFFSET ?
+        )
+        """
+        return self._ejecutar_actualizacion(sql, (max_entradas,))
+
+    def contar(self) -> int:
+        """
+        Número de entradas en la caché.
+        """
+        filas = self._ejecutar_consulta("SELECT COUNT(*) AS total FROM cache_hash")
+        return filas[0]["total"] if filas else 0
@@ -0,0 +1,141 @@
+from typing import Dict, Any, Iterable, List, Optional
+from models.daos.dao import DAO
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CachePortadaDAO(DAO):
+    """
+    DAO para la tabla `cache_portada`, el índice de la caché de portadas.
+
+    Cada fila describe una imagen generada para un documento (por su hash) y
+    un tamaño de renderizado, con su peso en disco y la última vez que se usó,
+    para poder desalojar las menos usadas al superar el presupuesto.
+    """
+
+    def __init__(self, ruta_db: str):
+        """
+        Inicializa el DAO de la caché de portadas.
+
+        Args:
+            ruta_db (str): Ruta al archivo del índice, junto a las imágenes.
+        """
+        super().__init__(ruta_db)
+
+    def crear_tabla(self):
+        """
+        Crea la tabla `cache_portada` y su índice LRU si no existen.
+        """
+        sql = """
+        CREATE TABLE IF NOT EXISTS cache_portada(
+            clave TEXT PRIMARY KEY,
+            hash TEXT NOT NULL,
+            ancho INTEGER NOT NULL,
+            alto INTEGER NOT NULL,
+            tamano_bytes INTEGER NOT NULL,
+            usado_en REAL NOT NULL
+        )
+        """
+        try:
+            with self._get_connection() as con:
+                cursor = con.cursor()
+                cursor.execute(sql)
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_cache_portada_usado_en "
+                    "ON cache_portada(usado_en)"
+                )
+        except sqlite3.Error as ex:
+            print(f"Error al crear la tabla cache_portada: {ex}")
+            raise
+
+    def insertar(self, sql: str = None, params: tuple = ()) -> Optional[int]:
+        """
+        Inserta o reemplaza una entrada de la caché.
+
+        Parámetros por defecto: (clave, hash, ancho, alto, tamano_bytes, usado_en)
+        """
+        if sql is None:
+            sql = """
+            INSERT OR REPLACE INTO cache_portada (clave, hash, ancho, alto, tamano_bytes, usado_en)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """
+        return self._ejecutar_insertar(sql, params)
+
+    def eliminar(self, sql: str = None, params: tuple = ()) -> bool:
+        """
+        Elimina una entrada de la caché. Por defecto, por `clave`.
+        """
+        if sql is None:
+            sql = "DELETE FROM cache_portada WHERE clave = ?"
+        return self._ejecutar_actualizacion(sql, params)
+
+    def instanciar(self, sql: str = None, params: tuple = ()) -> List[Dict[str, Any]]:
+        """
+        Consulta entradas de la caché. Por defecto, por `clave`.
+        """
+        if sql is None:
+            sql = "SELECT * FROM cache_portada WHERE clave = ?"
+        return self._ejecutar_consulta(sql, params)
+
+    def existe(self, sql: str = None, params: tuple = ()) -> bool:
+        """
+        Verifica si hay una entrada para una clave.
+        """
+        if sql is None:
+            sql = "SELECT 1 FROM cache_portada WHERE clave = ?"
+        return len(self._ejecutar_consulta(sql, params)) > 0
+
+    def marcar_usados(self, claves: Iterable[str], usado_en: float) -> bool:
+        """
+        Actualiza la marca de uso (LRU) de varias entradas en una sola transacción.
+        """
+        sql = "UPDATE cache_portada SET usado_en = ? WHERE clave = ?"
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura("cache_portada")
+                con.executemany(sql, [(usado_en, clave) for clave in claves])
+            return True
+        except sqlite3.Error as ex:
+            logger.error("Error al actualizar la caché de portadas: %s", ex)
+            return False
+
+    def tamano_total(self) -> int:
+        """
+        Suma en bytes de todas las imágenes de la caché.
+        """
+        filas = self._ejecutar_consulta(
+            "SELECT COALESCE(SUM(tamano_bytes), 0) AS total FROM cache_portada"
+        )
+        return filas[0]["total"] if filas else 0
+
+    def desalojar(self, presupuesto_bytes: int, conservar: Optional[str] = None) -> List[str]:
+        """
+        Elimina las entradas usadas hace más tiempo hasta que el total quede
+        dentro de `presupuesto_bytes`. La entrada `conservar` (la que se acaba
+        de generar) cuenta en el total pero nunca se elimina.
+
+        Returns:
+            List[str]: Las claves eliminadas, para borrar sus imágenes.
+        """
+        sql = """
+        SELECT clave FROM (
+            SELECT clave,
+                   SUM(tamano_bytes) OVER (ORDER BY usado_en DESC, clave) AS acumulado
+            FROM cache_portada
+        )
+        WHERE acumulado > ? AND clave IS NOT ?
+        """
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura("cache_portada")
+                filas = con.execute(sql, (presupuesto_bytes, conservar))
+                claves = [fila["clave"] for fila in filas]
+                con.executemany(
+                    "DELETE FROM cache_portada WHERE clave = ?", [(c,) for c in claves]
+                )
+            return claves
+        except sqlite3.Error as ex:
+            logger.error("Error al desalojar la caché de portadas: %s", ex)
+            return []
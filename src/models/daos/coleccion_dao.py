@@ -26,16 +26,14 @@ class ColeccionDAO(DAO):
         )
         """
         try:
-            con = self._conectar()
-            cursor = con.cursor()
-            cursor.execute(sql)
-            cursor.execute(
-                "CREATE UNIQUE INDEX IF NOT EXISTS idx_coleccion_nombre ON coleccion(nombre)"
-            )
-            con.commit()
+            with self._get_connection() as con:
+                cursor = con.cursor()
+                cursor.execute(sql)
+                cursor.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_coleccion_nombre ON coleccion(nombre)"
+                )
         except sqlite3.Error as ex:
             print(f"Error al crear la tabla coleccion: {ex}")
-            self._conectar().rollback()
             raise
 
     def insertar(self, data: ColeccionDTO) -> Optional[int]:
@@ -0,0 +1,167 @@
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Set, Tuple
+from models.daos.dao import DAO
+import sqlite3
+
+
+class ComentarioDAO(DAO):
+    """
+    DAO para la gestión de la tabla `comentario` en la base de datos.
+
+    Guarda un comentario libre por documento; el registro se borra en
+    cascada con el documento.
+    """
+
+    def __init__(self, ruta_db: Optional[str] = None):
+        """
+        Inicializa el DAO de Comentario.
+
+        Args:
+            ruta_db (Optional[str]): Ruta opcional al archivo de la base de datos.
+        """
+        super().__init__(ruta_db)
+
+    def crear_tabla(self):
+        """
+        Crea la tabla `comentario` en la base de datos si no existe.
+        """
+        sql = """
+        CREATE TABLE IF NOT EXISTS comentario(
+            id_documento INTEGER PRIMARY KEY,
+            texto TEXT NOT NULL,
+            actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (id_documento) REFERENCES documento (id) ON DELETE CASCADE
+        )
+        """
+        try:
+            with self._get_connection() as con:
+                cursor = con.cursor()
+                cursor.execute(sql)
+        except sqlite3.Error as ex:
+            print(f"Error al crear la tabla comentario: {ex}")
+            raise
+
+    def insertar(self, sql: str = None, params: tuple = ()) -> Optional[int]:
+        """
+        Guarda el comentario de un documento, reemplazando el anterior si lo hay.
+
+        Por defecto, espera los parámetros en el orden: (id_documento, texto, actualizado_en).
+
+        Returns:
+            Optional[int]: El ID del documento, o None si falla.
+        """
+        if sql is None:
+            sql = """
+            INSERT INTO comentario (id_documento, texto, actualizado_en) VALUES (?, ?, ?)
+            ON CONFLICT(id_documento) DO UPDATE SET
+                texto = excluded.texto,
+                actualizado_en = excluded.actualizado_en
+            """
+        return self._ejecutar_insertar(sql, params)
+
+    def guardar(self, id_documento: int, texto: str) -> bool:
+        """
+        Guarda el comentario de un documento.
+
+        Returns:
+            bool: True si se guardó, False en caso contrario.
+        """
+        actualizado_en = datetime.now().isoformat(timespec="seconds")
+        return self.insertar(params=(int(id_documento), texto, actualizado_en)) is not None
+
+    def eliminar(self, sql: str = None, params: tuple = ()) -> bool:
+        """
+        Elimina el comentario de un documento.
+
+        Por defecto, espera el parámetro: (id_documento).
+
+        Returns:
+            bool: True si se eliminó el comentario, False en caso contrario.
+        """
+        if sql is None:
+            sql = "DELETE FROM comentario WHERE id_documento = ?"
+        return self._ejecutar_actualizacion(sql, params)
+
+    def instanciar(self, sql: str = None, params: tuple = ()) -> List[Dict[str, Any]]:
+        """
+        Consulta registros de comentarios.
+
+        Por defecto, busca el comentario por `id_documento`.
+
+        Returns:
+            List[Dict[str, Any]]: Lista de diccionarios con los datos.
+        """
+        if sql is None:
+            sql = "SELECT * FROM comentario WHERE id_documento = ?"
+        return self._ejecutar_consulta(sql, params)
+
+    def existe(self, sql: str = None, params: tuple = ()) -> bool:
+        """
+        Verifica si un documento tiene comentario.
+
+        Por defecto, busca por `id_documento`.
+        """
+        if sql is None:
+            sql = "SELECT 1 FROM comentario WHERE id_documento = ?"
+
+        resultados = self._ejecutar_consulta(sql, params)
+        return len(resultados) > 0
+
+    def obtener_todos(self) -> List[Dict[str, Any]]:
+        """
+        Obtiene todos los comentarios.
+
+        Returns:
+            List[Dict[str, Any]]: Una lista de todos los registros de comentarios.
+        """
+        sql = "SELECT * FROM comentario ORDER BY actualizado_en DESC"
+        return self._ejecutar_consulta(sql)
+
+    def ids_con_comentario(self, ids_documentos: Sequence[int]) -> Set[int]:
+        """
+        Obtiene cuáles de los documentos dados (p. ej. los de una página del
+        estante) tienen comentario, en una sola consulta por lote.
+
+        Returns:
+            Set[int]: IDs de los documentos con comentario.
+        """
+        sql = "SELECT id_documento FROM comentario WHERE id_documento IN ({marcadores})"
+        return {
+            fila["id_documento"]
+            for fila in self._consultar_por_ids(sql, [int(i) for i in ids_documentos])
+        }
+
+    def insertar_lote(self, filas: Iterable[Tuple[int, str, Optional[str]]]) -> Optional[int]:
+        """
+        Importa varios comentarios con `executemany` en una sola transacción,
+        omitiendo los vacíos y los de documentos que ya no existen.
+
+        Args:
+            filas (Iterable[Tuple[int, str, Optional[str]]]): Tuplas
+                (id_documento, texto, actualizado_en).
+
+        Returns:
+            Optional[int]: Número de comentarios guardados, o None si falla (no se
+                guarda ninguno).
+        """
+        sql = """
+        INSERT OR REPLACE INTO comentario (id_documento, texto, actualizado_en)
+        SELECT ?, ?, COALESCE(?, CURRENT_TIMESTAMP)
+        WHERE EXISTS (SELECT 1 FROM documento WHERE id = ?)
+        """
+        params = [
+            (int(id_documento), texto, actualizado_en, int(id_documento))
+            for id_documento, texto, actualizado_en in filas
+            if texto and texto.strip()
+        ]
+        if not params:
+            return 0
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura("comentario")
+                antes = con.total_changes
+                con.executemany(sql, params)
+                return con.total_changes - antes
+        except sqlite3.Error as ex:
+            print(f"Error al importar comentarios: {ex}")
+            return None
@@ -1,63 +1,117 @@
 import sqlite3
 import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from os.path import abspath, join
 from sqlite3 import Connection, Cursor
 from utilities.configuracion import RUTA_DATA
-from os.path import join
 
 
 class Database:
     """
-    Clase Singleton thread-safe para gestionar conexiones SQLite.
-    Cada thread obtiene su propia conexión.
+    Clase thread-safe para gestionar conexiones SQLite.
+
+    Existe una única instancia por ruta de base de datos. Cada thread obtiene
+    su propia conexión de larga duración para cada ruta, configurada una sola
+    vez con los PRAGMA de rendimiento. Las conexiones de cada thread forman un
+    pool acotado (LRU) de `MAX_CONEXIONES_POR_THREAD` rutas.
     """
 
-    _instancia = None
+    MAX_CONEXIONES_POR_THREAD = 8
+
+    _instancias = {}
     _lock = threading.Lock()
     _local = threading.local()  # Almacenamiento local por thread
 
     def __new__(cls, ruta_db: str = None):
-        if cls._instancia is None:
+        clave = cls._normalizar_ruta(ruta_db)
+        instancia = cls._instancias.get(clave)
+        if instancia is None:
             with cls._lock:
-                if cls._instancia is None:
-                    cls._instancia = super().__new__(cls)
-                    cls._instancia._ruta_db = None
-        return cls._instancia
+                instancia = cls._instancias.get(clave)
+                if instancia is None:
+                    instancia = super().__new__(cls)
+                    instancia._ruta_db = clave
+                    cls._instancias[clave] = instancia
+        return instancia
 
     def __init__(self, ruta_db: str = None):
         """
-        Inicializa la ruta de la base de datos.
-        La conexión se crea por thread según sea necesario.
+        La ruta queda fijada en `__new__`; la conexión se crea por thread
+        según sea necesario.
+        """
+        pass
+
+    @property
+    def ruta_db(self) -> str:
+        """
+        Ruta normalizada de la base de datos gestionada por esta instancia.
         """
+        return self._ruta_db
+
+    @staticmethod
+    def _normalizar_ruta(ruta_db: str = None) -> str:
         if ruta_db is None:
             ruta_db = join(RUTA_DATA, "bibliotecaTK.sqlite3")
+        ruta_db = str(ruta_db)
+        if ruta_db == ":memory:" or ruta_db.startswith("file:"):
+            return ruta_db
+        return abspath(ruta_db)
 
-        # Guardamos la ruta para crear conexiones en cada thread
-        if self._ruta_db is None:
-            self._ruta_db = ruta_db
+    @classmethod
+    def _pool_thread(cls) -> "OrderedDict[str, Connection]":
+        pool = getattr(cls._local, "conexiones", None)
+        if pool is None:
+            pool = OrderedDict()
+            cls._local.conexiones = pool
+            cls._local.profundidad = {}
+        return pool
+
+    def _crear_conexion(self) -> Connection:
+        conexion = sqlite3.connect(
+            self._ruta_db,
+            check_same_thread=False,
+            timeout=10.0,  # Espera 10 segundos si hay lock
+        )
+        conexion.row_factory = sqlite3.Row
+
+        # Optimizaciones de rendimiento
+        conexion.execute("PRAGMA foreign_keys = ON")
+        conexion.execute("PRAGMA journal_mode = WAL")  # Write-Ahead Logging
+        conexion.execute("PRAGMA synchronous = NORMAL")
+        conexion.execute("PRAGMA cache_size = -64000")  # 64MB cache
+        conexion.execute("PRAGMA temp_store = MEMORY")
+        return conexion
 
     def _obtener_conexion_thread(self) -> Connection:
-        if not hasattr(self._local, 'conexion') or self._local.conexion is None:
-            try:
-                self._local.conexion = sqlite3.connect(
-                    self._ruta_db,
-                    check_same_thread=False,
-                    timeout=10.0,  # Espera 10 segundos si hay lock
-                )
-                self._local.conexion.row_factory = sqlite3.Row
-
-                # Optimizaciones de rendimiento
-                self._local.conexion.execute("PRAGMA foreign_keys = ON")
-                self._local.conexion.execute("PRAGMA journal_mode = WAL")  # Write-Ahead Logging
-                self._local.conexion.execute("PRAGMA synchronous = NORMAL")
-                self._local.conexion.execute("PRAGMA cache_size = -64000")  # 64MB cache
-                self._local.conexion.execute("PRAGMA temp_store = MEMORY")
-
-            except sqlite3.Error as err:
-                print(f"Error al conectar: {err}")
-                self._local.conexion = None
-                raise
-
-        return self._local.conexion
+        pool = self._pool_thread()
+        conexion = pool.get(self._ruta_db)
+        if conexion is not None:
+            pool.move_to_end(self._ruta_db)
+            return conexion
+
+        try:
+            conexion = self._crear_conexion()
+        except sqlite3.Error as err:
+            print(f"Error al conectar: {err}")
+            raise
+
+        pool[self._ruta_db] = conexion
+        self._liberar_excedentes(pool)
+        return conexion
+
+    def _liberar_excedentes(self, pool: "OrderedDict[str, Connection]"):
+        """
+        Cierra las conexiones menos usadas del thread actual cuando se supera
+        el tamaño máximo del pool. Nunca cierra una conexión en uso.
+        """
+        profundidad = self._local.profundidad
+        for ruta in list(pool.keys()):
+            if len(pool) <= self.MAX_CONEXIONES_POR_THREAD:
+                break
+            if ruta == self._ruta_db or profundidad.get(ruta, 0) > 0:
+                continue
+            pool.pop(ruta).close()
 
     def obtener_conexion(self) -> Connection:
         """
@@ -74,32 +128,65 @@ class Database:
         """
         return self.obtener_conexion().cursor()
 
+    def en_transaccion(self) -> bool:
+        """
+        Indica si el thread actual está dentro de `transaccion` para esta ruta.
+        """
+        self._pool_thread()
+        return self._local.profundidad.get(self._ruta_db, 0) > 0
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Context manager que presta la conexión del thread actual.
+
+        Hace commit al salir (o rollback si hay una excepción) solo en el
+        bloque más externo, de modo que los usos anidados comparten la misma
+        transacción. La conexión no se cierra: queda en el pool del thread.
+        """
+        conexion = self.obtener_conexion()
+        profundidad = self._local.profundidad
+        nivel = profundidad.get(self._ruta_db, 0)
+        profundidad[self._ruta_db] = nivel + 1
+        try:
+            yield conexion
+            if nivel == 0:
+                conexion.commit()
+        except Exception:
+            if nivel == 0:
+                conexion.rollback()
+            raise
+        finally:
+            profundidad[self._ruta_db] = nivel
+
     def cerrar(self):
         """
         Cierra la conexión del thread actual.
         """
-        if hasattr(self._local, 'conexion') and self._local.conexion is not None:
-            self._local.conexion.close()
-            self._local.conexion = None
+        pool = self._pool_thread()
+        conexion = pool.pop(self._ruta_db, None)
+        if conexion is not None:
+            conexion.close()
 
     @classmethod
     def cerrar_todas(cls):
         """
         Cierra todas las conexiones (útil al finalizar la aplicación).
-        Nota: Solo cierra la conexión del thread actual ya que no podemos
+        Nota: Solo cierra las conexiones del thread actual ya que no podemos
         acceder a las conexiones de otros threads.
         """
-        if cls._instancia is not None:
-            cls._instancia.cerrar()
+        pool = cls._pool_thread()
+        while pool:
+            _, conexion = pool.popitem()
+            conexion.close()
 
     @classmethod
     def resetear(cls):
         """
-        Resetea el Singleton (útil principalmente para tests).
-        Cierra la conexión del thread actual y reinicia las variables de clase.
+        Resetea el registro de instancias (útil principalmente para tests).
+        Cierra las conexiones del thread actual y reinicia las variables de clase.
         """
-        if cls._instancia is not None:
-            cls._instancia.cerrar()
+        cls.cerrar_todas()
 
         with cls._lock:
-            cls._instancia = None
+            cls._instancias = {}
@@ -1,8 +1,36 @@
+import re
 from models.daos.dao import DAO
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from utilities.texto_paginas import descomprimir_texto, fragmento_coincidencia
 
 
 class ConsultaDAO(DAO):
+    # Columnas de `documento_fts` en las que busca cada campo del estante
+    COLUMNAS_FTS_CAMPO: Dict[str, List[str]] = {
+        "todo": ["nombre", "titulo", "autores", "colecciones", "grupos"],
+        "nombre": ["nombre"],
+        "titulo": ["titulo"],
+        "autores": ["autores"],
+        "editorial": ["editorial"],
+        "isbn": ["isbn"],
+        "coleccion": ["colecciones"],
+        "grupo": ["grupos"],
+    }
+    # Pesos de bm25 por columna de `documento_fts`: pesa más el nombre que las organizaciones
+    RANGO_FTS_DOCUMENTO = "bm25(documento_fts, 10.0, 8.0, 5.0, 2.0, 2.0, 1.0, 1.0, 1.0, 1.0, 1.0)"
+    # Con más coincidencias (las primeras letras al escribir) ordenar por
+    # relevancia cuesta más de lo que aporta, y el estante ordena por nombre
+    LIMITE_ORDEN_RELEVANCIA = 1000
+    # Tabla de asociación y columna de cada tipo de organización del estante
+    TABLAS_ORGANIZACION: Dict[str, Tuple[str, str]] = {
+        "coleccion": ("documento_coleccion", "id_coleccion"),
+        "grupo": ("documento_grupo", "id_grupo"),
+        "categoria": ("documento_categoria", "id_categoria"),
+        "etiqueta": ("documento_etiqueta", "id_etiqueta"),
+        "palabra_clave": ("documento_palabra_clave", "id_palabra_clave"),
+    }
+    ORDENES_ESTANTE = ("relevancia", "nombre")
+
     def __init__(self, ruta_db=None):
         """
         Inicializa una nueva instancia de ConsultaDAO.
@@ -266,10 +294,62 @@ class ConsultaDAO(DAO):
         params = (id_palabra_clave,)
         return self._ejecutar_consulta(sql=sql, params=params)
 
+    def get_conteo_documentos_por_organizacion(self, tipo_organizacion: str) -> Dict[int, int]:
+        """
+        Cuenta en una sola consulta los documentos de cada organización de
+        un tipo, sin leer los documentos.
+
+        Args:
+            tipo_organizacion (str): Clave de `TABLAS_ORGANIZACION`.
+
+        Returns:
+            Dict[int, int]: id de la organización -> número de documentos. Las
+            organizaciones sin documentos no aparecen.
+        """
+        tabla = self.TABLAS_ORGANIZACION.get(tipo_organizacion)
+        if tabla is None:
+            return {}
+        nombre_tabla, columna = tabla
+        sql = f"""
+            SELECT {columna} AS id_organizacion, COUNT(*) AS total
+            FROM {nombre_tabla}
+            GROUP BY {columna}
+        """
+        return {
+            fila["id_organizacion"]: fila["total"] for fila in self._ejecutar_consulta(sql=sql)
+        }
+
+    @staticmethod
+    def expresion_fts(termino: str, columnas: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Convierte el texto que escribe el usuario en una consulta FTS5.
+
+        Cada palabra se busca como prefijo ("pyth" encuentra "python") y
+        todas deben aparecer. Las palabras van entre comillas, de modo que
+        los operadores de FTS5 que escriba el usuario no se interpretan.
+
+        Args:
+            termino (str): Texto de búsqueda.
+            columnas (Optional[List[str]]): Limita la búsqueda a esas columnas.
+
+        Returns:
+            Optional[str]: La expresión para MATCH, o None si no hay palabras.
+        """
+        palabras = re.findall(r"\w+", termino or "")
+        if not palabras:
+            return None
+        expresion = " ".join(f'"{palabra}"*' for palabra in palabras)
+        if columnas:
+            expresion = f"{{{' '.join(columnas)}}} : ({expresion})"
+        return expresion
+
     def buscar_documentos(self, campo: str, buscar: str) -> List[Dict[str, any]]:
         """
         Busca documentos en la vista 'vistas_asociaciones_documentos' basándose en un campo y un término de búsqueda.
 
+        El nombre se busca en el índice de texto completo, ordenado por relevancia;
+        el resto de campos (extensión, hash) se comparan con LIKE.
+
         Args:
             campo (str): El campo en el que se realizará la búsqueda (ej. 'nombre', 'autor', etc.).
             buscar (str): El término a buscar dentro del campo especificado.
@@ -277,6 +357,8 @@ class ConsultaDAO(DAO):
         Returns:
             Una lista de diccionarios, donde cada diccionario representa un documento que coincide con los criterios de búsqueda.
         """
+        if campo.lower() == "nombre":
+            return self._buscar_documentos_fts(buscar, columnas=["nombre"])
         like_buscar = f"%{buscar}%"
         params = (like_buscar,)
         sql = f"SELECT * FROM vista_asociaciones_documentos WHERE {campo} LIKE ? ORDER BY nombre"
@@ -293,23 +375,22 @@ class ConsultaDAO(DAO):
         Returns:
             Una lista de diccionarios con los documentos encontrados.
         """
-        campos_permitidos = ["nombre"]
-        like_buscar = f"%{buscar}%"
-
-        if campo.lower() == "todo":
-            sql = """
-                SELECT * FROM vista_asociaciones_documentos
-                WHERE nombre LIKE ?
-                ORDER BY nombre
-            """
-            params = (like_buscar,)
-        elif campo.lower() in campos_permitidos:
-            sql = f"SELECT * FROM vista_asociaciones_documentos WHERE {campo.lower()} LIKE ? ORDER BY nombre"
-            params = (like_buscar,)
-        else:
+        if campo.lower() not in ("todo", "nombre"):
             return []
+        return self._buscar_documentos_fts(buscar, columnas=["nombre"])
 
-        return self._ejecutar_consulta(sql=sql, params=params)
+    def _buscar_documentos_fts(self, buscar: str, columnas: List[str]) -> List[Dict[str, any]]:
+        expresion = self.expresion_fts(buscar, columnas)
+        if expresion is None:
+            return []
+        sql = f"""
+            SELECT v.*
+            FROM documento_fts f
+            JOIN vista_asociaciones_documentos v ON v.id = f.rowid
+            WHERE documento_fts MATCH ?
+            ORDER BY {self.RANGO_FTS_DOCUMENTO}, v.nombre
+        """
+        return self._ejecutar_consulta(sql=sql, params=(expresion,))
 
     def existe_asociaciones(self, id_documento: int) -> List[Dict[str, any]]:
         """
@@ -351,28 +432,9 @@ class ConsultaDAO(DAO):
             SELECT
                 v.*,
                 b.titulo,
-                COALESCE(b.numero_paginas, mp.numero_paginas_meta) AS numero_paginas
+                COALESCE(b.numero_paginas, v.numero_paginas_metadato) AS numero_paginas
             FROM vista_asociaciones_documentos v
             LEFT JOIN bibliografia b ON v.id = b.id_documento
-            LEFT JOIN (
-                SELECT
-                    m.id_documento,
-                    MAX(
-                        CASE
-                            WHEN (
-                                lower(replace(replace(m.clave, ' ', ''), '_', ''))
-                                LIKE '%pagecount%'
-                                OR lower(replace(replace(m.clave, ' ', ''), '_', ''))
-                                   IN ('pdf:pages', 'pages')
-                            )
-                                 AND trim(m.valor) <> ''
-                                 AND trim(m.valor) NOT GLOB '*[^0-9]*'
-                            THEN CAST(trim(m.valor) AS INTEGER)
-                        END
-                    ) AS numero_paginas_meta
-                FROM metadato m
-                GROUP BY m.id_documento
-            ) mp ON v.id = mp.id_documento
             ORDER BY v.nombre
         """
         return self._ejecutar_consulta(sql=sql, params=())
@@ -386,24 +448,27 @@ class ConsultaDAO(DAO):
             termino (str): El término a buscar.
 
         Returns:
-            Una lista de diccionarios con los resultados.
+            Una lista de diccionarios con los resultados, los más relevantes primero.
         """
         campos_permitidos = ["titulo", "autores", "editorial", "isbn"]
         if campo not in campos_permitidos:
             return []
 
-        like_termino = f"%{termino}%"
+        expresion = self.expresion_fts(termino, [campo])
+        if expresion is None:
+            return []
         sql = f"""
             SELECT
                 b.*,
                 d.nombre as nombre_doc,
                 d.extension as extension_doc
-            FROM bibliografia b
+            FROM documento_fts f
+            JOIN bibliografia b ON b.id_documento = f.rowid
             JOIN documento d ON b.id_documento = d.id
-            WHERE b.{campo} LIKE ?
-            ORDER BY b.titulo
+            WHERE documento_fts MATCH ?
+            ORDER BY {self.RANGO_FTS_DOCUMENTO}, b.titulo
         """
-        return self._ejecutar_consulta(sql=sql, params=(like_termino,))
+        return self._ejecutar_consulta(sql=sql, params=(expresion,))
 
     def buscar_en_contenido(self, termino: str) -> List[Dict[str, Any]]:
         """
@@ -414,192 +479,299 @@ class ConsultaDAO(DAO):
 
         Returns:
             Una lista de diccionarios con los resultados, incluyendo el tipo
-            ('Capítulo' o 'Sección'), el título, la página, y datos del documento.
+            ('Capítulo' o 'Sección'), el título, la página, y datos del documento,
+            los más relevantes primero.
         """
-        like_termino = f"%{termino}%"
+        expresion = self.expresion_fts(termino)
+        if expresion is None:
+            return []
         sql = """
-            SELECT
-                'Capítulo' as tipo,
-                c.id as id_item,
-                c.titulo as titulo_item,
-                c.pagina_inicio as pagina,
-                d.id as id_documento,
-                d.nombre as nombre_documento,
-                d.extension as extension_doc
-            FROM capitulo c
-            JOIN documento d ON c.id_documento = d.id
-            WHERE c.titulo LIKE ?
+            SELECT * FROM (
+                SELECT
+                    'Capítulo' as tipo,
+                    c.id as id_item,
+                    c.titulo as titulo_item,
+                    c.pagina_inicio as pagina,
+                    d.id as id_documento,
+                    d.nombre as nombre_documento,
+                    d.extension as extension_doc,
+                    bm25(capitulo_fts) as rango
+                FROM capitulo_fts
+                JOIN capitulo c ON c.id = capitulo_fts.rowid
+                JOIN documento d ON c.id_documento = d.id
+                WHERE capitulo_fts MATCH ?
+
+                UNION ALL
+
+                SELECT 'Sección', s.id, s.titulo, s.numero_pagina, d.id, d.nombre, d.extension,
+                       bm25(seccion_fts)
+                FROM seccion_fts
+                JOIN seccion s ON s.id = seccion_fts.rowid
+                JOIN capitulo c ON s.id_capitulo = c.id
+                JOIN documento d ON c.id_documento = d.id
+                WHERE seccion_fts MATCH ?
+            )
+            ORDER BY rango, titulo_item
+        """
+        return self._ejecutar_consulta(sql=sql, params=(expresion, expresion))
 
-            UNION ALL
+    def buscar_en_texto_paginas(self, termino: str, limite: int = 100) -> List[Dict[str, Any]]:
+        """
+        Busca un término en el texto extraído de las páginas de los documentos.
 
-            SELECT 'Sección', s.id, s.titulo, s.numero_pagina, d.id, d.nombre, d.extension
-            FROM seccion s
-            JOIN capitulo c ON s.id_capitulo = c.id
-            JOIN documento d ON c.id_documento = d.id
-            WHERE s.titulo LIKE ?
+        Solo se descomprime el texto de las páginas devueltas, para recortar
+        el fragmento que rodea a la coincidencia.
+
+        Args:
+            termino (str): El término a buscar.
+            limite (int): Número máximo de páginas.
+
+        Returns:
+            Una lista de diccionarios (id_item, id_documento, nombre_documento,
+            extension_doc, pagina, fragmento), las páginas más relevantes primero.
         """
-        return self._ejecutar_consulta(sql=sql, params=(like_termino, like_termino))
+        expresion = self.expresion_fts(termino)
+        if expresion is None:
+            return []
+        sql = """
+            SELECT
+                t.id as id_item,
+                t.id_documento,
+                d.nombre as nombre_documento,
+                d.extension as extension_doc,
+                t.numero_pagina as pagina,
+                t.texto
+            FROM (
+                SELECT rowid, bm25(texto_pagina_fts) AS rango FROM texto_pagina_fts
+                WHERE texto_pagina_fts MATCH ?
+                ORDER BY rango LIMIT ?
+            ) f
+            JOIN texto_pagina t ON t.id = f.rowid
+            JOIN documento d ON d.id = t.id_documento
+            ORDER BY f.rango, t.id_documento, t.numero_pagina
+        """
+        resultados = self._ejecutar_consulta(sql=sql, params=(expresion, limite))
+        for resultado in resultados:
+            resultado["fragmento"] = fragmento_coincidencia(
+                descomprimir_texto(resultado.pop("texto")), termino
+            )
+        return resultados
 
     def buscar_en_estante(
-        self, campo: str, termino: str, limit: int, offset: int
+        self,
+        campo: str,
+        termino: str,
+        limit: int,
+        offset: int,
+        despues_de: Optional[Tuple[str, int]] = None,
+        tipo_organizacion: Optional[str] = None,
+        id_organizacion: Optional[int] = None,
+        orden: str = "relevancia",
     ) -> List[Dict[str, Any]]:
         """
-        Busca documentos de forma dinámica en diferentes tablas (documento,
-        bibliografia, coleccion, grupo) según el campo especificado.
+        Busca documentos para el estante en el índice de texto completo
+        (nombre, bibliografía, colecciones y grupos), opcionalmente solo
+        entre los de una organización (colección, grupo, categoría, etiqueta
+        o palabra clave).
+
+        Los filtros se combinan en una única consulta. Primero se obtiene la
+        página de ids, ordenada por relevancia (bm25) o por nombre si así se
+        pide, si no hay término o si coinciden más de
+        `LIMITE_ORDEN_RELEVANCIA` documentos, y solo para esos documentos se
+        leen la bibliografía y el número de páginas (de la bibliografía o,
+        si no lo tiene, el extraído de los metadatos al importar).
+
+        Cuando el orden es por nombre y se indica `despues_de`, la página se
+        busca por clave: empieza justo después de ese documento en el índice
+        de (nombre, id), así que cualquier página cuesta lo mismo que la
+        primera, y `offset` se ignora.
 
         Args:
             campo (str): El campo por el cual buscar.
             termino (str): El término de búsqueda.
+            limit (int): Número máximo de resultados.
+            offset (int): Desplazamiento para paginación.
+            despues_de (Optional[Tuple[str, int]]): (nombre, id) del último
+                documento de la página anterior.
+            tipo_organizacion (Optional[str]): Clave de `TABLAS_ORGANIZACION`.
+            id_organizacion (Optional[int]): Id de la organización.
+            orden (str): "relevancia" o "nombre".
 
         Returns:
             List[Dict[str, Any]]: Una lista de diccionarios que representan
                                   los documentos encontrados.
         """
-        like_termino = f"%{termino}%"
-        params = (like_termino,)
-        paginas_select = "COALESCE(b.numero_paginas, mp.numero_paginas_meta) AS numero_paginas"
-        join_paginas_metadato = """
-            LEFT JOIN (
-                SELECT
-                    m.id_documento,
-                    MAX(
-                        CASE
-                            WHEN (
-                                lower(replace(replace(m.clave, ' ', ''), '_', ''))
-                                LIKE '%pagecount%'
-                                OR lower(replace(replace(m.clave, ' ', ''), '_', ''))
-                                   IN ('pdf:pages', 'pages')
-                            )
-                                 AND trim(m.valor) <> ''
-                                 AND trim(m.valor) NOT GLOB '*[^0-9]*'
-                            THEN CAST(trim(m.valor) AS INTEGER)
-                        END
-                    ) AS numero_paginas_meta
-                FROM metadato m
-                GROUP BY m.id_documento
-            ) mp ON v.id = mp.id_documento
-        """
-
-        # Mapeo de campos a sus respectivas tablas y columnas
-        mapa_busqueda = {
-            "nombre": ("documento", "v.nombre"),
-            "titulo": ("bibliografia", "b.titulo"),
-            "autores": ("bibliografia", "b.autores"),
-            "editorial": ("bibliografia", "b.editorial"),
-            "isbn": ("bibliografia", "b.isbn"),
-            "coleccion": ("coleccion", "c.nombre"),
-            "grupo": ("grupo", "g.nombre"),
-        }
-
-        campo_lower = campo.lower()
-
-        if campo_lower == "todo":
-            # Búsqueda en múltiples campos
-            sql = f"""
-                SELECT DISTINCT v.*, b.titulo, {paginas_select}
-                FROM vista_asociaciones_documentos v
-                LEFT JOIN bibliografia b ON v.id = b.id_documento
-                {join_paginas_metadato}
-                LEFT JOIN documento_coleccion dc ON v.id = dc.id_documento
-                LEFT JOIN coleccion c ON dc.id_coleccion = c.id
-                LEFT JOIN documento_grupo dg ON v.id = dg.id_documento
-                LEFT JOIN grupo g ON dg.id_grupo = g.id
-                WHERE v.nombre LIKE ? OR b.titulo LIKE ? OR b.autores LIKE ?
-                   OR c.nombre LIKE ? OR g.nombre LIKE ?"""
-            params = (
-                like_termino,
-                like_termino,
-                like_termino,
-                like_termino,
-                like_termino,
-            )
-        elif campo_lower in mapa_busqueda:
-            tabla, columna = mapa_busqueda[campo_lower]
-            if tabla == "documento":
-                sql = f"""
-                    SELECT v.*, b.titulo, {paginas_select}
-                    FROM vista_asociaciones_documentos v
-                    LEFT JOIN bibliografia b ON v.id = b.id_documento
-                    {join_paginas_metadato}
-                    WHERE {columna} LIKE ?"""
-            elif tabla == "bibliografia":
-                sql = f"""
-                    SELECT DISTINCT v.*, b.titulo, {paginas_select}
-                    FROM vista_asociaciones_documentos v
-                    JOIN bibliografia b ON v.id = b.id_documento
-                    {join_paginas_metadato}
-                    WHERE {columna} LIKE ?"""
-            elif tabla == "coleccion":
-                sql = f"""
-                    SELECT DISTINCT v.*, b.titulo, {paginas_select}
-                    FROM vista_asociaciones_documentos v
-                    LEFT JOIN bibliografia b ON v.id = b.id_documento
-                    {join_paginas_metadato}
-                    JOIN documento_coleccion dc ON v.id = dc.id_documento
-                    JOIN coleccion c ON dc.id_coleccion = c.id WHERE {columna} LIKE ?"""
-            elif tabla == "grupo":
-                sql = f"""
-                    SELECT DISTINCT v.*, b.titulo, {paginas_select}
-                    FROM vista_asociaciones_documentos v
-                    LEFT JOIN bibliografia b ON v.id = b.id_documento
-                    {join_paginas_metadato}
-                    JOIN documento_grupo dg ON v.id = dg.id_documento
-                    JOIN grupo g ON dg.id_grupo = g.id WHERE {columna} LIKE ?"""
-        else:
+        columnas = self.COLUMNAS_FTS_CAMPO.get(campo.lower())
+        if columnas is None or orden not in self.ORDENES_ESTANTE:
             # Campo no válido, no devolver nada
             return []
+        if tipo_organizacion and tipo_organizacion not in self.TABLAS_ORGANIZACION:
+            return []
+        sql_organizacion, params_organizacion = self._filtro_organizacion(
+            tipo_organizacion, id_organizacion, "documento.id"
+        )
+
+        expresion = self.expresion_fts(termino, columnas)
+        if (
+            expresion is None
+            or orden == "nombre"
+            or self._hay_mas_coincidencias(
+                expresion,
+                self.LIMITE_ORDEN_RELEVANCIA,
+                self._filtro_organizacion(
+                    tipo_organizacion, id_organizacion, "documento_fts.rowid"
+                ),
+            )
+        ):
+            # se recorre el índice por nombre hasta llenar la página
+            condiciones, params, indice = [], [], ""
+            if sql_organizacion:
+                # la organización acota los candidatos: se leen por id y se ordenan
+                condiciones.append(sql_organizacion)
+                params.extend(params_organizacion)
+            if expresion is not None:
+                if not sql_organizacion:
+                    # sin la pista el planificador recorrería antes el índice FTS
+                    indice = "INDEXED BY idx_documento_nombre"
+                condiciones.append(
+                    "id IN (SELECT rowid FROM documento_fts WHERE documento_fts MATCH ?)"
+                )
+                params.append(expresion)
+            if despues_de is not None:
+                condiciones.append("(nombre, id) > (?, ?)")
+                params.extend(despues_de)
+                offset = 0
+            where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+            sql_pagina = f"""
+                SELECT id, 0 AS rango FROM documento {indice}
+                {where}
+                ORDER BY nombre, id LIMIT ? OFFSET ?"""
+            params = (*params, limit, offset)
+        else:
+            sql_fts, params_fts = self._filtro_organizacion(
+                tipo_organizacion, id_organizacion, "documento_fts.rowid", con_rango=True
+            )
+            where_organizacion = f"AND {sql_fts}" if sql_fts else ""
+            sql_pagina = f"""
+                SELECT rowid AS id, {self.RANGO_FTS_DOCUMENTO} AS rango FROM documento_fts
+                WHERE documento_fts MATCH ? {where_organizacion}
+                ORDER BY rango, nombre, rowid LIMIT ? OFFSET ?"""
+            params = (expresion, *params_fts, limit, offset)
 
-        # Añadir paginación y orden
-        sql += " ORDER BY v.nombre LIMIT ? OFFSET ?"
-        params = (*params, limit, offset)
-
-        return self._ejecutar_consulta(sql=sql, params=params)
-
-    def count_buscar_en_estante(self, campo: str, termino: str) -> int:
-        """
-        Cuenta los documentos que coinciden con una búsqueda dinámica en el estante.
+        sql = f"""
+            WITH pagina AS ({sql_pagina})
+            SELECT
+                v.*,
+                b.titulo,
+                COALESCE(b.numero_paginas, v.numero_paginas_metadato) AS numero_paginas
+            FROM pagina p
+            JOIN vista_asociaciones_documentos v ON v.id = p.id
+            LEFT JOIN bibliografia b ON v.id = b.id_documento
+            ORDER BY p.rango, v.nombre, v.id
         """
-        like_termino = f"%{termino}%"
-        params = (like_termino,)
+        return self._ejecutar_consulta(sql=sql, params=params)
 
-        mapa_busqueda = {
-            "nombre": ("documento", "v.nombre"),
-            "titulo": ("bibliografia", "b.titulo"),
-            "autores": ("bibliografia", "b.autores"),
-            "editorial": ("bibliografia", "b.editorial"),
-            "isbn": ("bibliografia", "b.isbn"),
-            "coleccion": ("coleccion", "c.nombre"),
-            "grupo": ("grupo", "g.nombre"),
-        }
+    def _filtro_organizacion(
+        self,
+        tipo_organizacion: Optional[str],
+        id_organizacion: Optional[int],
+        columna_id: str,
+        con_rango: bool = False,
+    ) -> Tuple[str, tuple]:
+        """
+        Construye la condición que restringe `columna_id` a los documentos de
+        una organización.
+
+        Sobre `documento` la organización se lee por su índice y los
+        documentos por id. Sobre `documento_fts` eso solo conviene si la
+        organización es pequeña (se consulta el índice FTS una vez por
+        documento); si no, o si se calcula bm25 (que repetiría sus
+        estadísticas en cada consulta), se recorre el índice una vez y cada
+        coincidencia se comprueba contra la clave primaria de la tabla de
+        asociación.
 
-        campo_lower = campo.lower()
-
-        if campo_lower == "todo":
-            sql = """
-                SELECT COUNT(DISTINCT v.id) as total FROM vista_asociaciones_documentos v
-                LEFT JOIN bibliografia b ON v.id = b.id_documento
-                LEFT JOIN documento_coleccion dc ON v.id = dc.id_documento
-                LEFT JOIN coleccion c ON dc.id_coleccion = c.id
-                LEFT JOIN documento_grupo dg ON v.id = dg.id_documento
-                LEFT JOIN grupo g ON dg.id_grupo = g.id
-                WHERE v.nombre LIKE ? OR b.titulo LIKE ? OR b.autores LIKE ?
-                   OR c.nombre LIKE ? OR g.nombre LIKE ?
-            """
-            params = (like_termino, like_termino, like_termino, like_termino, like_termino)
-        elif campo_lower in mapa_busqueda:
-            tabla, columna = mapa_busqueda[campo_lower]
-            if tabla == "documento":
-                sql = f"SELECT COUNT(v.id) as total FROM vista_asociaciones_documentos v WHERE {columna} LIKE ?"
-            elif tabla == "bibliografia":
-                sql = f"SELECT COUNT(DISTINCT v.id) as total FROM vista_asociaciones_documentos v JOIN bibliografia b ON v.id = b.id_documento WHERE {columna} LIKE ?"
-            elif tabla == "coleccion":
-                sql = f"SELECT COUNT(DISTINCT v.id) as total FROM vista_asociaciones_documentos v JOIN documento_coleccion dc ON v.id = dc.id_documento JOIN coleccion c ON dc.id_coleccion = c.id WHERE {columna} LIKE ?"
-            elif tabla == "grupo":
-                sql = f"SELECT COUNT(DISTINCT v.id) as total FROM vista_asociaciones_documentos v JOIN documento_grupo dg ON v.id = dg.id_documento JOIN grupo g ON dg.id_grupo = g.id WHERE {columna} LIKE ?"
+        Returns:
+            Tuple[str, tuple]: La condición y sus parámetros (vacía si no se filtra).
+        """
+        tabla = self.TABLAS_ORGANIZACION.get(tipo_organizacion or "")
+        if tabla is None or id_organizacion is None:
+            return "", ()
+        nombre_tabla, columna = tabla
+        if columna_id.startswith("documento_fts") and (
+            con_rango or not self._organizacion_pequena(nombre_tabla, columna, id_organizacion)
+        ):
+            sql = (
+                f"EXISTS (SELECT 1 FROM {nombre_tabla} o "
+                f"WHERE o.id_documento = {columna_id} AND o.{columna} = ?)"
+            )
         else:
+            sql = f"{columna_id} IN (SELECT id_documento FROM {nombre_tabla} WHERE {columna} = ?)"
+        return sql, (id_organizacion,)
+
+    def _organizacion_pequena(self, nombre_tabla: str, columna: str, id_organizacion: int) -> bool:
+        """Indica si la organización tiene como mucho `LIMITE_ORDEN_RELEVANCIA` documentos."""
+        result = self._ejecutar_consulta(
+            sql=f"""SELECT COUNT(*) AS total FROM (
+                SELECT 1 FROM {nombre_tabla} WHERE {columna} = ? LIMIT ?
+            )""",
+            params=(id_organizacion, self.LIMITE_ORDEN_RELEVANCIA + 1),
+        )
+        return bool(result) and result[0]["total"] <= self.LIMITE_ORDEN_RELEVANCIA
+
+    def _hay_mas_coincidencias(
+        self, expresion: str, limite: int, filtro: Tuple[str, tuple] = ("", ())
+    ) -> bool:
+        """Indica si la expresión FTS coincide con más de `limite` documentos."""
+        sql_organizacion, params_organizacion = filtro
+        where_organizacion = f"AND {sql_organizacion}" if sql_organizacion else ""
+        sql = f"""
+            SELECT COUNT(*) AS total FROM (
+                SELECT 1 FROM documento_fts
+                WHERE documento_fts MATCH ? {where_organizacion} LIMIT ?
+            )
+        """
+        result = self._ejecutar_consulta(
+            sql=sql, params=(expresion, *params_organizacion, limite + 1)
+        )
+        return bool(result) and result[0]["total"] > limite
+
+    def count_buscar_en_estante(
+        self,
+        campo: str,
+        termino: str,
+        tipo_organizacion: Optional[str] = None,
+        id_organizacion: Optional[int] = None,
+    ) -> int:
+        """
+        Cuenta los documentos que coinciden con una búsqueda dinámica en el
+        estante, con los mismos filtros que `buscar_en_estante`.
+        """
+        columnas = self.COLUMNAS_FTS_CAMPO.get(campo.lower())
+        if columnas is None or (
+            tipo_organizacion and tipo_organizacion not in self.TABLAS_ORGANIZACION
+        ):
             return 0
-
-        result = self._ejecutar_consulta(sql=sql, params=params)
+        sql_organizacion, params_organizacion = self._filtro_organizacion(
+            tipo_organizacion, id_organizacion, "documento.id"
+        )
+
+        expresion = self.expresion_fts(termino, columnas)
+        if expresion is None:
+            where = f"WHERE {sql_organizacion}" if sql_organizacion else ""
+            result = self._ejecutar_consulta(
+                sql=f"SELECT COUNT(*) as total FROM documento {where}",
+                params=params_organizacion,
+            )
+        else:
+            sql_fts, params_fts = self._filtro_organizacion(
+                tipo_organizacion, id_organizacion, "documento_fts.rowid"
+            )
+            where_organizacion = f"AND {sql_fts}" if sql_fts else ""
+            result = self._ejecutar_consulta(
+                sql=f"""SELECT COUNT(*) as total FROM documento_fts
+                WHERE documento_fts MATCH ? {where_organizacion}""",
+                params=(expresion, *params_fts),
+            )
         return result[0]['total'] if result and result[0]['total'] is not None else 0
 
     # ┌────────────────────────────────────────────────────────────┐
@@ -620,6 +792,61 @@ class ConsultaDAO(DAO):
         params = (id_documento,)
         return self._ejecutar_consulta(sql=sql, params=params)
 
+    def arbol_contenido_documento(self, id_documento: int) -> List[Dict[str, Any]]:
+        """
+        Obtiene en una sola consulta los capítulos de un documento y todas
+        sus secciones, en el orden en que se insertan en un árbol: cada
+        capítulo (por número) seguido de sus secciones en profundidad, de
+        modo que el padre de cada fila siempre aparece antes que ella.
+
+        Las secciones cuyo padre no está en el mismo capítulo cuelgan del
+        capítulo.
+
+        Args:
+            id_documento (int): Documento del que se obtiene el contenido.
+
+        Returns:
+            List[Dict[str, Any]]: Filas con `tipo` ("capitulo" o "seccion"),
+            `id`, `id_capitulo`, `id_padre`, `titulo`, `numero_capitulo`,
+            `nivel`, `numero_pagina` y `profundidad` (0 para los capítulos).
+        """
+        sql = """
+        WITH RECURSIVE
+        capitulos AS (
+            SELECT * FROM capitulo WHERE id_documento = ?
+        ),
+        arbol(id, id_capitulo, profundidad, ruta) AS (
+            SELECT s.id, s.id_capitulo, 1, printf('%010d', s.id)
+            FROM seccion s
+            JOIN capitulos c ON c.id = s.id_capitulo
+            WHERE s.id_padre IS NULL
+               OR NOT EXISTS (
+                    SELECT 1 FROM seccion p
+                    WHERE p.id = s.id_padre AND p.id_capitulo = s.id_capitulo
+               )
+            UNION ALL
+            SELECT s.id, s.id_capitulo, a.profundidad + 1, a.ruta || '.' || printf('%010d', s.id)
+            FROM arbol a
+            JOIN seccion s ON s.id_padre = a.id AND s.id_capitulo = a.id_capitulo
+        )
+        SELECT 'capitulo' AS tipo, c.id, c.id_documento, c.id AS id_capitulo,
+               NULL AS id_padre, c.titulo, c.numero_capitulo, NULL AS nivel,
+               c.pagina_inicio AS numero_pagina, c.creado_en, c.actualizado_en,
+               0 AS profundidad, c.numero_capitulo AS orden_capitulo, '' AS ruta
+        FROM capitulos c
+        UNION ALL
+        SELECT 'seccion', s.id, c.id_documento, s.id_capitulo,
+               s.id_padre, s.titulo, NULL, s.nivel,
+               s.numero_pagina, s.creado_en, s.actualizado_en,
+               a.profundidad, c.numero_capitulo, a.ruta
+        FROM arbol a
+        JOIN seccion s ON s.id = a.id
+        JOIN capitulos c ON c.id = a.id_capitulo
+        ORDER BY orden_capitulo, id_capitulo, ruta
+        """
+        params = (id_documento,)
+        return self._ejecutar_consulta(sql=sql, params=params)
+
     # ┌────────────────────────────────────────────────────────────┐
     # │ Seccion
     # └────────────────────────────────────────────────────────────┘
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 import sqlite3
 from contextlib import contextmanager
 import threading
+from models.daos.cache_consultas import CacheConsultas, tabla_escrita
+from models.daos.connection_sqlite import Database
+from models.daos.registro_esquema import RegistroEsquema
 from utilities.configuracion import RUTA_DATA
 from os.path import join
 import logging
@@ -13,7 +16,8 @@ logger = logging.getLogger(__name__)
 class DAO(ABC):
     """
     Clase abstracta base para los Data Access Objects (DAO).
-    Versión thread-safe que crea conexiones independientes por operación.
+    Versión thread-safe que reutiliza la conexión de larga duración de cada
+    thread a través del pool de `Database`.
     """
 
     def __init__(self, ruta_db: Optional[str] = None):
@@ -25,29 +29,55 @@ class DAO(ABC):
             ruta_db = join(RUTA_DATA, "bibliotecaTK.sqlite3")
 
         self._ruta_db = ruta_db
+        self._db = Database(ruta_db=ruta_db)
         self._lock = threading.Lock()
 
-        # Crear la tabla
-        self.crear_tabla()
+        # Crear la tabla una sola vez por proceso y base de datos
+        clase = type(self)
+        RegistroEsquema.asegurar_tabla(
+            self._db.ruta_db, f"{clase.__module__}.{clase.__qualname__}", self.crear_tabla
+        )
+
+    @property
+    def ruta_db(self) -> str:
+        """
+        Ruta normalizada de la base de datos del DAO.
+        """
+        return self._db.ruta_db
 
     @contextmanager
     def _get_connection(self):
         """
         Context manager para obtener una conexión thread-safe.
-        Crea una nueva conexión que se cierra automáticamente.
-        """
-        con = sqlite3.connect(self._ruta_db)
-        con.row_factory = sqlite3.Row
-        con.execute("PRAGMA foreign_keys = ON")
-
+        Presta la conexión del thread actual desde el pool de `Database`
+        y hace commit/rollback al salir, sin cerrarla.
+
+        Al salir del bloque más externo invalida en `CacheConsultas` las
+        tablas escritas dentro (o toda la base de datos si hubo cambios sin
+        tablas anotadas con `_registrar_escritura`).
+        """
+        if self._db.en_transaccion():
+            with self._db.transaccion() as con:
+                yield con
+            return
+        con = None
+        cambios = 0
         try:
-            yield con
-            con.commit()
-        except Exception as e:
-            con.rollback()
-            raise e
+            with self._db.transaccion() as con:
+                cambios = con.total_changes
+                yield con
         finally:
-            con.close()
+            CacheConsultas.confirmar_escrituras(
+                self._db.ruta_db,
+                hubo_cambios=con is not None and con.total_changes != cambios,
+            )
+
+    def _registrar_escritura(self, *tablas: Optional[str]):
+        """
+        Anota las tablas que escribe la transacción en curso para invalidar
+        las consultas guardadas que dependen de ellas.
+        """
+        CacheConsultas.registrar_escritura(self._db.ruta_db, tablas)
 
     @abstractmethod
     def crear_tabla(self):
@@ -93,6 +123,7 @@ class DAO(ABC):
             return None
         try:
             with self._get_connection() as con:
+                self._registrar_escritura(tabla_escrita(sql))
                 cursor = con.cursor()
                 cursor.execute(sql, params)
                 return cursor.lastrowid
@@ -117,6 +148,21 @@ class DAO(ABC):
             logger.error("Error al ejecutar consulta: %s", ex)
             return []
 
+    def _consultar_por_ids(
+        self, sql: str, ids: Sequence[int], tamano_lote: int = 500
+    ) -> List[Dict[str, Any]]:
+        """
+        Ejecuta una consulta SELECT para una lista de ids, en lotes de
+        `tamano_lote`. `sql` lleva `{marcadores}` donde van los `?` del IN.
+        """
+        filas: List[Dict[str, Any]] = []
+        ids = list(dict.fromkeys(ids))
+        for inicio in range(0, len(ids), tamano_lote):
+            lote = tuple(ids[inicio : inicio + tamano_lote])
+            marcadores = ", ".join("?" for _ in lote)
+            filas.extend(self._ejecutar_consulta(sql.format(marcadores=marcadores), lote))
+        return filas
+
     def _ejecutar_actualizacion(self, sql: str, params: tuple = ()) -> bool:
         """
         Ejecuta una actualización o eliminación thread-safe.
@@ -126,6 +172,7 @@ class DAO(ABC):
             return False
         try:
             with self._get_connection() as con:
+                self._registrar_escritura(tabla_escrita(sql))
                 cursor = con.cursor()
                 cursor.execute(sql, params)
                 return cursor.rowcount > 0
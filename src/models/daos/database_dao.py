@@ -1,5 +1,7 @@
 import sqlite3
+from models.daos.cache_consultas import CacheConsultas
 from models.daos.connection_sqlite import Database
+from models.daos.registro_esquema import RegistroEsquema
 from models.dtos.database_dto import DataBaseDTO
 
 
@@ -27,11 +29,23 @@ class DataBaseDAO:
 
         Ejecuta las sentencias SQL en el orden correcto para asegurar que las
         dependencias (como las claves foráneas) se resuelvan correctamente.
+        Al terminar registra la base de datos en `RegistroEsquema`, de modo
+        que construir DAOs o entidades ya no vuelve a ejecutar DDL.
         """
         try:
             con = self._db.obtener_conexion()
             cursor = con.cursor()
 
+            # Bases de datos anteriores a `documento_flags`: sus vistas se recrean
+            migrar_vistas = not self._existe_tabla(cursor, "documento_flags")
+            # Índices de contenido externo que hay que construir la primera vez
+            crear_fts = not self._existe_tabla(cursor, "capitulo_fts")
+            # Bases de datos anteriores a las columnas derivadas de los metadatos
+            migrar_metadatos = self._existe_tabla(cursor, "documento") and not self._existe_columna(
+                cursor, "documento", "numero_paginas_metadato"
+            )
+            migrar_vistas = migrar_vistas or migrar_metadatos
+
             # Lista de todas las sentencias de creación de tablas
             tablas_sql = [
                 self._dto.sql_table_documento,
@@ -40,6 +54,8 @@ class DataBaseDAO:
                 self._dto.sql_table_capitulo,
                 self._dto.sql_table_seccion,
                 self._dto.sql_table_favorito,
+                self._dto.sql_table_progreso_lectura,
+                self._dto.sql_table_comentario,
                 self._dto.sql_table_categoria,
                 self._dto.sql_table_grupo,
                 self._dto.sql_table_coleccion,
@@ -50,13 +66,26 @@ class DataBaseDAO:
                 self._dto.sql_table_documento_coleccion,
                 self._dto.sql_table_documento_grupo,
                 self._dto.sql_table_documento_etiqueta,
+                self._dto.sql_table_documento_flags,
+                self._dto.sql_fts_documento,
+                self._dto.sql_fts_capitulo,
+                self._dto.sql_fts_seccion,
+                self._dto.sql_table_texto_pagina,
+                self._dto.sql_fts_texto_pagina,
+                self._dto.sql_table_extraccion_texto,
             ]
 
             # 1. Crear todas las tablas
             for sql in tablas_sql:
                 cursor.execute(sql)
+            if migrar_metadatos:
+                for sql in self._dto.sql_migracion_metadatos_derivados:
+                    cursor.execute(sql)
 
             # 2. Crear la vista
+            if migrar_vistas:
+                for sql in self._dto.sql_migracion_vistas:
+                    cursor.execute(sql)
             views_sql = [
                 self._dto.sql_view_asociaciones_documentos,
                 self._dto.sql_view_documento_asociaciones,
@@ -67,14 +96,49 @@ class DataBaseDAO:
             # 3. Crear todos los disparadores
             for sql in self._dto.sql_triggers:
                 cursor.execute(sql)
+            for sql in self._dto.sql_triggers_flags:
+                cursor.execute(sql)
+            for sql in self._dto.sql_triggers_fts:
+                cursor.execute(sql)
+            for sql in self._dto.sql_triggers_metadatos_derivados:
+                cursor.execute(sql)
 
             # 4. Crear todos los índices
             for sql in self._dto.sql_indexes:
                 cursor.execute(sql)
 
+            # 5. Indicadores de los documentos que aún no los tienen
+            cursor.execute(self._dto.sql_rellenar_documento_flags)
+
+            # 6. Índices de texto completo de los datos anteriores
+            cursor.execute(self._dto.sql_rellenar_documento_fts)
+            if crear_fts:
+                for sql in self._dto.sql_reconstruir_fts_contenido:
+                    cursor.execute(sql)
+
+            # 7. Datos derivados de los metadatos ya guardados
+            if migrar_metadatos:
+                cursor.execute(self._dto.sql_rellenar_metadatos_derivados)
+
             con.commit()
+            RegistroEsquema.marcar_inicializada(self._db.ruta_db)
+            # las migraciones pueden haber reescrito cualquier tabla
+            CacheConsultas.invalidar(self._db.ruta_db)
 
         except sqlite3.Error as e:
             print(f"Error al crear la base de datos: {e}")
             self._db.obtener_conexion().rollback()
             raise
+
+    @staticmethod
+    def _existe_columna(cursor: sqlite3.Cursor, tabla: str, columna: str) -> bool:
+        return any(fila["name"] == columna for fila in cursor.execute(f"PRAGMA table_info({tabla})"))
+
+    @staticmethod
+    def _existe_tabla(cursor: sqlite3.Cursor, nombre: str) -> bool:
+        return (
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (nombre,)
+            ).fetchone()
+            is not None
+        )
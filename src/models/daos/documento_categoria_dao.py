@@ -34,13 +34,11 @@ class DocumentoCategoriaDAO(DAO):
         )
         """
         try:
-            con = self._conectar()
-            cursor = con.cursor()
-            cursor.execute(sql)
-            con.commit()
+            with self._get_connection() as con:
+                cursor = con.cursor()
+                cursor.execute(sql)
         except sqlite3.Error as ex:
             print(f"Error al crear la tabla documento_categoria: {ex}")
-            self._conectar().rollback()
             raise
 
     def insertar(self, sql: str = None, params: tuple = ()) -> Optional[int]:
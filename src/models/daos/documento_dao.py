@@ -33,17 +33,18 @@ class DocumentoDAO(DAO):
             tamano INTEGER CHECK (tamano >= 0),
             esta_activo INTEGER DEFAULT 1,
             creado_en DATETIME DEFAULT CURRENT_TIMESTAMP,
-            actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP
+            actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP,
+            numero_paginas_metadato INTEGER,
+            titulo_metadato TEXT,
+            autor_metadato TEXT
         )
         """
         try:
-            con = self._conectar()
-            cursor = con.cursor()
-            cursor.execute(sql)
-            con.commit()
+            with self._get_connection() as con:
+                cursor = con.cursor()
+                cursor.execute(sql)
         except sqlite3.Error as ex:
             print(f"Error al crear la tabla documento: {ex}")
-            self._conectar().rollback()
             raise
 
     def insertar(self, sql: str = None, params: tuple = ()) -> Optional[int]:
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Tuple
 from models.daos.dao import DAO
 import sqlite3
 
@@ -36,13 +36,11 @@ class MetadatoDAO(DAO):
         )
         """
         try:
-            con = self._conectar()
-            cursor = con.cursor()
-            cursor.execute(sql)
-            con.commit()
+            with self._get_connection() as con:
+                cursor = con.cursor()
+                cursor.execute(sql)
         except sqlite3.Error as ex:
             print(f"Error al crear la tabla metadato: {ex}")
-            self._conectar().rollback()
             raise
 
     def insertar(self, sql: str = None, params: tuple = ()) -> Optional[int]:
@@ -75,17 +73,70 @@ class MetadatoDAO(DAO):
         """
         if sql is None:
             sql = "DELETE FROM metadato WHERE id = ?"
+        return self._ejecutar_actualizacion(sql, params)
+
+    def insertar_lote(self, filas: Iterable[Tuple[int, str, Any]]) -> int:
+        """
+        Inserta varios metadatos con `executemany` en una sola transacción.
 
+        Args:
+            filas (Iterable[Tuple[int, str, Any]]): Tuplas (id_documento, clave, valor).
+                                                    Los valores None se omiten y el
+                                                    resto se guarda como texto.
+
+        Returns:
+            int: Número de metadatos insertados (0 si falla; no se guarda ninguno).
+        """
+        sql = "INSERT INTO metadato (id_documento, clave, valor) VALUES (?, ?, ?)"
+        params = [
+            (id_documento, str(clave), str(valor))
+            for id_documento, clave, valor in filas
+            if valor is not None
+        ]
+        if not params:
+            return 0
         try:
-            con = self._conectar()
-            cursor = con.cursor()
-            cursor.execute(sql, params)
-            con.commit()
-            return cursor.rowcount > 0
+            with self._get_connection() as con:
+                self._registrar_escritura("metadato")
+                con.executemany(sql, params)
+            return len(params)
         except sqlite3.Error as ex:
-            print(f"Error al eliminar metadato: {ex}")
-            con.rollback()
-            return False
+            print(f"Error al insertar metadatos: {ex}")
+            return 0
+
+    def insertar_metadatos(self, id_documento: int, metadatos: Mapping[str, Any]) -> int:
+        """
+        Inserta todos los metadatos de un documento con un único commit.
+
+        Args:
+            id_documento (int): ID del documento.
+            metadatos (Mapping[str, Any]): Diccionario clave -> valor (p. ej. de exiftool).
+
+        Returns:
+            int: Número de metadatos insertados.
+        """
+        return self.insertar_lote(
+            (id_documento, clave, valor) for clave, valor in metadatos.items()
+        )
+
+    def insertar_metadatos_documentos(
+        self, metadatos_por_documento: Mapping[int, Mapping[str, Any]]
+    ) -> int:
+        """
+        Inserta los metadatos de varios documentos con un único commit.
+
+        Args:
+            metadatos_por_documento (Mapping[int, Mapping[str, Any]]):
+                id_documento -> diccionario clave -> valor.
+
+        Returns:
+            int: Número de metadatos insertados.
+        """
+        return self.insertar_lote(
+            (id_documento, clave, valor)
+            for id_documento, metadatos in metadatos_por_documento.items()
+            for clave, valor in metadatos.items()
+        )
 
     def instanciar(self, sql: str = None, params: tuple = ()) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,161 @@
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+from models.daos.dao import DAO
+import sqlite3
+
+
+class ProgresoLecturaDAO(DAO):
+    """
+    DAO para la gestión de la tabla `progreso_lectura` en la base de datos.
+
+    Guarda la página en la que va la lectura de cada documento; el registro
+    se borra en cascada con el documento.
+    """
+
+    def __init__(self, ruta_db: Optional[str] = None):
+        """
+        Inicializa el DAO de ProgresoLectura.
+
+        Args:
+            ruta_db (Optional[str]): Ruta opcional al archivo de la base de datos.
+        """
+        super().__init__(ruta_db)
+
+    def crear_tabla(self):
+        """
+        Crea la tabla `progreso_lectura` en la base de datos si no existe.
+        """
+        sql = """
+        CREATE TABLE IF NOT EXISTS progreso_lectura(
+            id_documento INTEGER PRIMARY KEY,
+            pagina_actual INTEGER NOT NULL DEFAULT 0,
+            en_lectura INTEGER NOT NULL DEFAULT 0,
+            actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (id_documento) REFERENCES documento (id) ON DELETE CASCADE
+        )
+        """
+        try:
+            with self._get_connection() as con:
+                cursor = con.cursor()
+                cursor.execute(sql)
+        except sqlite3.Error as ex:
+            print(f"Error al crear la tabla progreso_lectura: {ex}")
+            raise
+
+    def insertar(self, sql: str = None, params: tuple = ()) -> Optional[int]:
+        """
+        Guarda el progreso de un documento, reemplazando el anterior si lo hay.
+
+        Por defecto, espera los parámetros en el orden:
+        (id_documento, pagina_actual, en_lectura, actualizado_en).
+
+        Returns:
+            Optional[int]: El ID del documento, o None si falla.
+        """
+        if sql is None:
+            sql = """
+            INSERT INTO progreso_lectura (id_documento, pagina_actual, en_lectura, actualizado_en)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(id_documento) DO UPDATE SET
+                pagina_actual = excluded.pagina_actual,
+                en_lectura = excluded.en_lectura,
+                actualizado_en = excluded.actualizado_en
+            """
+        return self._ejecutar_insertar(sql, params)
+
+    def guardar(self, id_documento: int, pagina_actual: int, en_lectura: bool = True) -> bool:
+        """
+        Guarda la página actual de un documento.
+
+        Returns:
+            bool: True si se guardó, False en caso contrario.
+        """
+        actualizado_en = datetime.now().isoformat(timespec="seconds")
+        params = (int(id_documento), max(0, int(pagina_actual)), int(bool(en_lectura)), actualizado_en)
+        return self.insertar(params=params) is not None
+
+    def eliminar(self, sql: str = None, params: tuple = ()) -> bool:
+        """
+        Elimina el progreso de lectura de un documento.
+
+        Por defecto, espera el parámetro: (id_documento).
+
+        Returns:
+            bool: True si se eliminó el progreso, False en caso contrario.
+        """
+        if sql is None:
+            sql = "DELETE FROM progreso_lectura WHERE id_documento = ?"
+        return self._ejecutar_actualizacion(sql, params)
+
+    def instanciar(self, sql: str = None, params: tuple = ()) -> List[Dict[str, Any]]:
+        """
+        Consulta registros de progreso de lectura.
+
+        Por defecto, busca el progreso por `id_documento`.
+
+        Returns:
+            List[Dict[str, Any]]: Lista de diccionarios con los datos.
+        """
+        if sql is None:
+            sql = "SELECT * FROM progreso_lectura WHERE id_documento = ?"
+        return self._ejecutar_consulta(sql, params)
+
+    def existe(self, sql: str = None, params: tuple = ()) -> bool:
+        """
+        Verifica si un documento tiene progreso de lectura.
+
+        Por defecto, busca por `id_documento`.
+        """
+        if sql is None:
+            sql = "SELECT 1 FROM progreso_lectura WHERE id_documento = ?"
+
+        resultados = self._ejecutar_consulta(sql, params)
+        return len(resultados) > 0
+
+    def obtener_por_documentos(self, ids_documentos: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Obtiene el progreso de varios documentos (p. ej. los de una página
+        del estante) en una sola consulta por lote.
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Progreso de cada documento que lo tiene, por su ID.
+        """
+        sql = "SELECT * FROM progreso_lectura WHERE id_documento IN ({marcadores})"
+        return {
+            fila["id_documento"]: fila
+            for fila in self._consultar_por_ids(sql, [int(i) for i in ids_documentos])
+        }
+
+    def insertar_lote(self, filas: Iterable[Tuple[int, int, bool, Optional[str]]]) -> Optional[int]:
+        """
+        Importa varios progresos con `executemany` en una sola transacción,
+        omitiendo los de documentos que ya no existen.
+
+        Args:
+            filas (Iterable[Tuple[int, int, bool, Optional[str]]]): Tuplas
+                (id_documento, pagina_actual, en_lectura, actualizado_en).
+
+        Returns:
+            Optional[int]: Número de progresos guardados, o None si falla (no se
+                guarda ninguno).
+        """
+        sql = """
+        INSERT OR REPLACE INTO progreso_lectura (id_documento, pagina_actual, en_lectura, actualizado_en)
+        SELECT ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP)
+        WHERE EXISTS (SELECT 1 FROM documento WHERE id = ?)
+        """
+        params = [
+            (int(id_documento), max(0, int(pagina)), int(bool(en_lectura)), actualizado_en, int(id_documento))
+            for id_documento, pagina, en_lectura, actualizado_en in filas
+        ]
+        if not params:
+            return 0
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura("progreso_lectura")
+                antes = con.total_changes
+                con.executemany(sql, params)
+                return con.total_changes - antes
+        except sqlite3.Error as ex:
+            print(f"Error al importar progresos de lectura: {ex}")
+            return None
@@ -0,0 +1,54 @@
+import threading
+from typing import Callable, Set, Tuple
+
+
+class RegistroEsquema:
+    """
+    Registro de proceso que recuerda qué esquemas ya se crearon.
+
+    `DataBaseDAO.crear_base_de_datos` marca una base de datos como
+    inicializada por completo; a partir de ahí construir DAOs o entidades
+    sobre esa ruta no ejecuta ninguna sentencia DDL. Para rutas no
+    inicializadas (p. ej. bases de datos de pruebas), cada DAO crea su
+    tabla una única vez por proceso.
+    """
+
+    _lock = threading.Lock()
+    _bases_inicializadas: Set[str] = set()
+    _tablas_creadas: Set[Tuple[str, str]] = set()
+
+    @classmethod
+    def marcar_inicializada(cls, ruta_db: str):
+        """
+        Registra que el esquema completo de `ruta_db` ya existe.
+        """
+        with cls._lock:
+            cls._bases_inicializadas.add(ruta_db)
+
+    @classmethod
+    def esta_inicializada(cls, ruta_db: str) -> bool:
+        return ruta_db in cls._bases_inicializadas
+
+    @classmethod
+    def asegurar_tabla(cls, ruta_db: str, nombre: str, crear: Callable[[], None]):
+        """
+        Ejecuta `crear` solo si ni la base de datos ni la tabla `nombre`
+        se registraron antes en este proceso.
+        """
+        clave = (ruta_db, nombre)
+        if ruta_db in cls._bases_inicializadas or clave in cls._tablas_creadas:
+            return
+        with cls._lock:
+            if ruta_db in cls._bases_inicializadas or clave in cls._tablas_creadas:
+                return
+            crear()
+            cls._tablas_creadas.add(clave)
+
+    @classmethod
+    def resetear(cls):
+        """
+        Olvida todos los esquemas registrados (útil principalmente para tests).
+        """
+        with cls._lock:
+            cls._bases_inicializadas = set()
+            cls._tablas_creadas = set()
@@ -0,0 +1,301 @@
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from models.daos.dao import DAO
+from utilities.texto_paginas import comprimir_texto, descomprimir_texto
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TextoPaginaDAO(DAO):
+    """
+    DAO para el texto extraído de las páginas de los documentos.
+
+    Gestiona tres tablas: `texto_pagina` (texto comprimido de cada página),
+    el índice sin contenido `texto_pagina_fts` y `extraccion_texto`, que
+    guarda por documento hasta qué página se extrajo para poder reanudar.
+    Como el índice no guarda el texto, toda escritura pasa por este DAO, que
+    mantiene las dos tablas a la vez.
+    """
+
+    TABLAS = ("texto_pagina", "texto_pagina_fts", "extraccion_texto")
+
+    def __init__(self, ruta_db: Optional[str] = None):
+        """
+        Inicializa el DAO del texto de las páginas.
+
+        Args:
+            ruta_db (Optional[str]): Ruta opcional al archivo de la base de datos.
+        """
+        super().__init__(ruta_db)
+
+    def crear_tabla(self):
+        """
+        Crea las tablas del texto de las páginas y su índice si no existen.
+        """
+        sentencias = [
+            """
+            CREATE TABLE IF NOT EXISTS texto_pagina(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id_documento INTEGER NOT NULL,
+                numero_pagina INTEGER NOT NULL,
+                texto BLOB NOT NULL,
+                UNIQUE (id_documento, numero_pagina)
+            )
+            """,
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS texto_pagina_fts USING fts5(
+                texto,
+                content = '',
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS extraccion_texto(
+                id_documento INTEGER PRIMARY KEY,
+                hash TEXT NOT NULL,
+                paginas_total INTEGER NOT NULL DEFAULT 0,
+                paginas_extraidas INTEGER NOT NULL DEFAULT 0,
+                estado TEXT NOT NULL DEFAULT 'pendiente'
+                    CHECK (estado IN ('pendiente', 'completo', 'error')),
+                actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_texto_pagina_documento ON texto_pagina(id_documento)",
+        ]
+        try:
+            with self._get_connection() as con:
+                cursor = con.cursor()
+                for sql in sentencias:
+                    cursor.execute(sql)
+        except sqlite3.Error as ex:
+            print(f"Error al crear la tabla texto_pagina: {ex}")
+            raise
+
+    def insertar(self, sql: str = None, params: tuple = ()) -> Optional[int]:
+        """
+        Inserta el texto de una página y lo añade al índice.
+
+        Parámetros por defecto: (id_documento, numero_pagina, texto)
+        """
+        if sql is not None:
+            return self._ejecutar_insertar(sql, params)
+        id_documento, numero_pagina, texto = params
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura(*self.TABLAS)
+                return self._insertar_pagina(con, id_documento, numero_pagina, texto)
+        except sqlite3.Error as ex:
+            logger.error("Error al insertar el texto de la página: %s", ex)
+            return None
+
+    def eliminar(self, sql: str = None, params: tuple = ()) -> bool:
+        """
+        Elimina el texto de las páginas de un documento. Por defecto, por `id_documento`.
+        """
+        if sql is not None:
+            return self._ejecutar_actualizacion(sql, params)
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura(*self.TABLAS)
+                self._eliminar_paginas(
+                    con, "SELECT id, texto FROM texto_pagina WHERE id_documento = ?", params
+                )
+            return True
+        except sqlite3.Error as ex:
+            logger.error("Error al eliminar el texto de las páginas: %s", ex)
+            return False
+
+    def instanciar(self, sql: str = None, params: tuple = ()) -> List[Dict[str, Any]]:
+        """
+        Consulta páginas. Por defecto, las de un documento (`id_documento`),
+        con el texto ya descomprimido.
+        """
+        if sql is not None:
+            return self._ejecutar_consulta(sql, params)
+        filas = self._ejecutar_consulta(
+            "SELECT * FROM texto_pagina WHERE id_documento = ? ORDER BY numero_pagina", params
+        )
+        for fila in filas:
+            fila["texto"] = descomprimir_texto(fila["texto"])
+        return filas
+
+    def existe(self, sql: str = None, params: tuple = ()) -> bool:
+        """
+        Verifica si un documento tiene texto extraído. Por defecto, por `id_documento`.
+        """
+        if sql is None:
+            sql = "SELECT 1 FROM texto_pagina WHERE id_documento = ? LIMIT 1"
+        return len(self._ejecutar_consulta(sql, params)) > 0
+
+    # --- Extracción ---
+
+    def documentos_pendientes(self, extensiones: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Documentos con alguna de las extensiones dadas cuyo texto falta, está
+        a medias o se extrajo de otra versión del archivo (otro hash).
+        """
+        marcadores = ", ".join("?" for _ in extensiones)
+        sql = f"""
+        SELECT d.id, d.nombre, d.extension, d.hash
+        FROM documento d
+        LEFT JOIN extraccion_texto e ON e.id_documento = d.id
+        WHERE lower(d.extension) IN ({marcadores})
+          AND (e.id_documento IS NULL OR e.hash <> d.hash OR e.estado = 'pendiente')
+        ORDER BY d.id
+        """
+        return self._ejecutar_consulta(sql, tuple(extensiones))
+
+    def iniciar_documento(self, id_documento: int, hash_documento: str) -> int:
+        """
+        Prepara la extracción de un documento.
+
+        Si ya se empezó con el mismo hash, se continúa donde se dejó; si no,
+        se descarta el texto anterior.
+
+        Returns:
+            int: Índice (desde 0) de la primera página que falta por extraer.
+        """
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura(*self.TABLAS)
+                fila = con.execute(
+                    "SELECT hash, estado, paginas_extraidas FROM extraccion_texto "
+                    "WHERE id_documento = ?",
+                    (id_documento,),
+                ).fetchone()
+                if fila is not None and fila["hash"] == hash_documento and fila["estado"] == "pendiente":
+                    return fila["paginas_extraidas"]
+                self._eliminar_paginas(
+                    con,
+                    "SELECT id, texto FROM texto_pagina WHERE id_documento = ?",
+                    (id_documento,),
+                )
+                con.execute(
+                    "INSERT OR REPLACE INTO extraccion_texto (id_documento, hash) VALUES (?, ?)",
+                    (id_documento, hash_documento),
+                )
+            return 0
+        except sqlite3.Error as ex:
+            logger.error("Error al iniciar la extracción del documento %s: %s", id_documento, ex)
+            raise
+
+    def guardar_paginas(
+        self,
+        id_documento: int,
+        paginas: List[Tuple[int, str]],
+        paginas_extraidas: int,
+        paginas_total: int,
+    ) -> bool:
+        """
+        Guarda un lote de páginas extraídas y el progreso del documento en
+        una única transacción, de modo que al reanudar nunca se repiten ni
+        se pierden páginas.
+
+        Args:
+            id_documento (int): Documento al que pertenecen las páginas.
+            paginas (List[Tuple[int, str]]): (número de página, texto).
+            paginas_extraidas (int): Páginas recorridas hasta ahora.
+            paginas_total (int): Páginas del documento.
+        """
+        estado = "completo" if paginas_extraidas >= paginas_total else "pendiente"
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura(*self.TABLAS)
+                for numero_pagina, texto in paginas:
+                    self._insertar_pagina(con, id_documento, numero_pagina, texto)
+                con.execute(
+                    """
+                    UPDATE extraccion_texto
+                    SET paginas_extraidas = ?, paginas_total = ?, estado = ?,
+                        actualizado_en = CURRENT_TIMESTAMP
+                    WHERE id_documento = ?
+                    """,
+                    (paginas_extraidas, paginas_total, estado, id_documento),
+                )
+            return True
+        except sqlite3.Error as ex:
+            logger.error("Error al guardar el texto del documento %s: %s", id_documento, ex)
+            return False
+
+    def marcar_error(self, id_documento: int) -> bool:
+        """
+        Marca un documento cuyo texto no se pudo extraer, para no reintentarlo
+        hasta que cambie el archivo.
+        """
+        return self._ejecutar_actualizacion(
+            "UPDATE extraccion_texto SET estado = 'error', actualizado_en = CURRENT_TIMESTAMP "
+            "WHERE id_documento = ?",
+            (id_documento,),
+        )
+
+    def purgar_huerfanos(self) -> int:
+        """
+        Quita del índice y borra el texto de los documentos eliminados.
+
+        Returns:
+            int: Número de páginas purgadas.
+        """
+        try:
+            with self._get_connection() as con:
+                self._registrar_escritura(*self.TABLAS)
+                purgadas = self._eliminar_paginas(
+                    con,
+                    "SELECT id, texto FROM texto_pagina "
+                    "WHERE id_documento NOT IN (SELECT id FROM documento)",
+                )
+                con.execute(
+                    "DELETE FROM extraccion_texto "
+                    "WHERE id_documento NOT IN (SELECT id FROM documento)"
+                )
+            return purgadas
+        except sqlite3.Error as ex:
+            logger.error("Error al purgar el texto de documentos eliminados: %s", ex)
+            return 0
+
+    def progreso(self, extensiones: Sequence[str]) -> Tuple[int, int]:
+        """
+        Returns:
+            Tuple[int, int]: (documentos con el texto ya extraído, documentos con texto).
+        """
+        marcadores = ", ".join("?" for _ in extensiones)
+        filas = self._ejecutar_consulta(
+            f"""
+            SELECT COUNT(e.id_documento) AS extraidos, COUNT(*) AS total
+            FROM documento d
+            LEFT JOIN extraccion_texto e
+                ON e.id_documento = d.id AND e.hash = d.hash AND e.estado <> 'pendiente'
+            WHERE lower(d.extension) IN ({marcadores})
+            """,
+            tuple(extensiones),
+        )
+        return (filas[0]["extraidos"], filas[0]["total"]) if filas else (0, 0)
+
+    @staticmethod
+    def _insertar_pagina(
+        con: sqlite3.Connection, id_documento: int, numero_pagina: int, texto: str
+    ) -> int:
+        cursor = con.execute(
+            "INSERT INTO texto_pagina (id_documento, numero_pagina, texto) VALUES (?, ?, ?)",
+            (id_documento, numero_pagina, comprimir_texto(texto)),
+        )
+        con.execute(
+            "INSERT INTO texto_pagina_fts (rowid, texto) VALUES (?, ?)",
+            (cursor.lastrowid, texto),
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def _eliminar_paginas(con: sqlite3.Connection, sql: str, params: tuple = ()) -> int:
+        """
+        Borra las páginas que devuelve `sql` (id, texto). El índice sin
+        contenido necesita el texto original para quitar cada fila.
+        """
+        filas = con.execute(sql, params).fetchall()
+        con.executemany(
+            "INSERT INTO texto_pagina_fts (texto_pagina_fts, rowid, texto) VALUES ('delete', ?, ?)",
+            [(fila["id"], descomprimir_texto(fila["texto"])) for fila in filas],
+        )
+        con.executemany("DELETE FROM texto_pagina WHERE id = ?", [(fila["id"],) for fila in filas])
+        return len(filas)
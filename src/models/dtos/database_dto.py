@@ -1,4 +1,216 @@
 from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+# Indicador de `documento_flags` que corresponde a cada tabla hija de documento
+_FLAGS_POR_TABLA: Dict[str, str] = {
+    "bibliografia": "tiene_dato_bibliografico",
+    "metadato": "tiene_metadato",
+    "capitulo": "tiene_capitulos",
+    "documento_coleccion": "tiene_coleccion",
+    "documento_grupo": "tiene_grupo",
+    "documento_categoria": "tiene_categoria",
+    "documento_etiqueta": "tiene_etiqueta",
+    "documento_palabra_clave": "tiene_palabra_clave",
+    "favorito": "es_favorito",
+}
+
+
+def _disparadores_flags() -> List[str]:
+    """
+    Disparadores que mantienen `documento_flags` al día.
+
+    Al insertar en una tabla hija el indicador pasa a 1; al borrar (o mover
+    la fila a otro documento) se recalcula con un EXISTS sobre el índice de
+    `id_documento`, así que también es correcto con INSERT OR REPLACE.
+    """
+    disparadores = [
+        "CREATE TRIGGER IF NOT EXISTS trig_flags_documento_insertar AFTER INSERT ON documento "
+        "BEGIN INSERT OR IGNORE INTO documento_flags (id_documento) VALUES (NEW.id); END;",
+        "CREATE TRIGGER IF NOT EXISTS trig_flags_documento_eliminar AFTER DELETE ON documento "
+        "BEGIN DELETE FROM documento_flags WHERE id_documento = OLD.id; END;",
+    ]
+    for tabla, flag in _FLAGS_POR_TABLA.items():
+        recalcular = (
+            f"UPDATE documento_flags SET {flag} = EXISTS "
+            f"(SELECT 1 FROM {tabla} WHERE id_documento = OLD.id_documento) "
+            f"WHERE id_documento = OLD.id_documento;"
+        )
+        marcar = f"UPDATE documento_flags SET {flag} = 1 WHERE id_documento = NEW.id_documento;"
+        disparadores += [
+            f"CREATE TRIGGER IF NOT EXISTS trig_flags_{tabla}_insertar AFTER INSERT ON {tabla} "
+            f"BEGIN {marcar} END;",
+            f"CREATE TRIGGER IF NOT EXISTS trig_flags_{tabla}_eliminar AFTER DELETE ON {tabla} "
+            f"BEGIN {recalcular} END;",
+            f"CREATE TRIGGER IF NOT EXISTS trig_flags_{tabla}_actualizar "
+            f"AFTER UPDATE OF id_documento ON {tabla} BEGIN {recalcular} {marcar} END;",
+        ]
+    return disparadores
+
+
+# Tabla pivote y columna de `documento_fts` de cada tipo de organización:
+# (tabla, columna del nombre, tabla pivote, clave en la pivote, columna FTS)
+_ORGANIZACIONES_FTS: List[Tuple[str, str, str, str, str]] = [
+    ("coleccion", "nombre", "documento_coleccion", "id_coleccion", "colecciones"),
+    ("grupo", "nombre", "documento_grupo", "id_grupo", "grupos"),
+    ("categoria", "nombre", "documento_categoria", "id_categoria", "categorias"),
+    ("etiqueta", "nombre", "documento_etiqueta", "id_etiqueta", "etiquetas"),
+    ("palabra_clave", "palabra", "documento_palabra_clave", "id_palabra_clave", "palabras_clave"),
+]
+
+
+def _sql_insertar_documentos_fts(condicion: str) -> str:
+    """
+    Sentencia que indexa en `documento_fts` los documentos cuyo id cumple
+    `condicion` (p. ej. "= NEW.id_documento").
+    """
+    columnas = ", ".join(columna for *_, columna in _ORGANIZACIONES_FTS)
+    subconsultas = ",\n        ".join(
+        f"(SELECT group_concat(o.{nombre}, ' ') FROM {pivote} p "
+        f"JOIN {tabla} o ON o.id = p.{clave} WHERE p.id_documento = d.id)"
+        for tabla, nombre, pivote, clave, _ in _ORGANIZACIONES_FTS
+    )
+    return (
+        f"INSERT INTO documento_fts "
+        f"(rowid, nombre, titulo, autores, editorial, isbn, {columnas})\n"
+        f"    SELECT d.id, d.nombre, b.titulo, b.autores, b.editorial, b.isbn,\n"
+        f"        {subconsultas}\n"
+        f"    FROM documento d LEFT JOIN bibliografia b ON b.id_documento = d.id\n"
+        f"    WHERE d.id {condicion};"
+    )
+
+
+def _sql_indexar_documentos(condicion: str) -> str:
+    """
+    Sentencias que reescriben la fila de `documento_fts` de los documentos
+    cuyo id cumple `condicion`.
+    """
+    return (
+        f"DELETE FROM documento_fts WHERE rowid {condicion};\n"
+        f"    {_sql_insertar_documentos_fts(condicion)}"
+    )
+
+
+def _disparadores_fts() -> List[str]:
+    """
+    Disparadores que mantienen los índices de texto completo al día.
+
+    `documento_fts` guarda una fila por documento que se reescribe entera
+    cuando cambia el documento, su bibliografía, sus asociaciones o el nombre
+    de una organización. `capitulo_fts` y `seccion_fts` son de contenido
+    externo y siguen el esquema de borrado de FTS5.
+    """
+    disparadores = [
+        "CREATE TRIGGER IF NOT EXISTS trig_fts_documento_insertar AFTER INSERT ON documento "
+        f"BEGIN {_sql_indexar_documentos('= NEW.id')} END;",
+        "CREATE TRIGGER IF NOT EXISTS trig_fts_documento_actualizar "
+        "AFTER UPDATE OF nombre ON documento "
+        f"BEGIN {_sql_indexar_documentos('= NEW.id')} END;",
+        "CREATE TRIGGER IF NOT EXISTS trig_fts_documento_eliminar AFTER DELETE ON documento "
+        "BEGIN DELETE FROM documento_fts WHERE rowid = OLD.id; END;",
+        "CREATE TRIGGER IF NOT EXISTS trig_fts_bibliografia_insertar AFTER INSERT ON bibliografia "
+        f"BEGIN {_sql_indexar_documentos('= NEW.id_documento')} END;",
+        "CREATE TRIGGER IF NOT EXISTS trig_fts_bibliografia_actualizar "
+        "AFTER UPDATE OF titulo, autores, editorial, isbn, id_documento ON bibliografia "
+        f"BEGIN {_sql_indexar_documentos('= OLD.id_documento')} "
+        f"{_sql_indexar_documentos('= NEW.id_documento')} END;",
+        "CREATE TRIGGER IF NOT EXISTS trig_fts_bibliografia_eliminar AFTER DELETE ON bibliografia "
+        f"BEGIN {_sql_indexar_documentos('= OLD.id_documento')} END;",
+    ]
+    for tabla, nombre, pivote, clave, _ in _ORGANIZACIONES_FTS:
+        disparadores += [
+            f"CREATE TRIGGER IF NOT EXISTS trig_fts_{pivote}_insertar AFTER INSERT ON {pivote} "
+            f"BEGIN {_sql_indexar_documentos('= NEW.id_documento')} END;",
+            f"CREATE TRIGGER IF NOT EXISTS trig_fts_{pivote}_eliminar AFTER DELETE ON {pivote} "
+            f"BEGIN {_sql_indexar_documentos('= OLD.id_documento')} END;",
+            f"CREATE TRIGGER IF NOT EXISTS trig_fts_{tabla}_actualizar "
+            f"AFTER UPDATE OF {nombre} ON {tabla} BEGIN "
+            + _sql_indexar_documentos(
+                f"IN (SELECT id_documento FROM {pivote} WHERE {clave} = NEW.id)"
+            )
+            + " END;",
+        ]
+    for tabla in ("capitulo", "seccion"):
+        disparadores += [
+            f"CREATE TRIGGER IF NOT EXISTS trig_fts_{tabla}_insertar AFTER INSERT ON {tabla} "
+            f"BEGIN INSERT INTO {tabla}_fts (rowid, titulo) VALUES (NEW.id, NEW.titulo); END;",
+            f"CREATE TRIGGER IF NOT EXISTS trig_fts_{tabla}_eliminar AFTER DELETE ON {tabla} "
+            f"BEGIN INSERT INTO {tabla}_fts ({tabla}_fts, rowid, titulo) "
+            f"VALUES ('delete', OLD.id, OLD.titulo); END;",
+            f"CREATE TRIGGER IF NOT EXISTS trig_fts_{tabla}_actualizar "
+            f"AFTER UPDATE OF titulo ON {tabla} BEGIN "
+            f"INSERT INTO {tabla}_fts ({tabla}_fts, rowid, titulo) "
+            f"VALUES ('delete', OLD.id, OLD.titulo); "
+            f"INSERT INTO {tabla}_fts (rowid, titulo) VALUES (NEW.id, NEW.titulo); END;",
+        ]
+    return disparadores
+
+
+def _condiciones_metadatos_derivados(alias: str) -> Dict[str, str]:
+    """
+    Condiciones que reconocen, en la fila `alias` de `metadato`, las claves
+    de las que se deriva cada columna de `documento` (sin distinguir
+    mayúsculas, espacios ni guiones bajos, p. ej. "PDF:PageCount").
+    """
+    clave = f"lower(replace(replace({alias}.clave, ' ', ''), '_', ''))"
+    valor = f"trim({alias}.valor)"
+    return {
+        "numero_paginas_metadato": (
+            f"({clave} LIKE '%pagecount%' OR {clave} IN ('pdf:pages', 'pages')) "
+            f"AND {valor} <> '' AND {valor} NOT GLOB '*[^0-9]*'"
+        ),
+        "titulo_metadato": f"({clave} = 'title' OR {clave} LIKE '%:title') AND {valor} <> ''",
+        "autor_metadato": (
+            f"({clave} = 'author' OR {clave} LIKE '%:author' "
+            f"OR {clave} IN ('xmp:creator', 'xmp-dc:creator')) AND {valor} <> ''"
+        ),
+    }
+
+
+def _sql_actualizar_metadatos_derivados(condicion: str) -> str:
+    """
+    Sentencia que recalcula las columnas derivadas de los metadatos de los
+    documentos cuyo id cumple `condicion`: el mayor número de páginas y el
+    primer título y autor guardados.
+    """
+    condiciones = _condiciones_metadatos_derivados("m")
+    return (
+        "UPDATE documento SET\n"
+        "        numero_paginas_metadato = (SELECT MAX(CAST(trim(m.valor) AS INTEGER)) "
+        "FROM metadato m WHERE m.id_documento = documento.id "
+        f"AND {condiciones['numero_paginas_metadato']}),\n"
+        "        titulo_metadato = (SELECT trim(m.valor) FROM metadato m "
+        f"WHERE m.id_documento = documento.id AND {condiciones['titulo_metadato']} "
+        "ORDER BY m.id LIMIT 1),\n"
+        "        autor_metadato = (SELECT trim(m.valor) FROM metadato m "
+        f"WHERE m.id_documento = documento.id AND {condiciones['autor_metadato']} "
+        "ORDER BY m.id LIMIT 1)\n"
+        f"    WHERE id {condicion};"
+    )
+
+
+def _disparadores_metadatos_derivados() -> List[str]:
+    """
+    Disparadores que mantienen las columnas derivadas de `documento` al
+    insertar, borrar o modificar metadatos. Solo actúan con las filas cuya
+    clave interesa, así que la importación apenas los nota.
+    """
+
+    def relevante(alias: str) -> str:
+        return " OR ".join(f"({c})" for c in _condiciones_metadatos_derivados(alias).values())
+
+    return [
+        "CREATE TRIGGER IF NOT EXISTS trig_derivados_metadato_insertar AFTER INSERT ON metadato "
+        f"WHEN {relevante('NEW')} "
+        f"BEGIN {_sql_actualizar_metadatos_derivados('= NEW.id_documento')} END;",
+        "CREATE TRIGGER IF NOT EXISTS trig_derivados_metadato_eliminar AFTER DELETE ON metadato "
+        f"WHEN {relevante('OLD')} "
+        f"BEGIN {_sql_actualizar_metadatos_derivados('= OLD.id_documento')} END;",
+        "CREATE TRIGGER IF NOT EXISTS trig_derivados_metadato_actualizar "
+        "AFTER UPDATE OF clave, valor, id_documento ON metadato "
+        f"WHEN {relevante('OLD')} OR {relevante('NEW')} "
+        f"BEGIN {_sql_actualizar_metadatos_derivados('= OLD.id_documento')} "
+        f"{_sql_actualizar_metadatos_derivados('= NEW.id_documento')} END;",
+    ]
 
 
 @dataclass
@@ -19,7 +231,10 @@ class DataBaseDTO:
     tamano INTEGER CHECK (tamano >= 0),
     esta_activo INTEGER DEFAULT 1,
     creado_en DATETIME DEFAULT CURRENT_TIMESTAMP,
-    actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP
+    actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP,
+    numero_paginas_metadato INTEGER,
+    titulo_metadato TEXT,
+    autor_metadato TEXT
 );"""
     sql_table_metadato = """CREATE TABLE IF NOT EXISTS metadato(
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -75,6 +290,21 @@ class DataBaseDTO:
     creado_en DATETIME DEFAULT CURRENT_TIMESTAMP,
     actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (id_documento) REFERENCES documento (id) ON DELETE CASCADE
+);"""
+    # Página en la que va la lectura de cada documento
+    sql_table_progreso_lectura = """CREATE TABLE IF NOT EXISTS progreso_lectura(
+    id_documento INTEGER PRIMARY KEY,
+    pagina_actual INTEGER NOT NULL DEFAULT 0,
+    en_lectura INTEGER NOT NULL DEFAULT 0,
+    actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (id_documento) REFERENCES documento (id) ON DELETE CASCADE
+);"""
+    # Comentario libre del usuario sobre un documento
+    sql_table_comentario = """CREATE TABLE IF NOT EXISTS comentario(
+    id_documento INTEGER PRIMARY KEY,
+    texto TEXT NOT NULL,
+    actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (id_documento) REFERENCES documento (id) ON DELETE CASCADE
 );"""
     sql_table_categoria = """CREATE TABLE IF NOT EXISTS categoria(
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -159,6 +389,110 @@ class DataBaseDTO:
     FOREIGN KEY (id_etiqueta) REFERENCES etiqueta(id) ON DELETE CASCADE
 );"""
 
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Indicadores de asociaciones
+    # └────────────────────────────────────────────────────────────┘
+
+    # Una fila por documento con un indicador por tabla hija, mantenida por
+    # los disparadores de `sql_triggers_flags`. Sustituye al LEFT JOIN de
+    # todas las tablas hijas, que multiplicaba las filas antes del GROUP BY.
+    sql_table_documento_flags = """CREATE TABLE IF NOT EXISTS documento_flags(
+    id_documento INTEGER PRIMARY KEY,
+    tiene_dato_bibliografico INTEGER NOT NULL DEFAULT 0,
+    tiene_metadato INTEGER NOT NULL DEFAULT 0,
+    tiene_capitulos INTEGER NOT NULL DEFAULT 0,
+    tiene_coleccion INTEGER NOT NULL DEFAULT 0,
+    tiene_grupo INTEGER NOT NULL DEFAULT 0,
+    tiene_categoria INTEGER NOT NULL DEFAULT 0,
+    tiene_etiqueta INTEGER NOT NULL DEFAULT 0,
+    tiene_palabra_clave INTEGER NOT NULL DEFAULT 0,
+    es_favorito INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (id_documento) REFERENCES documento (id) ON DELETE CASCADE
+);"""
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Búsqueda de texto completo (FTS5)
+    # └────────────────────────────────────────────────────────────┘
+
+    # Un documento por fila (rowid = documento.id) con su nombre, su
+    # bibliografía y los nombres de sus organizaciones. Los índices de
+    # prefijos de 2 y 3 caracteres aceleran la búsqueda mientras se escribe.
+    sql_fts_documento = """CREATE VIRTUAL TABLE IF NOT EXISTS documento_fts USING fts5(
+    nombre,
+    titulo,
+    autores,
+    editorial,
+    isbn,
+    colecciones,
+    grupos,
+    categorias,
+    etiquetas,
+    palabras_clave,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);"""
+    sql_fts_capitulo = """CREATE VIRTUAL TABLE IF NOT EXISTS capitulo_fts USING fts5(
+    titulo,
+    content = 'capitulo',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);"""
+    sql_fts_seccion = """CREATE VIRTUAL TABLE IF NOT EXISTS seccion_fts USING fts5(
+    titulo,
+    content = 'seccion',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);"""
+
+    # Indexa los documentos que aún no están en `documento_fts`
+    sql_rellenar_documento_fts = _sql_insertar_documentos_fts(
+        "NOT IN (SELECT rowid FROM documento_fts)"
+    )
+
+    # Reconstruye los índices de contenido externo a partir de sus tablas
+    sql_reconstruir_fts_contenido = [
+        "INSERT INTO capitulo_fts (capitulo_fts) VALUES ('rebuild');",
+        "INSERT INTO seccion_fts (seccion_fts) VALUES ('rebuild');",
+    ]
+
+    sql_triggers_fts = _disparadores_fts()
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Texto de las páginas
+    # └────────────────────────────────────────────────────────────┘
+
+    # Texto extraído de cada página, comprimido con zlib. Sin clave foránea:
+    # al borrar un documento sus páginas quedan huérfanas hasta que la
+    # extracción las purga, porque para quitarlas del índice sin contenido
+    # hace falta su texto original. AUTOINCREMENT evita reutilizar rowids.
+    sql_table_texto_pagina = """CREATE TABLE IF NOT EXISTS texto_pagina(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_documento INTEGER NOT NULL,
+    numero_pagina INTEGER NOT NULL,
+    texto BLOB NOT NULL,
+    UNIQUE (id_documento, numero_pagina)
+);"""
+    # Índice sin contenido (rowid = texto_pagina.id): el texto solo se
+    # guarda una vez, comprimido, en `texto_pagina`
+    sql_fts_texto_pagina = """CREATE VIRTUAL TABLE IF NOT EXISTS texto_pagina_fts USING fts5(
+    texto,
+    content = '',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);"""
+    # Progreso de la extracción por documento, para reanudarla
+    sql_table_extraccion_texto = """CREATE TABLE IF NOT EXISTS extraccion_texto(
+    id_documento INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL,
+    paginas_total INTEGER NOT NULL DEFAULT 0,
+    paginas_extraidas INTEGER NOT NULL DEFAULT 0,
+    estado TEXT NOT NULL DEFAULT 'pendiente'
+        CHECK (estado IN ('pendiente', 'completo', 'error')),
+    actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP
+);"""
+
     # ┌────────────────────────────────────────────────────────────┐
     # │ Vistas
     # └────────────────────────────────────────────────────────────┘
@@ -167,27 +501,18 @@ class DataBaseDTO:
 SELECT
     d.id AS id_documento,
     d.nombre AS nombre_documento,
-    MAX(CASE WHEN b.id IS NOT NULL THEN 1 ELSE 0 END) AS tiene_dato_bibliografico,
-    MAX(CASE WHEN m.id IS NOT NULL THEN 1 ELSE 0 END) AS tiene_metadato,
-    MAX(CASE WHEN c.id IS NOT NULL THEN 1 ELSE 0 END) AS tiene_capitulos,
-    MAX(CASE WHEN dc.id_documento IS NOT NULL THEN 1 ELSE 0 END) AS tiene_coleccion,
-    MAX(CASE WHEN dg.id_documento IS NOT NULL THEN 1 ELSE 0 END) AS tiene_grupo,
-    MAX(CASE WHEN dca.id_documento IS NOT NULL THEN 1 ELSE 0 END) AS tiene_categoria,
-    MAX(CASE WHEN de.id_documento IS NOT NULL THEN 1 ELSE 0 END) AS tiene_etiqueta,
-    MAX(CASE WHEN dpc.id_documento IS NOT NULL THEN 1 ELSE 0 END) AS tiene_palabra_clave,
-    MAX(CASE WHEN f.id IS NOT NULL THEN 1 ELSE 0 END) AS es_favorito
+    COALESCE(f.tiene_dato_bibliografico, 0) AS tiene_dato_bibliografico,
+    COALESCE(f.tiene_metadato, 0) AS tiene_metadato,
+    COALESCE(f.tiene_capitulos, 0) AS tiene_capitulos,
+    COALESCE(f.tiene_coleccion, 0) AS tiene_coleccion,
+    COALESCE(f.tiene_grupo, 0) AS tiene_grupo,
+    COALESCE(f.tiene_categoria, 0) AS tiene_categoria,
+    COALESCE(f.tiene_etiqueta, 0) AS tiene_etiqueta,
+    COALESCE(f.tiene_palabra_clave, 0) AS tiene_palabra_clave,
+    COALESCE(f.es_favorito, 0) AS es_favorito
 FROM
     documento d
-LEFT JOIN bibliografia b ON d.id = b.id_documento
-LEFT JOIN metadato m ON d.id = m.id_documento
-LEFT JOIN capitulo c ON d.id = c.id_documento
-LEFT JOIN documento_coleccion dc ON d.id = dc.id_documento
-LEFT JOIN documento_grupo dg ON d.id = dg.id_documento
-LEFT JOIN documento_categoria dca ON d.id = dca.id_documento
-LEFT JOIN documento_etiqueta de ON d.id = de.id_documento
-LEFT JOIN documento_palabra_clave dpc ON d.id = dpc.id_documento
-LEFT JOIN favorito f ON d.id = f.id_documento
-GROUP BY d.id, d.nombre;"""
+LEFT JOIN documento_flags f ON d.id = f.id_documento;"""
 
     sql_view_asociaciones_documentos = """CREATE VIEW IF NOT EXISTS vista_asociaciones_documentos AS
 SELECT
@@ -199,17 +524,65 @@ SELECT
     d.esta_activo,
     d.creado_en,
     d.actualizado_en,
-    vda.es_favorito,
-    vda.tiene_capitulos,
-    vda.tiene_categoria,
-    vda.tiene_coleccion,
-    vda.tiene_dato_bibliografico,
-    vda.tiene_etiqueta,
-    vda.tiene_grupo,
-    vda.tiene_metadato,
-    vda.tiene_palabra_clave
+    d.numero_paginas_metadato,
+    d.titulo_metadato,
+    d.autor_metadato,
+    COALESCE(f.es_favorito, 0) AS es_favorito,
+    COALESCE(f.tiene_capitulos, 0) AS tiene_capitulos,
+    COALESCE(f.tiene_categoria, 0) AS tiene_categoria,
+    COALESCE(f.tiene_coleccion, 0) AS tiene_coleccion,
+    COALESCE(f.tiene_dato_bibliografico, 0) AS tiene_dato_bibliografico,
+    COALESCE(f.tiene_etiqueta, 0) AS tiene_etiqueta,
+    COALESCE(f.tiene_grupo, 0) AS tiene_grupo,
+    COALESCE(f.tiene_metadato, 0) AS tiene_metadato,
+    COALESCE(f.tiene_palabra_clave, 0) AS tiene_palabra_clave
 FROM documento d
-INNER JOIN vista_documento_asociaciones vda ON d.id = vda.id_documento;"""
+LEFT JOIN documento_flags f ON d.id = f.id_documento;"""
+
+    # Las versiones anteriores definían las vistas con un LEFT JOIN de todas
+    # las tablas hijas; al crear `documento_flags` se reemplazan.
+    sql_migracion_vistas = [
+        "DROP VIEW IF EXISTS vista_asociaciones_documentos;",
+        "DROP VIEW IF EXISTS vista_documento_asociaciones;",
+    ]
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Datos derivados de los metadatos
+    # └────────────────────────────────────────────────────────────┘
+
+    # Número de páginas, título y autor se extraen de `metadato` al
+    # guardarlo (ver `sql_triggers_metadatos_derivados`), de modo que los
+    # listados los leen de `documento` sin recorrer los metadatos.
+    sql_migracion_metadatos_derivados = [
+        "ALTER TABLE documento ADD COLUMN numero_paginas_metadato INTEGER;",
+        "ALTER TABLE documento ADD COLUMN titulo_metadato TEXT;",
+        "ALTER TABLE documento ADD COLUMN autor_metadato TEXT;",
+    ]
+    # Rellena las columnas en las bases de datos anteriores
+    sql_rellenar_metadatos_derivados = _sql_actualizar_metadatos_derivados(
+        "IN (SELECT DISTINCT id_documento FROM metadato)"
+    )
+    sql_triggers_metadatos_derivados = _disparadores_metadatos_derivados()
+
+    # Calcula los indicadores de los documentos que aún no tienen fila
+    sql_rellenar_documento_flags = """INSERT OR IGNORE INTO documento_flags (
+    id_documento, tiene_dato_bibliografico, tiene_metadato, tiene_capitulos,
+    tiene_coleccion, tiene_grupo, tiene_categoria, tiene_etiqueta,
+    tiene_palabra_clave, es_favorito
+)
+SELECT
+    d.id,
+    EXISTS (SELECT 1 FROM bibliografia x WHERE x.id_documento = d.id),
+    EXISTS (SELECT 1 FROM metadato x WHERE x.id_documento = d.id),
+    EXISTS (SELECT 1 FROM capitulo x WHERE x.id_documento = d.id),
+    EXISTS (SELECT 1 FROM documento_coleccion x WHERE x.id_documento = d.id),
+    EXISTS (SELECT 1 FROM documento_grupo x WHERE x.id_documento = d.id),
+    EXISTS (SELECT 1 FROM documento_categoria x WHERE x.id_documento = d.id),
+    EXISTS (SELECT 1 FROM documento_etiqueta x WHERE x.id_documento = d.id),
+    EXISTS (SELECT 1 FROM documento_palabra_clave x WHERE x.id_documento = d.id),
+    EXISTS (SELECT 1 FROM favorito x WHERE x.id_documento = d.id)
+FROM documento d
+WHERE d.id NOT IN (SELECT id_documento FROM documento_flags);"""
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Disparadores
@@ -229,6 +602,8 @@ INNER JOIN vista_documento_asociaciones vda ON d.id = vda.id_documento;"""
         "CREATE TRIGGER IF NOT EXISTS trig_actualizar_etiqueta AFTER UPDATE ON etiqueta BEGIN UPDATE etiqueta SET actualizado_en = CURRENT_TIMESTAMP WHERE id = NEW.id; END;",
     ]
 
+    sql_triggers_flags = _disparadores_flags()
+
     # ┌────────────────────────────────────────────────────────────┐
     # │ Índices
     # └────────────────────────────────────────────────────────────┘
@@ -237,6 +612,8 @@ INNER JOIN vista_documento_asociaciones vda ON d.id = vda.id_documento;"""
         "CREATE INDEX IF NOT EXISTS idx_documento_hash ON documento(hash);",
         "CREATE INDEX IF NOT EXISTS idx_documento_extension ON documento(extension);",
         "CREATE INDEX IF NOT EXISTS idx_documento_nombre ON documento(nombre);",
+        "CREATE INDEX IF NOT EXISTS idx_documento_titulo_metadato ON documento(titulo_metadato);",
+        "CREATE INDEX IF NOT EXISTS idx_documento_autor_metadato ON documento(autor_metadato);",
         "CREATE INDEX IF NOT EXISTS idx_bibliografia_titulo ON bibliografia(titulo);",
         "CREATE INDEX IF NOT EXISTS idx_bibliografia_ano ON bibliografia(ano_publicacion);",
         "CREATE INDEX IF NOT EXISTS idx_metadato_documento ON metadato(id_documento);",
@@ -250,10 +627,12 @@ INNER JOIN vista_documento_asociaciones vda ON d.id = vda.id_documento;"""
         "CREATE INDEX IF NOT EXISTS idx_capitulo_numero ON capitulo(numero_capitulo);",
         "CREATE INDEX IF NOT EXISTS idx_seccion_capitulo ON seccion(id_capitulo);",
         "CREATE INDEX IF NOT EXISTS idx_seccion_nivel ON seccion(nivel);",
+        "CREATE INDEX IF NOT EXISTS idx_seccion_padre ON seccion(id_padre);",
         "CREATE INDEX IF NOT EXISTS idx_documento_grupo_documento ON documento_grupo(id_documento);",
         "CREATE INDEX IF NOT EXISTS idx_documento_grupo_grupo ON documento_grupo(id_grupo);",
         "CREATE INDEX IF NOT EXISTS idx_documento_coleccion_coleccion ON documento_coleccion(id_coleccion);",
         "CREATE INDEX IF NOT EXISTS idx_documento_categoria_categoria ON documento_categoria(id_categoria);",
         "CREATE INDEX IF NOT EXISTS idx_documento_etiqueta_etiqueta ON documento_etiqueta(id_etiqueta);",
         "CREATE INDEX IF NOT EXISTS idx_documento_palabra_clave_palabra_clave ON documento_palabra_clave(id_palabra_clave);",
+        "CREATE INDEX IF NOT EXISTS idx_texto_pagina_documento ON texto_pagina(id_documento);",
     ]
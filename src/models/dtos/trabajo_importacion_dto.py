@@ -0,0 +1,85 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass
+class TrabajoImportacionDTO:
+    """
+    DTO que describe un archivo seleccionado para importar.
+
+    Se crea una sola vez en la selección (`ControlarSeleccionDocumentos`) y lo
+    consumen la importación y las operaciones de copiar, mover y eliminar, de
+    modo que ninguna necesita volver a calcular el hash ni interpretar las
+    columnas de texto de la tabla.
+
+    Attributes:
+        ruta (str): Ruta completa del archivo.
+        nombre (str): Nombre del archivo sin extensión.
+        extension (str): Extensión del archivo sin el punto.
+        tamano (int): Tamaño en bytes en el momento de la selección.
+        mtime_ns (int): Fecha de modificación (ns) en el momento de la selección.
+        ctime (float): Fecha de creación/cambio de metadatos (segundos).
+        hash (str): Hash SHA-256 del archivo.
+        existe_en_biblioteca (bool): Si ya había un documento con ese hash.
+
+    Example:
+        >>> trabajo = TrabajoImportacionDTO.desde_ruta(
+        ...     "/tmp/manual.pdf", hash="abc123", existe_en_biblioteca=False
+        ... )
+    """
+
+    ruta: str
+    nombre: str
+    extension: str
+    tamano: int
+    mtime_ns: int
+    ctime: float
+    hash: str
+    existe_en_biblioteca: bool = False
+
+    @property
+    def nombre_con_extension(self) -> str:
+        return f"{self.nombre}.{self.extension}" if self.extension else self.nombre
+
+    @property
+    def mtime(self) -> float:
+        return self.mtime_ns / 1_000_000_000
+
+    @classmethod
+    def desde_ruta(
+        cls, ruta: str, hash: str, existe_en_biblioteca: bool = False
+    ) -> Optional["TrabajoImportacionDTO"]:
+        """
+        Crea el trabajo a partir de un único `stat` del archivo.
+
+        Returns:
+            Optional[TrabajoImportacionDTO]: None si el archivo no existe.
+        """
+        try:
+            info = os.stat(ruta)
+        except OSError:
+            return None
+        archivo = Path(ruta)
+        return cls(
+            ruta=str(archivo),
+            nombre=archivo.stem,
+            extension=archivo.suffix[1:],
+            tamano=info.st_size,
+            mtime_ns=info.st_mtime_ns,
+            ctime=info.st_ctime,
+            hash=hash,
+            existe_en_biblioteca=existe_en_biblioteca,
+        )
+
+    def esta_vigente(self) -> bool:
+        """
+        Comprueba que el archivo no cambió desde la selección, de modo que el
+        hash guardado sigue siendo válido.
+        """
+        try:
+            info = os.stat(self.ruta)
+        except OSError:
+            return False
+        return info.st_size == self.tamano and info.st_mtime_ns == self.mtime_ns
@@ -4,16 +4,37 @@ from models.entities.etiqueta import Etiqueta
 from models.entities.palabra_clave import PalabraClave
 from models.entities.categoria import Categoria
 from models.entities.documento import Documento
+from models.daos.cache_consultas import CacheConsultas
 from models.daos.consulta_dao import ConsultaDAO
 from models.entities.capitulo import Capitulo
 from models.entities.seccion import Seccion
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+# Tablas que lee una búsqueda del estante: el documento, su índice de texto
+# completo y las organizaciones por las que se puede filtrar
+TABLAS_BUSQUEDA_ESTANTE: Tuple[str, ...] = (
+    "documento",
+    "documento_flags",
+    "documento_fts",
+    *ConsultaDAO.TABLAS_ORGANIZACION,
+    *(asociacion for asociacion, _ in ConsultaDAO.TABLAS_ORGANIZACION.values()),
+)
 
 
 class Consulta:
     def __init__(self, ruta_db: str = None):
         self.ruta_db = ruta_db
 
+    @staticmethod
+    def _en_cache(dao: ConsultaDAO, tablas: Tuple[str, ...], metodo: str, *args) -> Any:
+        """
+        Ejecuta `dao.metodo(*args)` a través de `CacheConsultas`: el resultado
+        se reutiliza mientras no se escriba en ninguna de `tablas`.
+        """
+        return CacheConsultas.obtener(
+            dao.ruta_db, (metodo, args), tablas, lambda: getattr(dao, metodo)(*args)
+        )
+
     # ┌────────────────────────────────────────────────────────────┐
     # │ Colecciones
     # └────────────────────────────────────────────────────────────┘
@@ -29,7 +50,7 @@ class Consulta:
         """
         lista = []
         dao = ConsultaDAO(ruta_db=self.ruta_db)
-        lista_colecciones = dao.get_colecciones()
+        lista_colecciones = self._en_cache(dao, ("coleccion",), "get_colecciones")
         if lista_colecciones:
             for dato in lista_colecciones:
                 coleccion = Coleccion(
@@ -72,7 +93,7 @@ class Consulta:
     def get_grupos(self) -> List[Grupo]:
         lista = []
         dao = ConsultaDAO(ruta_db=self.ruta_db)
-        lista_grupos = dao.get_grupos()
+        lista_grupos = self._en_cache(dao, ("grupo",), "get_grupos")
         if lista_grupos:
             for dato in lista_grupos:
                 grupo = Grupo(
@@ -115,7 +136,7 @@ class Consulta:
     def get_etiquetas(self) -> List[Etiqueta]:
         lista = []
         dao = ConsultaDAO(ruta_db=self.ruta_db)
-        lista_etiquetas = dao.get_etiquetas()
+        lista_etiquetas = self._en_cache(dao, ("etiqueta",), "get_etiquetas")
         if lista_etiquetas:
             for dato in lista_etiquetas:
                 etiqueta = Etiqueta(
@@ -158,7 +179,7 @@ class Consulta:
     def get_palabras_clave(self) -> List[PalabraClave]:
         lista = []
         dao = ConsultaDAO(ruta_db=self.ruta_db)
-        lista_palabras_clave = dao.get_palabras_clave()
+        lista_palabras_clave = self._en_cache(dao, ("palabra_clave",), "get_palabras_clave")
         if lista_palabras_clave:
             for dato in lista_palabras_clave:
                 palabra_clave = PalabraClave(
@@ -201,7 +222,7 @@ class Consulta:
     def get_categorias(self) -> List[Categoria]:
         lista = []
         dao = ConsultaDAO(ruta_db=self.ruta_db)
-        lista_categorias = dao.get_categorias()
+        lista_categorias = self._en_cache(dao, ("categoria",), "get_categorias")
         if lista_categorias:
             for dato in lista_categorias:
                 categoria = Categoria(
@@ -313,6 +334,23 @@ class Consulta:
         # Asumimos que ConsultaDAO tendrá un método correspondiente.
         return dao.get_documentos_por_palabra_clave(id_palabra_clave=id_palabra_clave)
 
+    def get_conteo_documentos_por_organizacion(self, tipo_organizacion: str) -> Dict[int, int]:
+        """
+        Cuenta con una sola consulta los documentos de cada organización de un tipo.
+
+        Returns:
+            Diccionario id de la organización -> número de documentos.
+        """
+        dao = ConsultaDAO(ruta_db=self.ruta_db)
+        tabla = ConsultaDAO.TABLAS_ORGANIZACION.get(tipo_organizacion)
+        if tabla is None:
+            return {}
+        return dict(
+            self._en_cache(
+                dao, (tabla[0],), "get_conteo_documentos_por_organizacion", tipo_organizacion
+            )
+        )
+
     def buscar_documentos(self, campo: str, buscar: str) -> List[Dict[str, Any]]:
         """
         Busca documentos basándose en un campo y un término de búsqueda.
@@ -404,8 +442,30 @@ class Consulta:
         # El DAO se encarga de la lógica de la consulta SQL
         return dao.buscar_en_contenido(termino=termino)
 
+    def buscar_en_texto_paginas(self, termino: str, limite: int = 100) -> List[Dict[str, Any]]:
+        """
+        Busca en el texto extraído de las páginas de los documentos.
+
+        Args:
+            termino (str): Término de búsqueda.
+            limite (int): Número máximo de páginas.
+
+        Returns:
+            Lista de diccionarios con el documento, la página y un fragmento.
+        """
+        dao = ConsultaDAO(ruta_db=self.ruta_db)
+        return dao.buscar_en_texto_paginas(termino=termino, limite=limite)
+
     def buscar_en_estante(
-        self, campo: str, termino: str, limit: int = None, offset: int = 0
+        self,
+        campo: str,
+        termino: str,
+        limit: int = None,
+        offset: int = 0,
+        despues_de: Optional[Tuple[str, int]] = None,
+        tipo_organizacion: Optional[str] = None,
+        id_organizacion: Optional[int] = None,
+        orden: str = "relevancia",
     ) -> List[Dict[str, Any]]:
         """
         Busca documentos de forma dinámica para la vista de "Estante".
@@ -415,6 +475,12 @@ class Consulta:
             termino (str): Término de búsqueda.
             limit (int): Número máximo de resultados.
             offset (int): Desplazamiento para paginación.
+            despues_de (Optional[Tuple[str, int]]): (nombre, id) del último documento
+                de la página anterior, para paginar por clave.
+            tipo_organizacion (Optional[str]): Restringe a una organización
+                ("coleccion", "grupo", "categoria", "etiqueta" o "palabra_clave").
+            id_organizacion (Optional[int]): Id de esa organización.
+            orden (str): "relevancia" o "nombre".
 
         Returns:
             Lista de diccionarios con los documentos encontrados.
@@ -422,22 +488,47 @@ class Consulta:
         dao = ConsultaDAO(ruta_db=self.ruta_db)
         if limit is None:
             # Para compatibilidad, si no se pasa limit, obtener todos
-            return dao.buscar_en_estante(campo=campo, termino=termino, limit=10000, offset=offset)
-        return dao.buscar_en_estante(campo=campo, termino=termino, limit=limit, offset=offset)
-
-    def contar_resultados_busqueda(self, campo: str, termino: str) -> int:
+            limit = 10000
+        return dao.buscar_en_estante(
+            campo=campo,
+            termino=termino,
+            limit=limit,
+            offset=offset,
+            despues_de=despues_de,
+            tipo_organizacion=tipo_organizacion,
+            id_organizacion=id_organizacion,
+            orden=orden,
+        )
+
+    def contar_resultados_busqueda(
+        self,
+        campo: str,
+        termino: str,
+        tipo_organizacion: Optional[str] = None,
+        id_organizacion: Optional[int] = None,
+    ) -> int:
         """
         Cuenta los documentos que coinciden con la búsqueda.
 
         Args:
             campo (str): Campo por el cual buscar.
             termino (str): Término de búsqueda.
+            tipo_organizacion (Optional[str]): Restringe a una organización.
+            id_organizacion (Optional[int]): Id de esa organización.
 
         Returns:
             Número total de resultados.
         """
         dao = ConsultaDAO(ruta_db=self.ruta_db)
-        return dao.count_buscar_en_estante(campo=campo, termino=termino)
+        return self._en_cache(
+            dao,
+            TABLAS_BUSQUEDA_ESTANTE,
+            "count_buscar_en_estante",
+            campo,
+            termino,
+            tipo_organizacion,
+            id_organizacion,
+        )
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Capitulos
@@ -461,6 +552,41 @@ class Consulta:
                 lista.append(capitulo)
         return lista
 
+    def arbol_contenido_documento(self, id_documento: int) -> List[Union[Capitulo, Seccion]]:
+        """
+        Lista los capítulos y secciones de un documento en el orden en que se
+        insertan en un árbol (cada padre antes que sus hijos).
+        """
+        lista = []
+        dao = ConsultaDAO(ruta_db=self.ruta_db)
+        for dato in dao.arbol_contenido_documento(id_documento=id_documento):
+            if dato['tipo'] == 'capitulo':
+                lista.append(
+                    Capitulo(
+                        id_documento=dato['id_documento'],
+                        numero_capitulo=dato['numero_capitulo'],
+                        titulo=dato['titulo'],
+                        id=dato['id'],
+                        pagina_inicio=dato['numero_pagina'],
+                        creado_en=dato['creado_en'],
+                        actualizado_en=dato['actualizado_en'],
+                    )
+                )
+            else:
+                lista.append(
+                    Seccion(
+                        id_capitulo=dato['id_capitulo'],
+                        titulo=dato['titulo'],
+                        id=dato['id'],
+                        nivel=dato['nivel'],
+                        id_padre=dato['id_padre'],
+                        numero_pagina=dato['numero_pagina'],
+                        creado_en=dato['creado_en'],
+                        actualizado_en=dato['actualizado_en'],
+                    )
+                )
+        return lista
+
     # ┌────────────────────────────────────────────────────────────┐
     # │ Secciones
     # └────────────────────────────────────────────────────────────┘
@@ -539,11 +665,11 @@ class Consulta:
             int: El número total de documentos.
         """
         dao = ConsultaDAO(ruta_db=self.ruta_db)
-        return dao.get_total_documentos()
+        return self._en_cache(dao, ("documento",), "get_total_documentos")
 
     def get_total_tamano_documentos(self) -> int:
         """
         Obtiene el tamaño total combinado de todos los documentos en la biblioteca (en bytes).
         """
         dao = ConsultaDAO(ruta_db=self.ruta_db)
-        return dao.get_total_tamano_documentos()
+        return self._en_cache(dao, ("documento",), "get_total_tamano_documentos")
@@ -1,6 +1,4 @@
-from PIL import Image, ImageTk
-from pdf2image import convert_from_path
-import exiftool
+from PIL import Image
 import subprocess
 import fitz
 import requests
@@ -8,10 +6,12 @@ from datetime import datetime as dt
 from pathlib import Path
 from os import rename, mkdir
 from os.path import exists, isfile, isdir, join
-from shutil import copy2, move
+from shutil import copy2, move, which
 from send2trash import send2trash  # type: ignore
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import logging
+from utilities.hashing import sha256_con_cache
+from utilities.sesion_exiftool import obtener_sesion_exiftool
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +101,40 @@ def desglosar_ruta_documento(ruta_documento: str) -> Dict[str, Any]:
         }
 
 
+def directorio_id_documento(ruta_biblioteca: str, id_documento: int) -> str:
+    """
+    Calcula, sin crearlo, el subdirectorio de la biblioteca que corresponde
+    a un documento: '000', '001', etc., uno por cada 1000 ids.
+
+    Args:
+        ruta_biblioteca (str): La ruta base de la biblioteca.
+        id_documento (int): El ID único del documento.
+
+    Returns:
+        str: La ruta del subdirectorio del documento.
+    """
+    return join(ruta_biblioteca, str(id_documento // 1000).zfill(3))
+
+
+def ruta_documento_biblioteca(ruta_biblioteca: str, nombre_documento: str, id_documento: int) -> str:
+    """
+    Calcula, sin crear directorios, la ruta del archivo de un documento en
+    la biblioteca.
+
+    Args:
+        ruta_biblioteca (str): La ruta base de la biblioteca.
+        nombre_documento (str): El nombre del archivo, incluyendo su extensión (ej. "documento.pdf").
+        id_documento (int): El ID único del documento.
+
+    Returns:
+        str: La ruta `{subdirectorio}/{id}_{nombre_documento}` del documento.
+    """
+    return join(
+        directorio_id_documento(ruta_biblioteca, id_documento),
+        f"{id_documento}_{nombre_documento}",
+    )
+
+
 def generar_ruta_documento(ruta_biblioteca: str, nombre_documento: str, id_documento: int) -> str:
     """
     Genera una ruta del documento a la biblioteca, para que el usuario para operar sobre el archivo
@@ -124,8 +158,7 @@ def generar_ruta_documento(ruta_biblioteca: str, nombre_documento: str, id_docum
         )
         if exists(ruta_subdirectorio):
             # Si existe el subdirectorio concanetamos con el nombre nombre
-            nuevo_nombre = f"{id_documento}_{nombre_documento}"
-            return join(ruta_subdirectorio, nuevo_nombre)
+            return ruta_documento_biblioteca(ruta_biblioteca, nombre_documento, id_documento)
         else:
             print(f"No existe la ruta del subdirectorio: {ruta_subdirectorio}")
             return None
@@ -171,13 +204,11 @@ def crear_directorio_id_documento(ruta_destino: str, id_documento: int) -> str:
     # verficamos que la ruta de destino sea un directorio y exista
     # este directorio sera la ubicacion para los documentos guardados por el usuario
     if isdir(ruta_destino) and exists(ruta_destino):
-        sub_directorio = str(id_documento // 1000).zfill(3)
-        # hacemos una union y verificamos si existe la carpeta dentro de la ruta de destino
-        if not exists(join(ruta_destino, sub_directorio)):
-            crear_directorio(join(ruta_destino, sub_directorio))
-            return join(ruta_destino, sub_directorio)
-        else:
-            return join(ruta_destino, sub_directorio)
+        ruta_subdirectorio = directorio_id_documento(ruta_destino, id_documento)
+        # verificamos si existe la carpeta dentro de la ruta de destino
+        if not exists(ruta_subdirectorio):
+            crear_directorio(ruta_subdirectorio)
+        return ruta_subdirectorio
     else:
         print(f"La ruta de destino no es un directorio: {ruta_destino}")
         return None
@@ -278,6 +309,9 @@ def obtener_metadatos(ruta_origen: str) -> Dict:
     """
     Obtiene los metadatos de un archivo utilizando exiftool.
 
+    Usa la sesión de exiftool compartida del proceso, por lo que no arranca
+    un proceso nuevo por archivo.
+
     Args:
         ruta_origen (str): La ruta completa del archivo del cual se extraerán los metadatos.
                            Se espera que exiftool esté instalado y accesible en el PATH.
@@ -287,18 +321,26 @@ def obtener_metadatos(ruta_origen: str) -> Dict:
               si el archivo no existe o si ocurre un error durante la extracción.
     """
     if exists(ruta_origen):
-        try:
-            with exiftool.ExifToolHelper() as exif:
-                metadatos = exif.get_metadata(ruta_origen)
-                return metadatos[0]
-        except Exception as e:
-            print(f"Error al obtener los metadatos del archivo: {e}")
-            return {}
+        return obtener_metadatos_lote([ruta_origen]).get(ruta_origen, {})
     else:
         print(f"No existe el archivo en la ruta de origen: {ruta_origen}")
         return {}
 
 
+def obtener_metadatos_lote(rutas: List[str]) -> Dict[str, Dict]:
+    """
+    Obtiene los metadatos de varios archivos con una sola orden a exiftool.
+
+    Args:
+        rutas (List[str]): Las rutas completas de los archivos.
+
+    Returns:
+        Dict[str, Dict]: Los metadatos de cada archivo, por ruta. Los archivos
+                         que no existen o fallan no aparecen.
+    """
+    return obtener_sesion_exiftool().obtener_metadatos(rutas)
+
+
 def editar_metadato(clave: str, valor: str, path_file: str) -> bool:
     """
     Edita un metadato específico de un archivo usando ExifTool.
@@ -312,29 +354,48 @@ def editar_metadato(clave: str, valor: str, path_file: str) -> bool:
         bool: True si la operación fue exitosa, False en caso contrario.
     """
     if exists(path_file):
-        comando = ['exiftool', f'-{clave}={valor}', '-overwrite_original', path_file]
-        try:
-            # Ejecutar el comando
-            subprocess.run(comando, capture_output=True, text=True, check=True, encoding='utf-8')
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"Error al ejecutar ExifTool: {e}")
-            print(f"Salida de error: {e.stderr}")
-            return False
-        except FileNotFoundError:
-            print("Error: ExifTool no está instalado o no está en el PATH del sistema")
-            # Podrías mostrar un messagebox aquí si lo deseas.
-            return False
+        return obtener_sesion_exiftool().editar_metadato(ruta=path_file, clave=clave, valor=valor)
     else:
         raise FileExistsError("No existe el archivo")
 
 
+# Visores que saben abrir un documento en una página concreta, por orden de
+# preferencia: (ejecutable, argumentos)
+VISORES_CON_PAGINA: List[Tuple[str, List[str]]] = [
+    ("okular", ["-p", "{pagina}", "{ruta}"]),
+    ("evince", ["--page-index={pagina}", "{ruta}"]),
+    ("atril", ["--page-index={pagina}", "{ruta}"]),
+    ("xreader", ["--page-index={pagina}", "{ruta}"]),
+    ("zathura", ["--page={pagina}", "{ruta}"]),
+    ("SumatraPDF", ["-page", "{pagina}", "{ruta}"]),
+]
+
+
+def comando_visor_en_pagina(ruta_origen: str, pagina: int) -> Optional[List[str]]:
+    """
+    Busca un visor instalado que pueda abrir el documento en una página.
+
+    Returns:
+        Optional[List[str]]: La orden a ejecutar, o None si no hay ninguno.
+    """
+    for ejecutable, argumentos in VISORES_CON_PAGINA:
+        ruta_ejecutable = which(ejecutable)
+        if ruta_ejecutable:
+            return [ruta_ejecutable] + [
+                argumento.format(pagina=pagina, ruta=ruta_origen) for argumento in argumentos
+            ]
+    return None
+
+
 def abrir_archivo(ruta_origen: str, pagina: Optional[int] = None):
     """
     Abre un archivo con la aplicación predeterminada del sistema de forma multiplataforma.
 
     Args:
             ruta_origen (str): La ruta completa del archivo a abrir.
+            pagina (Optional[int]): Página (empezando en 1) en la que abrirlo. Se
+                usa un visor de `VISORES_CON_PAGINA` si hay alguno instalado; si
+                no, se abre con la aplicación predeterminada en su primera página.
     """
     if not exists(ruta_origen):
         print(f"No existe el archivo en la ruta de origen: {ruta_origen}")
@@ -344,6 +405,13 @@ def abrir_archivo(ruta_origen: str, pagina: Optional[int] = None):
         import os
         import sys
 
+        if pagina is not None:
+            comando = comando_visor_en_pagina(ruta_origen, pagina)
+            if comando is not None:
+                # sin esperar: el visor sigue abierto después de esta llamada
+                subprocess.Popen(comando, start_new_session=sys.platform != "win32")
+                return
+
         if sys.platform == "win32":
             os.startfile(ruta_origen)
         elif sys.platform == "darwin":  # macOS
@@ -396,9 +464,7 @@ def abrir_documento_desde_biblioteca(
     ruta_destino_temporal = join(DIRECTORIO_TEMPORAL, nombre_archivo)
     try:
         copiar_archivo(ruta_origen=ruta_origen, ruta_destino=ruta_destino_temporal)
-        abrir_archivo(ruta_origen=ruta_destino_temporal) if pagina is None else abrir_archivo(
-            ruta_origen=ruta_destino_temporal
-        )
+        abrir_archivo(ruta_origen=ruta_destino_temporal, pagina=pagina)
         return True, ""
     except Exception as ex:
         logger.exception("Error al abrir documento desde biblioteca")
@@ -441,10 +507,12 @@ def obtener_datos_documento(ruta_origen: str) -> Dict[str, Any]:
 
 def hash_sha256(archivo: str) -> Optional[str]:
     """
-    Calcula el hash SHA-256 de un archivo utilizando el comando `sha256sum`.
+    Calcula el hash SHA-256 de un archivo en el propio proceso con `hashlib`.
 
-    Esta función depende de que el comando `sha256sum` esté disponible en el
-    entorno del sistema (común en sistemas tipo Unix/Linux).
+    Consulta primero la caché persistente de hashes; si la firma del archivo
+    (ruta, tamaño, mtime, inodo) no cambió, no vuelve a leerlo. Si no, lee el
+    archivo en bloques grandes sobre un buffer reutilizable, sin lanzar
+    subprocesos. Para lotes de archivos usar `utilities.hashing.MotorHash`.
 
     Args:
         archivo (str): La ruta completa del archivo para calcular el hash.
@@ -453,16 +521,7 @@ def hash_sha256(archivo: str) -> Optional[str]:
         Optional[str]: El hash SHA-256 como una cadena de texto si tiene éxito,
                        o None si ocurre un error.
     """
-    try:
-        resultado = subprocess.run(
-            ['sha256sum', archivo], capture_output=True, text=True, check=True
-        )
-        # Extraer solo el hash (sin el nombre del archivo)
-        hash_resultado = resultado.stdout.split()[0]
-        return hash_resultado
-    except subprocess.CalledProcessError as e:
-        print(f"Error al calcular hash: {e}")
-        return None
+    return sha256_con_cache(archivo)
 
 
 def pdf_primera_pagina_a_png(pdf_path, output_path, dpi=72, thumbnail_size=(150, 200)):
@@ -500,118 +559,3 @@ def pdf_primera_pagina_a_png(pdf_path, output_path, dpi=72, thumbnail_size=(150,
     except Exception as e:
         print(f"Error al extraer portada: {e}")
         return False
-
-
-def pdf_miniatura(pdf_path, output_path=None, size=(150, 200), dpi=72):
-    """
-    Extrae la primera página del PDF o carga una imagen como miniatura optimizada.
-    Ideal para TableView, listas, previews pequeñas.
-
-    Args:
-        pdf_path (str): Ruta al archivo (PDF o imagen)
-        output_path (str, optional): Ruta donde guardar. Si es None, retorna PhotoImage
-        size (tuple): (ancho, alto) de la miniatura. Default: (150, 200)
-        dpi (int): Resolución baja para rapidez (solo PDF). Default: 72
-
-    Returns:
-        ImageTk.PhotoImage si output_path es None, bool si se guarda archivo
-    """
-    try:
-        img = None
-        # Verificar si es PDF
-        if str(pdf_path).lower().endswith('.pdf'):
-            # Convertir solo primera página con baja resolución
-            imagenes = convert_from_path(pdf_path, dpi=dpi, first_page=1, last_page=1)
-            if imagenes:
-                img = imagenes[0]
-        elif str(pdf_path).lower().endswith('.epub'):
-            try:
-                with fitz.open(pdf_path) as doc:
-                    page = doc[0]
-                    zoom = dpi / 72
-                    mat = fitz.Matrix(zoom, zoom)
-                    pix = page.get_pixmap(matrix=mat)
-                    mode = "RGBA" if pix.alpha else "RGB"
-                    img = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
-            except RuntimeError as e:
-                print(f"Error al abrir EPUB (posible DRM o archivo corrupto): {e}")
-            except Exception as e:
-                print(f"Error inesperado procesando EPUB: {e}")
-        else:
-            # Intentar abrir como imagen
-            img = Image.open(pdf_path)
-
-        if img is None:
-            return None if output_path is None else False
-
-        # Redimensionar a miniatura manteniendo proporción
-        img.thumbnail(size, Image.Resampling.LANCZOS)
-
-        # Si se especifica ruta, guardar archivo
-        if output_path:
-            img.save(output_path, 'PNG', optimize=True, quality=85)
-            return True
-
-        # Si no, retornar PhotoImage para uso directo en tkinter
-        return ImageTk.PhotoImage(img)
-
-    except Exception as e:
-        return None if output_path is None else False
-
-
-def pdf_normal(pdf_path, output_path=None, max_size=(800, 1100), dpi=150):
-    """
-    Extrae la primera página del PDF o carga una imagen en tamaño normal con buena calidad.
-    Ideal para visualización completa, impresión, vista detallada.
-
-    Args:
-        pdf_path (str): Ruta al archivo (PDF o imagen)
-        output_path (str, optional): Ruta donde guardar. Si es None, retorna PhotoImage
-        max_size (tuple): Tamaño máximo (ancho, alto). Default: (800, 1100)
-        dpi (int): Resolución media-alta para calidad (solo PDF). Default: 150
-
-    Returns:
-        ImageTk.PhotoImage si output_path es None, bool si se guarda archivo
-    """
-    try:
-        img = None
-        # Verificar si es PDF
-        if str(pdf_path).lower().endswith('.pdf'):
-            # Convertir primera página con buena resolución
-            imagenes = convert_from_path(pdf_path, dpi=dpi, first_page=1, last_page=1)
-            if imagenes:
-                img = imagenes[0]
-        elif str(pdf_path).lower().endswith('.epub'):
-            try:
-                with fitz.open(pdf_path) as doc:
-                    page = doc[0]
-                    zoom = dpi / 72
-                    mat = fitz.Matrix(zoom, zoom)
-                    pix = page.get_pixmap(matrix=mat)
-                    mode = "RGBA" if pix.alpha else "RGB"
-                    img = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
-            except RuntimeError as e:
-                print(f"Error al abrir EPUB (posible DRM o archivo corrupto): {e}")
-            except Exception as e:
-                print(f"Error inesperado procesando EPUB: {e}")
-        else:
-            # Intentar abrir como imagen
-            img = Image.open(pdf_path)
-
-        if img is None:
-            return None if output_path is None else False
-
-        # Redimensionar si excede el tamaño máximo
-        if max_size:
-            img.thumbnail(max_size, Image.Resampling.LANCZOS)
-
-        # Si se especifica ruta, guardar archivo
-        if output_path:
-            img.save(output_path, 'PNG', optimize=True, quality=95)
-            return True
-
-        # Si no, retornar PhotoImage para uso directo en tkinter
-        return ImageTk.PhotoImage(img)
-
-    except Exception as e:
-        return None if output_path is None else False
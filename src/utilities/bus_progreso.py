@@ -0,0 +1,147 @@
+import logging
+import queue
+from typing import Any, Callable, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_TEXTO = "texto"
+_VALOR = "valor"
+_MAXIMO = "maximo"
+_ELIMINAR_FILA = "eliminar_fila"
+_EN_UI = "en_ui"
+_TERMINAR = "terminar"
+
+
+class BusProgreso:
+    """
+    Lleva a la interfaz el progreso que publican los hilos de trabajo.
+
+    Los hilos publican eventos (texto, valor y máximo de la barra, filas a
+    quitar, funciones a ejecutar en la interfaz) en una cola thread-safe, sin
+    tocar Tk. El hilo de Tk la vacía cada `INTERVALO_MS` con `after`: de los
+    textos y valores solo aplica el último, quita todas las filas de una vez
+    y luego ejecuta las funciones en orden. Así el coste para la interfaz
+    depende del tiempo que dura el trabajo, no del número de elementos.
+    """
+
+    # ~30 actualizaciones por segundo
+    INTERVALO_MS = 33
+
+    def __init__(
+        self,
+        widget,
+        label=None,
+        progress_bar=None,
+        table_view=None,
+        eliminar_filas: Optional[Callable[[List[Hashable]], None]] = None,
+    ) -> None:
+        """
+        Args:
+            widget: Widget cuyo `after` programa el vaciado de la cola.
+            label: Label donde se muestra el texto.
+            progress_bar: Barra de progreso que recibe valor y máximo.
+            table_view: Tableview de la que se quitan las filas (por iid).
+            eliminar_filas (Optional[Callable]): Quita una lista de filas en lugar
+                de borrar los iid de `table_view`.
+        """
+        self._widget = widget
+        self._label = label
+        self._progress_bar = progress_bar
+        self._table_view = table_view
+        self._eliminar_filas = eliminar_filas or self._eliminar_filas_tabla
+        self._cola: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._id_after: Optional[str] = None
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Publicación (desde cualquier hilo)
+    # └────────────────────────────────────────────────────────────┘
+
+    def texto(self, texto: str) -> None:
+        self._cola.put((_TEXTO, texto))
+
+    def valor(self, valor: int) -> None:
+        self._cola.put((_VALOR, valor))
+
+    def maximo(self, maximo: int, valor: int = 0) -> None:
+        self._cola.put((_MAXIMO, (maximo, valor)))
+
+    def eliminar_fila(self, fila: Hashable) -> None:
+        self._cola.put((_ELIMINAR_FILA, fila))
+
+    def en_ui(self, funcion: Callable[[], Any]) -> None:
+        """Ejecuta `funcion` en el hilo de Tk, tras el progreso publicado antes."""
+        self._cola.put((_EN_UI, funcion))
+
+    def terminar(self) -> None:
+        """Deja de vaciar la cola cuando se haya aplicado todo lo publicado."""
+        self._cola.put((_TERMINAR, None))
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Interfaz (desde el hilo de Tk)
+    # └────────────────────────────────────────────────────────────┘
+
+    def iniciar(self) -> None:
+        """Empieza a vaciar la cola periódicamente. Se llama desde el hilo de Tk."""
+        if self._id_after is None:
+            self._id_after = self._widget.after(self.INTERVALO_MS, self._tick)
+
+    def _tick(self) -> None:
+        self._id_after = None
+        try:
+            terminado = self.drenar()
+        except Exception as e:
+            # el widget pudo destruirse con el trabajo en curso
+            logger.error("Error al aplicar el progreso en la interfaz: %s", e)
+            return
+        if not terminado:
+            self._id_after = self._widget.after(self.INTERVALO_MS, self._tick)
+
+    def drenar(self) -> bool:
+        """
+        Aplica todo lo publicado hasta ahora.
+
+        Returns:
+            bool: True si se publicó `terminar`.
+        """
+        texto = valor = maximo = None
+        filas: List[Hashable] = []
+        funciones: List[Callable[[], Any]] = []
+        terminado = False
+        while True:
+            try:
+                tipo, dato = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            if tipo == _TEXTO:
+                texto = dato
+            elif tipo == _VALOR:
+                valor = dato
+            elif tipo == _MAXIMO:
+                maximo, valor = dato
+            elif tipo == _ELIMINAR_FILA:
+                filas.append(dato)
+            elif tipo == _EN_UI:
+                funciones.append(dato)
+            elif tipo == _TERMINAR:
+                terminado = True
+
+        if self._progress_bar is not None:
+            if maximo is not None:
+                self._progress_bar.config(maximum=maximo)
+            if valor is not None:
+                self._progress_bar.config(value=valor)
+        if texto is not None and self._label is not None:
+            self._label.config(text=texto)
+        if filas:
+            self._eliminar_filas(filas)
+        for funcion in funciones:
+            funcion()
+        return terminado
+
+    def _eliminar_filas_tabla(self, iids: List[Hashable]) -> None:
+        if self._table_view is None:
+            return
+        vista = self._table_view.view
+        existentes = [iid for iid in iids if vista.exists(iid)]
+        if existentes:
+            vista.delete(*existentes)
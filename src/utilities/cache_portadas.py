@@ -0,0 +1,284 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from os.path import dirname, exists, isdir, join
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from models.daos.cache_portada_dao import CachePortadaDAO
+from utilities.configuracion import RUTA_DATA
+from utilities.portadas import ServicioPortadas, obtener_servicio_portadas
+
+logger = logging.getLogger(__name__)
+
+# Directorio de la caché: imágenes por hash y su índice SQLite
+RUTA_CACHE_PORTADAS = join(RUTA_DATA, "cache_portadas")
+
+
+@dataclass(frozen=True)
+class SolicitudPortada:
+    """
+    Lo necesario para obtener la portada de un documento.
+
+    Attributes:
+        hash (str): Hash SHA-256 del documento (clave de la caché).
+        ruta_documento (str): Ruta del documento en la biblioteca.
+        ruta_portada_existente (Optional[str]): Portada generada en la importación
+            por versiones anteriores; si existe se reduce en lugar de renderizar.
+    """
+
+    hash: str
+    ruta_documento: str
+    ruta_portada_existente: Optional[str] = None
+
+
+class CachePortadas:
+    """
+    Caché de portadas direccionada por contenido: la clave es el hash del
+    documento y el tamaño de renderizado, por lo que sirve para cualquier
+    formato que PyMuPDF sepa abrir (PDF, EPUB, ...) y no depende del id.
+
+    Las portadas se generan bajo demanda, la primera vez que se piden, en el
+    pool de procesos de `ServicioPortadas`. El total en disco se mantiene por
+    debajo de `presupuesto_bytes` desalojando las menos usadas.
+    """
+
+    PRESUPUESTO_BYTES = 256 * 1024 * 1024
+    # aciertos que se acumulan antes de escribir sus marcas de uso
+    TAMANO_LOTE_USOS = 500
+
+    def __init__(
+        self,
+        directorio: Optional[str] = None,
+        presupuesto_bytes: int = PRESUPUESTO_BYTES,
+        servicio: Optional[ServicioPortadas] = None,
+    ) -> None:
+        """
+        Args:
+            directorio (Optional[str]): Carpeta de la caché. Por defecto `RUTA_CACHE_PORTADAS`.
+            presupuesto_bytes (int): Tamaño máximo en disco de las imágenes.
+            servicio (Optional[ServicioPortadas]): Pool donde se renderizan las portadas.
+        """
+        self.directorio: str = directorio or RUTA_CACHE_PORTADAS
+        os.makedirs(self.directorio, exist_ok=True)
+        self.presupuesto_bytes: int = presupuesto_bytes
+        self.servicio: ServicioPortadas = servicio or obtener_servicio_portadas()
+        self._dao = CachePortadaDAO(ruta_db=join(self.directorio, "indice.sqlite3"))
+        self._lock = threading.Lock()
+        self._en_curso: dict = {}
+        self._usos_pendientes: List[str] = []
+
+    @staticmethod
+    def clave(hash_documento: str, tamano: Tuple[int, int]) -> str:
+        return f"{hash_documento}_{tamano[0]}x{tamano[1]}"
+
+    def ruta(self, hash_documento: str, tamano: Tuple[int, int]) -> str:
+        """Ruta de la imagen en la caché, repartida por los dos primeros caracteres del hash."""
+        return join(self.directorio, hash_documento[:2], f"{self.clave(hash_documento, tamano)}.png")
+
+    def buscar(self, hash_documento: str, tamano: Tuple[int, int]) -> Optional[str]:
+        """
+        Retorna la ruta de la portada si ya está en la caché, anotándola como usada.
+        """
+        ruta = self.ruta(hash_documento, tamano)
+        if exists(ruta):
+            self.anotar_uso(self.clave(hash_documento, tamano))
+            return ruta
+        return None
+
+    def anotar_uso(self, clave: str) -> None:
+        """Anota un acierto; se escribe con los siguientes en un solo lote."""
+        with self._lock:
+            self._usos_pendientes.append(clave)
+            llena = len(self._usos_pendientes) >= self.TAMANO_LOTE_USOS
+        if llena:
+            self.volcar_usos()
+
+    def volcar_usos(self) -> None:
+        """Escribe los usos anotados con `anotar_uso`."""
+        with self._lock:
+            claves, self._usos_pendientes = self._usos_pendientes, []
+        if claves:
+            self._dao.marcar_usados(claves, time.time())
+
+    def solicitar(self, solicitud: SolicitudPortada, tamano: Tuple[int, int]) -> "Future[Optional[str]]":
+        """
+        Retorna la portada de un documento, generándola si hace falta.
+
+        Returns:
+            Future: Se resuelve con la ruta de la imagen, o None si el documento
+                    no tiene portada (archivo inexistente o ilegible).
+        """
+        ruta = self.buscar(solicitud.hash, tamano)
+        if ruta:
+            futuro: Future = Future()
+            futuro.set_result(ruta)
+            return futuro
+
+        clave = self.clave(solicitud.hash, tamano)
+        with self._lock:
+            # la misma portada pedida dos veces se genera una sola vez
+            futuro = self._en_curso.get(clave)
+            if futuro is not None:
+                return futuro
+            futuro = Future()
+            self._en_curso[clave] = futuro
+
+        origen = solicitud.ruta_documento
+        if solicitud.ruta_portada_existente and exists(solicitud.ruta_portada_existente):
+            origen = solicitud.ruta_portada_existente
+
+        if not origen or not exists(origen):
+            self._terminar(clave, futuro, None)
+            return futuro
+
+        ruta = self.ruta(solicitud.hash, tamano)
+        try:
+            generacion = self.servicio.enviar_ajustada(origen, ruta, tamano)
+        except Exception as e:
+            logger.error("No se pudo encolar la portada de %s: %s", origen, e)
+            self._terminar(clave, futuro, None)
+            return futuro
+
+        generacion.add_done_callback(
+            lambda f: self._registrar(clave, solicitud.hash, tamano, ruta, f, futuro)
+        )
+        return futuro
+
+    def obtener(self, solicitud: SolicitudPortada, tamano: Tuple[int, int]) -> Optional[str]:
+        """Versión bloqueante de `solicitar`."""
+        try:
+            return self.solicitar(solicitud, tamano).result()
+        except Exception as e:
+            logger.error("Error al obtener la portada de %s: %s", solicitud.ruta_documento, e)
+            return None
+
+    def _registrar(
+        self,
+        clave: str,
+        hash_documento: str,
+        tamano: Tuple[int, int],
+        ruta: str,
+        generacion: Future,
+        futuro: Future,
+    ) -> None:
+        try:
+            tamano_bytes = generacion.result()
+        except Exception as e:
+            logger.error("Error al generar la portada %s: %s", clave, e)
+            tamano_bytes = 0
+
+        if not tamano_bytes:
+            self._terminar(clave, futuro, None)
+            return
+
+        self._dao.insertar(
+            params=(clave, hash_documento, tamano[0], tamano[1], tamano_bytes, time.time())
+        )
+        self._desalojar(conservar=clave)
+        self._terminar(clave, futuro, ruta)
+
+    def _terminar(self, clave: str, futuro: Future, resultado: Optional[str]) -> None:
+        with self._lock:
+            self._en_curso.pop(clave, None)
+        futuro.set_result(resultado)
+
+    def _desalojar(self, conservar: Optional[str] = None) -> None:
+        # el orden LRU tiene en cuenta los aciertos aún no escritos
+        self.volcar_usos()
+        for clave in self._dao.desalojar(self.presupuesto_bytes, conservar=conservar):
+            hash_documento = clave.rsplit("_", 1)[0]
+            ruta = join(self.directorio, hash_documento[:2], f"{clave}.png")
+            try:
+                if exists(ruta):
+                    os.remove(ruta)
+            except OSError as e:
+                logger.error("No se pudo borrar la portada %s: %s", ruta, e)
+
+    def tamano_total(self) -> int:
+        return self._dao.tamano_total()
+
+    def rellenar(
+        self,
+        solicitudes: Iterable[SolicitudPortada],
+        tamano: Tuple[int, int],
+        cancelado: Optional[threading.Event] = None,
+        al_progresar: Optional[Callable[[int], None]] = None,
+        max_en_vuelo: int = 8,
+    ) -> int:
+        """
+        Genera las portadas que faltan en la caché (trabajo de relleno).
+
+        Mantiene como mucho `max_en_vuelo` portadas en el pool para no
+        competir con las que pide la interfaz.
+
+        Returns:
+            int: Número de portadas generadas.
+        """
+        generadas = 0
+        en_vuelo: List[Future] = []
+        for solicitud in solicitudes:
+            if cancelado is not None and cancelado.is_set():
+                break
+            if exists(self.ruta(solicitud.hash, tamano)):
+                continue
+            en_vuelo.append(self.solicitar(solicitud, tamano))
+            if len(en_vuelo) >= max_en_vuelo:
+                generadas += sum(1 for f in en_vuelo if f.result())
+                en_vuelo.clear()
+                if al_progresar is not None:
+                    al_progresar(generadas)
+        generadas += sum(1 for f in en_vuelo if f.result())
+        if al_progresar is not None:
+            al_progresar(generadas)
+        return generadas
+
+    def iniciar_relleno(
+        self,
+        obtener_solicitudes: Callable[[], Iterable[SolicitudPortada]],
+        tamano: Tuple[int, int],
+    ) -> threading.Event:
+        """
+        Lanza `rellenar` en un hilo de fondo.
+
+        Returns:
+            threading.Event: Permite cancelar el relleno.
+        """
+        cancelado = threading.Event()
+
+        def trabajar():
+            try:
+                generadas = self.rellenar(obtener_solicitudes(), tamano, cancelado=cancelado)
+                logger.info("Relleno de portadas terminado: %s generadas", generadas)
+            except Exception as e:
+                logger.error("Error en el relleno de portadas: %s", e)
+
+        threading.Thread(target=trabajar, name="relleno-portadas", daemon=True).start()
+        return cancelado
+
+
+_cache_portadas: Optional[CachePortadas] = None
+_cache_portadas_lock = threading.Lock()
+
+
+def obtener_cache_portadas() -> Optional[CachePortadas]:
+    """
+    Retorna la caché de portadas del proceso, o None si el directorio de
+    datos de la aplicación aún no existe.
+    """
+    global _cache_portadas
+    if _cache_portadas is None:
+        if not isdir(dirname(RUTA_CACHE_PORTADAS)):
+            return None
+        with _cache_portadas_lock:
+            if _cache_portadas is None:
+                try:
+                    _cache_portadas = CachePortadas()
+                    atexit.register(_cache_portadas.volcar_usos)
+                except Exception as e:
+                    logger.error("No se pudo abrir la caché de portadas: %s", e)
+                    return None
+    return _cache_portadas
@@ -0,0 +1,229 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from os.path import exists
+from typing import Callable, Dict, Optional, Tuple
+
+from models.daos.texto_pagina_dao import TextoPaginaDAO
+from utilities.auxiliar import generar_ruta_documento
+from utilities.texto_paginas import EXTENSIONES_CON_TEXTO, extraer_texto_paginas
+
+logger = logging.getLogger(__name__)
+
+
+def _bajar_prioridad() -> None:
+    """Inicializador de los procesos de extracción: cede la CPU a la interfaz."""
+    if hasattr(os, "nice"):
+        try:
+            os.nice(10)
+        except OSError:
+            pass
+
+
+class ExtractorTextoPaginas:
+    """
+    Extrae en segundo plano el texto de las páginas de los documentos PDF y
+    EPUB y lo guarda en el índice `texto_pagina_fts`.
+
+    El texto se extrae en un `ProcessPoolExecutor` de baja prioridad (la
+    mitad de los núcleos, con `nice`) y por lotes de `PAGINAS_POR_LOTE`
+    páginas; cada lote se guarda junto con el progreso del documento en una
+    sola transacción, así que una extracción interrumpida se reanuda en el
+    siguiente lote. Como mucho hay un lote por proceso en vuelo, y los lotes
+    de un mismo documento van en orden.
+    """
+
+    PAGINAS_POR_LOTE = 25
+
+    def __init__(
+        self,
+        ruta_db: Optional[str] = None,
+        obtener_ruta_biblioteca: Optional[Callable[[], Optional[str]]] = None,
+        num_procesos: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Args:
+            ruta_db (Optional[str]): Base de datos. Por defecto, la de la aplicación.
+            obtener_ruta_biblioteca (Optional[Callable]): Devuelve la carpeta de la
+                biblioteca en cada pasada. Por defecto, la de la configuración.
+            num_procesos (Optional[int]): Procesos del pool. Por defecto, la mitad de los núcleos.
+            executor (Optional[Executor]): Executor a usar en lugar del pool propio.
+        """
+        self._dao = TextoPaginaDAO(ruta_db=ruta_db)
+        self._obtener_ruta_biblioteca = obtener_ruta_biblioteca or self._ruta_biblioteca_configurada
+        self.num_procesos: int = max(1, num_procesos or (os.cpu_count() or 2) // 2)
+        self._executor: Optional[Executor] = executor
+        self._executor_propio = executor is None
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+        self._repetir = threading.Event()
+        self._cancelado = threading.Event()
+
+    @staticmethod
+    def _ruta_biblioteca_configurada() -> Optional[str]:
+        from models.controllers.configuracion_controller import ConfiguracionController
+
+        return ConfiguracionController().obtener_ubicacion_biblioteca()
+
+    def _obtener_executor(self) -> Optional[Executor]:
+        with self._lock:
+            if self._executor is None:
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.num_procesos,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_bajar_prioridad,
+                    )
+                except Exception as e:
+                    logger.error("No se pudo crear el pool de extracción de texto: %s", e)
+                    return None
+            return self._executor
+
+    def _enviar(self, ruta_documento: str, desde: int) -> Future:
+        hasta = desde + self.PAGINAS_POR_LOTE
+        executor = self._obtener_executor()
+        if executor is not None:
+            try:
+                return executor.submit(extraer_texto_paginas, ruta_documento, desde, hasta)
+            except Exception as e:
+                logger.error("Pool de extracción de texto no disponible: %s", e)
+
+        futuro: Future = Future()
+        try:
+            futuro.set_result(extraer_texto_paginas(ruta_documento, desde, hasta))
+        except Exception as e:
+            futuro.set_exception(e)
+        return futuro
+
+    def procesar_pendientes(
+        self,
+        cancelado: Optional[threading.Event] = None,
+        al_progresar: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """
+        Extrae el texto de todos los documentos pendientes y espera a que termine.
+
+        Args:
+            cancelado (Optional[threading.Event]): Detiene la extracción tras los lotes en vuelo.
+            al_progresar (Optional[Callable[[int, int], None]]): Recibe
+                (documentos terminados, documentos pendientes) tras cada documento.
+
+        Returns:
+            int: Número de documentos terminados.
+        """
+        self._dao.purgar_huerfanos()
+        ruta_biblioteca = self._obtener_ruta_biblioteca()
+        if not ruta_biblioteca or not exists(ruta_biblioteca):
+            return 0
+
+        documentos = self._dao.documentos_pendientes(EXTENSIONES_CON_TEXTO)
+        pendientes = iter(documentos)
+        en_vuelo: Dict[Future, Tuple[int, str, int]] = {}
+        terminados = 0
+
+        def lanzar_siguiente() -> None:
+            for doc in pendientes:
+                ruta = generar_ruta_documento(
+                    ruta_biblioteca=ruta_biblioteca,
+                    id_documento=doc["id"],
+                    nombre_documento=f"{doc['nombre']}.{doc['extension']}",
+                )
+                if not ruta or not exists(ruta):
+                    continue
+                desde = self._dao.iniciar_documento(doc["id"], doc["hash"])
+                en_vuelo[self._enviar(ruta, desde)] = (doc["id"], ruta, desde)
+                return
+
+        for _ in range(self.num_procesos):
+            lanzar_siguiente()
+
+        while en_vuelo:
+            if cancelado is not None and cancelado.is_set():
+                for futuro in en_vuelo:
+                    futuro.cancel()
+                break
+            hechos, _ = wait(list(en_vuelo), timeout=0.5, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                id_documento, ruta, desde = en_vuelo.pop(futuro)
+                try:
+                    paginas_total, paginas = futuro.result()
+                except Exception as e:
+                    logger.error("No se pudo extraer el texto de %s: %s", ruta, e)
+                    self._dao.marcar_error(id_documento)
+                    lanzar_siguiente()
+                    continue
+
+                hasta = min(desde + self.PAGINAS_POR_LOTE, paginas_total)
+                if not self._dao.guardar_paginas(id_documento, paginas, hasta, paginas_total):
+                    lanzar_siguiente()
+                elif hasta < paginas_total:
+                    en_vuelo[self._enviar(ruta, hasta)] = (id_documento, ruta, hasta)
+                else:
+                    terminados += 1
+                    if al_progresar is not None:
+                        al_progresar(terminados, len(documentos))
+                    lanzar_siguiente()
+        return terminados
+
+    def iniciar(self) -> None:
+        """
+        Lanza `procesar_pendientes` en un hilo de fondo. Si ya hay una pasada
+        en curso (p. ej. tras otra importación), se repite al terminar para
+        recoger los documentos nuevos.
+        """
+        with self._lock:
+            if self._hilo is not None:
+                self._repetir.set()
+                return
+            self._cancelado.clear()
+            self._hilo = threading.Thread(target=self._trabajar, name="extraccion-texto", daemon=True)
+            self._hilo.start()
+
+    def _trabajar(self) -> None:
+        while True:
+            self._repetir.clear()
+            try:
+                terminados = self.procesar_pendientes(cancelado=self._cancelado)
+                logger.info("Extracción de texto terminada: %s documentos", terminados)
+            except Exception as e:
+                logger.error("Error en la extracción de texto: %s", e)
+            with self._lock:
+                if self._cancelado.is_set() or not self._repetir.is_set():
+                    self._hilo = None
+                    return
+
+    def progreso(self) -> Tuple[int, int]:
+        """
+        Returns:
+            Tuple[int, int]: (documentos con el texto extraído, documentos PDF y EPUB).
+        """
+        return self._dao.progreso(EXTENSIONES_CON_TEXTO)
+
+    def cerrar(self) -> None:
+        """Detiene la extracción y termina los procesos del pool propio."""
+        self._cancelado.set()
+        with self._lock:
+            if self._executor is not None and self._executor_propio:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_extractor: Optional[ExtractorTextoPaginas] = None
+_extractor_lock = threading.Lock()
+
+
+def obtener_extractor_texto() -> ExtractorTextoPaginas:
+    """
+    Retorna el extractor de texto compartido por todo el proceso.
+    """
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = ExtractorTextoPaginas()
+                atexit.register(_extractor.cerrar)
+    return _extractor
@@ -1,4 +1,10 @@
-from os.path import exists
+import atexit
+import logging
+import os
+import stat
+import tempfile
+import threading
+from os.path import abspath, dirname, exists
 from io import open
 from typing import Dict, List, Optional
 
@@ -9,11 +15,20 @@ Su estructura se basa en secciones y claves, y se compone de texto sin formato
 escrito en código ASCII.
 """
 
+logger = logging.getLogger(__name__)
+
 
 class FileINI:
     """
     Esta clase maneja archivos del tipo INI
 
+    El archivo se lee una sola vez: las líneas se conservan tal cual (con
+    sus comentarios y su orden) y se indexan en diccionarios, de modo que
+    las lecturas no recorren el archivo. Las escrituras cambian la copia en
+    memoria y se guardan en segundo plano, agrupando en una sola escritura
+    todos los cambios de `RETARDO_ESCRITURA` segundos; el archivo se
+    reemplaza de forma atómica (archivo temporal y renombrado).
+
     Args:
         pathINI: Ruta del archivo INI a manejar
     """
@@ -23,13 +38,44 @@ class FileINI:
     __SEPARATOR = "="
     __COMMENT = ";"
 
+    RETARDO_ESCRITURA = 0.5
+
+    _compartidos: Dict[str, "FileINI"] = {}
+    _lock_compartidos = threading.Lock()
+
     def __init__(self, pathINI: str):
         self.__pathINI = pathINI
         self.__fileINI = None  # Variable para almacenar el fichero
         self.__lineas = []
+        # Índices: sección -> línea de la cabecera, sección -> clave -> línea
+        self.__secciones: Dict[str, int] = {}
+        self.__claves: Dict[str, Dict[str, int]] = {}
+        self.__lock = threading.RLock()
+        self.__lock_escritura = threading.Lock()
+        self.__temporizador: Optional[threading.Timer] = None
+        self.__pendiente = False
+        self.__al_salir = False
         # Cargamos el archivo
         self.__load()
 
+    @classmethod
+    def compartido(cls, pathINI: str) -> "FileINI":
+        """
+        Retorna la instancia de proceso para un archivo INI, que se lee una
+        sola vez y comparten todos los que lo usan.
+
+        Args:
+            pathINI: Ruta del archivo INI a manejar
+        """
+        ruta = abspath(pathINI)
+        instancia = cls._compartidos.get(ruta)
+        if instancia is None:
+            with cls._lock_compartidos:
+                instancia = cls._compartidos.get(ruta)
+                if instancia is None:
+                    instancia = cls._compartidos[ruta] = cls(ruta)
+        return instancia
+
     def __load(self) -> None:
         """Método privado para cargar los datos del archivo INI"""
         if not self.__pathINI:
@@ -50,46 +96,123 @@ class FileINI:
                     pass  # Solo creamos el archivo
             except Exception as e:
                 raise IOError(f"Error al crear el archivo INI: {e}")
+        self.__indexar()
+
+    def __nombre_seccion(self, linea: str) -> Optional[str]:
+        """Nombre de la sección si la línea es una cabecera, o None"""
+        if not linea.startswith(self.__START_SECTION):
+            return None
+        fin = linea.find(self.__END_SECTION)
+        return linea[1:fin] if fin != -1 else None
+
+    def __indexar(self) -> None:
+        """
+        Método privado que recorre las líneas una vez y construye los índices
+        de secciones y claves. Si una sección o clave se repite, vale la última.
+        """
+        secciones: Dict[str, int] = {}
+        claves: Dict[str, Dict[str, int]] = {}
+        actual = None
+        for i, linea in enumerate(self.__lineas):
+            nombre = self.__nombre_seccion(linea)
+            if nombre is not None:
+                actual = nombre
+                secciones[nombre] = i
+                claves.setdefault(nombre, {})
+                continue
+            # Ignorar comentarios, líneas vacías y claves fuera de sección
+            if actual is None or linea.startswith(self.__COMMENT) or linea.strip() == '':
+                continue
+            if self.__SEPARATOR in linea:
+                claves[actual][linea.split(self.__SEPARATOR)[0].strip()] = i
+        self.__secciones = secciones
+        self.__claves = claves
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Escritura en segundo plano
+    # └────────────────────────────────────────────────────────────┘
 
     def __write_to_file(self) -> bool:
-        """Método privado para escribir en el archivo"""
-        try:
-            with open(self.__pathINI, "w", encoding='utf-8') as file:
-                file.writelines(self.__lineas)
+        """
+        Método privado que programa la escritura del archivo. Los cambios que
+        llegan antes de que venza el plazo se guardan en la misma escritura.
+        """
+        if not self.__pathINI:
             return True
-        except Exception as e:
-            raise IOError(f"Error al escribir en el archivo: {e}")
-        finally:
-            # Recargamos el archivo después de escribir
-            self.__load()
-
-    def sections(self) -> List[str]:
+        with self.__lock:
+            self.__pendiente = True
+            if not self.__al_salir:
+                atexit.register(self.guardar)
+                self.__al_salir = True
+            if self.__temporizador is None:
+                self.__temporizador = threading.Timer(self.RETARDO_ESCRITURA, self.guardar)
+                self.__temporizador.daemon = True
+                self.__temporizador.start()
+        return True
+
+    def guardar(self) -> bool:
         """
-        Lista todas las secciones en el archivo INI
+        Escribe en el archivo los cambios pendientes sin esperar al plazo.
 
         Returns:
-            Lista de nombres de secciones
+            True si no había cambios o se guardaron, False si falló la escritura
         """
-        values = []
-        for linea in self.__lineas:
-            if linea.startswith(self.__START_SECTION):
-                section_name = linea[1:linea.index(self.__END_SECTION)]
-                values.append(section_name)
-        return values
+        with self.__lock_escritura:
+            with self.__lock:
+                if self.__temporizador is not None:
+                    self.__temporizador.cancel()
+                    self.__temporizador = None
+                if not self.__pendiente:
+                    return True
+                self.__pendiente = False
+                contenido = "".join(self.__lineas)
+            try:
+                self.__reemplazar_archivo(contenido)
+                return True
+            except OSError as e:
+                logger.error("Error al escribir en el archivo %s: %s", self.__pathINI, e)
+                with self.__lock:
+                    self.__pendiente = True
+                return False
+
+    def __reemplazar_archivo(self, contenido: str) -> None:
+        """
+        Escribe el contenido en un temporal del mismo directorio y lo renombra
+        sobre el archivo, de modo que nunca queda un archivo a medias.
+        """
+        descriptor, temporal = tempfile.mkstemp(
+            prefix=".ini-", suffix=".tmp", dir=dirname(abspath(self.__pathINI))
+        )
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                file.write(contenido)
+                file.flush()
+                os.fsync(file.fileno())
+            if exists(self.__pathINI):
+                os.chmod(temporal, stat.S_IMODE(os.stat(self.__pathINI).st_mode))
+            os.replace(temporal, self.__pathINI)
+        except BaseException:
+            if exists(temporal):
+                os.remove(temporal)
+            raise
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Lectura
+    # └────────────────────────────────────────────────────────────┘
 
-    def __index_section(self) -> Dict[str, int]:
+    def sections(self) -> List[str]:
         """
-        Método privado que devuelve un diccionario con los índices de las secciones
+        Lista todas las secciones en el archivo INI
 
         Returns:
-            Diccionario con nombre de sección como clave e índice como valor
+            Lista de nombres de secciones
         """
-        coll = {}
-        for i, linea in enumerate(self.__lineas):
-            if linea.startswith(self.__START_SECTION):
-                section_name = linea[1:linea.index(self.__END_SECTION)]
-                coll[section_name] = i
-        return coll
+        with self.__lock:
+            return [
+                nombre
+                for nombre in map(self.__nombre_seccion, self.__lineas)
+                if nombre is not None
+            ]
 
     def section_exist(self, section: str) -> bool:
         """
@@ -101,7 +224,7 @@ class FileINI:
         Returns:
             True si la sección existe, False en caso contrario
         """
-        return section in self.sections()
+        return section in self.__secciones
 
     def section_keys(self, section: str) -> List[str]:
         """
@@ -113,30 +236,8 @@ class FileINI:
         Returns:
             Lista de claves en la sección
         """
-        lista = []
-        seccion_encontrada = False
-
-        for i, linea in enumerate(self.__lineas):
-            # Detectar si estamos en la sección buscada
-            if linea.startswith(self.__START_SECTION):
-                current_section = linea[1:linea.index(self.__END_SECTION)]
-                seccion_encontrada = (current_section == section)
-                continue
-
-            # Si estamos en la sección correcta
-            if seccion_encontrada:
-                # Ignorar comentarios y líneas vacías
-                if linea.startswith(self.__COMMENT) or linea.strip() == '':
-                    continue
-                # Si encontramos otra sección, terminamos
-                if linea.startswith(self.__START_SECTION):
-                    break
-                # Si hay un separador, es una clave-valor
-                if self.__SEPARATOR in linea:
-                    clave = linea.split(self.__SEPARATOR)[0].strip()
-                    lista.append(clave)
-
-        return lista
+        with self.__lock:
+            return list(self.__claves.get(section, {}))
 
     def section_values(self, section: str) -> List[str]:
         """
@@ -148,30 +249,11 @@ class FileINI:
         Returns:
             Lista de valores en la sección
         """
-        lista = []
-        seccion_encontrada = False
-
-        for linea in self.__lineas:
-            # Detectar si estamos en la sección buscada
-            if linea.startswith(self.__START_SECTION):
-                current_section = linea[1:linea.index(self.__END_SECTION)]
-                seccion_encontrada = (current_section == section)
-                continue
-
-            # Si estamos en la sección correcta
-            if seccion_encontrada:
-                # Ignorar comentarios y líneas vacías
-                if linea.startswith(self.__COMMENT) or linea.strip() == '':
-                    continue
-                # Si encontramos otra sección, terminamos
-                if linea.startswith(self.__START_SECTION):
-                    break
-                # Si hay un separador, es una clave-valor
-                if self.__SEPARATOR in linea:
-                    valor = linea.split(self.__SEPARATOR, 1)[1].strip()
-                    lista.append(valor)
-
-        return lista
+        with self.__lock:
+            return [
+                self.__lineas[i].split(self.__SEPARATOR, 1)[1].strip()
+                for i in self.__claves.get(section, {}).values()
+            ]
 
     def keys(self) -> List[str]:
         """
@@ -210,8 +292,7 @@ class FileINI:
         Returns:
             True si la clave existe en la sección, False en caso contrario
         """
-        comparar = f"{section}|{key}"
-        return comparar in self.keys()
+        return key in self.__claves.get(section, {})
 
     def value_exist(self, section: str, value: str) -> bool:
         """
@@ -224,43 +305,29 @@ class FileINI:
         Returns:
             True si el valor existe en la sección, False en caso contrario
         """
-        comparar = f"{section}|{value}"
-        return comparar in self.values()
+        return value in self.section_values(section=section)
 
-    def __index_key(self, section: str) -> Dict[str, int]:
+    def get_value(self, section: str, key: str) -> str:
         """
-        Método privado que devuelve un diccionario con los índices de las claves de una sección
+        Obtiene el valor de una clave en una sección
 
         Args:
             section: Nombre de la sección
+            key: Nombre de la clave
 
         Returns:
-            Diccionario con clave como key e índice como valor
+            El valor de la clave o cadena vacía si no existe
         """
-        coll = {}
-        seccion_encontrada = False
+        with self.__lock:
+            index = self.__claves.get(section, {}).get(key)
+            if index is None:
+                return ""
+            linea = self.__lineas[index]
+        return linea.split(self.__SEPARATOR, 1)[1].strip()
 
-        for i, linea in enumerate(self.__lineas):
-            # Detectar si estamos en la sección buscada
-            if linea.startswith(self.__START_SECTION):
-                current_section = linea[1:linea.index(self.__END_SECTION)]
-                seccion_encontrada = (current_section == section)
-                continue
-
-            # Si estamos en la sección correcta
-            if seccion_encontrada:
-                # Ignorar comentarios y líneas vacías
-                if linea.startswith(self.__COMMENT) or linea.strip() == '':
-                    continue
-                # Si encontramos otra sección, terminamos
-                if linea.startswith(self.__START_SECTION):
-                    break
-                # Si hay un separador, es una clave-valor
-                if self.__SEPARATOR in linea:
-                    clave = linea.split(self.__SEPARATOR)[0].strip()
-                    coll[clave] = i
-
-        return coll
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Modificación
+    # └────────────────────────────────────────────────────────────┘
 
     def add_section(self, section: str, comment: Optional[str] = None) -> bool:
         """
@@ -273,32 +340,34 @@ class FileINI:
         Returns:
             True si se agregó correctamente, False en caso contrario
         """
-        if not section or self.section_exist(section):
-            return False
+        with self.__lock:
+            if not section or self.section_exist(section):
+                return False
 
-        # Preparar la sección para agregar
-        nuevas_lineas = []
+            # Preparar la sección para agregar
+            nuevas_lineas = []
 
-        # Si hay líneas y la última no tiene salto de línea, añadimos uno
-        if self.__lineas and not self.__lineas[-1].endswith('\n'):
-            nuevas_lineas.append('\n')
+            # Si hay líneas y la última no tiene salto de línea, añadimos uno
+            if self.__lineas and not self.__lineas[-1].endswith('\n'):
+                nuevas_lineas.append('\n')
 
-        # Si no hay líneas o la última no está vacía, añadimos línea en blanco
-        if not self.__lineas or self.__lineas[-1].strip():
-            nuevas_lineas.append('\n')
+            # Si no hay líneas o la última no está vacía, añadimos línea en blanco
+            if not self.__lineas or self.__lineas[-1].strip():
+                nuevas_lineas.append('\n')
 
-        # Añadir la sección
-        nuevas_lineas.append(
-            f"{self.__START_SECTION}{section}{self.__END_SECTION}\n")
+            # Añadir la sección
+            nuevas_lineas.append(
+                f"{self.__START_SECTION}{section}{self.__END_SECTION}\n")
 
-        # Añadir el comentario si existe
-        if comment is not None:
-            nuevas_lineas.append(f"{self.__COMMENT} {comment}\n")
-        else:
-            nuevas_lineas.append(f"{self.__COMMENT} comentario\n")
+            # Añadir el comentario si existe
+            if comment is not None:
+                nuevas_lineas.append(f"{self.__COMMENT} {comment}\n")
+            else:
+                nuevas_lineas.append(f"{self.__COMMENT} comentario\n")
 
-        # Agregar las nuevas líneas
-        self.__lineas.extend(nuevas_lineas)
+            # Agregar las nuevas líneas
+            self.__lineas.extend(nuevas_lineas)
+            self.__indexar()
 
         # Guardar los cambios
         return self.__write_to_file()
@@ -315,33 +384,31 @@ class FileINI:
         Returns:
             True si se agregó o actualizó correctamente, False en caso contrario
         """
-        # Si la sección no existe, crearla
-        if not self.section_exist(section):
-            self.add_section(section)
-
-        # Verificar si el key existe para actualizarlo
-        if self.key_exist(section=section, key=key):
-            # Si la clave existe, reemplazamos su valor
-            dict_keys = self.__index_key(section=section)
-            index_key = dict_keys[key]
-            self.__lineas[index_key] = f"{key}{self.__SEPARATOR}{value}\n"
-        else:
-            # Si la clave no existe, la agregamos después del comentario de la sección
-            dict_sections = self.__index_section()
-            index_section = dict_sections[section]
-
-            # Encontrar la posición correcta para insertar
-            insert_pos = index_section + 1
-
-            # Saltarse comentarios después de la sección
-            while (insert_pos < len(self.__lineas) and
-                   (self.__lineas[insert_pos].startswith(self.__COMMENT) or
-                   self.__lineas[insert_pos].strip() == '')):
-                insert_pos += 1
-
-            # Insertar la nueva clave-valor
-            self.__lineas.insert(
-                insert_pos, f"{key}{self.__SEPARATOR}{value}\n")
+        with self.__lock:
+            # Si la sección no existe, crearla
+            if not self.section_exist(section):
+                self.add_section(section)
+
+            nueva_linea = f"{key}{self.__SEPARATOR}{value}\n"
+            index_key = self.__claves[section].get(key)
+            if index_key is not None:
+                # Si la clave existe, reemplazamos su valor
+                if self.__lineas[index_key] == nueva_linea:
+                    return True
+                self.__lineas[index_key] = nueva_linea
+            else:
+                # Si la clave no existe, la agregamos después del comentario de la sección
+                insert_pos = self.__secciones[section] + 1
+
+                # Saltarse comentarios después de la sección
+                while (insert_pos < len(self.__lineas) and
+                       (self.__lineas[insert_pos].startswith(self.__COMMENT) or
+                       self.__lineas[insert_pos].strip() == '')):
+                    insert_pos += 1
+
+                # Insertar la nueva clave-valor
+                self.__lineas.insert(insert_pos, nueva_linea)
+                self.__indexar()
 
         # Guardar los cambios
         return self.__write_to_file()
@@ -357,39 +424,18 @@ class FileINI:
         Returns:
             La línea borrada o cadena vacía si no se borró nada
         """
-        if not self.key_exist(section=section, key=key):
-            return ""
-
-        dict_keys = self.__index_key(section=section)
-        index_key = dict_keys[key]
-        val = self.__lineas.pop(index_key)
+        with self.__lock:
+            index_key = self.__claves.get(section, {}).get(key)
+            if index_key is None:
+                return ""
+            val = self.__lineas.pop(index_key)
+            self.__indexar()
 
         # Guardar los cambios
         self.__write_to_file()
 
         return val
 
-    def get_value(self, section: str, key: str) -> str:
-        """
-        Obtiene el valor de una clave en una sección
-
-        Args:
-            section: Nombre de la sección
-            key: Nombre de la clave
-
-        Returns:
-            El valor de la clave o cadena vacía si no existe
-        """
-        if not self.section_exist(section) or not self.key_exist(section=section, key=key):
-            return ""
-
-        dict_key = self.__index_key(section=section)
-        index = dict_key[key]
-        linea = self.__lineas[index]
-        valor = linea.split(self.__SEPARATOR, 1)[1].strip()
-
-        return valor
-
     def delete_section(self, section: str) -> bool:
         """
         Borra una sección completa incluyendo sus claves y valores
@@ -400,35 +446,26 @@ class FileINI:
         Returns:
             True si se borró correctamente, False en caso contrario
         """
-        if not self.section_exist(section):
-            return False
-
-        # Obtener el índice de la sección
-        section_indices = self.__index_section()
-        section_index = section_indices[section]
-
-        # Índices a eliminar (la sección y todo su contenido)
-        indices_to_remove = set()
-        indices_to_remove.add(section_index)
-
-        # Obtener índices de las claves de la sección
-        key_indices = self.__index_key(section)
-        indices_to_remove.update(key_indices.values())
-
-        # Añadir índices de comentarios y líneas vacías
-        i = section_index + 1
-        while (i < len(self.__lineas) and
-               not self.__lineas[i].startswith(self.__START_SECTION)):
-            indices_to_remove.add(i)
-            i += 1
-
-        # Convertir a lista ordenada de mayor a menor
-        indices_list = sorted(list(indices_to_remove), reverse=True)
-
-        # Eliminar líneas desde el índice más alto al más bajo
-        for idx in indices_list:
-            if 0 <= idx < len(self.__lineas):
+        with self.__lock:
+            if not self.section_exist(section):
+                return False
+
+            # Índices a eliminar (la sección y todo su contenido)
+            section_index = self.__secciones[section]
+            indices_to_remove = set(self.__claves[section].values())
+            indices_to_remove.add(section_index)
+
+            # Añadir índices de comentarios y líneas vacías
+            i = section_index + 1
+            while (i < len(self.__lineas) and
+                   not self.__lineas[i].startswith(self.__START_SECTION)):
+                indices_to_remove.add(i)
+                i += 1
+
+            # Eliminar líneas desde el índice más alto al más bajo
+            for idx in sorted(indices_to_remove, reverse=True):
                 self.__lineas.pop(idx)
+            self.__indexar()
 
         # Guardar los cambios
         return self.__write_to_file()
@@ -0,0 +1,366 @@
+import atexit
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from os.path import dirname, isdir
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from models.daos.cache_hash_dao import CacheHashDAO, RUTA_CACHE_HASH
+
+logger = logging.getLogger(__name__)
+
+# Tamaño del buffer de lectura reutilizable (1 MiB)
+TAMANO_BUFFER = 1024 * 1024
+
+# hashlib libera el GIL al procesar bloques grandes, por lo que varios hilos
+# aprovechan el ancho de banda del disco sin necesidad de procesos.
+NUM_HILOS_POR_DEFECTO = min(4, os.cpu_count() or 1)
+
+_local = threading.local()
+
+
+def _buffer_thread(tamano_buffer: int) -> bytearray:
+    """
+    Retorna el buffer de lectura del thread actual, creándolo una sola vez.
+    """
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None or len(buffer) != tamano_buffer:
+        buffer = bytearray(tamano_buffer)
+        _local.buffer = buffer
+    return buffer
+
+
+def calcular_sha256(ruta_archivo: str, tamano_buffer: int = TAMANO_BUFFER) -> Optional[str]:
+    """
+    Calcula el hash SHA-256 de un archivo en el propio proceso.
+
+    Lee el archivo en bloques sobre un buffer reutilizable por thread, sin
+    crear copias intermedias ni subprocesos.
+
+    Args:
+        ruta_archivo (str): La ruta completa del archivo.
+        tamano_buffer (int): Tamaño del bloque de lectura en bytes.
+
+    Returns:
+        Optional[str]: El hash en hexadecimal, o None si no se pudo leer.
+    """
+    buffer = _buffer_thread(tamano_buffer)
+    vista = memoryview(buffer)
+    sha256 = hashlib.sha256()
+    try:
+        with open(ruta_archivo, "rb", buffering=0) as archivo:
+            while True:
+                leidos = archivo.readinto(buffer)
+                if not leidos:
+                    break
+                sha256.update(vista[:leidos])
+    except OSError as e:
+        logger.error("Error al calcular hash de %s: %s", ruta_archivo, e)
+        return None
+    return sha256.hexdigest()
+
+
+@dataclass(frozen=True)
+class FirmaArchivo:
+    """
+    Identifica una versión concreta de un archivo en disco.
+    """
+
+    ruta: str
+    tamano: int
+    mtime_ns: int
+    inodo: int
+
+    @classmethod
+    def desde_ruta(cls, ruta: str) -> Optional["FirmaArchivo"]:
+        try:
+            info = os.stat(ruta)
+        except OSError:
+            return None
+        return cls(
+            ruta=os.path.abspath(ruta),
+            tamano=info.st_size,
+            mtime_ns=info.st_mtime_ns,
+            inodo=info.st_ino,
+        )
+
+
+class CacheHash:
+    """
+    Caché persistente de hashes keyed por (ruta, tamaño, mtime_ns, inodo).
+
+    Se guarda en una base de datos SQLite auxiliar bajo `RUTA_DATA`. Una
+    entrada deja de ser válida en cuanto cambia la firma del archivo, y las
+    menos usadas se desalojan al superar `max_entradas`.
+
+    Para que un acierto no cueste una escritura, los usos sueltos
+    (`anotar_uso`) se acumulan en memoria y se escriben por lotes; y el
+    desalojo solo se ejecuta cuando el número de entradas supera el máximo.
+    """
+
+    MAX_ENTRADAS = 200_000
+    # usos sueltos que se acumulan antes de escribirlos
+    TAMANO_LOTE_USOS = 500
+
+    def __init__(self, ruta_db: Optional[str] = None, max_entradas: int = MAX_ENTRADAS):
+        self._dao = CacheHashDAO(ruta_db=ruta_db)
+        self.max_entradas = max_entradas
+        self._lock = threading.Lock()
+        self._usos_pendientes: List[str] = []
+        # cota superior de las entradas guardadas (None: aún no se ha contado)
+        self._entradas: Optional[int] = None
+
+    def buscar(self, firma: FirmaArchivo) -> Optional[str]:
+        return self._dao.obtener_hash(firma.ruta, firma.tamano, firma.mtime_ns, firma.inodo)
+
+    def guardar(self, entradas: Iterable[Tuple[FirmaArchivo, str]]) -> None:
+        ahora = time.time()
+        filas = [
+            (f.ruta, f.tamano, f.mtime_ns, f.inodo, hash_archivo, ahora)
+            for f, hash_archivo in entradas
+        ]
+        if not filas or not self._dao.guardar_lote(filas):
+            return
+        with self._lock:
+            if self._entradas is None:
+                self._entradas = self._dao.contar()
+            else:
+                # INSERT OR REPLACE puede reemplazar: es una cota superior
+                self._entradas += len(filas)
+            if self._entradas <= self.max_entradas:
+                return
+            self._entradas = self._dao.contar()
+            if self._entradas <= self.max_entradas:
+                return
+        # antes de desalojar se escriben los usos pendientes, para no perder el orden LRU
+        self.volcar_usos()
+        if self._dao.desalojar(self.max_entradas):
+            with self._lock:
+                self._entradas = self.max_entradas
+
+    def marcar_usados(self, firmas: Iterable[FirmaArchivo]) -> None:
+        rutas = [f.ruta for f in firmas]
+        if rutas:
+            self._dao.marcar_usados(rutas, time.time())
+
+    def anotar_uso(self, firma: FirmaArchivo) -> None:
+        """Anota un acierto suelto; se escribe con los siguientes en un solo lote."""
+        with self._lock:
+            self._usos_pendientes.append(firma.ruta)
+            llena = len(self._usos_pendientes) >= self.TAMANO_LOTE_USOS
+        if llena:
+            self.volcar_usos()
+
+    def volcar_usos(self) -> None:
+        """Escribe los usos anotados con `anotar_uso`."""
+        with self._lock:
+            rutas, self._usos_pendientes = self._usos_pendientes, []
+        if rutas:
+            self._dao.marcar_usados(rutas, time.time())
+
+
+_cache_hash: Optional[CacheHash] = None
+_cache_hash_lock = threading.Lock()
+
+
+def obtener_cache_hash() -> Optional[CacheHash]:
+    """
+    Retorna la caché de hashes del proceso, o None si el directorio de datos
+    de la aplicación aún no existe.
+    """
+    global _cache_hash
+    if _cache_hash is None:
+        if not isdir(dirname(RUTA_CACHE_HASH)):
+            return None
+        with _cache_hash_lock:
+            if _cache_hash is None:
+                try:
+                    _cache_hash = CacheHash()
+                except Exception as e:
+                    logger.error("No se pudo abrir la caché de hashes: %s", e)
+                    return None
+                atexit.register(_cache_hash.volcar_usos)
+    return _cache_hash
+
+
+def sha256_con_cache(ruta_archivo: str, cache: Optional[CacheHash] = None) -> Optional[str]:
+    """
+    Retorna el hash de un archivo consultando primero la caché persistente.
+    """
+    if cache is None:
+        cache = obtener_cache_hash()
+    firma = FirmaArchivo.desde_ruta(ruta_archivo) if cache is not None else None
+    if firma is not None:
+        hash_archivo = cache.buscar(firma)
+        if hash_archivo:
+            cache.anotar_uso(firma)
+            return hash_archivo
+
+    hash_archivo = calcular_sha256(ruta_archivo)
+    if hash_archivo and firma is not None:
+        cache.guardar([(firma, hash_archivo)])
+    return hash_archivo
+
+
+@dataclass
+class ResultadoHash:
+    """
+    Resultado del cálculo del hash de un archivo.
+    """
+
+    ruta: str
+    hash: Optional[str]
+    tamano: int
+    segundos: float
+    desde_cache: bool = False
+
+    @property
+    def mb_por_segundo(self) -> float:
+        if self.segundos <= 0:
+            return 0.0
+        return self.tamano / (1024 * 1024) / self.segundos
+
+
+@dataclass
+class EstadisticasHash:
+    """
+    Progreso acumulado de un lote de archivos.
+    """
+
+    total_archivos: int
+    archivos_procesados: int = 0
+    bytes_procesados: int = 0
+    segundos: float = 0.0
+
+    @property
+    def mb_por_segundo(self) -> float:
+        if self.segundos <= 0:
+            return 0.0
+        return self.bytes_procesados / (1024 * 1024) / self.segundos
+
+
+class MotorHash:
+    """
+    Calcula hashes SHA-256 de muchos archivos en paralelo con un pool de hilos.
+
+    Si recibe una `CacheHash`, los archivos cuya firma no ha cambiado no se
+    vuelven a leer; las altas y los usos de la caché se escriben por lotes.
+    """
+
+    TAMANO_LOTE_CACHE = 500
+
+    def __init__(
+        self,
+        num_hilos: Optional[int] = None,
+        tamano_buffer: int = TAMANO_BUFFER,
+        cache: Optional[CacheHash] = None,
+    ) -> None:
+        """
+        Args:
+            num_hilos (Optional[int]): Número de hilos de trabajo. Si es None
+                                       se usa `NUM_HILOS_POR_DEFECTO`.
+            tamano_buffer (int): Tamaño del bloque de lectura de cada hilo.
+            cache (Optional[CacheHash]): Caché persistente de hashes.
+        """
+        self.num_hilos: int = max(1, num_hilos or NUM_HILOS_POR_DEFECTO)
+        self.tamano_buffer: int = tamano_buffer
+        self.cache: Optional[CacheHash] = cache
+        self._cancelado = threading.Event()
+
+    def cancelar(self) -> None:
+        """Evita que se procesen los archivos que aún no han comenzado."""
+        self._cancelado.set()
+
+    def _hashear_archivo(
+        self, ruta_archivo: str
+    ) -> Tuple[ResultadoHash, Optional[FirmaArchivo]]:
+        inicio = time.perf_counter()
+        firma = FirmaArchivo.desde_ruta(ruta_archivo)
+        tamano = firma.tamano if firma else 0
+        if self._cancelado.is_set():
+            return ResultadoHash(ruta=ruta_archivo, hash=None, tamano=tamano, segundos=0.0), None
+
+        if self.cache is not None and firma is not None:
+            hash_archivo = self.cache.buscar(firma)
+            if hash_archivo:
+                resultado = ResultadoHash(
+                    ruta=ruta_archivo,
+                    hash=hash_archivo,
+                    tamano=tamano,
+                    segundos=time.perf_counter() - inicio,
+                    desde_cache=True,
+                )
+                return resultado, firma
+
+        hash_archivo = calcular_sha256(ruta_archivo, tamano_buffer=self.tamano_buffer)
+        resultado = ResultadoHash(
+            ruta=ruta_archivo,
+            hash=hash_archivo,
+            tamano=tamano,
+            segundos=time.perf_counter() - inicio,
+        )
+        return resultado, firma
+
+    def _volcar_cache(
+        self, nuevos: List[Tuple[FirmaArchivo, str]], usados: List[FirmaArchivo]
+    ) -> None:
+        if self.cache is None:
+            return
+        try:
+            self.cache.guardar(nuevos)
+            self.cache.marcar_usados(usados)
+        except Exception as e:
+            logger.error("Error al actualizar la caché de hashes: %s", e)
+        nuevos.clear()
+        usados.clear()
+
+    def hashear(
+        self,
+        rutas: Iterable[str],
+        al_completar: Optional[Callable[[ResultadoHash, EstadisticasHash], None]] = None,
+    ) -> Iterator[ResultadoHash]:
+        """
+        Calcula el hash de cada ruta y los entrega a medida que terminan.
+
+        Args:
+            rutas (Iterable[str]): Rutas de los archivos a procesar.
+            al_completar (Optional[Callable]): Se llama tras cada archivo con su
+                                               resultado y el progreso acumulado.
+
+        Yields:
+            ResultadoHash: El resultado de cada archivo, en orden de finalización.
+        """
+        rutas = list(rutas)
+        estadisticas = EstadisticasHash(total_archivos=len(rutas))
+        inicio = time.perf_counter()
+        nuevos: List[Tuple[FirmaArchivo, str]] = []
+        usados: List[FirmaArchivo] = []
+
+        with ThreadPoolExecutor(
+            max_workers=self.num_hilos, thread_name_prefix="hash"
+        ) as executor:
+            futuros = [executor.submit(self._hashear_archivo, ruta) for ruta in rutas]
+            try:
+                for futuro in as_completed(futuros):
+                    resultado, firma = futuro.result()
+                    if firma is not None and resultado.hash:
+                        if resultado.desde_cache:
+                            usados.append(firma)
+                        else:
+                            nuevos.append((firma, resultado.hash))
+                        if len(nuevos) + len(usados) >= self.TAMANO_LOTE_CACHE:
+                            self._volcar_cache(nuevos, usados)
+
+                    estadisticas.archivos_procesados += 1
+                    estadisticas.bytes_procesados += resultado.tamano
+                    estadisticas.segundos = time.perf_counter() - inicio
+                    if al_completar is not None:
+                        al_completar(resultado, estadisticas)
+                    yield resultado
+            finally:
+                for futuro in futuros:
+                    futuro.cancel()
+                self._volcar_cache(nuevos, usados)
@@ -0,0 +1,251 @@
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+def clave_orden(valor: Any) -> Tuple[int, Any]:
+    """
+    Clave para ordenar una columna con números y texto mezclados: primero los
+    números (por su valor) y luego el texto (sin distinguir mayúsculas).
+    """
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return (0, valor)
+    texto = "" if valor is None else str(valor)
+    try:
+        return (0, float(texto))
+    except ValueError:
+        return (1, texto.casefold())
+
+
+_UNIDADES_TAMANO = {"B": 0, "KB": 1, "MB": 2, "GB": 3, "TB": 4, "PB": 5}
+
+
+def clave_tamano(valor: Any) -> Tuple[int, Any]:
+    """
+    Clave para ordenar tamaños legibles ("234 KB", "1.50 MB") por su valor en bytes.
+    """
+    partes = str(valor).split()
+    if len(partes) == 2 and partes[1].upper() in _UNIDADES_TAMANO:
+        try:
+            return (0, float(partes[0]) * 1024 ** _UNIDADES_TAMANO[partes[1].upper()])
+        except ValueError:
+            pass
+    return clave_orden(valor)
+
+
+class ModeloTablaColumnar:
+    """
+    Datos de una tabla en memoria, guardados por columnas, con la vista
+    (filtro y orden) calculada sobre ellos.
+
+    La interfaz solo dibuja la ventana visible (`ventana`), de modo que
+    cargar, ordenar o filtrar decenas de miles de filas no crea ni recorre
+    elementos de Tk. Cada fila tiene un identificador estable (`iid`) que
+    no cambia al ordenar, filtrar o quitar otras filas.
+    """
+
+    def __init__(self, numero_columnas: int, claves_orden: Optional[Dict[int, Callable]] = None):
+        """
+        Args:
+            numero_columnas (int): Número de columnas de cada fila.
+            claves_orden (Optional[Dict[int, Callable]]): Función de clave para
+                ordenar una columna, por índice; por defecto `clave_orden`.
+        """
+        self.numero_columnas = numero_columnas
+        self.claves_orden = claves_orden or {}
+        self._contador = count(1)
+        self._columnas: List[List[Any]] = [[] for _ in range(numero_columnas)]
+        self._iids: List[str] = []
+        self._posiciones: Dict[str, int] = {}
+        # texto en minúsculas (por columna, o de toda la fila con None) y
+        # claves de orden por columna; se recalculan al cambiar los datos
+        self._textos: Dict[Optional[int], List[str]] = {}
+        self._claves: Dict[int, List[Any]] = {}
+        self._orden: Optional[Tuple[int, bool]] = None
+        self._filtro: Optional[Tuple[str, Optional[int]]] = None
+        self._vista: List[int] = []
+        self._vista_valida = True
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Datos
+    # └────────────────────────────────────────────────────────────┘
+
+    def agregar_filas(self, filas: Iterable[Sequence[Any]]) -> List[str]:
+        """
+        Añade filas al final.
+
+        Returns:
+            List[str]: Los identificadores de las filas añadidas.
+        """
+        numero_columnas = self.numero_columnas
+        filas = [
+            fila if len(fila) >= numero_columnas else [*fila, *[""] * (numero_columnas - len(fila))]
+            for fila in filas
+        ]
+        if not filas:
+            return []
+        inicio = len(self._iids)
+        nuevos = [f"F{next(self._contador)}" for _ in filas]
+        self._posiciones.update(zip(nuevos, range(inicio, inicio + len(nuevos))))
+        self._iids.extend(nuevos)
+        # se trasponen las filas a columnas de una vez
+        for columna, valores in zip(self._columnas, zip(*filas)):
+            columna.extend(valores)
+        self._invalidar_cache()
+        if self._orden is None and self._filtro is None and self._vista_valida:
+            # sin orden ni filtro la vista es el orden de llegada
+            self._vista.extend(range(inicio, inicio + len(nuevos)))
+        else:
+            self._vista_valida = False
+        return nuevos
+
+    def eliminar_filas(self, iids: Iterable[str]) -> int:
+        """
+        Quita las filas indicadas (los iid desconocidos se ignoran).
+
+        Returns:
+            int: Número de filas quitadas.
+        """
+        quitar = {self._posiciones[iid] for iid in iids if iid in self._posiciones}
+        if not quitar:
+            return 0
+        conservar = [posicion for posicion in range(len(self._iids)) if posicion not in quitar]
+        self._columnas = [[columna[p] for p in conservar] for columna in self._columnas]
+        self._iids = [self._iids[p] for p in conservar]
+        self._posiciones = {iid: posicion for posicion, iid in enumerate(self._iids)}
+        self._invalidar_cache()
+        self._vista_valida = False
+        return len(quitar)
+
+    def limpiar(self) -> None:
+        """Quita todas las filas; se mantienen el orden y el filtro."""
+        self._columnas = [[] for _ in range(self.numero_columnas)]
+        self._iids = []
+        self._posiciones = {}
+        self._invalidar_cache()
+        self._vista = []
+        self._vista_valida = True
+
+    def actualizar_fila(self, iid: str, valores: Sequence[Any]) -> bool:
+        """
+        Cambia los valores de una fila.
+
+        Returns:
+            bool: False si la fila no existe.
+        """
+        posicion = self._posiciones.get(iid)
+        if posicion is None:
+            return False
+        for indice in range(self.numero_columnas):
+            self._columnas[indice][posicion] = valores[indice] if indice < len(valores) else ""
+        self._invalidar_cache()
+        if self._orden is not None or self._filtro is not None:
+            self._vista_valida = False
+        return True
+
+    def fila(self, iid: str) -> Optional[List[Any]]:
+        posicion = self._posiciones.get(iid)
+        if posicion is None:
+            return None
+        return [columna[posicion] for columna in self._columnas]
+
+    def existe(self, iid: str) -> bool:
+        return iid in self._posiciones
+
+    @property
+    def total(self) -> int:
+        """Filas guardadas, incluidas las que oculta el filtro."""
+        return len(self._iids)
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Vista
+    # └────────────────────────────────────────────────────────────┘
+
+    def __len__(self) -> int:
+        """Filas de la vista (las que pasan el filtro)."""
+        return len(self._obtener_vista())
+
+    def ordenar(self, columna: Optional[int], descendente: bool = False) -> None:
+        """Ordena la vista por `columna`; con None vuelve al orden de llegada."""
+        self._orden = None if columna is None else (columna, descendente)
+        self._vista_valida = False
+
+    @property
+    def orden(self) -> Optional[Tuple[int, bool]]:
+        """(columna, descendente) del orden actual, o None."""
+        return self._orden
+
+    def filtrar(self, texto: str, columna: Optional[int] = None) -> None:
+        """
+        Deja en la vista las filas que contienen `texto` (sin distinguir
+        mayúsculas) en `columna` o, sin columna, en cualquiera. Un texto
+        vacío quita el filtro.
+        """
+        texto = (texto or "").strip().casefold()
+        self._filtro = (texto, columna) if texto else None
+        self._vista_valida = False
+
+    def ventana(self, inicio: int, fin: int) -> List[Tuple[str, List[Any]]]:
+        """
+        Returns:
+            List[Tuple[str, List[Any]]]: (iid, valores) de las filas de la vista
+            entre las posiciones `inicio` y `fin`.
+        """
+        columnas = self._columnas
+        return [
+            (self._iids[posicion], [columna[posicion] for columna in columnas])
+            for posicion in self._obtener_vista()[max(0, inicio):max(0, fin)]
+        ]
+
+    def iids(self, seleccion: Optional[Set[str]] = None) -> List[str]:
+        """Los iid de la vista, en su orden; con `seleccion`, solo esos."""
+        iids = [self._iids[posicion] for posicion in self._obtener_vista()]
+        if seleccion is None:
+            return iids
+        return [iid for iid in iids if iid in seleccion]
+
+    def indice_en_vista(self, iid: str) -> Optional[int]:
+        posicion = self._posiciones.get(iid)
+        if posicion is None:
+            return None
+        try:
+            return self._obtener_vista().index(posicion)
+        except ValueError:
+            return None
+
+    def _invalidar_cache(self) -> None:
+        self._textos.clear()
+        self._claves.clear()
+
+    def _texto(self, columna: Optional[int]) -> List[str]:
+        textos = self._textos.get(columna)
+        if textos is None:
+            if columna is None:
+                # toda la fila en un solo texto: una búsqueda por fila al filtrar
+                columnas = [self._texto(indice) for indice in range(self.numero_columnas)]
+                textos = ["\x00".join(fila) for fila in zip(*columnas)]
+            else:
+                textos = [
+                    "" if valor is None else str(valor).casefold() for valor in self._columnas[columna]
+                ]
+            self._textos[columna] = textos
+        return textos
+
+    def _obtener_vista(self) -> List[int]:
+        if self._vista_valida:
+            return self._vista
+        if self._filtro is not None:
+            texto, columna = self._filtro
+            vista = [posicion for posicion, fila in enumerate(self._texto(columna)) if texto in fila]
+        else:
+            vista = list(range(len(self._iids)))
+        if self._orden is not None:
+            columna, descendente = self._orden
+            claves = self._claves.get(columna)
+            if claves is None:
+                clave = self.claves_orden.get(columna, clave_orden)
+                claves = self._claves[columna] = [clave(valor) for valor in self._columnas[columna]]
+            # sort es estable: a igual clave se mantiene el orden de llegada
+            vista.sort(key=claves.__getitem__, reverse=descendente)
+        self._vista = vista
+        self._vista_valida = True
+        return vista
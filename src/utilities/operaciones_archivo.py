@@ -0,0 +1,301 @@
+import atexit
+import errno
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from dataclasses import dataclass
+from os.path import basename, dirname, exists, isfile
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from send2trash import send2trash  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+COPIAR = "copiar"
+MOVER = "mover"
+PAPELERA = "papelera"
+ELIMINAR = "eliminar"
+
+# Bytes por llamada al copiar: entre bloque y bloque se comprueba la cancelación
+TAMANO_BLOQUE = 8 * 1024 * 1024
+
+
+class OperacionCancelada(Exception):
+    """La operación se canceló antes de terminar."""
+
+
+@dataclass
+class OperacionArchivo:
+    """
+    Una operación sobre un archivo y su resultado.
+
+    `dato` es libre para quien la encola (p. ej. la fila de la tabla que
+    representa el archivo).
+    """
+
+    tipo: str
+    origen: str
+    destino: Optional[str] = None
+    dato: Any = None
+    ok: bool = False
+    cancelada: bool = False
+    error: Optional[str] = None
+
+
+def _copiar_contenido(fsrc, fdst, cancelado: Optional[threading.Event]) -> None:
+    """
+    Copia el contenido entre dos archivos abiertos dentro del kernel con
+    `copy_file_range` (que en btrfs/XFS puede compartir bloques) o
+    `sendfile`, y si ninguno está disponible, por el espacio de usuario.
+    """
+    entrada, salida = fsrc.fileno(), fdst.fileno()
+    copiado = 0
+
+    def comprobar_cancelacion():
+        if cancelado is not None and cancelado.is_set():
+            raise OperacionCancelada()
+
+    if hasattr(os, "copy_file_range"):
+        try:
+            while True:
+                comprobar_cancelacion()
+                enviados = os.copy_file_range(entrada, salida, TAMANO_BLOQUE)
+                if not enviados:
+                    return
+                copiado += enviados
+        except OSError as ex:
+            # sistemas de archivos distintos (kernels antiguos) o no soportado
+            if ex.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+
+    if hasattr(os, "sendfile"):
+        try:
+            while True:
+                comprobar_cancelacion()
+                enviados = os.sendfile(salida, entrada, copiado, TAMANO_BLOQUE)
+                if not enviados:
+                    return
+                copiado += enviados
+        except OSError as ex:
+            if ex.errno not in (errno.ENOSYS, errno.EINVAL, errno.ENOTSOCK):
+                raise
+
+    fsrc.seek(copiado)
+    fdst.seek(copiado)
+    while True:
+        comprobar_cancelacion()
+        bloque = fsrc.read(TAMANO_BLOQUE)
+        if not bloque:
+            return
+        fdst.write(bloque)
+
+
+def copiar_archivo_rapido(
+    origen: str, destino: str, cancelado: Optional[threading.Event] = None
+) -> None:
+    """
+    Copia un archivo con sus permisos y fechas (como `shutil.copy2`), sin
+    pasar los datos por Python cuando el sistema lo permite.
+
+    La copia se escribe en un temporal junto al destino y se renombra al
+    terminar: si falla o se cancela, no queda una copia a medias y un
+    archivo que ya existía en el destino se conserva intacto.
+
+    Raises:
+        OperacionCancelada: Si `cancelado` se activa durante la copia.
+        OSError: Si no se puede leer el origen o escribir el destino.
+    """
+    if exists(destino) and os.path.samefile(origen, destino):
+        raise shutil.SameFileError(f"{origen} y {destino} son el mismo archivo")
+    with open(origen, "rb") as fsrc:
+        descriptor, temporal = tempfile.mkstemp(
+            prefix=f".{basename(destino)}.", suffix=".tmp", dir=dirname(destino) or "."
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as fdst:
+                _copiar_contenido(fsrc, fdst, cancelado)
+            shutil.copystat(origen, temporal)
+            os.replace(temporal, destino)
+        except BaseException:
+            try:
+                os.unlink(temporal)
+            except OSError:
+                pass
+            raise
+
+
+def mover_archivo_rapido(
+    origen: str, destino: str, cancelado: Optional[threading.Event] = None
+) -> None:
+    """
+    Mueve un archivo: con `rename` dentro del mismo sistema de archivos, y
+    copiando y borrando el original entre sistemas de archivos distintos.
+    """
+    try:
+        os.replace(origen, destino)
+        return
+    except OSError as ex:
+        if ex.errno != errno.EXDEV:
+            raise
+    copiar_archivo_rapido(origen, destino, cancelado)
+    os.unlink(origen)
+
+
+class EjecutorOperacionesArchivo:
+    """
+    Ejecuta en paralelo operaciones de copia, movimiento, envío a papelera y
+    borrado de archivos.
+
+    Las operaciones corren en un pool de hilos acotado a `max_hilos` y, para
+    no saturar un mismo disco con accesos aleatorios, como mucho
+    `max_por_dispositivo` a la vez por dispositivo (según `st_dev`) de
+    origen o de destino. Una copia o un movimiento entre dos dispositivos
+    ocupa un hueco en cada uno.
+    """
+
+    def __init__(self, max_hilos: int = 8, max_por_dispositivo: int = 2) -> None:
+        """
+        Args:
+            max_hilos (int): Operaciones en curso como máximo.
+            max_por_dispositivo (int): Operaciones en curso como máximo por dispositivo.
+        """
+        self.max_hilos = max(1, max_hilos)
+        self.max_por_dispositivo = max(1, max_por_dispositivo)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaforos: Dict[int, threading.Semaphore] = {}
+
+    def _obtener_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_hilos, thread_name_prefix="operaciones-archivo"
+                )
+            return self._executor
+
+    def _semaforo(self, dispositivo: int) -> threading.Semaphore:
+        with self._lock:
+            semaforo = self._semaforos.get(dispositivo)
+            if semaforo is None:
+                semaforo = self._semaforos[dispositivo] = threading.Semaphore(
+                    self.max_por_dispositivo
+                )
+            return semaforo
+
+    @staticmethod
+    def _dispositivo(ruta: Optional[str]) -> Optional[int]:
+        if not ruta:
+            return None
+        try:
+            return os.stat(ruta if exists(ruta) else dirname(ruta) or ".").st_dev
+        except OSError:
+            return None
+
+    def _dispositivos(self, operacion: OperacionArchivo) -> List[int]:
+        dispositivos = {self._dispositivo(operacion.origen)}
+        if operacion.tipo in (COPIAR, MOVER):
+            dispositivos.add(self._dispositivo(operacion.destino))
+        dispositivos.discard(None)
+        # siempre en el mismo orden, para no bloquearse entre operaciones cruzadas
+        return sorted(dispositivos)
+
+    def _realizar(self, operacion: OperacionArchivo, cancelado: Optional[threading.Event]) -> None:
+        if cancelado is not None and cancelado.is_set():
+            operacion.cancelada = True
+            return
+        if not isfile(operacion.origen):
+            operacion.error = f"No existe el archivo en ruta de origen: {operacion.origen}"
+            return
+
+        with ExitStack() as pila:
+            for dispositivo in self._dispositivos(operacion):
+                pila.enter_context(self._semaforo(dispositivo))
+            if cancelado is not None and cancelado.is_set():
+                operacion.cancelada = True
+                return
+            try:
+                if operacion.tipo == COPIAR:
+                    copiar_archivo_rapido(operacion.origen, operacion.destino, cancelado)
+                elif operacion.tipo == MOVER:
+                    mover_archivo_rapido(operacion.origen, operacion.destino, cancelado)
+                elif operacion.tipo == PAPELERA:
+                    send2trash(operacion.origen)
+                elif operacion.tipo == ELIMINAR:
+                    os.unlink(operacion.origen)
+                else:
+                    raise ValueError(f"Operación de archivo desconocida: {operacion.tipo}")
+                operacion.ok = True
+            except OperacionCancelada:
+                operacion.cancelada = True
+            except Exception as e:
+                operacion.error = str(e)
+                logger.error("No se pudo %s %s: %s", operacion.tipo, operacion.origen, e)
+
+    def ejecutar(
+        self,
+        operaciones: Iterable[OperacionArchivo],
+        cancelado: Optional[threading.Event] = None,
+        al_terminar: Optional[Callable[[OperacionArchivo, int], None]] = None,
+    ) -> List[OperacionArchivo]:
+        """
+        Ejecuta las operaciones y espera a que terminen todas.
+
+        Args:
+            operaciones (Iterable[OperacionArchivo]): Operaciones a ejecutar.
+            cancelado (Optional[threading.Event]): Detiene las copias en curso
+                entre bloques y descarta las operaciones que no empezaron.
+            al_terminar (Optional[Callable[[OperacionArchivo, int], None]]): Recibe
+                cada operación al terminar (bien, mal o cancelada) y el número de
+                operaciones terminadas. Se llama desde el hilo que llama a `ejecutar`.
+
+        Returns:
+            List[OperacionArchivo]: Las operaciones, en el orden en que se pasaron.
+        """
+        operaciones = list(operaciones)
+        executor = self._obtener_executor()
+        futuros: Dict[Future, OperacionArchivo] = {
+            executor.submit(self._realizar, operacion, cancelado): operacion
+            for operacion in operaciones
+        }
+        terminadas = 0
+        pendientes = set(futuros)
+        while pendientes:
+            hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                operacion = futuros[futuro]
+                if futuro.exception() is not None:
+                    operacion.error = str(futuro.exception())
+                terminadas += 1
+                if al_terminar is not None:
+                    al_terminar(operacion, terminadas)
+        return operaciones
+
+    def cerrar(self) -> None:
+        """Termina los hilos del pool tras las operaciones en curso."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_ejecutor: Optional[EjecutorOperacionesArchivo] = None
+_ejecutor_lock = threading.Lock()
+
+
+def obtener_ejecutor_archivos() -> EjecutorOperacionesArchivo:
+    """
+    Retorna el ejecutor de operaciones de archivo compartido por todo el proceso.
+    """
+    global _ejecutor
+    if _ejecutor is None:
+        with _ejecutor_lock:
+            if _ejecutor is None:
+                _ejecutor = EjecutorOperacionesArchivo(
+                    max_hilos=min(16, (os.cpu_count() or 2) * 2)
+                )
+                atexit.register(_ejecutor.cerrar)
+    return _ejecutor
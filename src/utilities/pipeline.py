@@ -0,0 +1,243 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marca de fin de datos que recorre las colas entre etapas
+_FIN = object()
+
+
+@dataclass
+class EstadisticasEtapa:
+    """
+    Progreso de una etapa del pipeline.
+    """
+
+    nombre: str
+    procesados: int = 0
+    descartados: int = 0
+    en_cola: int = 0
+    segundos: float = 0.0
+
+    @property
+    def por_segundo(self) -> float:
+        if self.segundos <= 0:
+            return 0.0
+        return self.procesados / self.segundos
+
+
+class EtapaPipeline:
+    """
+    Una etapa del pipeline: una función aplicada por `num_hilos` hilos a los
+    elementos de su cola de entrada.
+
+    La función recibe un elemento y retorna el elemento para la siguiente
+    etapa, o None para descartarlo (p. ej. un documento que ya existe).
+
+    Con `tamano_lote` > 1 la función recibe en cambio una lista de hasta
+    `tamano_lote` elementos (los que ya esperan en la cola, sin bloquear) y
+    retorna una lista con el resultado de cada uno, en el mismo orden.
+    """
+
+    def __init__(
+        self,
+        nombre: str,
+        funcion: Callable[[Any], Any],
+        num_hilos: int = 1,
+        tamano_cola: int = 32,
+        tamano_lote: int = 1,
+    ) -> None:
+        """
+        Args:
+            nombre (str): Nombre corto de la etapa, usado en el progreso.
+            funcion (Callable): Trabajo a realizar sobre cada elemento.
+            num_hilos (int): Número de hilos de la etapa.
+            tamano_cola (int): Capacidad de la cola de entrada; al llenarse,
+                               la etapa anterior espera.
+            tamano_lote (int): Máximo de elementos por llamada a `funcion`.
+        """
+        self.nombre: str = nombre
+        self.funcion: Callable[[Any], Any] = funcion
+        self.num_hilos: int = max(1, num_hilos)
+        self.cola: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, tamano_cola))
+        self.tamano_lote: int = max(1, tamano_lote)
+        self._lock = threading.Lock()
+        self._procesados = 0
+        self._descartados = 0
+        self._hilos_activos = 0
+        self._inicio: Optional[float] = None
+        self._fin: Optional[float] = None
+
+    def estadisticas(self) -> EstadisticasEtapa:
+        with self._lock:
+            if self._inicio is None:
+                segundos = 0.0
+            else:
+                segundos = (self._fin or time.perf_counter()) - self._inicio
+            return EstadisticasEtapa(
+                nombre=self.nombre,
+                procesados=self._procesados,
+                descartados=self._descartados,
+                en_cola=self.cola.qsize(),
+                segundos=segundos,
+            )
+
+
+class Pipeline:
+    """
+    Ejecuta una secuencia de etapas conectadas por colas acotadas.
+
+    Cada etapa tiene sus propios hilos, de modo que mientras un archivo se
+    copia, otro puede estar generando su portada y otro insertándose en la
+    base de datos. Las colas acotadas evitan acumular trabajo en memoria:
+    la etapa más lenta marca el ritmo de todo el proceso.
+
+    Example:
+        >>> pipeline = Pipeline([
+        ...     EtapaPipeline("hash", calcular, num_hilos=4),
+        ...     EtapaPipeline("bd", insertar, num_hilos=1),
+        ... ])
+        >>> pipeline.ejecutar(elementos, al_completar=print)
+    """
+
+    def __init__(self, etapas: List[EtapaPipeline]) -> None:
+        if not etapas:
+            raise ValueError("El pipeline necesita al menos una etapa")
+        self.etapas: List[EtapaPipeline] = etapas
+        self._cancelado = threading.Event()
+
+    def cancelar(self) -> None:
+        """Descarta los elementos que aún no han terminado todas las etapas."""
+        self._cancelado.set()
+
+    def estadisticas(self) -> List[EstadisticasEtapa]:
+        return [etapa.estadisticas() for etapa in self.etapas]
+
+    def _alimentar(self, elementos: Iterable[Any]) -> None:
+        primera = self.etapas[0]
+        try:
+            for elemento in elementos:
+                if self._cancelado.is_set():
+                    break
+                primera.cola.put(elemento)
+        finally:
+            for _ in range(primera.num_hilos):
+                primera.cola.put(_FIN)
+
+    def _trabajar(
+        self,
+        indice: int,
+        al_completar: Optional[Callable[[Any], None]],
+    ) -> None:
+        etapa = self.etapas[indice]
+        siguiente = self.etapas[indice + 1] if indice + 1 < len(self.etapas) else None
+
+        terminado = False
+        while not terminado:
+            lote = [etapa.cola.get()]
+            # completa el lote con lo que ya está en cola, sin esperar
+            while len(lote) < etapa.tamano_lote and lote[-1] is not _FIN:
+                try:
+                    lote.append(etapa.cola.get_nowait())
+                except queue.Empty:
+                    break
+            if lote[-1] is _FIN:
+                terminado = True
+                lote.pop()
+            if not lote:
+                continue
+
+            resultados: List[Any] = [None] * len(lote)
+            if not self._cancelado.is_set():
+                inicio = time.perf_counter()
+                try:
+                    if etapa.tamano_lote > 1:
+                        resultados = list(etapa.funcion(lote))
+                    else:
+                        resultados = [etapa.funcion(lote[0])]
+                except Exception as e:
+                    logger.error("Error en la etapa '%s': %s", etapa.nombre, e)
+                    resultados = [None] * len(lote)
+                with etapa._lock:
+                    if etapa._inicio is None:
+                        etapa._inicio = inicio
+                    validos = sum(1 for resultado in resultados if resultado is not None)
+                    etapa._procesados += validos
+                    etapa._descartados += len(lote) - validos
+
+            for resultado in resultados:
+                if resultado is None:
+                    continue
+                if siguiente is not None:
+                    siguiente.cola.put(resultado)
+                elif al_completar is not None:
+                    try:
+                        al_completar(resultado)
+                    except Exception as e:
+                        logger.error("Error al completar un elemento: %s", e)
+
+        # El último hilo de la etapa propaga el fin a la siguiente
+        with etapa._lock:
+            etapa._hilos_activos -= 1
+            ultimo = etapa._hilos_activos == 0
+            if ultimo:
+                etapa._fin = time.perf_counter()
+        if ultimo and siguiente is not None:
+            for _ in range(siguiente.num_hilos):
+                siguiente.cola.put(_FIN)
+
+    def ejecutar(
+        self,
+        elementos: Iterable[Any],
+        al_completar: Optional[Callable[[Any], None]] = None,
+        al_progresar: Optional[Callable[[List[EstadisticasEtapa]], None]] = None,
+        intervalo: float = 0.25,
+    ) -> List[EstadisticasEtapa]:
+        """
+        Procesa los elementos y bloquea hasta que todas las etapas terminan.
+
+        Args:
+            elementos (Iterable): Elementos de entrada de la primera etapa.
+            al_completar (Optional[Callable]): Se llama con cada elemento que
+                                               supera la última etapa.
+            al_progresar (Optional[Callable]): Se llama cada `intervalo`
+                                               segundos, desde el hilo que
+                                               ejecuta, con las estadísticas.
+            intervalo (float): Periodo de notificación del progreso.
+
+        Returns:
+            List[EstadisticasEtapa]: Las estadísticas finales de cada etapa.
+        """
+        hilos: List[threading.Thread] = []
+        for indice, etapa in enumerate(self.etapas):
+            etapa._hilos_activos = etapa.num_hilos
+            for n in range(etapa.num_hilos):
+                hilo = threading.Thread(
+                    target=self._trabajar,
+                    args=(indice, al_completar),
+                    name=f"pipeline-{etapa.nombre}-{n}",
+                    daemon=True,
+                )
+                hilo.start()
+                hilos.append(hilo)
+
+        alimentador = threading.Thread(
+            target=self._alimentar, args=(elementos,), name="pipeline-entrada", daemon=True
+        )
+        alimentador.start()
+
+        for hilo in hilos:
+            while hilo.is_alive():
+                hilo.join(intervalo)
+                if al_progresar is not None and hilo.is_alive():
+                    al_progresar(self.estadisticas())
+        alimentador.join()
+
+        estadisticas = self.estadisticas()
+        if al_progresar is not None:
+            al_progresar(estadisticas)
+        return estadisticas
@@ -0,0 +1,160 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import fitz
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Portada normal: visualización completa
+TAMANO_NORMAL: Tuple[int, int] = (800, 1100)
+DPI_NORMAL: int = 150
+
+
+def renderizar_portada(
+    ruta_documento: str, tamano_max: Tuple[int, int] = TAMANO_NORMAL, dpi: int = DPI_NORMAL
+) -> Optional[Image.Image]:
+    """
+    Rasteriza la primera página de un documento una sola vez con PyMuPDF.
+
+    La escala se limita para no generar un mapa de bits mayor que
+    `tamano_max`, de modo que páginas grandes no cuestan más de lo necesario.
+    Si PyMuPDF no reconoce el archivo, se intenta abrir como imagen.
+
+    Args:
+        ruta_documento (str): Ruta al archivo (PDF, EPUB o imagen).
+        tamano_max (Tuple[int, int]): Tamaño máximo (ancho, alto) del resultado.
+        dpi (int): Resolución máxima del renderizado.
+
+    Returns:
+        Optional[Image.Image]: La imagen de la portada, o None si no se pudo generar.
+    """
+    try:
+        with fitz.open(ruta_documento) as doc:
+            if doc.page_count == 0:
+                return None
+            pagina = doc[0]
+            zoom = dpi / 72
+            ancho, alto = pagina.rect.width, pagina.rect.height
+            if ancho > 0 and alto > 0:
+                zoom = min(zoom, tamano_max[0] / ancho, tamano_max[1] / alto)
+            pix = pagina.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    except Exception as e:
+        logger.debug("PyMuPDF no pudo abrir %s: %s", ruta_documento, e)
+
+    try:
+        with Image.open(ruta_documento) as img:
+            img = img.convert("RGB")
+            img.thumbnail(tamano_max, Image.Resampling.LANCZOS)
+            return img
+    except Exception as e:
+        logger.error("No se pudo generar la portada de %s: %s", ruta_documento, e)
+        return None
+
+
+def generar_portada_ajustada(ruta_origen: str, ruta_salida: str, tamano: Tuple[int, int]) -> int:
+    """
+    Renderiza la portada de un documento (o reduce una imagen existente)
+    al tamaño indicado y la guarda de forma atómica.
+
+    Es una función de módulo para que pueda ejecutarse en otro proceso.
+
+    Returns:
+        int: Bytes escritos, o 0 si no se pudo generar.
+    """
+    img = renderizar_portada(ruta_origen, tamano_max=tamano)
+    if img is None:
+        return 0
+    if img.width > tamano[0] or img.height > tamano[1]:
+        img.thumbnail(tamano, Image.Resampling.LANCZOS)
+    temporal = f"{ruta_salida}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(ruta_salida), exist_ok=True)
+        img.save(temporal, "PNG", optimize=True)
+        os.replace(temporal, ruta_salida)
+        return os.path.getsize(ruta_salida)
+    except Exception as e:
+        logger.error("No se pudo guardar la portada %s: %s", ruta_salida, e)
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        return 0
+
+
+class ServicioPortadas:
+    """
+    Genera portadas en un `ProcessPoolExecutor`, usando todos los núcleos.
+
+    Los procesos se crean con el método `spawn` para no duplicar los hilos
+    de la interfaz. Si no se puede crear el pool, las portadas se generan en
+    el hilo que las pide.
+    """
+
+    def __init__(self, num_procesos: Optional[int] = None) -> None:
+        """
+        Args:
+            num_procesos (Optional[int]): Procesos del pool. Por defecto, uno por núcleo.
+        """
+        self.num_procesos: int = max(1, num_procesos or os.cpu_count() or 1)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _obtener_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is None:
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.num_procesos,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                except Exception as e:
+                    logger.error("No se pudo crear el pool de portadas: %s", e)
+                    return None
+            return self._executor
+
+    def enviar_ajustada(self, ruta_origen: str, ruta_salida: str, tamano: Tuple[int, int]) -> Future:
+        """
+        Encola una portada de un tamaño concreto.
+
+        Returns:
+            Future: Se resuelve con los bytes escritos (0 si falla).
+        """
+        executor = self._obtener_executor()
+        if executor is not None:
+            try:
+                return executor.submit(generar_portada_ajustada, ruta_origen, ruta_salida, tamano)
+            except Exception as e:
+                logger.error("Pool de portadas no disponible: %s", e)
+
+        futuro: Future = Future()
+        futuro.set_result(generar_portada_ajustada(ruta_origen, ruta_salida, tamano))
+        return futuro
+
+    def cerrar(self) -> None:
+        """Termina los procesos del pool."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_servicio: Optional[ServicioPortadas] = None
+_servicio_lock = threading.Lock()
+
+
+def obtener_servicio_portadas() -> ServicioPortadas:
+    """
+    Retorna el servicio de portadas compartido por todo el proceso.
+    """
+    global _servicio
+    if _servicio is None:
+        with _servicio_lock:
+            if _servicio is None:
+                _servicio = ServicioPortadas()
+                atexit.register(_servicio.cerrar)
+    return _servicio
@@ -0,0 +1,155 @@
+import atexit
+import logging
+import os
+import threading
+from os.path import exists
+from typing import Any, Dict, Iterable, List, Optional
+
+import exiftool
+
+logger = logging.getLogger(__name__)
+
+# Permite usar otro ejecutable (p. ej. un exiftool falso en los tests)
+VARIABLE_EJECUTABLE = "BIBLIOTECATK_EXIFTOOL"
+
+
+def _normalizar_ruta(ruta: str) -> str:
+    """Forma comparable de una ruta (exiftool responde con `/` también en Windows)."""
+    return os.path.normcase(os.path.abspath(ruta))
+
+
+class SesionExifTool:
+    """
+    Sesión de larga duración con un único proceso exiftool.
+
+    Mantiene abierto un `exiftool.ExifToolHelper` (modo `-stay_open`), de modo
+    que leer o editar metadatos no arranca un proceso Perl por archivo. El
+    proceso atiende una orden a la vez, así que las llamadas se serializan con
+    un lock y varios hilos pueden compartir la sesión.
+
+    Example:
+        >>> with SesionExifTool() as sesion:
+        ...     metadatos = sesion.obtener_metadatos(["a.pdf", "b.pdf"])
+    """
+
+    def __init__(self, ejecutable: Optional[str] = None) -> None:
+        """
+        Args:
+            ejecutable (Optional[str]): Ruta del ejecutable de exiftool. Por
+                                        defecto la variable de entorno
+                                        `BIBLIOTECATK_EXIFTOOL` o `exiftool`.
+        """
+        self.ejecutable: Optional[str] = ejecutable or os.environ.get(VARIABLE_EJECUTABLE)
+        self._lock = threading.Lock()
+        self._helper: Optional[exiftool.ExifToolHelper] = None
+
+    def __enter__(self) -> "SesionExifTool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.cerrar()
+
+    def _obtener_helper(self) -> exiftool.ExifToolHelper:
+        # El proceso se arranca en la primera orden y se reinicia si murió
+        if self._helper is None:
+            self._helper = exiftool.ExifToolHelper(executable=self.ejecutable)
+        return self._helper
+
+    def cerrar(self) -> None:
+        """Termina el proceso exiftool, si está en marcha."""
+        with self._lock:
+            if self._helper is not None:
+                try:
+                    if self._helper.running:
+                        self._helper.terminate()
+                except Exception as e:
+                    logger.error("Error al cerrar exiftool: %s", e)
+                self._helper = None
+
+    def obtener_metadatos(self, rutas: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Lee los metadatos de varios archivos con una sola orden a exiftool.
+
+        Si el lote falla (p. ej. un archivo ilegible), se reintenta archivo por
+        archivo para no perder los metadatos del resto.
+
+        Args:
+            rutas (Iterable[str]): Rutas de los archivos.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Metadatos por ruta. Las rutas inexistentes
+                                       o que fallan no aparecen.
+        """
+        rutas = [ruta for ruta in rutas if exists(ruta)]
+        if not rutas:
+            return {}
+
+        with self._lock:
+            try:
+                return self._leer(rutas)
+            except Exception as e:
+                if len(rutas) == 1:
+                    logger.error("Error al obtener los metadatos de %s: %s", rutas[0], e)
+                    return {}
+                logger.warning("Lote de metadatos fallido, se reintenta por archivo: %s", e)
+
+            resultado: Dict[str, Dict[str, Any]] = {}
+            for ruta in rutas:
+                try:
+                    resultado.update(self._leer([ruta]))
+                except Exception as e:
+                    logger.error("Error al obtener los metadatos de %s: %s", ruta, e)
+            return resultado
+
+    def _leer(self, rutas: List[str]) -> Dict[str, Dict[str, Any]]:
+        metadatos = self._obtener_helper().get_metadata(rutas)
+        # exiftool puede omitir archivos (ilegibles, repetidos...), así que cada
+        # resultado se asocia por su `SourceFile` y no por su posición
+        por_ruta: Dict[str, List[str]] = {}
+        for ruta in rutas:
+            por_ruta.setdefault(_normalizar_ruta(ruta), []).append(ruta)
+        resultado: Dict[str, Dict[str, Any]] = {}
+        for datos in metadatos:
+            origen = datos.get("SourceFile") if isinstance(datos, dict) else None
+            if not origen:
+                continue
+            for ruta in por_ruta.get(_normalizar_ruta(origen), ()):
+                resultado[ruta] = datos
+        omitidas = [ruta for ruta in rutas if ruta not in resultado]
+        if omitidas:
+            logger.warning("exiftool no devolvió metadatos de: %s", ", ".join(omitidas))
+        return resultado
+
+    def editar_metadato(self, ruta: str, clave: str, valor: str) -> bool:
+        """
+        Escribe un metadato en el archivo, sobrescribiendo el original.
+
+        Returns:
+            bool: True si exiftool terminó sin error.
+        """
+        with self._lock:
+            try:
+                self._obtener_helper().execute(f"-{clave}={valor}", "-overwrite_original", ruta)
+                return True
+            except Exception as e:
+                logger.error("Error al ejecutar ExifTool sobre %s: %s", ruta, e)
+                return False
+
+
+_sesion: Optional[SesionExifTool] = None
+_sesion_lock = threading.Lock()
+
+
+def obtener_sesion_exiftool() -> SesionExifTool:
+    """
+    Retorna la sesión de exiftool compartida por todo el proceso.
+
+    El proceso exiftool se cierra al terminar la aplicación.
+    """
+    global _sesion
+    if _sesion is None:
+        with _sesion_lock:
+            if _sesion is None:
+                _sesion = SesionExifTool()
+                atexit.register(_sesion.cerrar)
+    return _sesion
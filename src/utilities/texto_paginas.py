@@ -0,0 +1,97 @@
+import logging
+import re
+import unicodedata
+import zlib
+from typing import List, Tuple
+
+import fitz
+
+logger = logging.getLogger(__name__)
+
+# Documentos de los que se extrae el texto de las páginas
+EXTENSIONES_CON_TEXTO: Tuple[str, ...] = ("pdf", "epub")
+NIVEL_COMPRESION: int = 6
+# Caracteres de contexto a cada lado de la coincidencia en un fragmento
+CONTEXTO_FRAGMENTO: int = 60
+
+
+def extraer_texto_paginas(
+    ruta_documento: str, desde: int, hasta: int
+) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Extrae con PyMuPDF el texto de las páginas [desde, hasta) de un documento.
+
+    Es una función de módulo para que pueda ejecutarse en otro proceso. Las
+    páginas sin texto (p. ej. escaneadas) no se devuelven.
+
+    Args:
+        ruta_documento (str): Ruta al archivo (PDF o EPUB).
+        desde (int): Primera página, empezando en 0.
+        hasta (int): Página siguiente a la última.
+
+    Returns:
+        Tuple[int, List[Tuple[int, str]]]: El número total de páginas del
+        documento y, por página extraída, su número (empezando en 1) y su texto.
+    """
+    paginas: List[Tuple[int, str]] = []
+    with fitz.open(ruta_documento) as doc:
+        total = doc.page_count
+        for indice in range(desde, min(hasta, total)):
+            texto = doc[indice].get_text("text").strip()
+            if texto:
+                paginas.append((indice + 1, texto))
+    return total, paginas
+
+
+def comprimir_texto(texto: str) -> bytes:
+    """Comprime el texto de una página para guardarlo en `texto_pagina`."""
+    return zlib.compress(texto.encode("utf-8"), NIVEL_COMPRESION)
+
+
+def descomprimir_texto(datos: bytes) -> str:
+    """Operación inversa de `comprimir_texto`."""
+    return zlib.decompress(datos).decode("utf-8")
+
+
+def _plegar(texto: str) -> str:
+    """
+    Minúsculas y sin acentos, carácter a carácter, de modo que las posiciones
+    coinciden con las del texto original.
+    """
+    return "".join(
+        (unicodedata.normalize("NFD", caracter)[:1].lower()[:1] or caracter)
+        for caracter in texto
+    )
+
+
+def fragmento_coincidencia(texto: str, termino: str, contexto: int = CONTEXTO_FRAGMENTO) -> str:
+    """
+    Recorta el texto de una página alrededor de la primera palabra que
+    empieza por alguna de las palabras del término, como hace el índice FTS5
+    (sin distinguir mayúsculas ni acentos).
+
+    Returns:
+        str: El fragmento en una sola línea, con "…" donde se recortó.
+    """
+    texto = " ".join(texto.split())
+    palabras = [re.escape(p) for p in re.findall(r"\w+", _plegar(termino))]
+    inicio = fin = 0
+    if palabras:
+        coincidencia = re.search(rf"\b(?:{'|'.join(palabras)})", _plegar(texto))
+        if coincidencia:
+            inicio, fin = coincidencia.span()
+
+    desde = max(0, inicio - contexto)
+    hasta = min(len(texto), fin + contexto)
+    # no cortar palabras por la mitad
+    if desde > 0:
+        espacio = texto.find(" ", desde, inicio)
+        desde = espacio + 1 if espacio != -1 else desde
+    if hasta < len(texto):
+        espacio = texto.rfind(" ", fin, hasta)
+        hasta = espacio if espacio != -1 else hasta
+    return (
+        ("…" if desde > 0 else "")
+        + texto[desde:hasta]
+        + ("…" if hasta < len(texto) else "")
+    )
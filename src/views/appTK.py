@@ -4,6 +4,7 @@ from views.frames.frame_menu import FrameMenu
 from views.frames.frame_central import FrameCentral
 from views.frames.frame_inferior import FrameInferior
 from models.controllers.configuracion_controller import ConfiguracionController
+from utilities.extraccion_texto import obtener_extractor_texto
 from views.components.ui_tokens import (
     DEFAULT_FONT,
     TABLE_ROWHEIGHT,
@@ -12,6 +13,9 @@ from views.components.ui_tokens import (
     PADDING_PANEL,
 )
 
+# Espera tras el arranque antes de empezar a extraer el texto de las páginas
+RETARDO_EXTRACCION_TEXTO_MS = 3000
+
 
 class AppTK:
     def __init__(self):
@@ -44,6 +48,10 @@ class AppTK:
         # llamamos a los widgets
         self.crear_widgets()
 
+        # extraemos en segundo plano el texto de los documentos nuevos, una
+        # vez que la ventana ya se muestra
+        self.raiz.after(RETARDO_EXTRACCION_TEXTO_MS, obtener_extractor_texto().iniciar)
+
     def centrar_ventana(self, ancho, alto):
         ancho_screen = self.raiz.winfo_screenwidth()
         alto_screen = self.raiz.winfo_screenheight()
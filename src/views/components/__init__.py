@@ -1,11 +1,13 @@
 from views.components.base_form_frame import BaseFormFrame
 from views.components.smart_table_frame import SmartTableFrame
+from views.components.virtual_table_view import VirtualTableView
 from views.components.context_menu_factory import ContextMenuFactory
 from views.components.resizable_input_dialog import ask_resizable_string
 
 __all__ = [
     "BaseFormFrame",
     "SmartTableFrame",
+    "VirtualTableView",
     "ContextMenuFactory",
     "ask_resizable_string",
 ]
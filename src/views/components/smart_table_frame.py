@@ -2,10 +2,17 @@ from ttkbootstrap import Frame, Entry, Combobox, Button, StringVar, Label
 from ttkbootstrap.constants import BOTH, LEFT, READONLY, TOP, X, PRIMARY
 from ttkbootstrap.tableview import Tableview
 from views.components.ui_tokens import PADDING_COMPACT, PADDING_PANEL
+from views.components.virtual_table_view import VirtualTableView
 
 
 class SmartTableFrame(Frame):
-    """Tabla reusable con barra de búsqueda y estado."""
+    """Tabla reusable con barra de búsqueda y estado.
+
+    Con `virtual=True` la tabla es un `VirtualTableView`: recibe los
+    resultados por lotes, solo dibuja las filas visibles y ordena y filtra
+    en memoria; con `searchable` se añade un campo que filtra las filas
+    cargadas mientras se escribe.
+    """
 
     def __init__(
         self,
@@ -20,6 +27,8 @@ class SmartTableFrame(Frame):
         paginated=False,
         searchable=False,
         autofit=True,
+        virtual=False,
+        claves_orden=None,
         **kwargs,
     ):
         super().__init__(master, **kwargs)
@@ -29,11 +38,15 @@ class SmartTableFrame(Frame):
         self.on_search = on_search
         self.on_refresh = on_refresh
         self.var_buscar = var_buscar or StringVar()
+        self.virtual = virtual
+        self.claves_orden = claves_orden
+        self.var_filtro = StringVar()
 
         self.ent_buscar = None
         self.cbx_campos = None
         self.btn_buscar = None
         self.btn_refrescar = None
+        self.ent_filtro = None
         self.lbl_estado = None
         self.table_view = None
 
@@ -75,14 +88,26 @@ class SmartTableFrame(Frame):
             )
             self.btn_refrescar.pack(side=LEFT, padx=(PADDING_PANEL, 0))
 
-        self.table_view = Tableview(
-            master=self,
-            coldata=self.coldata,
-            paginated=paginated,
-            searchable=searchable,
-            autofit=autofit,
-            bootstyle=bootstyle,
-        )
+        if self.virtual:
+            if searchable:
+                self.ent_filtro = Entry(self, textvariable=self.var_filtro)
+                self.ent_filtro.pack(side=TOP, fill=X, padx=PADDING_PANEL, pady=(0, PADDING_COMPACT))
+                self.ent_filtro.bind("<KeyRelease>", self._on_filtro_event)
+            self.table_view = VirtualTableView(
+                master=self,
+                coldata=self.coldata,
+                bootstyle=bootstyle,
+                claves_orden=self.claves_orden,
+            )
+        else:
+            self.table_view = Tableview(
+                master=self,
+                coldata=self.coldata,
+                paginated=paginated,
+                searchable=searchable,
+                autofit=autofit,
+                bootstyle=bootstyle,
+            )
         self.table_view.pack(side=TOP, fill=BOTH, expand=True, padx=PADDING_COMPACT, pady=PADDING_COMPACT)
 
         self.lbl_estado = Label(self, text="")
@@ -104,6 +129,26 @@ class SmartTableFrame(Frame):
         if callable(self.on_refresh):
             self.on_refresh()
 
+    def _on_filtro_event(self, _event):
+        self.filtrar_filas(self.var_filtro.get())
+
+    def agregar_filas(self, filas):
+        """Añade un lote de filas a la tabla con un solo redibujado."""
+        if self.virtual:
+            self.table_view.agregar_filas(filas)
+            return
+        for values in filas:
+            self.table_view.insert_row(values=values, reload=False)
+        self.table_view.load_table_data()
+
+    def limpiar_filas(self):
+        self.table_view.delete_rows()
+
+    def filtrar_filas(self, texto, columna=None):
+        """Filtra las filas cargadas (solo con `virtual=True`)."""
+        if self.virtual:
+            self.table_view.filtrar(texto, columna)
+
     def set_estado(self, texto):
         self.lbl_estado.config(text=texto)
 
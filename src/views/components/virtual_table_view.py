@@ -0,0 +1,347 @@
+from dataclasses import dataclass
+from tkinter import font
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from ttkbootstrap import Frame, Scrollbar, Treeview
+from ttkbootstrap.constants import (
+    BOTH, END, EXTENDED, HEADINGS, HORIZONTAL, LEFT, PRIMARY, RIGHT, TOP, VERTICAL, W, X, Y, YES,
+)
+from utilities.modelo_tabla import ModeloTablaColumnar
+from views.components.ui_tokens import TABLE_ROWHEIGHT
+
+FLECHA_ASCENDENTE = " ▲"
+FLECHA_DESCENDENTE = " ▼"
+
+# Modificadores de Tk: Shift y Control
+_MODIFICADORES_SELECCION = 0x0001 | 0x0004
+
+
+@dataclass
+class FilaTabla:
+    """Fila que retorna `VirtualTableView.get_rows` (como `TableRow` de Tableview)."""
+
+    iid: str
+    values: List[Any]
+
+
+class VirtualTableView(Frame):
+    """
+    Tabla para conjuntos de filas grandes.
+
+    Las filas se guardan en un `ModeloTablaColumnar` y el Treeview solo
+    contiene la ventana visible más `MARGEN` filas por encima y por debajo;
+    al desplazarse cerca del borde de la ventana se vuelve a dibujar
+    alrededor de la nueva posición. Ordenar (clic en la cabecera) y filtrar
+    se hacen sobre el modelo. La selección se guarda por iid, así que se
+    conserva aunque la fila salga de la ventana; un cambio de selección sin
+    Shift ni Control (clic, flechas, menú contextual) la reemplaza entera.
+
+    Mantiene el subconjunto de la API de `Tableview` que usan los
+    controladores (`view`, `get_rows`, `insert_row`, `insert_rows`,
+    `delete_rows`, `autofit_columns`). `view` solo contiene las filas
+    dibujadas: para leer o cambiar filas se usan los métodos de la tabla.
+    """
+
+    MARGEN = 50
+    # filas que se miden en autofit_columns
+    MUESTRA_AJUSTE = 200
+
+    def __init__(
+        self,
+        master=None,
+        coldata=None,
+        bootstyle=PRIMARY,
+        claves_orden: Optional[Dict[int, Callable]] = None,
+        **kwargs,
+    ):
+        super().__init__(master, **kwargs)
+
+        self.coldata = [
+            columna if isinstance(columna, dict) else {"text": str(columna)}
+            for columna in (coldata or [])
+        ]
+        self.modelo = ModeloTablaColumnar(len(self.coldata), claves_orden=claves_orden)
+
+        self._seleccion = set()
+        self._renderizadas = set()
+        # con Shift o Control en la última pulsación, la selección se amplía en vez de reemplazarse
+        self._extender_seleccion = False
+        # los cambios de selección que provoca el propio dibujado no son del usuario
+        self._ignorar_seleccion = False
+        # ventana dibujada [inicio, fin) y primera fila visible, en posiciones de la vista
+        self._inicio = 0
+        self._fin = 0
+        self._primera = 0
+        self._visibles = 20
+        self._id_render = None
+
+        self.view = None
+        self.ybar = None
+        self.hbar = None
+        self._crear_widgets(bootstyle)
+
+    def _crear_widgets(self, bootstyle):
+        frame_tabla = Frame(self)
+        frame_tabla.pack(side=TOP, fill=BOTH, expand=YES)
+
+        self.view = Treeview(
+            frame_tabla,
+            columns=list(range(len(self.coldata))),
+            selectmode=EXTENDED,
+            show=HEADINGS,
+            bootstyle=f"{bootstyle}-table",
+        )
+        self.view.pack(side=LEFT, fill=BOTH, expand=YES)
+
+        self.ybar = Scrollbar(frame_tabla, orient=VERTICAL, command=self._yview)
+        self.ybar.pack(side=RIGHT, fill=Y)
+        self.hbar = Scrollbar(self, orient=HORIZONTAL, command=self.view.xview)
+        self.hbar.pack(side=TOP, fill=X)
+        self.view.configure(yscrollcommand=self._al_desplazar_vista, xscrollcommand=self.hbar.set)
+
+        for indice, columna in enumerate(self.coldata):
+            self.view.column(
+                indice,
+                width=columna.get("width", 200),
+                minwidth=columna.get("minwidth", 20),
+                stretch=columna.get("stretch", False),
+                anchor=columna.get("anchor", W),
+            )
+            self.view.heading(
+                indice,
+                text=columna.get("text", ""),
+                anchor=W,
+                command=lambda c=indice: self._ordenar_por_columna(c),
+            )
+
+        self.view.bind("<<TreeviewSelect>>", self._al_cambiar_seleccion, add="+")
+        self.view.bind("<Configure>", self._al_redimensionar, add="+")
+        # etiqueta propia delante de las del Treeview, para ver todas las pulsaciones
+        # aunque otro código enlace en `view` eventos más concretos (p. ej. <Button-3>)
+        etiqueta = f"VirtualTableView{id(self)}"
+        self.view.bindtags((etiqueta, *self.view.bindtags()))
+        self.view.bind_class(etiqueta, "<ButtonPress>", self._al_pulsar)
+        self.view.bind_class(etiqueta, "<KeyPress>", self._al_pulsar_tecla)
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Datos
+    # └────────────────────────────────────────────────────────────┘
+
+    def agregar_filas(self, filas: Iterable[Sequence[Any]]) -> List[str]:
+        """
+        Añade un lote de filas y redibuja una sola vez.
+
+        Returns:
+            List[str]: Los iid de las filas añadidas.
+        """
+        iids = self.modelo.agregar_filas(filas)
+        if iids:
+            self._programar_render()
+        return iids
+
+    def insert_row(self, index=END, values=None) -> Optional[FilaTabla]:
+        """Añade una fila al final (`index` se ignora; se mantiene por compatibilidad)."""
+        if not values:
+            return None
+        iid = self.agregar_filas([values])[0]
+        return FilaTabla(iid=iid, values=list(values))
+
+    def insert_rows(self, index, rowdata):
+        """Añade las filas al final (`index` se ignora; se mantiene por compatibilidad)."""
+        self.agregar_filas(rowdata)
+
+    def delete_rows(self, indices=None, iids=None):
+        """Quita las filas `iids` o, sin iids, todas."""
+        if iids is None:
+            self.modelo.limpiar()
+            self._seleccion.clear()
+            self._primera = 0
+        else:
+            iids = list(iids)
+            self.modelo.eliminar_filas(iids)
+            self._seleccion.difference_update(iids)
+        self._programar_render()
+
+    def actualizar_fila(self, iid: str, values: Sequence[Any]) -> bool:
+        """
+        Cambia los valores de una fila, esté o no dibujada.
+
+        Returns:
+            bool: False si la fila no existe.
+        """
+        if not self.modelo.actualizar_fila(iid, values):
+            return False
+        if iid in self._renderizadas:
+            self.view.item(iid, values=list(values))
+        if self.modelo.orden is not None:
+            self._programar_render()
+        return True
+
+    def get_rows(self, visible=False, filtered=False, selected=False) -> List[FilaTabla]:
+        """
+        Retorna las filas de la vista (filtradas y ordenadas); con `selected`,
+        las seleccionadas, y con `visible`, las dibujadas.
+        """
+        if selected:
+            iids = self.modelo.iids(self._seleccion)
+        elif visible:
+            iids = list(self.view.get_children())
+        else:
+            iids = self.modelo.iids()
+        return [FilaTabla(iid=iid, values=self.modelo.fila(iid)) for iid in iids]
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Orden y filtro
+    # └────────────────────────────────────────────────────────────┘
+
+    def ordenar(self, columna: Optional[int], descendente: bool = False):
+        self.modelo.ordenar(columna, descendente)
+        for indice, datos in enumerate(self.coldata):
+            texto = datos.get("text", "")
+            if indice == columna:
+                texto += FLECHA_DESCENDENTE if descendente else FLECHA_ASCENDENTE
+            self.view.heading(indice, text=texto)
+        self._primera = 0
+        self._programar_render()
+
+    def filtrar(self, texto: str, columna: Optional[int] = None):
+        """Deja visibles las filas que contienen `texto`; un texto vacío quita el filtro."""
+        self.modelo.filtrar(texto, columna)
+        # las filas ocultas por el filtro dejan de estar seleccionadas
+        self._seleccion.intersection_update(self.modelo.iids())
+        self._primera = 0
+        self._programar_render()
+
+    def _ordenar_por_columna(self, columna: int):
+        descendente = self.modelo.orden == (columna, False)
+        self.ordenar(columna, descendente)
+
+    def autofit_columns(self):
+        """Ajusta el ancho de las columnas a la cabecera y a las primeras filas de la vista."""
+        fuente = font.nametofont("TkDefaultFont")
+        relleno = 20
+        anchos = [
+            fuente.measure(f"{columna.get('text', '')}{FLECHA_ASCENDENTE}") + relleno
+            for columna in self.coldata
+        ]
+        for _, valores in self.modelo.ventana(0, self.MUESTRA_AJUSTE):
+            for indice, valor in enumerate(valores):
+                anchos[indice] = max(anchos[indice], fuente.measure(str(valor)) + relleno)
+        for indice, ancho in enumerate(anchos):
+            self.view.column(indice, width=ancho)
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Ventana dibujada
+    # └────────────────────────────────────────────────────────────┘
+
+    def _programar_render(self):
+        if self._id_render is None:
+            self._id_render = self.after_idle(self._renderizar)
+
+    def _renderizar(self):
+        self._id_render = None
+        total = len(self.modelo)
+        self._primera = max(0, min(self._primera, total - self._visibles))
+        inicio = max(0, self._primera - self.MARGEN)
+        fin = min(total, self._primera + self._visibles + self.MARGEN)
+
+        vista = self.view
+        foco = vista.focus()
+        self._ignorar_seleccion = True
+        hijos = vista.get_children()
+        if hijos:
+            vista.delete(*hijos)
+        filas = self.modelo.ventana(inicio, fin)
+        for iid, valores in filas:
+            vista.insert("", END, iid=iid, values=valores)
+        self._inicio, self._fin = inicio, fin
+        self._renderizadas = {iid for iid, _ in filas}
+
+        seleccionadas = [iid for iid, _ in filas if iid in self._seleccion]
+        if seleccionadas:
+            vista.selection_set(*seleccionadas)
+        if foco in self._renderizadas:
+            vista.focus(foco)
+        # Tk entrega <<TreeviewSelect>> más tarde: se deja de ignorar cuando ya se procesaron
+        self.after_idle(self._aceptar_seleccion)
+        if fin > inicio:
+            vista.yview_moveto((self._primera - inicio) / (fin - inicio))
+        self._actualizar_scrollbar()
+
+    def _necesita_render(self) -> bool:
+        holgura = self.MARGEN // 2
+        arriba = self._inicio > 0 and self._primera - self._inicio < holgura
+        abajo = self._fin < len(self.modelo) and self._fin - (self._primera + self._visibles) < holgura
+        return arriba or abajo
+
+    def _actualizar_scrollbar(self):
+        total = len(self.modelo)
+        if total == 0:
+            self.ybar.set(0, 1)
+        else:
+            self.ybar.set(self._primera / total, min(1.0, (self._primera + self._visibles) / total))
+
+    def _mover_a(self, primera: int):
+        total = len(self.modelo)
+        self._primera = max(0, min(primera, total - self._visibles))
+        if self._necesita_render() or not self._inicio <= self._primera <= self._fin:
+            self._renderizar()
+        elif self._fin > self._inicio:
+            self.view.yview_moveto((self._primera - self._inicio) / (self._fin - self._inicio))
+            self._actualizar_scrollbar()
+
+    # ┌────────────────────────────────────────────────────────────┐
+    # │ Eventos
+    # └────────────────────────────────────────────────────────────┘
+
+    def _yview(self, *args):
+        """Comando de la barra de desplazamiento, en filas de la vista completa."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._mover_a(int(float(args[1]) * len(self.modelo)))
+        elif args[0] == "scroll":
+            paso = self._visibles if args[2] == "pages" else 1
+            self._mover_a(self._primera + int(args[1]) * paso)
+
+    def _al_desplazar_vista(self, primero, _ultimo):
+        """`yscrollcommand` del Treeview: rueda del ratón y teclado dentro de la ventana."""
+        dibujadas = self._fin - self._inicio
+        if dibujadas:
+            self._primera = self._inicio + round(float(primero) * dibujadas)
+        self._actualizar_scrollbar()
+        if self._necesita_render():
+            self._programar_render()
+
+    def _al_redimensionar(self, event):
+        visibles = max(1, event.height // TABLE_ROWHEIGHT)
+        if visibles != self._visibles:
+            self._visibles = visibles
+            self._programar_render()
+
+    def _al_pulsar(self, event):
+        self._extender_seleccion = bool(event.state & _MODIFICADORES_SELECCION)
+        # un clic sin Shift ni Control deja solo la fila pulsada, aunque Tk no
+        # avise porque la selección dibujada no cambia
+        if event.num == 1 and not self._extender_seleccion:
+            if self.view.identify_region(event.x, event.y) in ("cell", "tree"):
+                fila = self.view.identify_row(event.y)
+                if fila:
+                    self._seleccion = {fila}
+
+    def _al_pulsar_tecla(self, event):
+        self._extender_seleccion = bool(event.state & _MODIFICADORES_SELECCION)
+
+    def _aceptar_seleccion(self):
+        self._ignorar_seleccion = False
+
+    def _al_cambiar_seleccion(self, _event):
+        if self._ignorar_seleccion:
+            return
+        seleccion = self.view.selection()
+        if self._extender_seleccion:
+            # las filas fuera de la ventana siguen seleccionadas
+            self._seleccion.difference_update(self._renderizadas)
+            self._seleccion.update(seleccion)
+        else:
+            self._seleccion = set(seleccion)
@@ -32,6 +32,7 @@ from views.dialogs.dialog_administrar_contenido import DialogAdministrarContenid
 from typing import Dict, Any
 from views.components.base_form_frame import BaseFormFrame
 from views.components.smart_table_frame import SmartTableFrame
+from utilities.modelo_tabla import clave_tamano
 from views.components.context_menu_factory import ContextMenuFactory
 from views.components.ui_tokens import (
     BUTTON_STYLE_OUTLINE_DANGER,
@@ -69,6 +70,8 @@ class AdministrarDocumentos(Frame):
         self.campos = ["Nombre", "Extension", "Hash"]
         self.var_nombre = StringVar()
         self.var_id = IntVar()
+        # controlador de la operación de archivos en curso, para poder cancelarla
+        self.operacion_en_curso = None
         # variables de visualizacion
         self.mostrar_asociaciones = False
         self.mostrar_datos_bibliograficos = False
@@ -347,8 +350,10 @@ class AdministrarDocumentos(Frame):
             var_buscar=self.var_buscar,
             bootstyle="primary",
             paginated=False,
-            searchable=False,
+            searchable=True,
             autofit=True,
+            virtual=True,
+            claves_orden={5: clave_tamano},
         )
         self.smart_table.pack(side=TOP, fill=BOTH, expand=True, padx=PADDING_COMPACT, pady=PADDING_COMPACT)
 
@@ -449,8 +454,20 @@ class AdministrarDocumentos(Frame):
         self.lbl_progreso = Label(frame_pregreso, text="")
         self.lbl_progreso.pack(side=TOP, fill=X, padx=PADDING_COMPACT, pady=PADDING_COMPACT, expand=True)
 
-        self.progress_bar = Progressbar(frame_pregreso, maximum=100, bootstyle="primary")
-        self.progress_bar.pack(side=TOP, fill=X, padx=PADDING_COMPACT, pady=PADDING_COMPACT, expand=True)
+        frame_barra = Frame(frame_pregreso)
+        frame_barra.pack(side=TOP, fill=X, expand=True)
+
+        self.progress_bar = Progressbar(frame_barra, maximum=100, bootstyle="primary")
+        self.progress_bar.pack(side=LEFT, fill=X, padx=PADDING_COMPACT, pady=PADDING_COMPACT, expand=True)
+
+        self.btn_cancelar_operacion = Button(
+            frame_barra,
+            text="⛔ Cancelar",
+            command=self.on_cancelar_operacion,
+            style="danger.Outline.TButton",
+        )
+        self.btn_cancelar_operacion.pack(side=LEFT, padx=PADDING_COMPACT, pady=PADDING_COMPACT)
+        ToolTip(self.btn_cancelar_operacion, "Detener la copia, el movimiento o la eliminación en curso")
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Funciones Privadas
@@ -543,6 +560,7 @@ class AdministrarDocumentos(Frame):
             progress_bar=self.progress_bar,
         )
         operaciones.set_path_copy(path_copy=path_copy)
+        self.operacion_en_curso = operaciones
         operaciones.ejecutar_copia_seleccionados()
 
         conf.set_copiar_ubicacion(valor=path_copy)
@@ -567,6 +585,7 @@ class AdministrarDocumentos(Frame):
             progress_bar=self.progress_bar,
         )
         operaciones.set_path_move(path_move=path_move)
+        self.operacion_en_curso = operaciones
         operaciones.ejecutar_mover_seleccionados()
 
         # cargamos en la configuración la ubicación seleccionada por el usuario
@@ -585,6 +604,7 @@ class AdministrarDocumentos(Frame):
                 lbl_progreso=self.lbl_progreso,
                 progress_bar=self.progress_bar,
             )
+            self.operacion_en_curso = operaciones
             operaciones.ejecutar_eliminar_seleccionados()
 
     def _eliminar_registros(self):
@@ -615,6 +635,10 @@ class AdministrarDocumentos(Frame):
     # │ Eventos
     # └────────────────────────────────────────────────────────────┘
 
+    def on_cancelar_operacion(self):
+        if self.operacion_en_curso is not None:
+            self.operacion_en_curso.cancelar()
+
     def on_eliminar_registros(self):
         self._eliminar_registros()
 
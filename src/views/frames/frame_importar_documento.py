@@ -1,5 +1,6 @@
 from os.path import exists, join, expanduser
 from pathlib import Path
+from typing import Dict, Optional
 from tkinter import filedialog, messagebox, Toplevel, Label, Entry, Button, StringVar, Frame
 from ttkbootstrap import (
     Frame as TTFrame,
@@ -25,6 +26,7 @@ from models.controllers.controlar_seleccion_documentos import ControlarSeleccion
 from models.controllers.controlar_todos import ControlarTodos
 from models.controllers.controlar_importacion_documento import ControlarImporetacionDocumento
 from models.controllers.controlar_existentes import ControlarExistentes
+from models.dtos.trabajo_importacion_dto import TrabajoImportacionDTO
 from utilities.auxiliar import (
     abrir_archivo,
     copiar_archivo,
@@ -76,6 +78,10 @@ class FrameImportarDocumento(TTFrame):
         self.ruta_padre_archivo = ""
         # variable para almacenar el focus
         self.item_focus = ""
+        # trabajos de importación de los archivos cargados en la tabla, por ruta
+        self.trabajos_importacion: Dict[str, TrabajoImportacionDTO] = {}
+        # controlador de la operación en curso, para poder cancelarla
+        self.operacion_en_curso = None
 
         # creamos los widgets
         self.crear_widgets()
@@ -268,7 +274,7 @@ class FrameImportarDocumento(TTFrame):
         btn_eliminar_filas = TTButton(
             frame_tabla_ops,
             text="Limpiar tabla",
-            command=lambda: self.table_view.delete_rows(),
+            command=self.on_limpiar_tabla,
             style="secondary.Outline.TButton",
         )
         btn_eliminar_filas.pack(side=TOP, fill=X, padx=3, pady=3)
@@ -395,8 +401,20 @@ class FrameImportarDocumento(TTFrame):
         self.lbl_progreso.pack(side=TOP, fill=X, expand=True, padx=5, pady=5)
 
         # Progress Bar
-        self.progress_bar = Progressbar(self.label_frame, maximum=100, length=400)
-        self.progress_bar.pack(side=TOP, fill=X, expand=True, padx=5, pady=5)
+        frame_progreso = TTFrame(self.label_frame)
+        frame_progreso.pack(side=TOP, fill=X, expand=True)
+
+        self.progress_bar = Progressbar(frame_progreso, maximum=100, length=400)
+        self.progress_bar.pack(side=LEFT, fill=X, expand=True, padx=5, pady=5)
+
+        self.btn_cancelar_operacion = TTButton(
+            frame_progreso,
+            text="⛔ Cancelar",
+            command=self.on_cancelar_operacion,
+            style="danger.Outline.TButton",
+        )
+        self.btn_cancelar_operacion.pack(side=LEFT, padx=5, pady=5)
+        ToolTip(self.btn_cancelar_operacion, "Detener la importación o la operación de archivos en curso")
 
     # ┌────────────────────────────────────────────────────────────┐
     # │ Eventos
@@ -423,6 +441,8 @@ class FrameImportarDocumento(TTFrame):
                 self.table_view.view.set(
                     self.item_focus, "#1", f"📗 {self.var_nombre_documento.get()}"
                 )
+                self.table_view.view.set(self.item_focus, "#7", ruta_destino)
+                self._renombrar_trabajo(ruta_origen=ruta_origen, ruta_destino=ruta_destino)
                 self.ruta_archivo = ruta_destino
 
     def on_abrir_archivo(self):
@@ -540,13 +560,29 @@ class FrameImportarDocumento(TTFrame):
         if items:
             self.table_view.view.delete(*items)
 
+    def on_limpiar_tabla(self):
+        self.table_view.delete_rows()
+        self.trabajos_importacion.clear()
+
+    def _trabajo_item(self, item) -> Optional[TrabajoImportacionDTO]:
+        fila = self.table_view.view.item(item, 'values')
+        return self.trabajos_importacion.get(fila[6]) if len(fila) > 6 else None
+
+    def _renombrar_trabajo(self, ruta_origen: str, ruta_destino: str):
+        trabajo = self.trabajos_importacion.pop(str(ruta_origen), None)
+        if trabajo:
+            archivo = Path(ruta_destino)
+            trabajo.ruta = str(archivo)
+            trabajo.nombre = archivo.stem
+            trabajo.extension = archivo.suffix[1:]
+            self.trabajos_importacion[trabajo.ruta] = trabajo
+
     def on_eliminar_filas_existentes(self):
         items = self.table_view.view.get_children()
         if items:
             for item in items:
-                fila = self.table_view.view.item(item, 'values')
-                existente = True if fila[4] == "🔴 Ya Existe" else False
-                if existente:
+                trabajo = self._trabajo_item(item)
+                if trabajo and trabajo.existe_en_biblioteca:
                     self.table_view.view.delete(item)
 
     def on_importar_documentos(self):
@@ -557,9 +593,15 @@ class FrameImportarDocumento(TTFrame):
             progress_bar=self.progress_bar,
             table_view=self.table_view,
             tipo_importacion=tipo_importacion,
+            trabajos=self.trabajos_importacion,
         )
+        self.operacion_en_curso = controlar_importaciones
         controlar_importaciones.importar()
 
+    def on_cancelar_operacion(self):
+        if self.operacion_en_curso is not None:
+            self.operacion_en_curso.cancelar()
+
     def on_papelera_todos(self):
         # mensaje de advertencia al usuario
         res = messagebox.askyesno(
@@ -573,7 +615,9 @@ class FrameImportarDocumento(TTFrame):
                 table_view=self.table_view,
                 progress_bar=self.progress_bar,
                 ruta_destino="",
+                trabajos=self.trabajos_importacion,
             )
+            self.operacion_en_curso = controlar_todos
             controlar_todos.papelara_todos()
 
     def on_papelera_existentes(self):
@@ -589,7 +633,9 @@ class FrameImportarDocumento(TTFrame):
                 table_view=self.table_view,
                 progress_bar=self.progress_bar,
                 ruta_destino="",
+                trabajos=self.trabajos_importacion,
             )
+            self.operacion_en_curso = controlar_todos
             controlar_todos.papelera_existentes()
 
     def on_eliminar_todos(self):
@@ -605,7 +651,9 @@ class FrameImportarDocumento(TTFrame):
                 table_view=self.table_view,
                 progress_bar=self.progress_bar,
                 ruta_destino="",
+                trabajos=self.trabajos_importacion,
             )
+            self.operacion_en_curso = controlar_todos
             controlar_todos.eliminar_todos()
 
     def on_eliminar_existentes(self):
@@ -621,7 +669,9 @@ class FrameImportarDocumento(TTFrame):
                 table_view=self.table_view,
                 progress_bar=self.progress_bar,
                 ruta_destino="",
+                trabajos=self.trabajos_importacion,
             )
+            self.operacion_en_curso = controlar_todos
             controlar_todos.eliminar_existentes()
 
     def on_copiar_todos(self):
@@ -643,7 +693,9 @@ class FrameImportarDocumento(TTFrame):
             table_view=self.table_view,
             progress_bar=self.progress_bar,
             ruta_destino=ubicacion_copiar,
+            trabajos=self.trabajos_importacion,
         )
+        self.operacion_en_curso = controlar_todos
         controlar_todos.copiar_todos()
 
     def on_copiar_existentes(self):
@@ -665,7 +717,9 @@ class FrameImportarDocumento(TTFrame):
             table_view=self.table_view,
             progress_bar=self.progress_bar,
             ruta_destino=ubicacion_copiar,
+            trabajos=self.trabajos_importacion,
         )
+        self.operacion_en_curso = controlar_todos
         controlar_todos.copiar_existentes()
 
     def on_mover_todos(self):
@@ -687,7 +741,9 @@ class FrameImportarDocumento(TTFrame):
             table_view=self.table_view,
             progress_bar=self.progress_bar,
             ruta_destino=ubicacion_mover,
+            trabajos=self.trabajos_importacion,
         )
+        self.operacion_en_curso = controlar_todos
         controlar_todos.mover_todos()
 
     def on_mover_existentes(self):
@@ -709,7 +765,9 @@ class FrameImportarDocumento(TTFrame):
             table_view=self.table_view,
             progress_bar=self.progress_bar,
             ruta_destino=ubicacion_mover,
+            trabajos=self.trabajos_importacion,
         )
+        self.operacion_en_curso = controlar_todos
         controlar_todos.mover_existentes()
 
     def on_comparar_existentes(self):
@@ -722,31 +780,26 @@ class FrameImportarDocumento(TTFrame):
             )
             return
 
-        filas = [self.table_view.view.item(item, "values") for item in items]
-        existentes = [fila for fila in filas if len(fila) > 4 and fila[4] == "🔴 Ya Existe"]
-        no_existentes = [fila for fila in filas if len(fila) > 4 and fila[4] == "🟢 No Existe"]
+        trabajos = [self._trabajo_item(item) for item in items]
+        trabajos = [trabajo for trabajo in trabajos if trabajo]
+        existentes = [trabajo for trabajo in trabajos if trabajo.existe_en_biblioteca]
+        no_existentes = [trabajo for trabajo in trabajos if not trabajo.existe_en_biblioteca]
 
         # Duplicados por hash dentro de la selección
         mapa_hash = {}
-        for fila in filas:
-            if len(fila) < 7:
-                continue
-            hash_archivo = fila[5]
-            nombre_archivo = Path(fila[6]).name
-            mapa_hash.setdefault(hash_archivo, []).append(nombre_archivo)
+        for trabajo in trabajos:
+            mapa_hash.setdefault(trabajo.hash, []).append(Path(trabajo.ruta).name)
         duplicados_hash = [nombres for nombres in mapa_hash.values() if len(nombres) > 1]
 
         # Duplicados por nombre dentro de la selección
         mapa_nombre = {}
-        for fila in filas:
-            if len(fila) < 7:
-                continue
-            nombre_archivo = Path(fila[6]).name.lower()
+        for trabajo in trabajos:
+            nombre_archivo = Path(trabajo.ruta).name.lower()
             mapa_nombre.setdefault(nombre_archivo, 0)
             mapa_nombre[nombre_archivo] += 1
         duplicados_nombre = [nombre for nombre, total in mapa_nombre.items() if total > 1]
 
-        total = len(filas)
+        total = len(trabajos)
         mensaje = [
             f"Total analizados: {total}",
             f"Existentes en biblioteca: {len(existentes)}",
@@ -769,7 +822,7 @@ class FrameImportarDocumento(TTFrame):
 
     def on_seleccionar_archivos(self):
         # limpiamos la tabla
-        self.table_view.delete_rows()
+        self.on_limpiar_tabla()
 
         configuracion = ConfiguracionController()
         dir_init = configuracion.get_ultima_ubicacion()
@@ -828,6 +881,7 @@ class FrameImportarDocumento(TTFrame):
                 progress_bar=self.progress_bar,
                 table_view=self.table_view,
                 lista_archivos=lista_seleccionados,
+                trabajos=self.trabajos_importacion,
             )
             controlarSeleccion.cargar_archivos_seleccionados()
 
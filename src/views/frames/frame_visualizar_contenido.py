@@ -17,7 +17,8 @@ from views.components.ui_tokens import PADDING_OUTER, PADDING_PANEL
 
 class FrameVisualizarContenido(Frame):
     """
-    Frame que permite buscar en el contenido (capítulos y secciones) de los documentos.
+    Frame que permite buscar en el contenido (capítulos, secciones y texto
+    de las páginas) de los documentos.
     """
 
     def __init__(self, master=None, **kwargs):
@@ -50,7 +51,8 @@ class FrameVisualizarContenido(Frame):
         self.ent_buscar.pack(side=LEFT, fill=X, expand=True, padx=(0, PADDING_PANEL))
         ToolTip(
             self.ent_buscar,
-            "Busca en títulos de capítulos y secciones. Presiona Enter para buscar.",
+            "Busca en títulos de capítulos y secciones y en el texto de las páginas. "
+            "Presiona Enter para buscar.",
         )
 
         self.btn_buscar = Button(frame_busqueda, text="Buscar", style="primary")
@@ -80,7 +82,7 @@ class FrameVisualizarContenido(Frame):
         # Configuración de encabezados y columnas
         self.tree_view.heading("#0", text="Documento / contenido", anchor=W)
         self.tree_view.heading("tipo", text="Tipo", anchor=W)
-        self.tree_view.heading("titulo", text="Título", anchor=W)
+        self.tree_view.heading("titulo", text="Título / fragmento", anchor=W)
         self.tree_view.heading("pagina", text="Página", anchor=E)
 
         self.tree_view.column("#0", stretch=True, width=300)
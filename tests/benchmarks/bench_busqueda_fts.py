@@ -0,0 +1,136 @@
+"""
+Benchmark: búsqueda mientras se escribe en el estante con el índice FTS5.
+
+Genera una biblioteca sintética de documentos con bibliografía y
+colecciones (vocabulario con frecuencias de Zipf), escribe letra a letra
+dos palabras frecuentes y mide `buscar_en_estante` +
+`count_buscar_en_estante` (lo que ejecuta el estante en cada búsqueda),
+comparándolo con la búsqueda anterior por LIKE '%termino%'.
+
+Uso:
+    python tests/benchmarks/bench_busqueda_fts.py [numero_documentos]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from models.daos.consulta_dao import ConsultaDAO  # noqa: E402
+from models.daos.database_dao import DataBaseDAO  # noqa: E402
+
+SILABAS = "al go rit mo re des sis te ma his to ria da tos fi si ca qui mi bio lo gi a".split()
+TAMANO_VOCABULARIO = 8000
+REPETICIONES = 20
+
+# Búsqueda "todo" anterior, sin el índice de texto completo
+SQL_LIKE = """
+    SELECT DISTINCT v.id FROM vista_asociaciones_documentos v
+    LEFT JOIN bibliografia b ON v.id = b.id_documento
+    LEFT JOIN documento_coleccion dc ON v.id = dc.id_documento
+    LEFT JOIN coleccion c ON dc.id_coleccion = c.id
+    LEFT JOIN documento_grupo dg ON v.id = dg.id_documento
+    LEFT JOIN grupo g ON dg.id_grupo = g.id
+    WHERE v.nombre LIKE ? OR b.titulo LIKE ? OR b.autores LIKE ?
+       OR c.nombre LIKE ? OR g.nombre LIKE ?
+    ORDER BY v.nombre LIMIT 40
+"""
+
+
+def _vocabulario(azar: random.Random):
+    """
+    Palabras inventadas con frecuencias de Zipf, como en títulos reales:
+    unas pocas muy comunes y una cola larga de palabras raras.
+    """
+    palabras = sorted(
+        {
+            "".join(azar.choice(SILABAS) for _ in range(azar.randint(2, 4)))
+            for _ in range(TAMANO_VOCABULARIO * 2)
+        }
+    )[:TAMANO_VOCABULARIO]
+    azar.shuffle(palabras)
+    pesos = [1 / rango for rango in range(1, len(palabras) + 1)]
+    return palabras, pesos
+
+
+def _titulo(azar: random.Random, vocabulario, palabras: int) -> str:
+    return " ".join(azar.choices(vocabulario[0], weights=vocabulario[1], k=palabras))
+
+
+def _poblar(ruta_db: str, numero_documentos: int):
+    azar = random.Random(42)
+    vocabulario = _vocabulario(azar)
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.executemany(
+            "INSERT INTO coleccion (id, nombre) VALUES (?, ?)",
+            ((i, f"colección {_titulo(azar, vocabulario, 2)} {i}") for i in range(1, 101)),
+        )
+        con.executemany(
+            "INSERT INTO documento (id, nombre, extension, hash, tamano) VALUES (?, ?, 'pdf', ?, 1)",
+            (
+                (i, f"{_titulo(azar, vocabulario, 3)}_{i}", f"hash_{i}")
+                for i in range(1, numero_documentos + 1)
+            ),
+        )
+        con.executemany(
+            "INSERT INTO bibliografia (titulo, autores, id_documento) VALUES (?, ?, ?)",
+            (
+                (_titulo(azar, vocabulario, 5), f"autor {azar.randint(1, 5000)}", i)
+                for i in range(1, numero_documentos + 1, 2)
+            ),
+        )
+        con.executemany(
+            "INSERT INTO documento_coleccion (id_documento, id_coleccion) VALUES (?, ?)",
+            ((i, azar.randint(1, 100)) for i in range(1, numero_documentos + 1, 3)),
+        )
+    con.close()
+
+
+def _medir(funcion) -> float:
+    funcion()
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        funcion()
+    return (time.perf_counter() - inicio) / REPETICIONES * 1000
+
+
+def main(numero_documentos: int = 100000):
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_db = os.path.join(directorio, "bench.sqlite3")
+        DataBaseDAO(ruta_db=ruta_db).crear_base_de_datos()
+        inicio = time.perf_counter()
+        _poblar(ruta_db, numero_documentos)
+        print(
+            f"Documentos: {numero_documentos} "
+            f"(inserción con disparadores FTS: {time.perf_counter() - inicio:.1f} s)"
+        )
+
+        dao = ConsultaDAO(ruta_db=ruta_db)
+        # se escriben letra a letra dos palabras frecuentes del vocabulario
+        frecuentes = dao._ejecutar_consulta(
+            "SELECT nombre FROM documento WHERE id IN (1, 2)"
+        )
+        primera, segunda = (fila["nombre"].split()[0] for fila in frecuentes)
+        terminos = [primera[:n] for n in range(1, len(primera) + 1)]
+        terminos += [f"{primera} {segunda[:n]}" for n in range(1, len(segunda) + 1)]
+        print(f"{'Término':<24}{'Resultados':>12}{'LIKE':>12}{'FTS5':>12}")
+        for prefijo in terminos:
+            like = f"%{prefijo}%"
+            antes = _medir(lambda: dao._ejecutar_consulta(SQL_LIKE, (like,) * 5))
+            despues = _medir(
+                lambda: (
+                    dao.buscar_en_estante("todo", prefijo, 40, 0),
+                    dao.count_buscar_en_estante("todo", prefijo),
+                )
+            )
+            total = dao.count_buscar_en_estante("todo", prefijo)
+            print(f"{prefijo!r:<24}{total:>12}{antes:>9.1f} ms{despues:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,181 @@
+"""
+Benchmark: latencia de las consultas del estante con la vista anterior
+(LEFT JOIN de todas las tablas hijas antes del GROUP BY) y con la tabla
+materializada `documento_flags`.
+
+Genera una biblioteca sintética de documentos con metadatos, capítulos,
+etiquetas, colecciones y favoritos, y mide las consultas de `ConsultaDAO`
+que leen de `vista_asociaciones_documentos`.
+
+Uso:
+    python tests/benchmarks/bench_documento_flags.py [numero_documentos]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from models.daos.consulta_dao import ConsultaDAO  # noqa: E402
+from models.daos.database_dao import DataBaseDAO  # noqa: E402
+
+METADATOS_POR_DOCUMENTO = 30
+CAPITULOS_POR_DOCUMENTO = 10
+ETIQUETAS_POR_DOCUMENTO = 3
+REPETICIONES = 3
+
+# Definición de las vistas antes de `documento_flags`
+VISTAS_ANTERIORES = [
+    """CREATE VIEW vista_documento_asociaciones AS
+SELECT
+    d.id AS id_documento,
+    d.nombre AS nombre_documento,
+    MAX(CASE WHEN b.id IS NOT NULL THEN 1 ELSE 0 END) AS tiene_dato_bibliografico,
+    MAX(CASE WHEN m.id IS NOT NULL THEN 1 ELSE 0 END) AS tiene_metadato,
+    MAX(CASE WHEN c.id IS NOT NULL THEN 1 ELSE 0 END) AS tiene_capitulos,
+    MAX(CASE WHEN dc.id_documento IS NOT NULL THEN 1 ELSE 0 END) AS tiene_coleccion,
+    MAX(CASE WHEN dg.id_documento IS NOT NULL THEN 1 ELSE 0 END) AS tiene_grupo,
+    MAX(CASE WHEN dca.id_documento IS NOT NULL THEN 1 ELSE 0 END) AS tiene_categoria,
+    MAX(CASE WHEN de.id_documento IS NOT NULL THEN 1 ELSE 0 END) AS tiene_etiqueta,
+    MAX(CASE WHEN dpc.id_documento IS NOT NULL THEN 1 ELSE 0 END) AS tiene_palabra_clave,
+    MAX(CASE WHEN f.id IS NOT NULL THEN 1 ELSE 0 END) AS es_favorito
+FROM
+    documento d
+LEFT JOIN bibliografia b ON d.id = b.id_documento
+LEFT JOIN metadato m ON d.id = m.id_documento
+LEFT JOIN capitulo c ON d.id = c.id_documento
+LEFT JOIN documento_coleccion dc ON d.id = dc.id_documento
+LEFT JOIN documento_grupo dg ON d.id = dg.id_documento
+LEFT JOIN documento_categoria dca ON d.id = dca.id_documento
+LEFT JOIN documento_etiqueta de ON d.id = de.id_documento
+LEFT JOIN documento_palabra_clave dpc ON d.id = dpc.id_documento
+LEFT JOIN favorito f ON d.id = f.id_documento
+GROUP BY d.id, d.nombre;""",
+    """CREATE VIEW vista_asociaciones_documentos AS
+SELECT
+    d.id, d.nombre, d.extension, d.hash, d.tamano, d.esta_activo,
+    d.creado_en, d.actualizado_en,
+    vda.es_favorito, vda.tiene_capitulos, vda.tiene_categoria,
+    vda.tiene_coleccion, vda.tiene_dato_bibliografico, vda.tiene_etiqueta,
+    vda.tiene_grupo, vda.tiene_metadato, vda.tiene_palabra_clave
+FROM documento d
+INNER JOIN vista_documento_asociaciones vda ON d.id = vda.id_documento;""",
+]
+
+
+def _poblar(ruta_db: str, numero_documentos: int):
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.executemany(
+            "INSERT INTO documento (id, nombre, extension, hash, tamano) VALUES (?, ?, 'pdf', ?, 1024)",
+            ((i, f"documento_{i:06d}", f"hash_{i}") for i in range(1, numero_documentos + 1)),
+        )
+        con.executemany(
+            "INSERT INTO metadato (id_documento, clave, valor) VALUES (?, ?, 'valor')",
+            (
+                (i, f"clave_{k}")
+                for i in range(1, numero_documentos + 1)
+                for k in range(METADATOS_POR_DOCUMENTO)
+            ),
+        )
+        con.executemany(
+            "INSERT INTO capitulo (id_documento, numero_capitulo, titulo) VALUES (?, ?, 'capítulo')",
+            (
+                (i, k)
+                for i in range(1, numero_documentos + 1)
+                for k in range(CAPITULOS_POR_DOCUMENTO)
+            ),
+        )
+        con.executemany(
+            "INSERT INTO etiqueta (id, nombre) VALUES (?, ?)",
+            ((k, f"etiqueta_{k}") for k in range(1, 51)),
+        )
+        con.executemany(
+            "INSERT INTO documento_etiqueta (id_documento, id_etiqueta) VALUES (?, ?)",
+            (
+                (i, (i + k) % 50 + 1)
+                for i in range(1, numero_documentos + 1)
+                for k in range(ETIQUETAS_POR_DOCUMENTO)
+            ),
+        )
+        con.execute("INSERT INTO coleccion (id, nombre) VALUES (1, 'colección')")
+        con.executemany(
+            "INSERT INTO documento_coleccion (id_documento, id_coleccion) VALUES (?, 1)",
+            ((i,) for i in range(1, numero_documentos + 1, 3)),
+        )
+        con.executemany(
+            "INSERT INTO favorito (id_documento) VALUES (?)",
+            ((i,) for i in range(1, numero_documentos + 1, 10)),
+        )
+    con.close()
+
+
+def _usar_vistas(ruta_db: str, vistas):
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.execute("DROP VIEW IF EXISTS vista_asociaciones_documentos")
+        con.execute("DROP VIEW IF EXISTS vista_documento_asociaciones")
+        for sql in vistas:
+            con.execute(sql)
+    con.close()
+
+
+def _medir(consultas) -> dict:
+    tiempos = {}
+    for nombre, consulta in consultas.items():
+        consulta()  # calienta la caché de páginas
+        inicio = time.perf_counter()
+        for _ in range(REPETICIONES):
+            consulta()
+        tiempos[nombre] = (time.perf_counter() - inicio) / REPETICIONES * 1000
+    return tiempos
+
+
+def main(numero_documentos: int = 20000):
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_db = os.path.join(directorio, "bench.sqlite3")
+        database = DataBaseDAO(ruta_db=ruta_db)
+        database.crear_base_de_datos()
+        _poblar(ruta_db, numero_documentos)
+
+        consultas = {
+            "estante (página 1)": lambda dao: dao.buscar_en_estante("todo", "", 50, 0),
+            "estante (contar)": lambda dao: dao.count_buscar_en_estante("todo", ""),
+            "favoritos": lambda dao: dao.get_documentos_favoritos(),
+            "asociaciones de un documento": lambda dao: dao.existe_asociaciones(
+                numero_documentos // 2
+            ),
+        }
+
+        _usar_vistas(ruta_db, VISTAS_ANTERIORES)
+        dao = ConsultaDAO(ruta_db=ruta_db)
+        antes = _medir({n: (lambda c=c: c(dao)) for n, c in consultas.items()})
+
+        _usar_vistas(
+            ruta_db,
+            [
+                database._dto.sql_view_documento_asociaciones,
+                database._dto.sql_view_asociaciones_documentos,
+            ],
+        )
+        dao = ConsultaDAO(ruta_db=ruta_db)
+        despues = _medir({n: (lambda c=c: c(dao)) for n, c in consultas.items()})
+
+    print(
+        f"Documentos: {numero_documentos} "
+        f"({METADATOS_POR_DOCUMENTO} metadatos, {CAPITULOS_POR_DOCUMENTO} capítulos, "
+        f"{ETIQUETAS_POR_DOCUMENTO} etiquetas cada uno)"
+    )
+    print(f"{'Consulta':<32}{'Vista anterior':>16}{'documento_flags':>18}{'Aceleración':>14}")
+    for nombre in consultas:
+        print(
+            f"{nombre:<32}{antes[nombre]:>13.1f} ms{despues[nombre]:>15.1f} ms"
+            f"{antes[nombre] / despues[nombre]:>13.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
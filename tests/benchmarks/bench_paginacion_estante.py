@@ -0,0 +1,86 @@
+"""
+Benchmark: pasar de página en el estante con LIMIT/OFFSET y por clave
+(nombre, id), y el conteo del total con y sin `CacheConsultas`.
+
+Genera una biblioteca sintética de documentos y mide `buscar_en_estante`
+para páginas cada vez más profundas del catálogo completo.
+
+Uso:
+    python tests/benchmarks/bench_paginacion_estante.py [numero_documentos]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from models.daos.cache_consultas import CacheConsultas  # noqa: E402
+from models.daos.consulta_dao import ConsultaDAO  # noqa: E402
+from models.daos.database_dao import DataBaseDAO  # noqa: E402
+from models.entities.consulta import Consulta  # noqa: E402
+
+DOCUMENTOS_POR_PAGINA = 40
+REPETICIONES = 20
+
+
+def _poblar(ruta_db: str, numero_documentos: int):
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.executemany(
+            "INSERT INTO documento (id, nombre, extension, hash, tamano) VALUES (?, ?, 'pdf', ?, 1)",
+            (
+                (i, f"documento {(i * 7919) % numero_documentos:06d}", f"hash_{i}")
+                for i in range(1, numero_documentos + 1)
+            ),
+        )
+    con.close()
+
+
+def _medir(funcion) -> float:
+    funcion()
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        funcion()
+    return (time.perf_counter() - inicio) / REPETICIONES * 1000
+
+
+def main(numero_documentos: int = 100000):
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_db = os.path.join(directorio, "bench.sqlite3")
+        DataBaseDAO(ruta_db=ruta_db).crear_base_de_datos()
+        _poblar(ruta_db, numero_documentos)
+        dao = ConsultaDAO(ruta_db=ruta_db)
+
+        total_paginas = numero_documentos // DOCUMENTOS_POR_PAGINA
+        print(f"Documentos: {numero_documentos} ({total_paginas} páginas)")
+        print(f"{'Página':>8}{'OFFSET':>12}{'Por clave':>14}")
+        for pagina in (2, total_paginas // 10, total_paginas // 2, total_paginas):
+            offset = (pagina - 1) * DOCUMENTOS_POR_PAGINA
+            anterior = dao.buscar_en_estante("todo", "", 1, offset - 1)[0]
+            despues_de = (anterior["nombre"], anterior["id"])
+            con_offset = _medir(
+                lambda: dao.buscar_en_estante("todo", "", DOCUMENTOS_POR_PAGINA, offset)
+            )
+            por_clave = _medir(
+                lambda: dao.buscar_en_estante(
+                    "todo", "", DOCUMENTOS_POR_PAGINA, offset, despues_de=despues_de
+                )
+            )
+            print(f"{pagina:>8}{con_offset:>9.1f} ms{por_clave:>11.1f} ms")
+
+        consulta = Consulta(ruta_db=ruta_db)
+
+        def contar_sin_cache():
+            CacheConsultas.resetear()
+            consulta.contar_resultados_busqueda("todo", "")
+
+        sin_cache = _medir(contar_sin_cache)
+        con_cache = _medir(lambda: consulta.contar_resultados_busqueda("todo", ""))
+        print(f"Conteo del total: {sin_cache:.2f} ms sin caché, {con_cache:.2f} ms con caché")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
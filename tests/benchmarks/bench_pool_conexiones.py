@@ -0,0 +1,62 @@
+"""
+Micro-benchmark: consultas por segundo de la clase base DAO.
+
+Compara el esquema anterior (abrir conexión, PRAGMA y cerrar en cada
+consulta) con el pool de conexiones por thread de `Database`.
+
+Uso:
+    python tests/benchmarks/bench_pool_conexiones.py [numero_consultas]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from models.daos.documento_dao import DocumentoDAO  # noqa: E402
+
+
+def _consulta_sin_pool(ruta_db: str, sql: str, params: tuple):
+    """Reproduce el comportamiento anterior de `DAO._get_connection`."""
+    con = sqlite3.connect(ruta_db)
+    con.row_factory = sqlite3.Row
+    con.execute("PRAGMA foreign_keys = ON")
+    try:
+        filas = [dict(fila) for fila in con.execute(sql, params).fetchall()]
+        con.commit()
+        return filas
+    finally:
+        con.close()
+
+
+def _medir(funcion, numero_consultas: int) -> float:
+    inicio = time.perf_counter()
+    for i in range(numero_consultas):
+        funcion(i)
+    return numero_consultas / (time.perf_counter() - inicio)
+
+
+def main(numero_consultas: int = 5000):
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_db = os.path.join(directorio, "bench.sqlite3")
+        dao = DocumentoDAO(ruta_db=ruta_db)
+        for i in range(100):
+            dao.insertar(params=(f"doc_{i}", "pdf", f"hash_{i}", 1024, 1))
+
+        sql = "SELECT * FROM documento WHERE id = ?"
+        antes = _medir(
+            lambda i: _consulta_sin_pool(ruta_db, sql, (i % 100 + 1,)), numero_consultas
+        )
+        despues = _medir(lambda i: dao.instanciar(params=(i % 100 + 1,)), numero_consultas)
+
+    print(f"Consultas: {numero_consultas}")
+    print(f"Sin pool (conexión por consulta): {antes:,.0f} consultas/s")
+    print(f"Con pool por thread:              {despues:,.0f} consultas/s")
+    print(f"Aceleración: x{despues / antes:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,98 @@
+"""
+Benchmark: cargar los resultados de una búsqueda en la tabla de
+administración de documentos.
+
+Genera resultados sintéticos y una biblioteca con la mitad de sus
+archivos, y mide generar las filas (con la comprobación de existencia),
+pasarlas por lotes al modelo columnar de la tabla y ordenarlas y
+filtrarlas en memoria. La interfaz solo dibuja la ventana visible, así que
+su coste no depende del número de resultados.
+
+Uso:
+    python tests/benchmarks/bench_tabla_resultados.py [numero_resultados]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from models.controllers.controlar_administrar_documentos import (  # noqa: E402
+    ControlarAdministrarDocumentos,
+)
+from utilities.modelo_tabla import ModeloTablaColumnar, clave_tamano  # noqa: E402
+
+
+class _Widget:
+    def after(self, ms, funcion):
+        return None
+
+
+def _resultados(numero_resultados: int):
+    return [
+        {
+            "id": i,
+            "nombre": f"documento {(i * 7919) % numero_resultados:06d}",
+            "extension": "pdf",
+            "tamano": (i * 104729) % (50 * 1024 * 1024),
+            "esta_activo": i % 5 != 0,
+            "creado_en": "2024-01-01 10:00:00",
+            "actualizado_en": "2024-01-02 10:00:00",
+            "hash": f"hash_{i}",
+            "tiene_metadato": i % 2,
+            "es_favorito": i % 7 == 0,
+        }
+        for i in range(1, numero_resultados + 1)
+    ]
+
+
+def _poblar_biblioteca(ruta_biblioteca: str, resultados):
+    for dato in resultados[::2]:
+        sub_directorio = os.path.join(ruta_biblioteca, str(dato["id"] // 1000).zfill(3))
+        os.makedirs(sub_directorio, exist_ok=True)
+        open(os.path.join(sub_directorio, f"{dato['id']}_{dato['nombre']}.pdf"), "w").close()
+
+
+def _medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return (time.perf_counter() - inicio) * 1000, resultado
+
+
+def main(numero_resultados: int = 50000):
+    resultados = _resultados(numero_resultados)
+    with tempfile.TemporaryDirectory() as ruta_biblioteca:
+        _poblar_biblioteca(ruta_biblioteca, resultados)
+
+        controlar = ControlarAdministrarDocumentos(_Widget(), _Widget(), _Widget())
+        controlar._ruta_biblioteca = ruta_biblioteca
+        modelo = ModeloTablaColumnar(10, claves_orden={5: clave_tamano})
+
+        def cargar():
+            for inicio in range(0, numero_resultados, controlar.TAMANO_LOTE):
+                lote = resultados[inicio:inicio + controlar.TAMANO_LOTE]
+                modelo.agregar_filas([controlar._generar_fila(dato) for dato in lote])
+            return len(modelo)
+
+        tiempo_carga, filas = _medir(cargar)
+        existentes = sum(
+            1 for _, valores in modelo.ventana(0, filas) if controlar.icon_existe in valores[1]
+        )
+        print(f"Resultados: {filas} ({existentes} en la biblioteca)")
+        print(f"Generar y cargar por lotes: {tiempo_carga:8.1f} ms")
+
+        modelo.ordenar(5)
+        tiempo_orden, _ = _medir(lambda: modelo.ventana(0, 100))
+        print(f"Ordenar por tamaño:         {tiempo_orden:8.1f} ms")
+
+        for texto in ("documento 01", "documento 012"):
+            # el primer filtro prepara el texto de cada fila; los siguientes lo reutilizan
+            modelo.filtrar(texto)
+            tiempo_filtro, visibles = _medir(lambda: len(modelo))
+            print(f"Filtrar '{texto}' ({visibles} filas): {tiempo_filtro:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,5 @@
+from models.daos.cache_consultas import CacheConsultas
+
+# Los tests escriben en bases de datos temporales sin pasar siempre por los
+# DAO; la caché de consultas queda apagada salvo en los tests que la prueban.
+CacheConsultas.habilitada = False
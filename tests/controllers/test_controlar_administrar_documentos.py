@@ -0,0 +1,52 @@
+import os
+
+from models.controllers import controlar_administrar_documentos
+from models.controllers.controlar_administrar_documentos import ControlarAdministrarDocumentos
+from utilities.auxiliar import ruta_documento_biblioteca
+
+# --- Fixtures ---
+
+
+def _controlador(ruta_biblioteca):
+    """Controlador sin Tk con la biblioteca ya preparada."""
+    controlar = ControlarAdministrarDocumentos.__new__(ControlarAdministrarDocumentos)
+    controlar._ruta_biblioteca = str(ruta_biblioteca)
+    controlar._archivos_subdirectorio = {}
+    return controlar
+
+
+def _guardar(ruta_biblioteca, id_documento, nombre_archivo):
+    ruta = ruta_documento_biblioteca(str(ruta_biblioteca), nombre_archivo, id_documento)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "wb") as archivo:
+        archivo.write(b"x")
+
+
+# --- Tests ---
+
+
+def test_existe_documento_usa_la_ruta_de_la_biblioteca(tmp_path):
+    """
+    Verifica que la existencia se comprueba en la ruta que calcula
+    `ruta_documento_biblioteca`, sin crear subdirectorios.
+    """
+    _guardar(tmp_path, 1234, "manual.pdf")
+    controlar = _controlador(tmp_path)
+
+    assert controlar._existe_documento({"id": 1234, "nombre": "manual", "extension": "pdf"})
+    assert not controlar._existe_documento({"id": 1235, "nombre": "otro", "extension": "pdf"})
+    assert not controlar._existe_documento({"id": 5000, "nombre": "manual", "extension": "pdf"})
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["001"]
+
+
+def test_existe_documento_compara_nombres_normalizados(tmp_path, monkeypatch):
+    """
+    Verifica que los nombres se comparan con `normcase`, de modo que en un
+    sistema de archivos sin mayúsculas (Windows) la extensión en mayúsculas
+    del archivo no lo da por ausente.
+    """
+    monkeypatch.setattr(controlar_administrar_documentos, "normcase", str.lower)
+    _guardar(tmp_path, 7, "Manual.PDF")
+    controlar = _controlador(tmp_path)
+
+    assert controlar._existe_documento({"id": 7, "nombre": "manual", "extension": "pdf"})
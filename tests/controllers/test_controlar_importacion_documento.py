@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+from models.controllers.controlar_importacion_documento import (
+    ControlarImporetacionDocumento,
+    _ElementoImportacion,
+)
+
+
+class _SesionExifToolRota:
+    def obtener_metadatos(self, rutas):
+        raise RuntimeError("exiftool no responde")
+
+
+def test_etapa_metadatos_no_descarta_documentos_si_falla():
+    """
+    Verifica que un error al leer los metadatos no saca el lote de la
+    importación: los documentos ya están en la base de datos y sus archivos
+    tienen que seguir a la etapa de copia.
+    """
+    controlador = ControlarImporetacionDocumento.__new__(ControlarImporetacionDocumento)
+    controlador.sesion_exiftool = _SesionExifToolRota()
+    elementos = [
+        _ElementoImportacion(
+            item=f"I{i}", trabajo=SimpleNamespace(ruta=f"/tmp/doc{i}.pdf"), id_documento=i
+        )
+        for i in range(1, 17)
+    ]
+
+    assert controlador._etapa_metadatos(elementos) is elementos
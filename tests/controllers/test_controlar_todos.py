@@ -0,0 +1,93 @@
+from models.controllers.controlar_existentes import ControlarExistentes
+from models.controllers.controlar_todos import ControlarTodos
+from models.dtos.trabajo_importacion_dto import TrabajoImportacionDTO
+from utilities.operaciones_archivo import COPIAR
+
+
+class _Vista:
+    def __init__(self, filas):
+        self.filas = filas
+
+    def get_children(self):
+        return list(self.filas)
+
+    def item(self, item, opcion):
+        return self.filas[item]
+
+
+class _Tabla:
+    def __init__(self, filas):
+        self.view = _Vista(filas)
+
+    def after(self, ms, funcion):
+        return None
+
+    def autofit_columns(self):
+        pass
+
+
+class _Label:
+    def __init__(self):
+        self.texto = ""
+
+    def config(self, text):
+        self.texto = text
+
+
+def test_cancelar_antes_de_empezar_no_copia_nada(tmp_path):
+    """
+    Verifica que una cancelación pedida desde la interfaz antes de que el
+    hilo de trabajo empiece no se pierde: no se copia ningún archivo.
+    """
+    origen = tmp_path / "origen"
+    origen.mkdir()
+    destino = tmp_path / "destino"
+    destino.mkdir()
+    trabajos = {}
+    filas = {}
+    for i in range(3):
+        ruta = origen / f"doc{i}.pdf"
+        ruta.write_bytes(b"x" * 1024)
+        trabajos[str(ruta)] = TrabajoImportacionDTO.desde_ruta(str(ruta), hash=f"h{i}")
+        filas[f"I{i}"] = ("", "", "", "", "", "", str(ruta))
+    label = _Label()
+    controlar = ControlarTodos(
+        label_progreso=label,
+        progress_bar=None,
+        table_view=_Tabla(filas),
+        ruta_destino=str(destino),
+        trabajos=trabajos,
+    )
+
+    controlar.cancelar()
+    controlar._procesar(COPIAR)
+    controlar.bus.drenar()
+
+    assert list(destino.iterdir()) == []
+    assert label.texto == "⛔ Operación cancelada"
+
+
+def test_existentes_solo_carga_los_archivos_de_la_biblioteca(tmp_path):
+    """
+    Verifica que `ControlarExistentes` reutiliza la carga de `ControlarTodos`
+    quedándose solo con los archivos marcados como existentes.
+    """
+    trabajos = {}
+    filas = {}
+    for i in range(4):
+        ruta = tmp_path / f"doc{i}.pdf"
+        ruta.write_bytes(b"x")
+        ruta = str(ruta)
+        trabajos[ruta] = TrabajoImportacionDTO.desde_ruta(
+            ruta, hash=f"h{i}", existe_en_biblioteca=i % 2 == 0
+        )
+        filas[f"I{i}"] = ("", "", "", "", "", "", ruta)
+    tabla = _Tabla(filas)
+
+    todos = ControlarTodos(_Label(), None, tabla, str(tmp_path), trabajos=trabajos)
+    existentes = ControlarExistentes(_Label(), None, tabla, str(tmp_path), trabajos=trabajos)
+    todos._load_data()
+    existentes._load_data()
+
+    assert list(todos.dict_data) == ["I0", "I1", "I2", "I3"]
+    assert list(existentes.dict_data) == ["I0", "I2"]
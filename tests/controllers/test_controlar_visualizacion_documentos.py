@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+
+from models.controllers.controlar_visualizacion_documentos import (
+    ARBOLES_ORGANIZACION,
+    ControlarVisualizacionDocumentos,
+)
+
+# --- Fixtures ---
+
+
+class _Tree:
+    """Lo mínimo de un Treeview: nodos por padre y foco."""
+
+    def __init__(self):
+        self.hijos = {"": []}
+        self.foco = ""
+
+    def insert(self, parent, index, iid, text, open=False):
+        hijos = self.hijos[parent]
+        hijos.insert(len(hijos) if index == "end" else index, iid)
+        self.hijos[iid] = []
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.hijos.pop(iid, None)
+            for hijos in self.hijos.values():
+                if iid in hijos:
+                    hijos.remove(iid)
+
+    def exists(self, iid):
+        return iid in self.hijos
+
+    def get_children(self, iid=""):
+        return tuple(self.hijos[iid])
+
+    def focus(self):
+        return self.foco
+
+
+class _Consulta:
+    def __init__(self, documentos_por_coleccion):
+        self.documentos_por_coleccion = documentos_por_coleccion
+
+    def get_documentos_por_coleccion(self, id_coleccion):
+        return self.documentos_por_coleccion[id_coleccion]
+
+
+class _Tabla:
+    def __init__(self):
+        self.filas = []
+
+    def delete_rows(self):
+        self.filas = []
+
+    def build_table_data(self, coldata, rowdata):
+        self.filas = rowdata
+
+    def autofit_columns(self):
+        pass
+
+    def autoalign_columns(self):
+        pass
+
+
+def _controlador(documentos_por_coleccion):
+    """Controlador sin Tk con un árbol de colecciones."""
+    controlar = ControlarVisualizacionDocumentos.__new__(ControlarVisualizacionDocumentos)
+    controlar.consulta = _Consulta(documentos_por_coleccion)
+    controlar.table_view = _Tabla()
+    controlar.master = SimpleNamespace(coldata=[])
+    controlar.icon_libro = ""
+    for _, atributo_mapa, _ in ARBOLES_ORGANIZACION.values():
+        setattr(controlar, atributo_mapa, {})
+    controlar.map_documentos = {}
+    controlar.ids_documentos_tabla = set()
+    tree = _Tree()
+    controlar.map_treeviews = {"Colecciones": tree}
+    for id_coleccion, documentos in documentos_por_coleccion.items():
+        controlar._insertar_nodo_organizacion(
+            tree, "", f"col_{id_coleccion}", f"Colección {id_coleccion}", len(documentos)
+        )
+    return controlar, tree
+
+
+def _expandir(controlar, tree, iid):
+    tree.foco = iid
+    controlar._on_expandir_organizacion("Colecciones")
+
+
+def _colapsar(controlar, tree, iid):
+    tree.foco = iid
+    controlar._on_colapsar_organizacion("Colecciones")
+
+
+def _doc(id_documento):
+    return {"id": id_documento, "nombre": f"doc{id_documento}"}
+
+
+# --- Tests ---
+
+
+def test_colapsar_libera_los_documentos_que_nadie_muestra():
+    """
+    Verifica que al colapsar una organización sus documentos salen de
+    `map_documentos`, salvo los que sigue mostrando otra organización
+    expandida.
+    """
+    controlar, tree = _controlador({1: [_doc(10), _doc(11)], 2: [_doc(11), _doc(12)]})
+    _expandir(controlar, tree, "col_1")
+    _expandir(controlar, tree, "col_2")
+    assert set(controlar.map_documentos) == {10, 11, 12}
+
+    _colapsar(controlar, tree, "col_1")
+    assert set(controlar.map_documentos) == {11, 12}
+
+    _colapsar(controlar, tree, "col_2")
+    assert controlar.map_documentos == {}
+
+
+def test_colapsar_conserva_los_documentos_de_la_tabla():
+    """
+    Verifica que los documentos mostrados en la tabla siguen resolviéndose
+    tras colapsar su organización, y se liberan al cambiar la tabla.
+    """
+    controlar, tree = _controlador({1: [_doc(10)]})
+    _expandir(controlar, tree, "col_1")
+    controlar._poblar_tabla(controlar.map_documentos_por_coleccion[1])
+
+    _colapsar(controlar, tree, "col_1")
+    assert set(controlar.map_documentos) == {10}
+
+    controlar._poblar_tabla([])
+    assert controlar.map_documentos == {}
@@ -0,0 +1,19 @@
+import os
+
+from models.controllers.controlar_visualizar_estante import _solicitud_portada_documento
+
+
+def test_solicitud_portada_no_crea_directorios(tmp_path):
+    """
+    Verifica que construir la solicitud de portada solo calcula la ruta del
+    documento en la biblioteca, sin crear su subdirectorio.
+    """
+    biblioteca = tmp_path / "biblioteca"
+    biblioteca.mkdir()
+    doc = {"id": 12345, "nombre": "manual", "extension": "pdf", "hash": "abc"}
+
+    solicitud = _solicitud_portada_documento(doc, str(biblioteca), "")
+
+    assert solicitud.ruta_documento == os.path.join(str(biblioteca), "012", "12345_manual.pdf")
+    assert os.listdir(biblioteca) == []
+    assert solicitud.hash == "abc"
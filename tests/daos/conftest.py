@@ -0,0 +1,22 @@
+import sqlite3
+
+import pytest
+
+from models.daos.database_dao import DataBaseDAO
+
+
+@pytest.fixture
+def ruta_db(tmp_path):
+    """
+    Fixture con una biblioteca de tres documentos.
+    """
+    ruta = str(tmp_path / "biblioteca.sqlite3")
+    DataBaseDAO(ruta_db=ruta).crear_base_de_datos()
+    con = sqlite3.connect(ruta)
+    with con:
+        con.executemany(
+            "INSERT INTO documento (id, nombre, extension, hash, tamano) VALUES (?, ?, 'pdf', ?, 10)",
+            [(i, f"doc{i}", f"h{i}") for i in (1, 2, 3)],
+        )
+    con.close()
+    return ruta
@@ -0,0 +1,144 @@
+import sqlite3
+
+import pytest
+
+from models.daos.cache_consultas import CacheConsultas, tabla_escrita
+from models.daos.coleccion_dao import ColeccionDAO
+from models.daos.database_dao import DataBaseDAO
+from models.daos.documento_coleccion_dao import DocumentoColeccionDAO
+from models.dtos.coleccion_dto import ColeccionDTO
+from models.entities.consulta import Consulta
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def ruta_db(tmp_path, monkeypatch):
+    """
+    Fixture con una biblioteca de dos documentos y la caché activada.
+    """
+    monkeypatch.setattr(CacheConsultas, "habilitada", True)
+    CacheConsultas.resetear()
+    ruta = str(tmp_path / "biblioteca.sqlite3")
+    DataBaseDAO(ruta_db=ruta).crear_base_de_datos()
+    con = sqlite3.connect(ruta)
+    with con:
+        con.executemany(
+            "INSERT INTO documento (id, nombre, extension, hash, tamano) VALUES (?, ?, 'pdf', ?, 10)",
+            [(1, "manual_python", "h1"), (2, "tesis_grado", "h2")],
+        )
+    con.close()
+    yield ruta
+    CacheConsultas.resetear()
+
+
+# --- Tests ---
+
+
+def test_tabla_escrita():
+    """
+    Verifica que se reconoce la tabla de cada tipo de escritura.
+    """
+    assert tabla_escrita("INSERT INTO coleccion (nombre) VALUES (?)") == "coleccion"
+    assert tabla_escrita("  insert or replace into Favorito VALUES (?)") == "favorito"
+    assert tabla_escrita("UPDATE documento SET nombre = ?") == "documento"
+    assert tabla_escrita("DELETE FROM documento_grupo WHERE id_grupo = ?") == "documento_grupo"
+    assert tabla_escrita("WITH x AS (SELECT 1) DELETE FROM grupo") is None
+
+
+def test_resultado_se_reutiliza_hasta_que_se_escribe_la_tabla(ruta_db):
+    """
+    Verifica los aciertos y que solo invalidan las escrituras de las tablas leídas.
+    """
+    consulta = Consulta(ruta_db=ruta_db)
+    id_coleccion = ColeccionDAO(ruta_db=ruta_db).insertar(
+        ColeccionDTO(nombre="Novelas", descripcion=None)
+    )
+    DocumentoColeccionDAO(ruta_db=ruta_db).insertar(params=(1, id_coleccion))
+
+    for _ in range(2):
+        assert consulta.get_conteo_documentos_por_organizacion("coleccion") == {id_coleccion: 1}
+        assert consulta.get_total_documentos() == 2
+    assert CacheConsultas.estadisticas()["aciertos"] == 2
+
+    DocumentoColeccionDAO(ruta_db=ruta_db).insertar(params=(2, id_coleccion))
+    assert consulta.get_conteo_documentos_por_organizacion("coleccion") == {id_coleccion: 2}
+    # el total de documentos no depende de las colecciones
+    assert consulta.get_total_documentos() == 2
+    estadisticas = CacheConsultas.estadisticas()
+    assert (estadisticas["aciertos"], estadisticas["fallos"]) == (3, 3)
+
+
+def test_borrado_en_cascada_invalida_las_tablas_derivadas(ruta_db):
+    """
+    Verifica que borrar una colección invalida los conteos de sus documentos.
+    """
+    consulta = Consulta(ruta_db=ruta_db)
+    id_coleccion = ColeccionDAO(ruta_db=ruta_db).insertar(
+        ColeccionDTO(nombre="Novelas", descripcion=None)
+    )
+    DocumentoColeccionDAO(ruta_db=ruta_db).insertar(params=(1, id_coleccion))
+    assert consulta.get_conteo_documentos_por_organizacion("coleccion") == {id_coleccion: 1}
+
+    ColeccionDAO(ruta_db=ruta_db).eliminar(id_coleccion)
+    assert consulta.get_conteo_documentos_por_organizacion("coleccion") == {}
+
+
+def test_conteo_del_estante_se_invalida_con_el_indice_de_texto(ruta_db):
+    """
+    Verifica que el total de una búsqueda del estante se reutiliza y que
+    asociar un documento a una colección (que reescribe `documento_fts`) lo
+    invalida.
+    """
+    consulta = Consulta(ruta_db=ruta_db)
+    id_coleccion = ColeccionDAO(ruta_db=ruta_db).insertar(
+        ColeccionDTO(nombre="Novelas", descripcion=None)
+    )
+    en_coleccion = {"tipo_organizacion": "coleccion", "id_organizacion": id_coleccion}
+
+    for _ in range(2):
+        assert consulta.contar_resultados_busqueda("todo", "") == 2
+        assert consulta.contar_resultados_busqueda("coleccion", "novelas") == 0
+        assert consulta.contar_resultados_busqueda("todo", "", **en_coleccion) == 0
+    assert CacheConsultas.estadisticas()["aciertos"] == 3
+
+    DocumentoColeccionDAO(ruta_db=ruta_db).insertar(params=(1, id_coleccion))
+    assert consulta.contar_resultados_busqueda("coleccion", "novelas") == 1
+    assert consulta.contar_resultados_busqueda("todo", "", **en_coleccion) == 1
+
+
+def test_escrituras_se_confirman_al_terminar_la_transaccion(ruta_db):
+    """
+    Verifica que una escritura anidada invalida al terminar la transacción
+    más externa, y que una escritura sin tablas anotadas invalida todo.
+    """
+    consulta = Consulta(ruta_db=ruta_db)
+    dao = ColeccionDAO(ruta_db=ruta_db)
+    id_coleccion = dao.insertar(ColeccionDTO(nombre="Novelas", descripcion=None))
+    assert consulta.get_conteo_documentos_por_organizacion("coleccion") == {}
+
+    with dao._get_connection():
+        DocumentoColeccionDAO(ruta_db=ruta_db).insertar(params=(1, id_coleccion))
+        assert consulta.get_conteo_documentos_por_organizacion("coleccion") == {}
+    assert consulta.get_conteo_documentos_por_organizacion("coleccion") == {id_coleccion: 1}
+
+    assert consulta.get_total_documentos() == 2
+    with dao._get_connection() as con:
+        con.execute("DELETE FROM documento WHERE id = 2")
+    assert consulta.get_total_documentos() == 1
+
+
+def test_cache_acotada_y_desactivable(ruta_db, monkeypatch):
+    """
+    Verifica el límite de entradas y que apagada siempre consulta.
+    """
+    monkeypatch.setattr(CacheConsultas, "MAX_ENTRADAS", 2)
+    for clave in range(3):
+        CacheConsultas.obtener(ruta_db, clave, ("documento",), lambda: clave)
+    assert CacheConsultas.estadisticas()["entradas"] == 2
+
+    monkeypatch.setattr(CacheConsultas, "habilitada", False)
+    llamadas = []
+    for _ in range(2):
+        CacheConsultas.obtener(ruta_db, "x", ("documento",), lambda: llamadas.append(1))
+    assert len(llamadas) == 2
@@ -0,0 +1,66 @@
+import json
+
+from models.controllers.controlar_comentarios import ControlarComentarios
+from models.daos.comentario_dao import ComentarioDAO
+
+# --- Tests ---
+
+
+def test_ids_con_comentario(ruta_db):
+    """
+    Verifica la consulta por lote de los documentos con comentario.
+    """
+    dao = ComentarioDAO(ruta_db=ruta_db)
+    dao.guardar(1, "primero")
+    dao.guardar(3, "tercero")
+    dao.guardar(3, "tercero, revisado")
+
+    assert dao.ids_con_comentario([1, 2, 3]) == {1, 3}
+    assert dao.instanciar(params=(3,))[0]["texto"] == "tercero, revisado"
+
+
+def test_guardar_comentario_vacio_lo_borra(ruta_db, tmp_path):
+    """
+    Verifica que guardar un texto vacío elimina el comentario.
+    """
+    comentarios = ControlarComentarios(str(tmp_path / "comentarios.json"), ruta_db=ruta_db)
+    assert comentarios.guardar_comentario(2, "  nota  ")
+    assert comentarios.obtener_comentario(2) == "nota"
+
+    assert comentarios.guardar_comentario(2, "")
+    assert comentarios.obtener_comentario(2) == ""
+    assert comentarios.guardar_comentario(2, "")
+    assert comentarios.ids_con_comentario([1, 2, 3]) == set()
+
+
+def test_migrar_archivo(ruta_db, tmp_path):
+    """
+    Verifica que se importan los comentarios del JSON (en sus dos formatos)
+    de documentos existentes y que el archivo se renombra.
+    """
+    ruta_archivo = tmp_path / "comentarios.json"
+    ruta_archivo.write_text(
+        json.dumps(
+            {
+                "comentarios": {
+                    "1": {"texto": "con fecha", "actualizado_en": "2024-01-02T10:00:00"},
+                    "2": "solo texto",
+                    "99": "documento borrado",
+                    "x": "id inválido",
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    comentarios = ControlarComentarios(str(ruta_archivo), ruta_db=ruta_db)
+
+    assert comentarios.migrar_archivo() == 2
+    assert not ruta_archivo.exists()
+    assert (tmp_path / "comentarios.json.migrado").exists()
+    guardados = comentarios.obtener_comentarios()
+    assert {id_documento: c["texto"] for id_documento, c in guardados.items()} == {
+        "1": "con fecha",
+        "2": "solo texto",
+    }
+    assert guardados["1"]["actualizado_en"] == "2024-01-02T10:00:00"
+    assert comentarios.migrar_archivo() == 0
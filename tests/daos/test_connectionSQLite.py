@@ -136,3 +136,64 @@ def test_multiples_consultas(db_con_tabla_libros):
     assert len(resultados) == 3
     assert resultados[0]['titulo'] == "Libro 1"
     assert resultados[2]['año'] == 2022
+
+
+def test_instancia_por_ruta(tmp_path):
+    """Verifica que cada ruta de base de datos tiene su propia instancia"""
+    db_a = Database(ruta_db=str(tmp_path / "a.sqlite3"))
+    db_b = Database(ruta_db=str(tmp_path / "b.sqlite3"))
+    assert db_a is not db_b
+    assert db_a is Database(ruta_db=str(tmp_path / "a.sqlite3"))
+    db_a.cerrar()
+    db_b.cerrar()
+
+
+def test_conexion_reutilizada_en_el_mismo_thread(tmp_path):
+    """Verifica que el pool devuelve la misma conexión dentro de un thread"""
+    db = Database(ruta_db=str(tmp_path / "pool.sqlite3"))
+    assert db.obtener_conexion() is db.obtener_conexion()
+    db.cerrar()
+
+
+def test_conexion_distinta_por_thread(tmp_path):
+    """Verifica que cada thread obtiene su propia conexión"""
+    import threading
+
+    db = Database(ruta_db=str(tmp_path / "threads.sqlite3"))
+    principal = db.obtener_conexion()
+    conexiones = []
+
+    hilo = threading.Thread(target=lambda: conexiones.append(db.obtener_conexion()))
+    hilo.start()
+    hilo.join()
+
+    assert conexiones[0] is not principal
+    db.cerrar()
+
+
+def test_pool_acotado_por_thread(tmp_path):
+    """Verifica que el pool cierra las conexiones menos usadas al superar el máximo"""
+    maximo = Database.MAX_CONEXIONES_POR_THREAD
+    rutas = [str(tmp_path / f"db_{i}.sqlite3") for i in range(maximo + 2)]
+    for ruta in rutas:
+        Database(ruta_db=ruta).obtener_conexion()
+
+    assert len(Database._pool_thread()) <= maximo
+    Database.cerrar_todas()
+
+
+def test_transaccion_anidada_confirma_en_el_bloque_externo(db_con_tabla_libros):
+    """Verifica que un rollback externo deshace también el bloque anidado"""
+    with pytest.raises(RuntimeError):
+        with db_con_tabla_libros.transaccion() as con:
+            with db_con_tabla_libros.transaccion() as con_anidada:
+                assert con is con_anidada
+                con_anidada.execute(
+                    "INSERT INTO libros (titulo, autor, año) VALUES (?, ?, ?)",
+                    ("Anidado", "Autor", 2000),
+                )
+            raise RuntimeError("fallo")
+
+    cursor = db_con_tabla_libros.obtener_cursor()
+    cursor.execute("SELECT COUNT(*) FROM libros")
+    assert cursor.fetchone()[0] == 0
@@ -0,0 +1,312 @@
+import sqlite3
+
+import pytest
+
+from models.daos.consulta_dao import ConsultaDAO
+from models.daos.database_dao import DataBaseDAO
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def ruta_db(tmp_path):
+    """
+    Fixture que crea el esquema completo con documentos, bibliografía,
+    colecciones y capítulos de prueba.
+    """
+    ruta = str(tmp_path / "biblioteca.sqlite3")
+    DataBaseDAO(ruta_db=ruta).crear_base_de_datos()
+    con = sqlite3.connect(ruta)
+    with con:
+        con.executemany(
+            "INSERT INTO documento (id, nombre, extension, hash, tamano) VALUES (?, ?, 'pdf', ?, 1)",
+            [
+                (1, "manual_python", "h1"),
+                (2, "tesis_grado", "h2"),
+                (3, "notas reunión", "h3"),
+            ],
+        )
+        con.execute(
+            "INSERT INTO bibliografia (titulo, autores, isbn, id_documento) "
+            "VALUES ('Aprendiendo Python', 'Guido van Rossum', '978-0-13', 2)"
+        )
+        con.execute("INSERT INTO coleccion (id, nombre) VALUES (1, 'Programación')")
+        con.execute("INSERT INTO documento_coleccion (id_documento, id_coleccion) VALUES (3, 1)")
+        con.execute(
+            "INSERT INTO capitulo (id, id_documento, numero_capitulo, titulo, pagina_inicio) "
+            "VALUES (1, 1, 1, 'Introducción a los decoradores', 5)"
+        )
+        con.execute(
+            "INSERT INTO seccion (id_capitulo, titulo, numero_pagina) "
+            "VALUES (1, 'Decoradores con argumentos', 9)"
+        )
+    con.close()
+    return ruta
+
+
+@pytest.fixture
+def dao(ruta_db):
+    return ConsultaDAO(ruta_db=ruta_db)
+
+
+def _ids(resultados):
+    return [fila["id"] for fila in resultados]
+
+
+# --- Tests ---
+
+
+def test_expresion_fts_prefijos_y_columnas():
+    """
+    Verifica que cada palabra se busca como prefijo y los operadores se escapan.
+    """
+    assert ConsultaDAO.expresion_fts("pyth gui") == '"pyth"* "gui"*'
+    assert ConsultaDAO.expresion_fts('a OR "b', ["nombre"]) == '{nombre} : ("a"* "OR"* "b"*)'
+    assert ConsultaDAO.expresion_fts("  -- ") is None
+
+
+def test_buscar_en_estante_por_prefijo_ordenado_por_relevancia(dao):
+    """
+    Verifica la búsqueda por prefijo en "todo": el nombre pesa más que el título.
+    """
+    assert _ids(dao.buscar_en_estante("todo", "pyth", 10, 0)) == [1, 2]
+    assert dao.count_buscar_en_estante("todo", "pyth") == 2
+    # sin distinguir acentos, y por nombre de colección
+    assert _ids(dao.buscar_en_estante("todo", "programacion", 10, 0)) == [3]
+    assert _ids(dao.buscar_en_estante("todo", "reunion", 10, 0)) == [3]
+
+
+def test_buscar_en_estante_por_campo_y_sin_termino(dao):
+    """
+    Verifica que el campo limita las columnas y que sin término se lista todo por nombre.
+    """
+    assert _ids(dao.buscar_en_estante("nombre", "python", 10, 0)) == [1]
+    assert _ids(dao.buscar_en_estante("autores", "rossum", 10, 0)) == [2]
+    assert _ids(dao.buscar_en_estante("isbn", "978", 10, 0)) == [2]
+    assert _ids(dao.buscar_en_estante("todo", "", 2, 0)) == [1, 3]
+    assert dao.count_buscar_en_estante("todo", "") == 3
+    assert dao.buscar_en_estante("desconocido", "python", 10, 0) == []
+
+
+def test_indice_se_actualiza_con_los_cambios(ruta_db, dao):
+    """
+    Verifica que los disparadores reindexan al renombrar y al desasociar.
+    """
+    con = sqlite3.connect(ruta_db)
+    con.execute("PRAGMA foreign_keys = ON")
+    with con:
+        con.execute("UPDATE coleccion SET nombre = 'Algoritmos' WHERE id = 1")
+        con.execute("UPDATE documento SET nombre = 'manual_rust' WHERE id = 1")
+    assert _ids(dao.buscar_en_estante("coleccion", "algor", 10, 0)) == [3]
+    assert dao.buscar_en_estante("coleccion", "program", 10, 0) == []
+    assert _ids(dao.buscar_en_estante("nombre", "rust", 10, 0)) == [1]
+
+    with con:
+        con.execute("DELETE FROM documento_coleccion WHERE id_documento = 3")
+        con.execute("DELETE FROM documento WHERE id = 2")
+    con.close()
+    assert dao.count_buscar_en_estante("coleccion", "algor") == 0
+    assert dao.buscar_en_bibliografia("titulo", "python") == []
+
+
+def test_buscar_en_bibliografia_y_contenido(dao):
+    """
+    Verifica las búsquedas de bibliografía y de capítulos y secciones.
+    """
+    resultados = dao.buscar_en_bibliografia("autores", "guido")
+    assert [r["id_documento"] for r in resultados] == [2]
+    assert dao.buscar_en_bibliografia("desconocido", "guido") == []
+
+    resultados = dao.buscar_en_contenido("decorador")
+    assert sorted(r["tipo"] for r in resultados) == ["Capítulo", "Sección"]
+    assert {r["id_documento"] for r in resultados} == {1}
+
+
+def test_indices_se_construyen_en_bases_anteriores(ruta_db):
+    """
+    Verifica que una base de datos sin índices de texto completo los crea
+    y los rellena con los datos existentes.
+    """
+    con = sqlite3.connect(ruta_db)
+    with con:
+        for (nombre,) in con.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trig_fts_%'"
+        ).fetchall():
+            con.execute(f"DROP TRIGGER {nombre}")
+        for tabla in ("documento_fts", "capitulo_fts", "seccion_fts"):
+            con.execute(f"DROP TABLE {tabla}")
+    con.close()
+
+    DataBaseDAO(ruta_db=ruta_db).crear_base_de_datos()
+    dao = ConsultaDAO(ruta_db=ruta_db)
+
+    assert _ids(dao.buscar_en_estante("todo", "tesis", 10, 0)) == [2]
+    assert len(dao.buscar_en_contenido("decoradores")) == 2
+
+
+def test_paginacion_por_clave_recorre_todo_en_orden(ruta_db, dao):
+    """
+    Verifica que paginar por (nombre, id) da las mismas páginas que OFFSET,
+    también con nombres repetidos.
+    """
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.executemany(
+            "INSERT INTO documento (id, nombre, extension, hash, tamano) VALUES (?, ?, 'pdf', ?, 1)",
+            [(i, f"informe {i % 4}", f"h{i}") for i in range(10, 30)],
+        )
+    con.close()
+
+    # por nombre (sin término o con demasiadas coincidencias) y por relevancia
+    for termino, limite in (("", 1000), ("informe", 5), ("informe", 1000)):
+        dao.LIMITE_ORDEN_RELEVANCIA = limite
+        total = dao.count_buscar_en_estante("todo", termino)
+        por_offset = _ids(dao.buscar_en_estante("todo", termino, total, 0))
+        por_clave, pagina = [], None
+        while pagina is None or pagina:
+            despues_de = (pagina[-1]["nombre"], pagina[-1]["id"]) if pagina else None
+            pagina = dao.buscar_en_estante(
+                "todo", termino, 3, len(por_clave), despues_de=despues_de
+            )
+            por_clave += _ids(pagina)
+        assert por_clave == por_offset
+        assert len(por_clave) == total
+
+    # con clave y orden por nombre el desplazamiento se ignora
+    dao.LIMITE_ORDEN_RELEVANCIA = 1000
+    primera = dao.buscar_en_estante("todo", "", 3, 0)
+    despues_de = (primera[-1]["nombre"], primera[-1]["id"])
+    assert dao.buscar_en_estante("todo", "", 3, 99, despues_de=despues_de) == (
+        dao.buscar_en_estante("todo", "", 3, 3)
+    )
+
+
+def test_filtro_organizacion_se_combina_con_busqueda_y_paginacion(ruta_db, dao):
+    """
+    Verifica que el filtro por organización se resuelve en SQL junto con el
+    término, el orden y la paginación, y que el total lo respeta.
+    """
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.executemany(
+            "INSERT INTO documento (id, nombre, extension, hash, tamano) VALUES (?, ?, 'pdf', ?, 1)",
+            [(i, f"informe {i:02d}", f"hi{i}") for i in range(10, 20)],
+        )
+        con.executemany(
+            "INSERT INTO documento_coleccion (id_documento, id_coleccion) VALUES (?, 1)",
+            [(i,) for i in range(10, 20, 2)],
+        )
+        con.execute("INSERT INTO etiqueta (id, nombre) VALUES (1, 'revisar')")
+        con.execute("INSERT INTO documento_etiqueta (id_documento, id_etiqueta) VALUES (11, 1)")
+    con.close()
+
+    en_coleccion = dict(tipo_organizacion="coleccion", id_organizacion=1)
+    assert _ids(dao.buscar_en_estante("todo", "", 10, 0, orden="nombre", **en_coleccion)) == [
+        10, 12, 14, 16, 18, 3
+    ]
+    assert dao.count_buscar_en_estante("todo", "", **en_coleccion) == 6
+    assert _ids(dao.buscar_en_estante("nombre", "informe", 10, 0, **en_coleccion)) == [
+        10, 12, 14, 16, 18
+    ]
+    assert dao.count_buscar_en_estante("nombre", "informe", **en_coleccion) == 5
+    assert dao.count_buscar_en_estante("nombre", "informe") == 10
+
+    # paginación por clave dentro de la organización
+    primera = dao.buscar_en_estante("todo", "", 2, 0, orden="nombre", **en_coleccion)
+    ultimo = primera[-1]
+    siguiente = dao.buscar_en_estante(
+        "todo", "", 2, 2, despues_de=(ultimo["nombre"], ultimo["id"]), **en_coleccion
+    )
+    assert _ids(primera) + _ids(siguiente) == [10, 12, 14, 16]
+
+    por_etiqueta = dict(tipo_organizacion="etiqueta", id_organizacion=1)
+    assert _ids(dao.buscar_en_estante("todo", "informe", 10, 0, **por_etiqueta)) == [11]
+    assert dao.buscar_en_estante("todo", "", 10, 0, tipo_organizacion="otra", id_organizacion=1) == []
+    assert dao.count_buscar_en_estante("todo", "", tipo_organizacion="otra", id_organizacion=1) == 0
+
+
+def test_numero_paginas_de_bibliografia_o_metadatos(ruta_db, dao):
+    """
+    Verifica que los listados toman el número de páginas de la bibliografía
+    y, si no lo tiene, del extraído de los metadatos.
+    """
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.execute("UPDATE bibliografia SET numero_paginas = 300 WHERE id_documento = 2")
+        con.executemany(
+            "INSERT INTO metadato (id_documento, clave, valor) VALUES (?, 'PDF:PageCount', ?)",
+            [(1, "57"), (2, "10")],
+        )
+    con.close()
+
+    paginas = {fila["id"]: fila["numero_paginas"] for fila in dao.get_todos_documentos()}
+    assert paginas == {1: 57, 2: 300, 3: None}
+    estante = dao.buscar_en_estante("todo", "", 10, 0)
+    assert {fila["id"]: fila["numero_paginas"] for fila in estante} == paginas
+
+
+def test_conteo_documentos_por_organizacion(ruta_db, dao):
+    """
+    Verifica que una sola consulta cuenta los documentos de cada
+    organización de un tipo, sin leerlos.
+    """
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.execute("INSERT INTO etiqueta (id, nombre) VALUES (1, 'leer'), (2, 'citar'), (3, 'vacía')")
+        con.executemany(
+            "INSERT INTO documento_etiqueta (id_documento, id_etiqueta) VALUES (?, ?)",
+            [(2, 1), (1, 1), (2, 2)],
+        )
+    con.close()
+    llamadas = []
+    original = dao._ejecutar_consulta
+    dao._ejecutar_consulta = lambda *a, **k: llamadas.append(a) or original(*a, **k)
+
+    assert dao.get_conteo_documentos_por_organizacion("etiqueta") == {1: 2, 2: 1}
+    assert len(llamadas) == 1
+    assert dao.get_conteo_documentos_por_organizacion("coleccion") == {1: 1}
+    assert dao.get_conteo_documentos_por_organizacion("otra") == {}
+
+
+def test_arbol_contenido_en_orden_de_insercion(ruta_db, dao):
+    """
+    Verifica que una sola consulta devuelve capítulos y secciones anidadas
+    con cada padre antes que sus hijos.
+    """
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.execute(
+            "INSERT INTO capitulo (id, id_documento, numero_capitulo, titulo) "
+            "VALUES (2, 1, 0, 'Prólogo'), (3, 2, 1, 'Otro documento')"
+        )
+        # la sección 1 es la del fixture (capítulo 1, sin padre)
+        con.executemany(
+            "INSERT INTO seccion (id, id_capitulo, titulo, id_padre) VALUES (?, ?, ?, ?)",
+            [
+                (2, 1, "Decoradores de clase", None),
+                (3, 1, "Argumentos posicionales", 1),
+                (4, 1, "Argumentos con nombre", 1),
+                (5, 1, "Solo con nombre", 4),
+                (6, 2, "Agradecimientos", None),
+                (7, 3, "De otro documento", None),
+            ],
+        )
+    con.close()
+    llamadas = []
+    original = dao._ejecutar_consulta
+    dao._ejecutar_consulta = lambda *a, **k: llamadas.append(a) or original(*a, **k)
+
+    arbol = dao.arbol_contenido_documento(1)
+    assert len(llamadas) == 1
+    assert [(f["tipo"], f["id"], f["profundidad"]) for f in arbol] == [
+        ("capitulo", 2, 0),
+        ("seccion", 6, 1),
+        ("capitulo", 1, 0),
+        ("seccion", 1, 1),
+        ("seccion", 3, 2),
+        ("seccion", 4, 2),
+        ("seccion", 5, 3),
+        ("seccion", 2, 1),
+    ]
+    assert arbol[2]["numero_pagina"] == 5 and arbol[3]["numero_pagina"] == 9
+    assert dao.arbol_contenido_documento(3) == []
@@ -0,0 +1,202 @@
+import sqlite3
+
+import pytest
+
+from models.daos.database_dao import DataBaseDAO
+
+# Definición de la vista antes de `documento_flags`, para probar la migración
+VISTA_ANTERIOR = """CREATE VIEW vista_documento_asociaciones AS
+SELECT d.id AS id_documento, d.nombre AS nombre_documento,
+    MAX(CASE WHEN m.id IS NOT NULL THEN 1 ELSE 0 END) AS tiene_metadato,
+    MAX(CASE WHEN f.id IS NOT NULL THEN 1 ELSE 0 END) AS es_favorito
+FROM documento d
+LEFT JOIN metadato m ON d.id = m.id_documento
+LEFT JOIN favorito f ON d.id = f.id_documento
+GROUP BY d.id, d.nombre;"""
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def ruta_db(tmp_path):
+    """
+    Fixture que crea el esquema completo en una base de datos temporal.
+    """
+    ruta = str(tmp_path / "biblioteca.sqlite3")
+    DataBaseDAO(ruta_db=ruta).crear_base_de_datos()
+    return ruta
+
+
+@pytest.fixture
+def con(ruta_db):
+    conexion = sqlite3.connect(ruta_db)
+    conexion.row_factory = sqlite3.Row
+    conexion.execute("PRAGMA foreign_keys = ON")
+    yield conexion
+    conexion.close()
+
+
+def _insertar_documento(con, nombre):
+    cursor = con.execute(
+        "INSERT INTO documento (nombre, extension, hash, tamano) VALUES (?, 'pdf', ?, 1)",
+        (nombre, f"hash_{nombre}"),
+    )
+    return cursor.lastrowid
+
+
+def _indicadores(con, id_documento):
+    fila = con.execute(
+        "SELECT * FROM vista_asociaciones_documentos WHERE id = ?", (id_documento,)
+    ).fetchone()
+    return dict(fila)
+
+
+# --- Tests ---
+
+
+def test_indicadores_se_mantienen_con_las_tablas_hijas(con):
+    """
+    Verifica que insertar y borrar filas hijas actualiza los indicadores.
+    """
+    id_documento = _insertar_documento(con, "manual")
+    assert _indicadores(con, id_documento)["tiene_metadato"] == 0
+
+    con.executemany(
+        "INSERT INTO metadato (id_documento, clave, valor) VALUES (?, ?, 'x')",
+        [(id_documento, "a"), (id_documento, "b")],
+    )
+    con.execute("INSERT INTO favorito (id_documento) VALUES (?)", (id_documento,))
+    indicadores = _indicadores(con, id_documento)
+    assert indicadores["tiene_metadato"] == 1
+    assert indicadores["es_favorito"] == 1
+    assert indicadores["tiene_capitulos"] == 0
+
+    # mientras quede una fila el indicador se mantiene
+    con.execute("DELETE FROM metadato WHERE clave = 'a'")
+    assert _indicadores(con, id_documento)["tiene_metadato"] == 1
+    con.execute("DELETE FROM metadato WHERE clave = 'b'")
+    con.execute("DELETE FROM favorito WHERE id_documento = ?", (id_documento,))
+    indicadores = _indicadores(con, id_documento)
+    assert indicadores["tiene_metadato"] == 0
+    assert indicadores["es_favorito"] == 0
+
+
+def test_indicadores_de_pivotes_y_borrado_de_documento(con):
+    """
+    Verifica las tablas pivote y que borrar el documento borra sus indicadores.
+    """
+    id_documento = _insertar_documento(con, "tesis")
+    id_etiqueta = con.execute("INSERT INTO etiqueta (nombre) VALUES ('python')").lastrowid
+    con.execute(
+        "INSERT INTO documento_etiqueta (id_documento, id_etiqueta) VALUES (?, ?)",
+        (id_documento, id_etiqueta),
+    )
+    assert _indicadores(con, id_documento)["tiene_etiqueta"] == 1
+
+    # borrar la etiqueta borra la asociación en cascada
+    con.execute("DELETE FROM etiqueta WHERE id = ?", (id_etiqueta,))
+    assert _indicadores(con, id_documento)["tiene_etiqueta"] == 0
+
+    con.execute("DELETE FROM documento WHERE id = ?", (id_documento,))
+    assert con.execute("SELECT COUNT(*) FROM documento_flags").fetchone()[0] == 0
+
+
+def test_migracion_desde_vista_anterior(ruta_db, con):
+    """
+    Verifica que una base de datos anterior recrea sus vistas y calcula
+    los indicadores de los documentos existentes.
+    """
+    con.execute("DROP VIEW vista_asociaciones_documentos")
+    con.execute("DROP VIEW vista_documento_asociaciones")
+    for (nombre,) in con.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trig_flags_%'"
+    ).fetchall():
+        con.execute(f"DROP TRIGGER {nombre}")
+    con.execute("DROP TABLE documento_flags")
+    con.execute(VISTA_ANTERIOR)
+    id_documento = _insertar_documento(con, "antiguo")
+    con.execute(
+        "INSERT INTO metadato (id_documento, clave, valor) VALUES (?, 'autor', 'x')",
+        (id_documento,),
+    )
+    con.commit()
+
+    DataBaseDAO(ruta_db=ruta_db).crear_base_de_datos()
+
+    sql_vista = con.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'vista_documento_asociaciones'"
+    ).fetchone()[0]
+    assert "documento_flags" in sql_vista
+    indicadores = _indicadores(con, id_documento)
+    assert indicadores["tiene_metadato"] == 1
+    assert indicadores["es_favorito"] == 0
+
+
+def test_columnas_derivadas_de_metadatos(con):
+    """
+    Verifica que páginas, título y autor se extraen de los metadatos al
+    guardarlos y se recalculan al borrarlos o modificarlos.
+    """
+    id_documento = _insertar_documento(con, "informe")
+    con.executemany(
+        "INSERT INTO metadato (id_documento, clave, valor) VALUES (?, ?, ?)",
+        [
+            (id_documento, "PDF:PageCount", " 120 "),
+            (id_documento, "XMP:PageCount", "desconocido"),
+            (id_documento, "PDF:Title", "Informe anual"),
+            (id_documento, "XMP:Title", "Otro título"),
+            (id_documento, "PDF:Creator", "Writer"),
+            (id_documento, "PDF:Author", "Ana Pérez"),
+            (id_documento, "File:FileSize", "2 MB"),
+        ],
+    )
+    fila = _indicadores(con, id_documento)
+    assert fila["numero_paginas_metadato"] == 120
+    assert fila["titulo_metadato"] == "Informe anual"
+    assert fila["autor_metadato"] == "Ana Pérez"
+
+    con.execute("DELETE FROM metadato WHERE clave = 'PDF:Title'")
+    con.execute("UPDATE metadato SET valor = '98' WHERE clave = 'PDF:PageCount'")
+    con.execute("DELETE FROM metadato WHERE clave = 'PDF:Author'")
+    fila = _indicadores(con, id_documento)
+    assert fila["numero_paginas_metadato"] == 98
+    assert fila["titulo_metadato"] == "Otro título"
+    assert fila["autor_metadato"] is None
+
+
+def test_migracion_rellena_columnas_derivadas(tmp_path):
+    """
+    Verifica que una base de datos sin las columnas derivadas las añade y
+    las calcula a partir de los metadatos existentes.
+    """
+    ruta = str(tmp_path / "anterior.sqlite3")
+    anterior = sqlite3.connect(ruta)
+    with anterior:
+        anterior.execute(
+            "CREATE TABLE documento(id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT NOT NULL, "
+            "extension TEXT NOT NULL, hash TEXT NOT NULL UNIQUE, tamano INTEGER, "
+            "esta_activo INTEGER DEFAULT 1, creado_en DATETIME DEFAULT CURRENT_TIMESTAMP, "
+            "actualizado_en DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        )
+        anterior.execute(
+            "CREATE TABLE metadato(id INTEGER PRIMARY KEY AUTOINCREMENT, id_documento INTEGER "
+            "NOT NULL, clave TEXT NOT NULL, valor TEXT NOT NULL, creado_en DATETIME, "
+            "actualizado_en DATETIME)"
+        )
+        anterior.execute(
+            "INSERT INTO documento (id, nombre, extension, hash, tamano) "
+            "VALUES (1, 'antiguo', 'pdf', 'h1', 1)"
+        )
+        anterior.execute(
+            "INSERT INTO metadato (id_documento, clave, valor) VALUES (1, 'Page Count', '42')"
+        )
+    anterior.close()
+
+    DataBaseDAO(ruta_db=ruta).crear_base_de_datos()
+
+    con = sqlite3.connect(ruta)
+    con.row_factory = sqlite3.Row
+    fila = _indicadores(con, 1)
+    con.close()
+    assert fila["numero_paginas_metadato"] == 42
+    assert fila["titulo_metadato"] is None
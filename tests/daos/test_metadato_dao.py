@@ -0,0 +1,103 @@
+import pytest
+import sqlite3
+from models.daos.documento_dao import DocumentoDAO
+from models.daos.metadato_dao import MetadatoDAO
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def metadato_dao(tmp_path):
+    """
+    Fixture que crea un MetadatoDAO sobre una base de datos temporal con
+    dos documentos, necesarios por la clave foránea de `metadato`.
+    """
+    ruta_db = str(tmp_path / "metadato.sqlite3")
+    documento_dao = DocumentoDAO(ruta_db=ruta_db)
+    documento_dao.insertar(params=('manual_python', 'pdf', 'hash123', 1024, 1))
+    documento_dao.insertar(params=('tesis_grado', 'pdf', 'hash456', 2048, 1))
+    yield MetadatoDAO(ruta_db=ruta_db)
+
+
+def _contar(dao, id_documento):
+    sql = "SELECT COUNT(*) AS total FROM metadato WHERE id_documento = ?"
+    return dao.instanciar(sql=sql, params=(id_documento,))[0]["total"]
+
+
+# --- Tests ---
+
+
+def test_insertar_metadatos_un_commit(metadato_dao, monkeypatch):
+    """
+    Verifica que todos los metadatos de un documento se insertan con un solo commit.
+    """
+    metadatos = {f"PDF:Clave{i}": f"valor {i}" for i in range(200)}
+    metadatos["PDF:PageCount"] = 12
+    metadatos["PDF:Nulo"] = None
+
+    con = metadato_dao._db.obtener_conexion()
+    commits = []
+    monkeypatch.setattr(
+        metadato_dao._db, "obtener_conexion", lambda: _ConexionEspia(con, commits)
+    )
+
+    insertados = metadato_dao.insertar_metadatos(id_documento=1, metadatos=metadatos)
+    monkeypatch.undo()
+
+    assert insertados == 201
+    assert len(commits) == 1
+    assert _contar(metadato_dao, 1) == 201
+    fila = metadato_dao.instanciar(
+        sql="SELECT valor FROM metadato WHERE clave = ?", params=("PDF:PageCount",)
+    )
+    assert fila[0]["valor"] == "12"
+
+
+def test_insertar_metadatos_varios_documentos(metadato_dao):
+    """
+    Verifica la inserción en lote de los metadatos de varios documentos.
+    """
+    insertados = metadato_dao.insertar_metadatos_documentos(
+        {1: {"A": "1", "B": "2"}, 2: {"A": "3"}}
+    )
+
+    assert insertados == 3
+    assert _contar(metadato_dao, 1) == 2
+    assert _contar(metadato_dao, 2) == 1
+
+
+def test_insertar_lote_es_atomico(metadato_dao):
+    """
+    Verifica que si una fila falla no se guarda ninguna del lote.
+    """
+    insertados = metadato_dao.insertar_lote([(1, "A", "1"), (999, "B", "2")])
+
+    assert insertados == 0
+    assert _contar(metadato_dao, 1) == 0
+
+
+def test_eliminar_metadato(metadato_dao):
+    """
+    Verifica que se elimina un metadato por su id.
+    """
+    id_metadato = metadato_dao.insertar(params=(1, "A", "1"))
+
+    assert metadato_dao.eliminar(params=(id_metadato,)) is True
+    assert metadato_dao.eliminar(params=(id_metadato,)) is False
+
+
+class _ConexionEspia:
+    """
+    Envuelve una conexión sqlite3 y registra las llamadas a commit.
+    """
+
+    def __init__(self, con: sqlite3.Connection, commits: list):
+        self._con = con
+        self._commits = commits
+
+    def commit(self):
+        self._commits.append(True)
+        self._con.commit()
+
+    def __getattr__(self, nombre):
+        return getattr(self._con, nombre)
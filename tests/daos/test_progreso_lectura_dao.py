@@ -0,0 +1,74 @@
+import sqlite3
+
+from models.controllers.controlar_progreso_lectura import ControlarProgresoLectura
+from models.daos.progreso_lectura_dao import ProgresoLecturaDAO
+
+# --- Fixtures ---
+
+
+class _ConfiguracionFalsa:
+    def __init__(self, progresos):
+        self.progresos = progresos
+
+    def obtener_progresos_lectura(self):
+        return dict(self.progresos)
+
+    def eliminar_progresos_lectura(self):
+        self.progresos = {}
+        return True
+
+
+# --- Tests ---
+
+
+def test_guardar_reemplaza_y_obtener_por_documentos(ruta_db):
+    """
+    Verifica que guardar dos veces deja un solo registro y que la consulta
+    por lote solo devuelve los documentos con progreso.
+    """
+    dao = ProgresoLecturaDAO(ruta_db=ruta_db)
+    assert dao.guardar(1, 10)
+    assert dao.guardar(1, 25)
+    assert dao.guardar(3, 0, en_lectura=False)
+
+    progresos = dao.obtener_por_documentos([1, 2, 3, 1])
+    assert sorted(progresos) == [1, 3]
+    assert progresos[1]["pagina_actual"] == 25
+    assert progresos[3]["en_lectura"] == 0
+    assert dao.obtener_por_documentos([]) == {}
+
+
+def test_progreso_se_borra_con_el_documento(ruta_db):
+    """
+    Verifica el borrado en cascada al eliminar el documento.
+    """
+    dao = ProgresoLecturaDAO(ruta_db=ruta_db)
+    dao.guardar(2, 5)
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.execute("PRAGMA foreign_keys = ON")
+        con.execute("DELETE FROM documento WHERE id = 2")
+    con.close()
+
+    assert not dao.existe(params=(2,))
+
+
+def test_migrar_configuracion(ruta_db):
+    """
+    Verifica que se importan los progresos de documentos existentes y se
+    borran del archivo de configuración.
+    """
+    config = _ConfiguracionFalsa(
+        {
+            "1": {"pagina_actual": 12, "en_lectura": True, "actualizado_en": "2024-01-02T10:00:00"},
+            "99": {"pagina_actual": 3, "en_lectura": True, "actualizado_en": ""},
+        }
+    )
+    controlador = ControlarProgresoLectura(ruta_db=ruta_db)
+
+    assert controlador.migrar_configuracion(config) == 1
+    assert config.progresos == {}
+    assert controlador.obtener_progresos([1, 99]) == {
+        "1": {"pagina_actual": 12, "en_lectura": True, "actualizado_en": "2024-01-02T10:00:00"}
+    }
+    assert controlador.migrar_configuracion(config) == 0
@@ -0,0 +1,46 @@
+import os
+
+from models.dtos.trabajo_importacion_dto import TrabajoImportacionDTO
+
+
+def test_trabajo_importacion_desde_ruta(tmp_path):
+    """
+    Verifica que el trabajo toma nombre, extensión y tamaño de un solo stat
+    y conserva el hash y la existencia recibidos.
+    """
+    ruta = tmp_path / "manual.pdf"
+    ruta.write_bytes(b"x" * 2048)
+
+    trabajo = TrabajoImportacionDTO.desde_ruta(
+        str(ruta), hash="abc123", existe_en_biblioteca=True
+    )
+
+    assert trabajo.ruta == str(ruta)
+    assert trabajo.nombre == "manual"
+    assert trabajo.extension == "pdf"
+    assert trabajo.nombre_con_extension == "manual.pdf"
+    assert trabajo.tamano == 2048
+    assert trabajo.hash == "abc123"
+    assert trabajo.existe_en_biblioteca is True
+    assert trabajo.esta_vigente() is True
+
+
+def test_trabajo_importacion_ruta_inexistente(tmp_path):
+    """
+    Verifica que no se crea un trabajo para un archivo que no existe.
+    """
+    assert TrabajoImportacionDTO.desde_ruta(str(tmp_path / "nada.pdf"), hash="x") is None
+
+
+def test_trabajo_importacion_deja_de_estar_vigente(tmp_path):
+    """
+    Verifica que el trabajo detecta que el archivo cambió desde la selección.
+    """
+    ruta = tmp_path / "libro.epub"
+    ruta.write_bytes(b"original")
+    trabajo = TrabajoImportacionDTO.desde_ruta(str(ruta), hash="h")
+
+    ruta.write_bytes(b"contenido modificado")
+    os.utime(ruta, ns=(trabajo.mtime_ns + 1_000_000_000, trabajo.mtime_ns + 1_000_000_000))
+
+    assert trabajo.esta_vigente() is False
@@ -136,3 +136,27 @@ def test_instanciar_documento_no_existente(ruta_db):
     doc = Documento("", "", "", 0, id=999, ruta_db=ruta_db)
     exito = doc.instanciar()
     assert exito is False
+
+
+def test_construir_documentos_no_abre_conexiones(ruta_db, monkeypatch):
+    """
+    Verifica que, con el esquema ya creado, construir entidades no hace I/O.
+    """
+    import sqlite3
+    from models.daos.database_dao import DataBaseDAO
+
+    DataBaseDAO(ruta_db=ruta_db).crear_base_de_datos()
+
+    conexiones_abiertas = {"total": 0}
+    connect_original = sqlite3.connect
+
+    def _connect_contado(*args, **kwargs):
+        conexiones_abiertas["total"] += 1
+        return connect_original(*args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, "connect", _connect_contado)
+
+    for i in range(10_000):
+        Documento(f"doc_{i}", "pdf", f"hash_{i}", i, ruta_db=ruta_db)
+
+    assert conexiones_abiertas["total"] == 0
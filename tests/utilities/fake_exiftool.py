@@ -0,0 +1,98 @@
+"""
+exiftool falso para los tests: implementa el modo `-stay_open True -@ -`
+que usa PyExifTool, sin necesidad de tener Perl ni exiftool instalados.
+
+- `-ver` responde una versión compatible.
+- Leer archivos responde JSON con `SourceFile`, `File:FileName`,
+  `File:FileSize` y los metadatos escritos antes con `-CLAVE=VALOR`, que se
+  guardan en `<archivo>.exif.json`.
+- Los archivos cuyo nombre contiene `omitir` no aparecen en la respuesta,
+  como los que exiftool salta con solo un aviso.
+- Cada arranque del proceso añade una línea al archivo indicado en la
+  variable de entorno `FAKE_EXIFTOOL_LOG`.
+"""
+
+import json
+import os
+import sys
+
+
+def _sidecar(ruta):
+    return f"{ruta}.exif.json"
+
+
+def _leer(ruta):
+    datos = {
+        "SourceFile": ruta,
+        "File:FileName": os.path.basename(ruta),
+        "File:FileSize": os.path.getsize(ruta),
+    }
+    if os.path.exists(_sidecar(ruta)):
+        with open(_sidecar(ruta), encoding="utf-8") as f:
+            datos.update(json.load(f))
+    return datos
+
+
+def _ejecutar(args):
+    """Retorna (stdout, status) para una orden."""
+    if "-ver" in args:
+        return "12.70\n", 0
+
+    escrituras = {}
+    archivos = []
+    for arg in args:
+        if arg.startswith("-") and "=" in arg:
+            clave, valor = arg[1:].split("=", 1)
+            escrituras[clave] = valor
+        elif not arg.startswith("-"):
+            archivos.append(arg)
+
+    if any(not os.path.exists(ruta) for ruta in archivos):
+        return "", 1
+
+    if escrituras:
+        for ruta in archivos:
+            datos = {}
+            if os.path.exists(_sidecar(ruta)):
+                with open(_sidecar(ruta), encoding="utf-8") as f:
+                    datos = json.load(f)
+            datos.update(escrituras)
+            with open(_sidecar(ruta), "w", encoding="utf-8") as f:
+                json.dump(datos, f)
+        return f"    {len(archivos)} image files updated\n", 0
+
+    leidos = [_leer(ruta) for ruta in archivos if "omitir" not in os.path.basename(ruta)]
+    return json.dumps(leidos), 0
+
+
+def main():
+    registro = os.environ.get("FAKE_EXIFTOOL_LOG")
+    if registro:
+        with open(registro, "a", encoding="utf-8") as f:
+            f.write("inicio\n")
+
+    args = []
+    eco = None
+    for linea in sys.stdin:
+        linea = linea.rstrip("\n")
+        if linea == "False" and args and args[-1] == "-stay_open":
+            break
+        if linea.startswith("-execute"):
+            numero = linea[len("-execute"):]
+            salida, status = _ejecutar(args)
+            sys.stdout.write(salida)
+            sys.stdout.write(f"{{ready{numero}}}\n")
+            sys.stdout.flush()
+            if eco is not None:
+                sys.stderr.write(eco.replace("${status}", str(status)) + "\n")
+                sys.stderr.flush()
+            args, eco = [], None
+        elif args and args[-1] == "-echo4":
+            args.pop()
+            eco = linea
+        else:
+            args.append(linea)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import threading
+
+from utilities.bus_progreso import BusProgreso
+
+# --- Fixtures ---
+
+
+class _Widget:
+    """Widget falso: guarda los `after` programados y su configuración."""
+
+    def __init__(self):
+        self.programados = []
+        self.configuraciones = []
+
+    def after(self, ms, funcion):
+        self.programados.append(funcion)
+        return f"after#{len(self.programados)}"
+
+    def config(self, **opciones):
+        self.configuraciones.append(opciones)
+
+
+class _Vista:
+    def __init__(self, iids):
+        self.iids = set(iids)
+        self.llamadas_delete = []
+
+    def exists(self, iid):
+        return iid in self.iids
+
+    def delete(self, *iids):
+        self.llamadas_delete.append(iids)
+        self.iids.difference_update(iids)
+
+
+class _Tabla:
+    def __init__(self, iids):
+        self.view = _Vista(iids)
+
+
+# --- Tests ---
+
+
+def test_drenar_agrupa_textos_valores_y_filas():
+    """
+    Verifica que de mil eventos solo se aplica el último texto y valor, y
+    que las filas se quitan con una sola llamada.
+    """
+    label, barra, tabla = _Widget(), _Widget(), _Tabla([f"I{i}" for i in range(1000)])
+    bus = BusProgreso(_Widget(), label=label, progress_bar=barra, table_view=tabla)
+
+    def trabajar():
+        bus.maximo(1000)
+        for i in range(1000):
+            bus.texto(f"archivo {i}")
+            bus.valor(i + 1)
+            bus.eliminar_fila(f"I{i}")
+
+    hilo = threading.Thread(target=trabajar)
+    hilo.start()
+    hilo.join()
+    bus.eliminar_fila("borrada")
+
+    assert bus.drenar() is False
+    assert barra.configuraciones == [{"maximum": 1000}, {"value": 1000}]
+    assert label.configuraciones == [{"text": "archivo 999"}]
+    assert len(tabla.view.llamadas_delete) == 1
+    assert tabla.view.iids == set()
+
+
+def test_funciones_en_orden_tras_el_progreso_y_terminar():
+    """
+    Verifica que las funciones se ejecutan en orden después del progreso y
+    que el vaciado periódico se detiene tras `terminar`.
+    """
+    widget, label = _Widget(), _Widget()
+    bus = BusProgreso(widget, label=label)
+    orden = []
+
+    bus.iniciar()
+    bus.iniciar()
+    assert len(widget.programados) == 1
+
+    bus.texto("trabajando")
+    bus.en_ui(lambda: orden.append(("primera", label.configuraciones[-1]["text"])))
+    bus.en_ui(lambda: orden.append(("segunda", None)))
+    widget.programados.pop(0)()
+    assert orden == [("primera", "trabajando"), ("segunda", None)]
+    # sigue vaciando mientras no se termine
+    assert len(widget.programados) == 1
+
+    bus.terminar()
+    widget.programados.pop(0)()
+    assert widget.programados == []
+
+
+def test_eliminar_filas_personalizado():
+    """
+    Verifica que las filas se entregan juntas a la función indicada.
+    """
+    recibidas = []
+    bus = BusProgreso(_Widget(), eliminar_filas=recibidas.append)
+    for id_documento in (3, 1, 2):
+        bus.eliminar_fila(id_documento)
+    bus.drenar()
+
+    assert recibidas == [[3, 1, 2]]
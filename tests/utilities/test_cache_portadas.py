@@ -0,0 +1,168 @@
+import os
+import threading
+from concurrent.futures import Future
+
+import fitz
+import pytest
+from PIL import Image
+
+from utilities.cache_portadas import CachePortadas, SolicitudPortada
+from utilities.portadas import generar_portada_ajustada
+
+TAMANO = (100, 150)
+
+# --- Fixtures ---
+
+
+class _ServicioEnHilo:
+    """
+    Servicio de portadas que renderiza en el hilo que pide, contando las llamadas.
+    """
+
+    def __init__(self):
+        self.llamadas = []
+
+    def enviar_ajustada(self, ruta_origen, ruta_salida, tamano):
+        self.llamadas.append(ruta_origen)
+        futuro = Future()
+        futuro.set_result(generar_portada_ajustada(ruta_origen, ruta_salida, tamano))
+        return futuro
+
+
+def _crear_pdf(ruta):
+    doc = fitz.open()
+    pagina = doc.new_page(width=595, height=842)
+    pagina.insert_text((72, 72), os.path.basename(ruta))
+    doc.save(str(ruta))
+    doc.close()
+    return str(ruta)
+
+
+@pytest.fixture
+def servicio():
+    return _ServicioEnHilo()
+
+
+@pytest.fixture
+def cache(tmp_path, servicio):
+    """
+    Fixture que crea una caché de portadas en un directorio temporal.
+    """
+    return CachePortadas(directorio=str(tmp_path / "cache"), servicio=servicio)
+
+
+@pytest.fixture
+def solicitudes(tmp_path):
+    """
+    Fixture con cuatro PDFs distintos y sus solicitudes de portada.
+    """
+    return [
+        SolicitudPortada(hash=f"{i:02d}" * 32, ruta_documento=_crear_pdf(tmp_path / f"doc{i}.pdf"))
+        for i in range(4)
+    ]
+
+
+# --- Tests ---
+
+
+def test_solicitar_genera_bajo_demanda_una_vez(cache, servicio, solicitudes):
+    """
+    Verifica que la primera solicitud renderiza y las siguientes son aciertos.
+    """
+    ruta = cache.obtener(solicitudes[0], TAMANO)
+
+    assert ruta == cache.ruta(solicitudes[0].hash, TAMANO)
+    with Image.open(ruta) as img:
+        assert img.width <= TAMANO[0] and img.height <= TAMANO[1]
+    assert cache.obtener(solicitudes[0], TAMANO) == ruta
+    assert len(servicio.llamadas) == 1
+    assert cache.tamano_total() == os.path.getsize(ruta)
+
+
+def test_solicitar_reutiliza_portada_existente(cache, servicio, solicitudes, tmp_path):
+    """
+    Verifica que una portada de la importación se usa como origen.
+    """
+    legado = tmp_path / "1_miniatura.png"
+    Image.new("RGB", (150, 200), "red").save(legado)
+    solicitud = SolicitudPortada(
+        hash=solicitudes[0].hash,
+        ruta_documento=solicitudes[0].ruta_documento,
+        ruta_portada_existente=str(legado),
+    )
+
+    assert cache.obtener(solicitud, TAMANO)
+    assert servicio.llamadas == [str(legado)]
+
+
+def test_solicitar_sin_documento_retorna_none(cache, servicio, tmp_path):
+    """
+    Verifica que un documento inexistente no tiene portada ni se encola.
+    """
+    solicitud = SolicitudPortada(hash="ab" * 32, ruta_documento=str(tmp_path / "no.pdf"))
+
+    assert cache.obtener(solicitud, TAMANO) is None
+    assert servicio.llamadas == []
+
+
+def test_desalojo_lru_por_presupuesto(cache, solicitudes):
+    """
+    Verifica que al superar el presupuesto se borran las portadas menos usadas.
+    """
+    rutas = [cache.obtener(s, TAMANO) for s in solicitudes[:2]]
+    # el presupuesto solo admite dos portadas
+    cache.presupuesto_bytes = sum(os.path.getsize(r) for r in rutas) + 1
+    # la primera pasa a ser la más reciente
+    cache.obtener(solicitudes[0], TAMANO)
+    cache.obtener(solicitudes[2], TAMANO)
+
+    assert os.path.exists(rutas[0])
+    assert not os.path.exists(rutas[1])
+    assert os.path.exists(cache.ruta(solicitudes[2].hash, TAMANO))
+    assert cache.tamano_total() <= cache.presupuesto_bytes
+
+
+def test_rellenar_genera_solo_las_que_faltan(cache, servicio, solicitudes):
+    """
+    Verifica que el relleno genera las portadas ausentes y respeta la cancelación.
+    """
+    cache.obtener(solicitudes[0], TAMANO)
+
+    assert cache.rellenar(solicitudes, TAMANO, max_en_vuelo=2) == 3
+    assert len(servicio.llamadas) == 4
+
+    cancelado = threading.Event()
+    cancelado.set()
+    assert cache.rellenar(solicitudes, (50, 75), cancelado=cancelado) == 0
+
+
+def test_aciertos_se_escriben_por_lotes(cache, solicitudes, monkeypatch):
+    """
+    Verifica que los aciertos no escriben en el índice uno a uno, sino en
+    un solo lote al volcarlos.
+    """
+    cache.obtener(solicitudes[0], TAMANO)
+    escrituras = []
+    monkeypatch.setattr(
+        cache._dao, "marcar_usados", lambda claves, usado_en: escrituras.append(list(claves))
+    )
+
+    for _ in range(50):
+        assert cache.buscar(solicitudes[0].hash, TAMANO)
+    assert escrituras == []
+
+    cache.volcar_usos()
+    assert len(escrituras) == 1 and len(escrituras[0]) == 50
+
+
+def test_desalojo_conserva_indice_y_archivo_de_la_nueva(cache, solicitudes):
+    """
+    Verifica que la portada recién generada sigue en el índice y en disco
+    aunque por sí sola supere el presupuesto.
+    """
+    cache.presupuesto_bytes = 1
+    ruta = cache.obtener(solicitudes[0], TAMANO)
+
+    assert os.path.exists(ruta)
+    assert cache.tamano_total() == os.path.getsize(ruta)
+    assert cache.buscar(solicitudes[0].hash, TAMANO) == ruta
@@ -0,0 +1,172 @@
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz
+import pytest
+
+from models.daos.consulta_dao import ConsultaDAO
+from models.daos.database_dao import DataBaseDAO
+from models.daos.texto_pagina_dao import TextoPaginaDAO
+from utilities import auxiliar
+from utilities.auxiliar import comando_visor_en_pagina, generar_ruta_documento
+from utilities.extraccion_texto import ExtractorTextoPaginas
+from utilities.texto_paginas import fragmento_coincidencia
+
+# --- Fixtures ---
+
+
+def _crear_pdf(ruta, textos):
+    doc = fitz.open()
+    for texto in textos:
+        pagina = doc.new_page(width=595, height=842)
+        pagina.insert_text((72, 72), texto)
+    doc.save(str(ruta))
+    doc.close()
+
+
+def _insertar_documento(ruta_db, ruta_biblioteca, id_documento, textos, hash_documento=None):
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.execute(
+            "INSERT OR REPLACE INTO documento (id, nombre, extension, hash, tamano) "
+            "VALUES (?, ?, 'pdf', ?, 1)",
+            (id_documento, f"doc{id_documento}", hash_documento or f"hash_{id_documento}"),
+        )
+    con.close()
+    _crear_pdf(
+        generar_ruta_documento(ruta_biblioteca, f"doc{id_documento}.pdf", id_documento), textos
+    )
+
+
+@pytest.fixture
+def ruta_db(tmp_path):
+    ruta = str(tmp_path / "biblioteca.sqlite3")
+    DataBaseDAO(ruta_db=ruta).crear_base_de_datos()
+    return ruta
+
+
+@pytest.fixture
+def ruta_biblioteca(tmp_path):
+    ruta = tmp_path / "biblioteca"
+    ruta.mkdir()
+    return str(ruta)
+
+
+@pytest.fixture
+def extractor(ruta_db, ruta_biblioteca):
+    """
+    Fixture con un extractor que usa hilos en lugar del pool de procesos.
+    """
+    executor = ThreadPoolExecutor(max_workers=2)
+    extractor = ExtractorTextoPaginas(
+        ruta_db=ruta_db,
+        obtener_ruta_biblioteca=lambda: ruta_biblioteca,
+        num_procesos=2,
+        executor=executor,
+    )
+    extractor.PAGINAS_POR_LOTE = 2
+    yield extractor
+    executor.shutdown()
+
+
+# --- Tests ---
+
+
+def test_extraer_y_buscar_por_pagina(ruta_db, ruta_biblioteca, extractor):
+    """
+    Verifica que la búsqueda devuelve documento, página y fragmento.
+    """
+    _insertar_documento(
+        ruta_db, ruta_biblioteca, 1, ["Portada", "Los algoritmos de ordenación", "Fin"]
+    )
+    _insertar_documento(ruta_db, ruta_biblioteca, 2, ["Redes neuronales y algoritmos"])
+
+    assert extractor.procesar_pendientes() == 2
+    assert extractor.progreso() == (2, 2)
+
+    resultados = ConsultaDAO(ruta_db=ruta_db).buscar_en_texto_paginas("algoritmo")
+    assert sorted((r["id_documento"], r["pagina"]) for r in resultados) == [(1, 2), (2, 1)]
+    assert {r["fragmento"] for r in resultados} == {
+        "Los algoritmos de ordenación",
+        "Redes neuronales y algoritmos",
+    }
+    assert ConsultaDAO(ruta_db=ruta_db).buscar_en_texto_paginas("ordenacion")[0]["pagina"] == 2
+
+    # una segunda pasada no tiene nada pendiente
+    assert extractor.procesar_pendientes() == 0
+
+
+def test_extraccion_se_reanuda_donde_se_dejo(ruta_db, ruta_biblioteca, extractor):
+    """
+    Verifica que una extracción cancelada continúa en el siguiente lote.
+    """
+    _insertar_documento(ruta_db, ruta_biblioteca, 1, [f"página {i}" for i in range(1, 6)])
+    cancelado = threading.Event()
+
+    original = extractor._dao.guardar_paginas
+
+    def guardar_y_cancelar(*args):
+        cancelado.set()
+        return original(*args)
+
+    extractor._dao.guardar_paginas = guardar_y_cancelar
+    assert extractor.procesar_pendientes(cancelado=cancelado) == 0
+    assert extractor.progreso() == (0, 1)
+    extractor._dao.guardar_paginas = original
+
+    assert extractor.procesar_pendientes() == 1
+    paginas = TextoPaginaDAO(ruta_db=ruta_db).instanciar(params=(1,))
+    assert [p["numero_pagina"] for p in paginas] == [1, 2, 3, 4, 5]
+    assert paginas[4]["texto"] == "página 5"
+
+
+def test_documento_borrado_o_modificado_se_reindexa(ruta_db, ruta_biblioteca, extractor):
+    """
+    Verifica que se purga el texto de documentos borrados y se vuelve a
+    extraer el de los que cambiaron de hash.
+    """
+    _insertar_documento(ruta_db, ruta_biblioteca, 1, ["texto original"])
+    _insertar_documento(ruta_db, ruta_biblioteca, 2, ["texto borrado"])
+    extractor.procesar_pendientes()
+
+    con = sqlite3.connect(ruta_db)
+    with con:
+        con.execute("DELETE FROM documento WHERE id = 2")
+    con.close()
+    _insertar_documento(ruta_db, ruta_biblioteca, 1, ["texto nuevo"], hash_documento="otro")
+
+    assert extractor.procesar_pendientes() == 1
+    dao = ConsultaDAO(ruta_db=ruta_db)
+    assert dao.buscar_en_texto_paginas("original") == []
+    assert dao.buscar_en_texto_paginas("borrado") == []
+    assert [r["id_documento"] for r in dao.buscar_en_texto_paginas("nuevo")] == [1]
+
+
+def test_fragmento_coincidencia_recorta_alrededor():
+    """
+    Verifica el recorte sin distinguir acentos y sin partir palabras.
+    """
+    texto = "uno dos tres " * 20 + "la Programación funcional " + "cuatro cinco " * 20
+    fragmento = fragmento_coincidencia(texto, "programacion", contexto=20)
+
+    assert fragmento.startswith("…") and fragmento.endswith("…")
+    assert "Programación funcional" in fragmento
+    assert all(palabra in texto.split() for palabra in fragmento.strip("…").split())
+    assert fragmento_coincidencia("corto", "nada") == "corto"
+
+
+def test_comando_visor_en_pagina(monkeypatch):
+    """
+    Verifica que se usa el primer visor instalado que admite página.
+    """
+    instalados = {"evince": "/usr/bin/evince", "zathura": "/usr/bin/zathura"}
+    monkeypatch.setattr(auxiliar, "which", instalados.get)
+
+    assert comando_visor_en_pagina("/tmp/a.pdf", 7) == [
+        "/usr/bin/evince",
+        "--page-index=7",
+        "/tmp/a.pdf",
+    ]
+    monkeypatch.setattr(auxiliar, "which", lambda _: None)
+    assert comando_visor_en_pagina("/tmp/a.pdf", 7) is None
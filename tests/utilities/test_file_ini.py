@@ -0,0 +1,107 @@
+import os
+import threading
+
+import pytest
+
+from utilities.fileINI import FileINI
+
+CONTENIDO = """; configuración de prueba
+[ubicaciones]
+; ubicaciones varias
+ubicacion_biblioteca=/home/u/BibliotecaTK
+
+[toggle]
+; paneles
+panel_lateral=1
+estado = {"a": 1}
+"""
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def ruta_ini(tmp_path):
+    ruta = tmp_path / "settings.ini"
+    ruta.write_text(CONTENIDO, encoding="utf-8")
+    return str(ruta)
+
+
+@pytest.fixture
+def ini(ruta_ini, monkeypatch):
+    monkeypatch.setattr(FileINI, "RETARDO_ESCRITURA", 60)
+    return FileINI(ruta_ini)
+
+
+# --- Tests ---
+
+
+def test_lectura_desde_los_indices(ini):
+    """
+    Verifica secciones, claves y valores, incluidos los separados con espacios.
+    """
+    assert ini.sections() == ["ubicaciones", "toggle"]
+    assert ini.get_value("ubicaciones", "ubicacion_biblioteca") == "/home/u/BibliotecaTK"
+    assert ini.get_value("toggle", "estado") == '{"a": 1}'
+    assert ini.get_value("toggle", "no_existe") == ""
+    assert ini.get_value("otra", "panel_lateral") == ""
+    assert ini.section_keys("toggle") == ["panel_lateral", "estado"]
+    assert ini.key_exist("toggle", "panel_lateral")
+    assert ini.value_exist("toggle", "1")
+
+
+def test_escrituras_se_agrupan_y_conservan_el_formato(ini, ruta_ini):
+    """
+    Verifica que los cambios no tocan el disco hasta guardar, que se guardan
+    juntos y que se conservan comentarios y orden.
+    """
+    ini.add_value("toggle", "panel_lateral", "0")
+    ini.add_value("toggle", "panel_archivo", "1")
+    ini.add_value("estilo", "tema", "cosmo")
+    assert open(ruta_ini, encoding="utf-8").read() == CONTENIDO
+    assert ini.get_value("toggle", "panel_archivo") == "1"
+
+    assert ini.guardar()
+    assert open(ruta_ini, encoding="utf-8").read() == CONTENIDO.replace(
+        "panel_lateral=1\n", "panel_archivo=1\npanel_lateral=0\n"
+    ) + "\n[estilo]\n; comentario\ntema=cosmo\n"
+    assert [f for f in os.listdir(os.path.dirname(ruta_ini)) if f.endswith(".tmp")] == []
+
+    ini.delete_key("toggle", "panel_archivo")
+    ini.delete_section("estilo")
+    ini.guardar()
+    releido = FileINI(ruta_ini)
+    assert releido.sections() == ["ubicaciones", "toggle"]
+    assert releido.get_value("toggle", "panel_lateral") == "0"
+    assert not releido.key_exist("toggle", "panel_archivo")
+
+
+def test_escritura_diferida_en_segundo_plano(ruta_ini, monkeypatch):
+    """
+    Verifica que una ráfaga de cambios produce una sola escritura al vencer el plazo.
+    """
+    monkeypatch.setattr(FileINI, "RETARDO_ESCRITURA", 0.05)
+    ini = FileINI(ruta_ini)
+    escrituras = []
+    escrito = threading.Event()
+    original = ini._FileINI__reemplazar_archivo
+
+    def reemplazar(contenido):
+        escrituras.append(contenido)
+        original(contenido)
+        escrito.set()
+
+    ini._FileINI__reemplazar_archivo = reemplazar
+    for valor in range(20):
+        ini.add_value("toggle", "panel_lateral", str(valor))
+
+    assert escrito.wait(2)
+    assert len(escrituras) == 1
+    assert FileINI(ruta_ini).get_value("toggle", "panel_lateral") == "19"
+
+
+def test_instancia_compartida_por_ruta(ruta_ini):
+    """
+    Verifica que la instancia compartida se crea una vez por archivo.
+    """
+    assert FileINI.compartido(ruta_ini) is FileINI.compartido(ruta_ini)
+    assert FileINI.compartido(ruta_ini) is not FileINI(ruta_ini)
@@ -0,0 +1,138 @@
+import hashlib
+
+import pytest
+
+import os
+
+from utilities.hashing import CacheHash, FirmaArchivo, MotorHash, calcular_sha256, sha256_con_cache
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def archivos(tmp_path):
+    """
+    Fixture que crea varios archivos con contenidos distintos.
+    """
+    rutas = []
+    for i in range(6):
+        ruta = tmp_path / f"archivo_{i}.bin"
+        ruta.write_bytes(bytes([i]) * (300_000 + i))
+        rutas.append(str(ruta))
+    return rutas
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    Fixture que crea una caché de hashes en una base de datos temporal.
+    """
+    return CacheHash(ruta_db=str(tmp_path / "hash_cache.sqlite3"), max_entradas=4)
+
+
+# --- Tests ---
+
+
+def test_calcular_sha256_coincide_con_hashlib(archivos):
+    """
+    Verifica que el hash por bloques coincide con el hash del contenido completo.
+    """
+    for ruta in archivos:
+        with open(ruta, "rb") as f:
+            esperado = hashlib.sha256(f.read()).hexdigest()
+        assert calcular_sha256(ruta, tamano_buffer=64 * 1024) == esperado
+
+
+def test_calcular_sha256_archivo_inexistente(tmp_path):
+    """
+    Verifica que un archivo inexistente devuelve None.
+    """
+    assert calcular_sha256(str(tmp_path / "no_existe.pdf")) is None
+
+
+def test_motor_hash_procesa_todos_y_reporta_progreso(archivos):
+    """
+    Verifica que el motor entrega un resultado por archivo y acumula el progreso.
+    """
+    progreso = []
+    motor = MotorHash(num_hilos=3)
+
+    resultados = list(
+        motor.hashear(archivos, al_completar=lambda r, e: progreso.append(e.archivos_procesados))
+    )
+
+    assert sorted(r.ruta for r in resultados) == sorted(archivos)
+    assert all(r.hash == calcular_sha256(r.ruta) for r in resultados)
+    assert progreso == list(range(1, len(archivos) + 1))
+    assert sum(r.tamano for r in resultados) == sum(300_000 + i for i in range(6))
+
+
+def test_cache_evita_releer_archivos_sin_cambios(archivos, cache, monkeypatch):
+    """
+    Verifica que un segundo escaneo usa la caché y no vuelve a leer los archivos.
+    """
+    motor = MotorHash(num_hilos=2, cache=cache)
+    primeros = {r.ruta: r.hash for r in motor.hashear(archivos[:3])}
+
+    def _no_leer(*args, **kwargs):
+        raise AssertionError("no se debería releer el archivo")
+
+    monkeypatch.setattr("utilities.hashing.calcular_sha256", _no_leer)
+    segundos = list(motor.hashear(archivos[:3]))
+
+    assert all(r.desde_cache for r in segundos)
+    assert {r.ruta: r.hash for r in segundos} == primeros
+
+
+def test_cache_invalida_archivo_modificado(archivos, cache):
+    """
+    Verifica que una entrada deja de usarse cuando cambia la firma del archivo.
+    """
+    ruta = archivos[0]
+    hash_original = sha256_con_cache(ruta, cache=cache)
+
+    with open(ruta, "ab") as f:
+        f.write(b"cambio")
+    os.utime(ruta, ns=(0, 123_456_789))
+
+    assert cache.buscar(FirmaArchivo.desde_ruta(ruta)) is None
+    hash_nuevo = sha256_con_cache(ruta, cache=cache)
+    assert hash_nuevo != hash_original
+    assert cache.buscar(FirmaArchivo.desde_ruta(ruta)) == hash_nuevo
+
+
+def test_cache_desaloja_las_entradas_menos_usadas(archivos, cache):
+    """
+    Verifica que la caché no supera su tamaño máximo.
+    """
+    for ruta in archivos:
+        sha256_con_cache(ruta, cache=cache)
+
+    assert cache._dao.contar() == 4
+    assert cache.buscar(FirmaArchivo.desde_ruta(archivos[-1])) is not None
+
+
+def test_aciertos_y_altas_sin_escrituras_innecesarias(archivos, tmp_path, monkeypatch):
+    """
+    Verifica que los aciertos sueltos no escriben hasta completar un lote y
+    que guardar por debajo del máximo no desaloja.
+    """
+    cache = CacheHash(ruta_db=str(tmp_path / "hash_cache.sqlite3"), max_entradas=100)
+    llamadas = {"desalojar": 0, "marcar_usados": 0}
+    for nombre in llamadas:
+        original = getattr(cache._dao, nombre)
+
+        def contar(*args, _nombre=nombre, _original=original, **kwargs):
+            llamadas[_nombre] += 1
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(cache._dao, nombre, contar)
+
+    for ruta in archivos:
+        sha256_con_cache(ruta, cache=cache)
+    for ruta in archivos:
+        sha256_con_cache(ruta, cache=cache)
+
+    assert llamadas == {"desalojar": 0, "marcar_usados": 0}
+    cache.volcar_usos()
+    assert llamadas["marcar_usados"] == 1
@@ -0,0 +1,84 @@
+from utilities.modelo_tabla import ModeloTablaColumnar, clave_tamano
+
+# --- Fixtures ---
+
+
+def _modelo(numero_filas):
+    modelo = ModeloTablaColumnar(3, claves_orden={2: clave_tamano})
+    unidades = ("B", "KB", "MB")
+    filas = [
+        [i, f"Documento {(i * 7) % numero_filas:05d}", f"{i % 10}.00 {unidades[i % 3]}"]
+        for i in range(1, numero_filas + 1)
+    ]
+    # llegan por lotes, como desde el hilo de búsqueda
+    for inicio in range(0, numero_filas, 1000):
+        modelo.agregar_filas(filas[inicio:inicio + 1000])
+    return modelo
+
+
+# --- Tests ---
+
+
+def test_carga_por_lotes_y_ventana():
+    """
+    Verifica que las filas cargadas por lotes conservan el orden de llegada
+    y que la ventana solo materializa las filas pedidas.
+    """
+    modelo = _modelo(5000)
+
+    assert len(modelo) == modelo.total == 5000
+    ventana = modelo.ventana(100, 103)
+    assert [valores[0] for _, valores in ventana] == [101, 102, 103]
+    iid, valores = ventana[0]
+    assert modelo.fila(iid) == valores
+
+
+def test_ordenar_y_filtrar_en_memoria():
+    """
+    Verifica el orden numérico, por tamaño legible y descendente, y que el
+    filtro se combina con el orden.
+    """
+    modelo = _modelo(3000)
+
+    modelo.ordenar(1)
+    nombres = [valores[1] for _, valores in modelo.ventana(0, len(modelo))]
+    assert nombres == sorted(nombres)
+
+    modelo.ordenar(2)
+    tamanos = [clave_tamano(valores[2]) for _, valores in modelo.ventana(0, len(modelo))]
+    assert tamanos == sorted(tamanos)
+    assert modelo.ventana(len(modelo) - 1, len(modelo))[0][1][2] == "9.00 MB"
+
+    modelo.ordenar(0, descendente=True)
+    modelo.filtrar("DOCUMENTO 0001")
+    ids = [valores[0] for _, valores in modelo.ventana(0, len(modelo))]
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == 10
+    assert all("Documento 0001" in modelo.fila(iid)[1] for iid in modelo.iids())
+
+    # las filas que llegan después respetan el orden y el filtro
+    modelo.agregar_filas([[99999, "Documento 00019", "1 KB"]])
+    assert modelo.ventana(0, 1)[0][1][0] == 99999
+
+    modelo.filtrar("")
+    assert len(modelo) == 3001
+
+
+def test_eliminar_y_actualizar_mantienen_los_iid():
+    """
+    Verifica que quitar filas no cambia el iid de las demás y que
+    actualizar una fila reordena la vista.
+    """
+    modelo = ModeloTablaColumnar(2)
+    iids = modelo.agregar_filas([[1, "c"], [2, "a"], [3, "b"]])
+
+    assert modelo.eliminar_filas([iids[0], "desconocido"]) == 1
+    assert not modelo.existe(iids[0])
+    assert modelo.fila(iids[2]) == [3, "b"]
+
+    modelo.ordenar(1)
+    assert modelo.iids() == [iids[1], iids[2]]
+    assert modelo.actualizar_fila(iids[1], [2, "z"])
+    assert modelo.iids() == [iids[2], iids[1]]
+    assert modelo.iids(seleccion={iids[1]}) == [iids[1]]
+    assert modelo.actualizar_fila(iids[0], [1, "x"]) is False
@@ -0,0 +1,143 @@
+import os
+import threading
+
+import pytest
+
+from utilities import operaciones_archivo
+from utilities.operaciones_archivo import (
+    COPIAR,
+    ELIMINAR,
+    MOVER,
+    EjecutorOperacionesArchivo,
+    OperacionArchivo,
+    OperacionCancelada,
+    copiar_archivo_rapido,
+)
+
+# --- Fixtures ---
+
+
+def _crear_archivos(directorio, cantidad, tamano=1024):
+    directorio.mkdir(exist_ok=True)
+    rutas = []
+    for i in range(cantidad):
+        ruta = directorio / f"doc{i}.pdf"
+        ruta.write_bytes(bytes([i % 256]) * tamano)
+        rutas.append(ruta)
+    return rutas
+
+
+# --- Tests ---
+
+
+def test_copiar_mover_y_eliminar_en_paralelo(tmp_path):
+    """
+    Verifica las tres operaciones, el orden del resultado y la llamada por
+    cada operación terminada.
+    """
+    origenes = _crear_archivos(tmp_path / "origen", 6)
+    destino = tmp_path / "destino"
+    destino.mkdir()
+    operaciones = [
+        OperacionArchivo(COPIAR, str(origenes[0]), str(destino / "copia.pdf")),
+        OperacionArchivo(MOVER, str(origenes[1]), str(destino / "movido.pdf")),
+        OperacionArchivo(ELIMINAR, str(origenes[2])),
+        OperacionArchivo(COPIAR, str(tmp_path / "no_existe.pdf"), str(destino / "x.pdf")),
+    ]
+    terminadas = []
+
+    ejecutor = EjecutorOperacionesArchivo(max_hilos=4, max_por_dispositivo=2)
+    resultado = ejecutor.ejecutar(
+        operaciones, al_terminar=lambda operacion, n: terminadas.append(n)
+    )
+    ejecutor.cerrar()
+
+    assert resultado == operaciones
+    assert [o.ok for o in resultado] == [True, True, True, False]
+    assert "no_existe.pdf" in resultado[3].error
+    assert sorted(terminadas) == [1, 2, 3, 4]
+    assert (destino / "copia.pdf").read_bytes() == origenes[0].read_bytes()
+    assert (destino / "movido.pdf").read_bytes() == bytes([1]) * 1024
+    assert not origenes[1].exists() and not origenes[2].exists()
+
+
+def test_copia_conserva_fechas_y_no_pisa_el_origen(tmp_path):
+    """
+    Verifica que la copia mantiene la fecha de modificación y que copiar un
+    archivo sobre sí mismo falla sin vaciarlo.
+    """
+    (origen,) = _crear_archivos(tmp_path, 1)
+    os.utime(origen, (1_000_000_000, 1_000_000_000))
+    copia = tmp_path / "copia.pdf"
+
+    copiar_archivo_rapido(str(origen), str(copia))
+    assert copia.stat().st_mtime == 1_000_000_000
+
+    ejecutor = EjecutorOperacionesArchivo(max_hilos=1)
+    (operacion,) = ejecutor.ejecutar([OperacionArchivo(COPIAR, str(origen), str(origen))])
+    assert not operacion.ok
+    assert origen.stat().st_size == 1024
+
+
+def test_cancelar_no_deja_copias_a_medias(tmp_path, monkeypatch):
+    """
+    Verifica que una copia cancelada entre bloques borra el destino y que
+    las operaciones aún no empezadas se descartan.
+    """
+    monkeypatch.setattr(operaciones_archivo, "TAMANO_BLOQUE", 1024)
+    origenes = _crear_archivos(tmp_path / "origen", 3, tamano=64 * 1024)
+    destino = tmp_path / "destino"
+    destino.mkdir()
+    cancelado = threading.Event()
+    original = os.copy_file_range if hasattr(os, "copy_file_range") else None
+
+    def copiar_y_cancelar(*args):
+        cancelado.set()
+        return original(*args)
+
+    if original is not None:
+        monkeypatch.setattr(os, "copy_file_range", copiar_y_cancelar)
+    else:
+        cancelado.set()
+
+    ejecutor = EjecutorOperacionesArchivo(max_hilos=1)
+    resultado = ejecutor.ejecutar(
+        [OperacionArchivo(COPIAR, str(o), str(destino / o.name)) for o in origenes],
+        cancelado=cancelado,
+    )
+    ejecutor.cerrar()
+
+    assert all(o.cancelada and not o.ok for o in resultado)
+    assert list(destino.iterdir()) == []
+    assert all(o.exists() for o in origenes)
+
+
+def test_copia_fallida_conserva_el_destino_existente(tmp_path, monkeypatch):
+    """
+    Verifica que si la copia falla o se cancela, el archivo que ya había en
+    el destino sigue intacto y no quedan temporales.
+    """
+    (origen,) = _crear_archivos(tmp_path / "origen", 1)
+    destino = tmp_path / "destino"
+    destino.mkdir()
+    existente = destino / "doc0.pdf"
+    existente.write_bytes(b"contenido anterior")
+
+    def fallar(*args, **kwargs):
+        raise PermissionError("sin permisos")
+
+    with monkeypatch.context() as parche:
+        parche.setattr(operaciones_archivo.shutil, "copystat", fallar)
+        with pytest.raises(PermissionError):
+            copiar_archivo_rapido(str(origen), str(existente))
+
+    cancelado = threading.Event()
+    cancelado.set()
+    with pytest.raises(OperacionCancelada):
+        copiar_archivo_rapido(str(origen), str(existente), cancelado)
+
+    assert existente.read_bytes() == b"contenido anterior"
+    assert list(destino.iterdir()) == [existente]
+
+    copiar_archivo_rapido(str(origen), str(existente))
+    assert existente.read_bytes() == origen.read_bytes()
@@ -0,0 +1,122 @@
+import threading
+import time
+
+from utilities.pipeline import EtapaPipeline, Pipeline
+
+
+def test_pipeline_procesa_todos_los_elementos():
+    """
+    Verifica que cada elemento recorre todas las etapas en orden.
+    """
+    completados = []
+    lock = threading.Lock()
+
+    def al_completar(elemento):
+        with lock:
+            completados.append(elemento)
+
+    pipeline = Pipeline(
+        [
+            EtapaPipeline("doble", lambda x: x * 2, num_hilos=3, tamano_cola=2),
+            EtapaPipeline("mas_uno", lambda x: x + 1, num_hilos=2, tamano_cola=2),
+        ]
+    )
+    estadisticas = pipeline.ejecutar(range(50), al_completar=al_completar)
+
+    assert sorted(completados) == [x * 2 + 1 for x in range(50)]
+    assert [e.procesados for e in estadisticas] == [50, 50]
+    assert all(e.en_cola == 0 for e in estadisticas)
+
+
+def test_pipeline_descarta_none_y_errores():
+    """
+    Verifica que un None o una excepción sacan al elemento del pipeline
+    sin detener al resto.
+    """
+
+    def filtrar(x):
+        if x == 3:
+            raise ValueError("fallo")
+        return None if x % 2 else x
+
+    completados = []
+    pipeline = Pipeline(
+        [
+            EtapaPipeline("filtro", filtrar, num_hilos=2),
+            EtapaPipeline("identidad", lambda x: x),
+        ]
+    )
+    estadisticas = pipeline.ejecutar(range(10), al_completar=completados.append)
+
+    assert sorted(completados) == [0, 2, 4, 6, 8]
+    assert estadisticas[0].descartados == 5
+    assert estadisticas[1].procesados == 5
+
+
+def test_pipeline_solapa_etapas():
+    """
+    Verifica que las etapas trabajan a la vez: con dos etapas de 20 ms y
+    diez elementos, el total es menor que ejecutarlas en serie.
+    """
+
+    def lento(x):
+        time.sleep(0.02)
+        return x
+
+    pipeline = Pipeline([EtapaPipeline("a", lento), EtapaPipeline("b", lento)])
+    inicio = time.perf_counter()
+    pipeline.ejecutar(range(10))
+
+    assert time.perf_counter() - inicio < 0.4 * 0.9
+
+
+def test_pipeline_notifica_progreso():
+    """
+    Verifica que se notifican las estadísticas de todas las etapas.
+    """
+    notificaciones = []
+    pipeline = Pipeline([EtapaPipeline("a", lambda x: x), EtapaPipeline("b", lambda x: x)])
+    pipeline.ejecutar(range(5), al_progresar=notificaciones.append, intervalo=0.01)
+
+    assert notificaciones
+    assert [e.nombre for e in notificaciones[-1]] == ["a", "b"]
+    assert notificaciones[-1][-1].procesados == 5
+
+
+def test_pipeline_cancelado_no_procesa():
+    """
+    Verifica que tras cancelar no se procesan más elementos y el pipeline termina.
+    """
+    pipeline = Pipeline([EtapaPipeline("a", lambda x: x)])
+    pipeline.cancelar()
+    completados = []
+    pipeline.ejecutar(range(100), al_completar=completados.append)
+
+    assert completados == []
+
+
+def test_pipeline_etapa_por_lotes():
+    """
+    Verifica que una etapa con `tamano_lote` recibe listas acotadas y que
+    sus resultados siguen a la etapa siguiente.
+    """
+    tamanos = []
+
+    def duplicar_lote(lote):
+        tamanos.append(len(lote))
+        return [None if x == 0 else x * 2 for x in lote]
+
+    completados = []
+    pipeline = Pipeline(
+        [
+            EtapaPipeline("lento", lambda x: x, tamano_cola=50),
+            EtapaPipeline("lote", duplicar_lote, tamano_cola=50, tamano_lote=8),
+        ]
+    )
+    estadisticas = pipeline.ejecutar(range(40), al_completar=completados.append)
+
+    assert sorted(completados) == [x * 2 for x in range(1, 40)]
+    assert max(tamanos) <= 8
+    assert sum(tamanos) == 40
+    assert estadisticas[1].procesados == 39
+    assert estadisticas[1].descartados == 1
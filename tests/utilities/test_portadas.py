@@ -0,0 +1,53 @@
+import fitz
+import pytest
+from PIL import Image
+
+from utilities.portadas import TAMANO_NORMAL, ServicioPortadas, renderizar_portada
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    """
+    Fixture que crea un PDF A4 de dos páginas.
+    """
+    ruta = tmp_path / "documento.pdf"
+    doc = fitz.open()
+    for i in range(2):
+        pagina = doc.new_page(width=595, height=842)
+        pagina.insert_text((72, 72), f"Página {i + 1}")
+    doc.save(str(ruta))
+    doc.close()
+    return str(ruta)
+
+
+# --- Tests ---
+
+
+def test_renderizar_portada_respeta_tamano_maximo(pdf):
+    """
+    Verifica que la portada no supera el tamaño máximo.
+    """
+    img = renderizar_portada(pdf)
+
+    assert img is not None
+    assert img.width <= TAMANO_NORMAL[0] and img.height <= TAMANO_NORMAL[1]
+
+
+def test_servicio_portadas_en_pool_de_procesos(pdf, tmp_path):
+    """
+    Verifica que el servicio genera las portadas en otro proceso.
+    """
+    servicio = ServicioPortadas(num_procesos=2)
+    try:
+        futuros = [
+            servicio.enviar_ajustada(pdf, str(tmp_path / f"{i}_200x280.png"), (200, 280))
+            for i in range(3)
+        ]
+        assert all(futuro.result(timeout=60) > 0 for futuro in futuros)
+    finally:
+        servicio.cerrar()
+
+    with Image.open(tmp_path / "2_200x280.png") as img:
+        assert img.width <= 200 and img.height <= 280
@@ -0,0 +1,133 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from utilities.sesion_exiftool import SesionExifTool
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def exiftool_falso(tmp_path, monkeypatch):
+    """
+    Fixture que crea un ejecutable que lanza el exiftool falso y registra
+    cada arranque del proceso.
+    """
+    registro = tmp_path / "arranques.log"
+    script = os.path.join(os.path.dirname(__file__), "fake_exiftool.py")
+    ejecutable = tmp_path / "exiftool"
+    ejecutable.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+    ejecutable.chmod(ejecutable.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("FAKE_EXIFTOOL_LOG", str(registro))
+    return str(ejecutable), registro
+
+
+@pytest.fixture
+def archivos(tmp_path):
+    rutas = []
+    for i in range(5):
+        ruta = tmp_path / f"documento_{i}.pdf"
+        ruta.write_bytes(b"%PDF" + bytes(i))
+        rutas.append(str(ruta))
+    return rutas
+
+
+def _arranques(registro):
+    return len(registro.read_text().splitlines()) if registro.exists() else 0
+
+
+# --- Tests ---
+
+
+def test_obtener_metadatos_lote_un_proceso(exiftool_falso, archivos):
+    """
+    Verifica que varios lotes de archivos se leen con un único proceso exiftool.
+    """
+    ejecutable, registro = exiftool_falso
+
+    with SesionExifTool(ejecutable=ejecutable) as sesion:
+        primero = sesion.obtener_metadatos(archivos[:3])
+        segundo = sesion.obtener_metadatos(archivos[3:])
+
+    assert set(primero) == set(archivos[:3])
+    assert set(segundo) == set(archivos[3:])
+    assert primero[archivos[0]]["File:FileName"] == "documento_0.pdf"
+    assert _arranques(registro) == 1
+
+
+def test_obtener_metadatos_ignora_inexistentes(exiftool_falso, archivos, tmp_path):
+    """
+    Verifica que un archivo inexistente no impide leer el resto del lote.
+    """
+    ejecutable, _ = exiftool_falso
+
+    with SesionExifTool(ejecutable=ejecutable) as sesion:
+        metadatos = sesion.obtener_metadatos([archivos[0], str(tmp_path / "no_existe.pdf")])
+
+    assert list(metadatos) == [archivos[0]]
+
+
+def test_obtener_metadatos_reintenta_por_archivo(exiftool_falso, archivos):
+    """
+    Verifica que si el lote falla se recuperan los archivos legibles.
+    """
+    ejecutable, _ = exiftool_falso
+
+    with SesionExifTool(ejecutable=ejecutable) as sesion:
+        sesion.obtener_metadatos(archivos[:1])
+        # el archivo desaparece después del filtro de existencia
+        original = sesion._leer
+
+        def leer_con_fallo(rutas):
+            if len(rutas) > 1:
+                raise RuntimeError("lote fallido")
+            return original(rutas)
+
+        sesion._leer = leer_con_fallo
+        metadatos = sesion.obtener_metadatos(archivos)
+
+    assert set(metadatos) == set(archivos)
+
+
+def test_editar_metadato_reutiliza_sesion(exiftool_falso, archivos):
+    """
+    Verifica que editar y volver a leer un metadato usa el mismo proceso.
+    """
+    ejecutable, registro = exiftool_falso
+
+    with SesionExifTool(ejecutable=ejecutable) as sesion:
+        assert sesion.editar_metadato(archivos[0], "PDF:Title", "Nuevo título") is True
+        metadatos = sesion.obtener_metadatos([archivos[0]])
+
+    assert metadatos[archivos[0]]["PDF:Title"] == "Nuevo título"
+    assert _arranques(registro) == 1
+
+
+def test_editar_metadato_archivo_inexistente(exiftool_falso, tmp_path):
+    """
+    Verifica que un error de exiftool se informa como False.
+    """
+    ejecutable, _ = exiftool_falso
+
+    with SesionExifTool(ejecutable=ejecutable) as sesion:
+        assert sesion.editar_metadato(str(tmp_path / "nada.pdf"), "PDF:Title", "x") is False
+
+
+def test_obtener_metadatos_asocia_por_source_file(exiftool_falso, archivos, tmp_path):
+    """
+    Verifica que si exiftool omite un archivo del lote, el resto recibe sus
+    propios metadatos y el omitido no aparece.
+    """
+    ejecutable, _ = exiftool_falso
+    omitido = tmp_path / "omitir_documento.pdf"
+    omitido.write_bytes(b"%PDF")
+    rutas = [archivos[0], str(omitido), *archivos[1:3]]
+
+    with SesionExifTool(ejecutable=ejecutable) as sesion:
+        metadatos = sesion.obtener_metadatos(rutas)
+
+    assert set(metadatos) == {archivos[0], archivos[1], archivos[2]}
+    for ruta in metadatos:
+        assert metadatos[ruta]["File:FileName"] == os.path.basename(ruta)
@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+from utilities.modelo_tabla import ModeloTablaColumnar
+from views.components.virtual_table_view import VirtualTableView
+
+# --- Fixtures ---
+
+
+class _Treeview:
+    """Lo mínimo de un Treeview: filas dibujadas, selección y foco."""
+
+    def __init__(self):
+        self.filas = []
+        self.seleccion = ()
+        self.foco = ""
+
+    def get_children(self):
+        return tuple(self.filas)
+
+    def delete(self, *iids):
+        self.filas = [iid for iid in self.filas if iid not in iids]
+        self.seleccion = tuple(iid for iid in self.seleccion if iid not in iids)
+
+    def insert(self, parent, index, iid, values):
+        self.filas.append(iid)
+
+    def selection(self):
+        return self.seleccion
+
+    def selection_set(self, *iids):
+        self.seleccion = tuple(iids)
+
+    def focus(self, iid=None):
+        if iid is None:
+            return self.foco
+        self.foco = iid
+
+    def yview_moveto(self, fraccion):
+        pass
+
+
+def _tabla(numero_filas):
+    """Tabla sin Tk: `after_idle` se acumula y se ejecuta con `_idle`."""
+    tabla = VirtualTableView.__new__(VirtualTableView)
+    tabla.MARGEN = 2
+    tabla.modelo = ModeloTablaColumnar(1)
+    tabla._seleccion = set()
+    tabla._renderizadas = set()
+    tabla._extender_seleccion = False
+    tabla._ignorar_seleccion = False
+    tabla._inicio = tabla._fin = tabla._primera = 0
+    tabla._visibles = 3
+    tabla._id_render = None
+    tabla.view = _Treeview()
+    tabla.ybar = SimpleNamespace(set=lambda primero, ultimo: None)
+    pendientes = []
+    tabla.after_idle = lambda funcion: pendientes.append(funcion) or "idle"
+
+    def idle():
+        while pendientes:
+            pendientes.pop(0)()
+
+    tabla._idle = idle
+    tabla.agregar_filas([[f"fila {i}"] for i in range(numero_filas)])
+    idle()
+    return tabla
+
+
+def _seleccionar(tabla, *iids):
+    # como el Treeview: cambia la selección dibujada y avisa con <<TreeviewSelect>>
+    tabla.view.selection_set(*iids)
+    tabla._al_cambiar_seleccion(None)
+
+
+# --- Tests ---
+
+
+def test_seleccion_sin_modificadores_reemplaza_filas_fuera_de_la_ventana():
+    """
+    Verifica que una fila seleccionada que sale de la ventana deja de estar
+    seleccionada cuando la selección cambia sin Shift ni Control (p. ej. el
+    menú contextual llama a `selection_set`).
+    """
+    tabla = _tabla(100)
+    primera = tabla.view.get_children()[0]
+    _seleccionar(tabla, primera)
+
+    tabla._mover_a(60)
+    # el dibujado quita la fila de la ventana y Tk avisa después
+    tabla._al_cambiar_seleccion(None)
+    tabla._idle()
+    assert primera not in tabla.view.get_children()
+    assert [fila.iid for fila in tabla.get_rows(selected=True)] == [primera]
+
+    otra = tabla.view.get_children()[0]
+    _seleccionar(tabla, otra)
+
+    assert [fila.iid for fila in tabla.get_rows(selected=True)] == [otra]
+
+
+def test_seleccion_con_control_conserva_filas_fuera_de_la_ventana():
+    """
+    Verifica que con Control la selección de las filas que no están
+    dibujadas se conserva.
+    """
+    tabla = _tabla(100)
+    primera = tabla.view.get_children()[0]
+    _seleccionar(tabla, primera)
+
+    tabla._mover_a(60)
+    tabla._idle()
+    otra = tabla.view.get_children()[0]
+    tabla._al_pulsar_tecla(SimpleNamespace(state=0x0004))
+    _seleccionar(tabla, otra)
+
+    assert {fila.iid for fila in tabla.get_rows(selected=True)} == {primera, otra}